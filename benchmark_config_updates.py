@@ -0,0 +1,46 @@
+"""Measure the per frame cost of checking for camera config updates.
+
+Usage: python benchmark_config_updates.py [check_count]
+"""
+
+import os
+import sys
+import time
+
+from frigate.config.camera.updater import (
+    CameraConfigUpdateEnum,
+    CameraConfigUpdatePublisher,
+    CameraConfigUpdateSubscriber,
+)
+
+CHECK_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+CAMERA = "benchmark_camera"
+
+
+def run(name: str, check) -> None:
+    start = time.perf_counter()
+
+    for _ in range(CHECK_COUNT):
+        check()
+
+    duration = time.perf_counter() - start
+    print(f"{name}: {duration / CHECK_COUNT * 1e6:.2f}us per frame")
+
+
+if __name__ == "__main__":
+    os.makedirs("/tmp/cache", exist_ok=True)
+    publisher = CameraConfigUpdatePublisher([CAMERA])
+    subscriber = CameraConfigUpdateSubscriber(
+        None, {CAMERA: None}, [CameraConfigUpdateEnum.enabled]
+    )
+
+    # let the startup grace period pass so only the generation is read
+    time.sleep(1.1)
+    subscriber.check_for_updates()
+
+    # what every frame used to do
+    run("zmq poll", subscriber.subscriber.check_for_update)
+    run("generation check", subscriber.check_for_updates)
+
+    subscriber.stop()
+    publisher.stop()
@@ -0,0 +1,130 @@
+"""Compare recall and latency of quantized semantic search against float embeddings.
+
+Builds one sqlite-vec table per quantization from the same synthetic, clustered
+768 dimension embeddings and searches them the way the semantic search does:
+the float table directly, the quantized tables for rerank_factor * k
+candidates that are reranked with the full precision embeddings.
+
+Usage: python benchmark_embedding_quantization.py [row_count] [rerank_factor] [vec0_path]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from frigate.db.sqlitevecq import (
+    EMBEDDINGS_FULL_COLUMN,
+    EMBEDDINGS_VECTOR_TYPES,
+    quantize_embedding_sql,
+)
+
+ROW_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+RERANK_FACTOR = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+VEC_PATH = sys.argv[3] if len(sys.argv) > 3 else "/usr/local/lib/vec0"
+DIMENSIONS = 768
+CLUSTERS = 1_000
+K = 50
+QUERY_COUNT = 50
+INSERT_BATCH = 5_000
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.enable_load_extension(True)
+    conn.load_extension(VEC_PATH)
+    conn.enable_load_extension(False)
+    return conn
+
+
+def embeddings(rng: np.random.Generator, centers: np.ndarray, count: int):
+    # objects of the same kind have similar embeddings
+    vectors = centers[rng.integers(len(centers), size=count)]
+    vectors = vectors + rng.standard_normal((count, DIMENSIONS), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build(conn: sqlite3.Connection, quantization: str, centers: np.ndarray) -> None:
+    full = f", +{EMBEDDINGS_FULL_COLUMN} BLOB" if quantization != "none" else ""
+    conn.execute(
+        f"CREATE VIRTUAL TABLE vec USING vec0(id TEXT PRIMARY KEY, "
+        f"embedding {EMBEDDINGS_VECTOR_TYPES[quantization]}{full})"
+    )
+
+    if quantization == "none":
+        insert = "INSERT INTO vec(id, embedding) VALUES (?, ?)"
+    else:
+        insert = (
+            f"INSERT INTO vec(id, embedding, {EMBEDDINGS_FULL_COLUMN}) "
+            f"VALUES (?1, {quantize_embedding_sql(quantization, '?2')}, ?2)"
+        )
+
+    # every table gets the same embeddings
+    rng = np.random.default_rng(0)
+    conn.execute("BEGIN")
+
+    for start in range(0, ROW_COUNT, INSERT_BATCH):
+        vectors = embeddings(rng, centers, min(INSERT_BATCH, ROW_COUNT - start))
+        conn.executemany(
+            insert,
+            [(f"event-{start + i}", v.tobytes()) for i, v in enumerate(vectors)],
+        )
+
+    conn.execute("COMMIT")
+
+
+def search(conn: sqlite3.Connection, quantization: str, query: bytes) -> list[str]:
+    if quantization == "none":
+        rows = conn.execute(
+            "SELECT id, distance FROM vec WHERE embedding MATCH ? AND k = ? ORDER BY distance",
+            [query, K],
+        )
+    else:
+        rows = conn.execute(
+            f"SELECT id, vec_distance_cosine({EMBEDDINGS_FULL_COLUMN}, ?) AS distance "
+            f"FROM (SELECT id, {EMBEDDINGS_FULL_COLUMN} FROM vec "
+            f"WHERE embedding MATCH {quantize_embedding_sql(quantization, '?')} "
+            f"AND k = ?) ORDER BY distance LIMIT ?",
+            [query, query, K * RERANK_FACTOR, K],
+        )
+
+    return [row[0] for row in rows]
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(1)
+    centers = rng.standard_normal((CLUSTERS, DIMENSIONS), dtype=np.float32) * 0.5
+    queries = [v.tobytes() for v in embeddings(rng, centers, QUERY_COUNT)]
+    exact: list[set[str]] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for quantization in EMBEDDINGS_VECTOR_TYPES:
+            path = os.path.join(tmp, f"{quantization}.db")
+            conn = connect(path)
+            start = time.perf_counter()
+            build(conn, quantization, centers)
+            build_duration = time.perf_counter() - start
+
+            # warm the page cache
+            search(conn, quantization, queries[0])
+            recall = 0.0
+            start = time.perf_counter()
+
+            for i, query in enumerate(queries):
+                results = search(conn, quantization, query)
+
+                if quantization == "none":
+                    exact.append(set(results))
+                else:
+                    recall += len(exact[i].intersection(results)) / K
+
+            duration = time.perf_counter() - start
+            conn.close()
+            print(
+                f"{quantization}: {duration / QUERY_COUNT * 1000:.1f}ms per search, "
+                f"recall@{K} {recall / QUERY_COUNT if quantization != 'none' else 1:.3f}, "
+                f"{os.path.getsize(path) / 2**20:.0f}MB, built in {build_duration:.1f}s"
+            )
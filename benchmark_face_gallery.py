@@ -0,0 +1,101 @@
+"""Compare matching faces against the face gallery and per identity means.
+
+Enrolls synthetic ArcFace sized embeddings, grouped by identity, and matches
+noisy faces of enrolled identities the way the face model did before (cosine
+similarity to the trimmed mean of every identity, one identity at a time) and
+with the gallery (centroid shortlist and exact trimmed mean rerank). Also
+times updating the model after one face is enrolled: recomputing the trimmed
+mean of every identity versus the incremental gallery update. Embedding the
+face images is not included, a rebuild before also embedded every image.
+
+Usage: python benchmark_face_gallery.py [samples_per_identity] [sample_counts...]
+"""
+
+import sys
+import time
+
+import numpy as np
+from scipy import stats
+
+from frigate.data_processing.common.face.gallery import FaceGallery
+
+SAMPLES_PER_IDENTITY = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+SAMPLE_COUNTS = [int(c) for c in sys.argv[2:]] or [100, 1_000, 10_000]
+DIMENSIONS = 512
+QUERY_COUNT = 200
+
+
+def per_identity(mean_embs: dict[str, np.ndarray], embedding: np.ndarray):
+    score = -1.0
+    label = ""
+
+    for name, mean_emb in mean_embs.items():
+        dot_product = np.dot(embedding, mean_emb)
+        magnitude_A = np.linalg.norm(embedding)
+        magnitude_B = np.linalg.norm(mean_emb)
+        cosine_similarity = dot_product / (magnitude_A * magnitude_B)
+
+        if cosine_similarity > score:
+            score = cosine_similarity
+            label = name
+
+    return label
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    for sample_count in SAMPLE_COUNTS:
+        rng = np.random.default_rng(0)
+        identity_count = max(1, sample_count // SAMPLES_PER_IDENTITY)
+        centers = rng.standard_normal((identity_count, DIMENSIONS), np.float32)
+        samples: dict[str, list[np.ndarray]] = {}
+        enrolled = []
+
+        for i in range(sample_count):
+            name = f"person_{i % identity_count}"
+            embedding = centers[i % identity_count] + rng.standard_normal(
+                DIMENSIONS, np.float32
+            )
+            samples.setdefault(name, []).append(embedding)
+            enrolled.append((f"{name}-{i}.webp", name, embedding))
+
+        queries = [
+            (f"person_{i}", centers[i] + rng.standard_normal(DIMENSIONS, np.float32))
+            for i in rng.integers(identity_count, size=QUERY_COUNT)
+        ]
+
+        start = time.perf_counter()
+        mean_embs = {
+            name: stats.trim_mean(embs, 0.15) for name, embs in samples.items()
+        }
+        rebuild = (time.perf_counter() - start) * 1000
+        gallery = FaceGallery()
+        gallery.update(enrolled)
+
+        # scores of every identity are computed once before timing the search
+        for _, query in queries[:10]:
+            gallery.search(query)
+
+        start = time.perf_counter()
+        before = [per_identity(mean_embs, query) for _, query in queries]
+        before_ms = (time.perf_counter() - start) * 1000 / QUERY_COUNT
+        start = time.perf_counter()
+        after = [gallery.search(query)[0] for _, query in queries]
+        after_ms = (time.perf_counter() - start) * 1000 / QUERY_COUNT
+
+        new_face = ("person_0-new.webp", "person_0", queries[0][1])
+        update = timed(gallery.update, [new_face])
+        update += timed(gallery.search, queries[0][1])
+
+        print(
+            f"{sample_count} samples, {identity_count} identities: "
+            f"match {before_ms:.3f}ms per identity loop vs {after_ms:.3f}ms gallery "
+            f"({sum(a == b for a, b in zip(before, after))}/{QUERY_COUNT} equal, "
+            f"{sum(a == q[0] for a, q in zip(after, queries))}/{QUERY_COUNT} correct), "
+            f"update {rebuild:.1f}ms rebuild vs {update:.2f}ms incremental"
+        )
@@ -0,0 +1,78 @@
+"""Compare preprocessing thumbnails serially with PIL and on the preprocessing pool.
+
+Encodes synthetic thumbnails the size of the ones Frigate stores and prepares
+batches for the jina v2 vision model: decoded and resized one by one with PIL
+as before, and with the shared image preprocessor, which has to produce the
+same tensors.
+
+Usage: python benchmark_image_preprocessing.py [batch_size] [batches]
+"""
+
+import io
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+from frigate.embeddings.onnx.image_preprocessor import ImagePreprocessor
+from frigate.embeddings.onnx.jina_v2_embedding import JinaV2Embedding
+
+BATCH_SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+BATCHES = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+THUMBNAIL_SIZE = (262, 175)
+
+
+def thumbnails(count: int) -> list[bytes]:
+    rng = np.random.default_rng(0)
+    result = []
+
+    for _ in range(count):
+        # blurred noise compresses roughly like a real thumbnail
+        pixels = rng.integers(0, 255, (*THUMBNAIL_SIZE[::-1], 3), dtype=np.uint8)
+        image = Image.fromarray(pixels).resize((64, 43)).resize(THUMBNAIL_SIZE)
+        buf = io.BytesIO()
+        image.save(buf, format="WEBP", quality=60)
+        result.append(buf.getvalue())
+
+    return result
+
+
+def serial(images: list[bytes]) -> np.ndarray:
+    processed = []
+
+    for data in images:
+        image = Image.open(io.BytesIO(data)).convert("RGB")
+        image = image.resize((512, 512), Image.Resampling.LANCZOS)
+        processed.append(
+            np.transpose(np.array(image, dtype=np.float32) / 255.0, (2, 0, 1))
+        )
+
+    return np.stack(processed)
+
+
+def run(name: str, preprocess, batches: list[list[bytes]]) -> None:
+    preprocess(batches[0])
+    start = time.perf_counter()
+
+    for batch in batches:
+        preprocess(batch)
+
+    duration = time.perf_counter() - start
+    print(
+        f"{name}: {duration / len(batches) * 1000:.1f}ms per batch of {BATCH_SIZE}, "
+        f"{len(batches) * BATCH_SIZE / duration:.0f} thumbnails/s"
+    )
+
+
+if __name__ == "__main__":
+    images = thumbnails(BATCH_SIZE)
+    batches = [images] * BATCHES
+    model = JinaV2Embedding.__new__(JinaV2Embedding)
+    preprocessor = ImagePreprocessor((3, 512, 512), model._transform_image)
+
+    run("serial pil", serial, batches)
+    run("preprocessing pool", lambda batch: preprocessor(batch)[0], batches)
+
+    difference = np.abs(serial(images) - preprocessor(images)[0]).max()
+    print(f"max difference from serial pil: {difference:.2e}")
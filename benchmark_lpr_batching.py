@@ -0,0 +1,145 @@
+"""Compare recognizing license plates one object at a time and per frame.
+
+Loads license plate images, such as the plate crops of a camera watching a road,
+groups them into frames of several plates and runs the PaddleOCR detection,
+classification and recognition models from the model cache: once per plate as
+tracked objects were processed before, and with all plates of a frame batched
+like the objects updated in the same frame are now. The plate strings have to
+be identical.
+
+Usage: python benchmark_lpr_batching.py plate_dir [plates_per_frame] [device]
+"""
+
+import glob
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import cv2
+
+from frigate.config.classification import LicensePlateRecognitionConfig
+from frigate.const import MODEL_CACHE_DIR
+
+# isort: off
+# the license plate mixin is imported by the embeddings maintainer, import it first
+from frigate.embeddings import EmbeddingsContext  # noqa: F401
+from frigate.data_processing.common.license_plate.mixin import (
+    CTCDecoder,
+    LicensePlateProcessingMixin,
+)
+from frigate.embeddings.onnx.lpr_embedding import (
+    PaddleOCRClassification,
+    PaddleOCRDetection,
+    PaddleOCRRecognition,
+)
+# isort: on
+
+if len(sys.argv) < 2:
+    sys.exit(__doc__)
+
+PLATE_DIR = sys.argv[1]
+PLATES_PER_FRAME = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+DEVICE = sys.argv[3] if len(sys.argv) > 3 else "CPU"
+CAMERA = "benchmark"
+MODEL_FILES = [
+    "detection_v5-small.onnx",
+    "classification.onnx",
+    "recognition_v4.onnx",
+    "ppocr_keys_v1.txt",
+]
+
+
+class Requestor:
+    def send_data(self, topic, data) -> None:
+        pass
+
+
+def create_processor() -> LicensePlateProcessingMixin:
+    processor = LicensePlateProcessingMixin.__new__(LicensePlateProcessingMixin)
+    processor.lpr_config = LicensePlateRecognitionConfig()
+    processor.config = SimpleNamespace(
+        lpr=processor.lpr_config,
+        cameras={CAMERA: SimpleNamespace(lpr=SimpleNamespace(enhancement=0))},
+    )
+    processor.model_runner = SimpleNamespace(
+        detection_model=PaddleOCRDetection("small", Requestor(), DEVICE),
+        classification_model=PaddleOCRClassification("small", Requestor(), DEVICE),
+        recognition_model=PaddleOCRRecognition("small", Requestor(), DEVICE),
+    )
+    processor.ctc_decoder = CTCDecoder(
+        character_dict_path=os.path.join(
+            MODEL_CACHE_DIR, "paddleocr-onnx", "ppocr_keys_v1.txt"
+        )
+    )
+    processor.min_size = 8
+    processor.max_size = 960
+    processor.box_thresh = 0.6
+    processor.mask_thresh = 0.6
+    return processor
+
+
+def load_frames() -> list[list]:
+    plates = []
+
+    for path in sorted(glob.glob(os.path.join(PLATE_DIR, "**", "*"), recursive=True)):
+        if path.lower().endswith((".jpg", ".jpeg", ".png", ".webp")):
+            image = cv2.imread(path)
+
+            if image is not None:
+                plates.append(image)
+
+    return [
+        plates[i : i + PLATES_PER_FRAME]
+        for i in range(0, len(plates), PLATES_PER_FRAME)
+    ]
+
+
+def run(name: str, process, frames: list[list]) -> list:
+    process(frames[0])
+    start = time.perf_counter()
+    results = [plate for frame in frames for plate in process(frame)]
+    duration = time.perf_counter() - start
+    print(
+        f"{name}: {duration / len(frames) * 1000:.1f}ms per frame, "
+        f"{len(results) / duration:.1f} plates/s"
+    )
+    return [plates for plates, _, _ in results]
+
+
+if __name__ == "__main__":
+    missing = [
+        file
+        for file in MODEL_FILES
+        if not os.path.exists(os.path.join(MODEL_CACHE_DIR, "paddleocr-onnx", file))
+    ]
+
+    if missing:
+        sys.exit(f"PaddleOCR models missing from the model cache: {missing}")
+
+    frames = load_frames()
+
+    if not frames:
+        sys.exit(f"No plate images found in {PLATE_DIR}")
+
+    processor = create_processor()
+    print(f"{sum(len(frame) for frame in frames)} plates in {len(frames)} frames")
+
+    one_by_one = run(
+        "one by one",
+        lambda frame: [
+            tuple(processor._process_license_plate(CAMERA, "plate", plate))
+            for plate in frame
+        ],
+        frames,
+    )
+    batched = run(
+        "per frame",
+        lambda frame: processor._process_license_plates(
+            CAMERA, ["plate"] * len(frame), frame
+        ),
+        frames,
+    )
+
+    equal = sum(before == after for before, after in zip(one_by_one, batched))
+    print(f"identical plate strings for {equal}/{len(one_by_one)} plates")
@@ -0,0 +1,128 @@
+"""Compare recordings range overlap query forms on a synthetic database.
+
+Usage: python benchmark_recordings.py [row_count] [db_path]
+"""
+
+import logging
+import os
+import random
+import sys
+import time
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.models import Recordings
+from frigate.util.media import recordings_overlap_clause
+
+ROW_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+DB_PATH = sys.argv[2] if len(sys.argv) > 2 else "/tmp/benchmark_recordings.db"
+CAMERAS = [f"camera_{i}" for i in range(10)]
+SEGMENT_DURATION = 10
+QUERY_COUNT = 200
+QUERY_LENGTH = 3600
+
+if os.path.exists(DB_PATH):
+    os.remove(DB_PATH)
+
+db = SqliteExtDatabase(
+    DB_PATH,
+    pragmas={"journal_mode": "wal", "synchronous": "off", "cache_size": -512 * 1000},
+)
+del logging.getLogger("peewee_migrate").handlers[:]
+Router(db).run()
+db.bind([Recordings])
+
+# build the synthetic table, each camera records continuously
+start = time.time()
+rows_per_camera = ROW_COUNT // len(CAMERAS)
+first_start_time = 1_700_000_000
+insert_sql = (
+    "INSERT INTO recordings (id, camera, path, start_time, end_time, duration, "
+    "motion, objects, dBFS, segment_size, regions) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+with db.atomic():
+    for camera in CAMERAS:
+        batch = []
+
+        for i in range(rows_per_camera):
+            start_time = first_start_time + i * SEGMENT_DURATION
+            batch.append(
+                (
+                    f"{start_time}-{camera}",
+                    camera,
+                    f"/media/frigate/recordings/{camera}/{start_time}.mp4",
+                    start_time,
+                    start_time + SEGMENT_DURATION,
+                    SEGMENT_DURATION,
+                    random.randint(0, 100),
+                    random.randint(0, 2),
+                    0,
+                    1.5,
+                    random.randint(0, 5),
+                )
+            )
+
+            if len(batch) == 100_000:
+                db.cursor().executemany(insert_sql, batch)
+                batch = []
+
+        if batch:
+            db.cursor().executemany(insert_sql, batch)
+
+db.execute_sql("ANALYZE")
+print(f"Inserted {rows_per_camera * len(CAMERAS)} rows in {time.time() - start:.1f}s")
+
+last_start_time = first_start_time + rows_per_camera * SEGMENT_DURATION
+ranges = []
+
+for _ in range(QUERY_COUNT):
+    range_start = random.uniform(first_start_time, last_start_time - QUERY_LENGTH)
+    ranges.append((random.choice(CAMERAS), range_start, range_start + QUERY_LENGTH))
+
+
+def between_query(camera: str, start_ts: float, end_ts: float):
+    return (
+        Recordings.select(Recordings.path, Recordings.start_time, Recordings.end_time)
+        .where(
+            Recordings.start_time.between(start_ts, end_ts)
+            | Recordings.end_time.between(start_ts, end_ts)
+            | ((start_ts > Recordings.start_time) & (end_ts < Recordings.end_time))
+        )
+        .where(Recordings.camera == camera)
+        .order_by(Recordings.start_time.asc())
+    )
+
+
+def overlap_query(camera: str, start_ts: float, end_ts: float):
+    return (
+        Recordings.select(Recordings.path, Recordings.start_time, Recordings.end_time)
+        .where(recordings_overlap_clause(start_ts, end_ts))
+        .where(Recordings.camera == camera)
+        .order_by(Recordings.start_time.asc())
+    )
+
+
+for name, build in [("between", between_query), ("overlap", overlap_query)]:
+    sql, params = build(*ranges[0]).sql()
+    plan = db.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    print(f"{name} plan: {[row[-1] for row in plan]}")
+
+    durations = []
+    rows = 0
+
+    for camera, start_ts, end_ts in ranges:
+        query_start = time.perf_counter()
+        rows += len(list(build(camera, start_ts, end_ts).tuples()))
+        durations.append(time.perf_counter() - query_start)
+
+    durations.sort()
+    print(
+        f"{name}: {QUERY_COUNT} queries, {rows} rows, "
+        f"avg {sum(durations) / len(durations) * 1000:.2f}ms, "
+        f"p50 {durations[len(durations) // 2] * 1000:.2f}ms, "
+        f"p95 {durations[int(len(durations) * 0.95)] * 1000:.2f}ms"
+    )
+
+db.close()
@@ -0,0 +1,162 @@
+"""Compare filtering semantic search results before and after the KNN search.
+
+Builds a synthetic sqlite-vec table of random embeddings with camera, label and
+day metadata, then runs filtered searches the way the search API did before
+(k nearest, filtered afterwards, k grown up to the sqlite-vec limit) and with
+the filters pushed into the vec0 query.
+
+Usage: python benchmark_vector_prefilter.py [row_count] [vec0_path]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROW_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+VEC_PATH = sys.argv[2] if len(sys.argv) > 2 else "/usr/local/lib/vec0"
+DIMENSIONS = 768
+CAMERAS = [f"camera_{i}" for i in range(20)]
+LABELS = ["person", "car", "dog", "cat", "bicycle", "motorcycle", "bird", "truck"]
+DAYS = 365
+K = 100
+MAX_K = 4096
+QUERY_COUNT = 20
+INSERT_BATCH = 5_000
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.enable_load_extension(True)
+    conn.load_extension(VEC_PATH)
+    conn.enable_load_extension(False)
+    return conn
+
+
+def build(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "CREATE TABLE event (id TEXT PRIMARY KEY, camera TEXT, label TEXT, start_day INTEGER)"
+    )
+    conn.execute(
+        f"""CREATE VIRTUAL TABLE vec_plain USING vec0(
+            id TEXT PRIMARY KEY,
+            embedding FLOAT[{DIMENSIONS}] distance_metric=cosine
+        )"""
+    )
+    conn.execute(
+        f"""CREATE VIRTUAL TABLE vec_metadata USING vec0(
+            id TEXT PRIMARY KEY,
+            embedding FLOAT[{DIMENSIONS}] distance_metric=cosine,
+            camera TEXT partition key,
+            label TEXT,
+            start_day INTEGER
+        )"""
+    )
+    rng = np.random.default_rng(0)
+
+    for start in range(0, ROW_COUNT, INSERT_BATCH):
+        count = min(INSERT_BATCH, ROW_COUNT - start)
+        vectors = rng.standard_normal((count, DIMENSIONS), dtype=np.float32)
+        cameras = rng.integers(len(CAMERAS), size=count)
+        labels = rng.integers(len(LABELS), size=count)
+        days = rng.integers(DAYS, size=count)
+        rows = [
+            (
+                f"event-{start + i}",
+                vectors[i].tobytes(),
+                CAMERAS[cameras[i]],
+                LABELS[labels[i]],
+                int(days[i]),
+            )
+            for i in range(count)
+        ]
+        conn.executemany(
+            "INSERT INTO event VALUES (?, ?, ?, ?)",
+            [(r[0], r[2], r[3], r[4]) for r in rows],
+        )
+        conn.executemany("INSERT INTO vec_plain VALUES (?, ?)", [r[:2] for r in rows])
+        conn.executemany("INSERT INTO vec_metadata VALUES (?, ?, ?, ?, ?)", rows)
+
+    conn.commit()
+
+
+def post_filter(conn: sqlite3.Connection, query: bytes, filters: tuple) -> list:
+    camera, label, after = filters
+    k = K
+
+    while True:
+        candidates = conn.execute(
+            "SELECT id, distance FROM vec_plain WHERE embedding MATCH ? AND k = ?",
+            [query, k],
+        ).fetchall()
+        distances = dict(candidates)
+        ids = list(distances)
+        matches = [
+            row[0]
+            for row in conn.execute(
+                "SELECT id FROM event WHERE id IN ({}) AND camera = ? AND label = ? AND start_day >= ?".format(
+                    ",".join("?" * len(ids))
+                ),
+                ids + [camera, label, after],
+            )
+        ]
+
+        if len(matches) >= K or k >= MAX_K:
+            return sorted(matches, key=distances.get)[:K]
+
+        k = min(k * 4, MAX_K)
+
+
+def pre_filter(conn: sqlite3.Connection, query: bytes, filters: tuple) -> list:
+    camera, label, after = filters
+    return [
+        row[0]
+        for row in conn.execute(
+            "SELECT id, distance FROM vec_metadata WHERE embedding MATCH ? AND k = ? "
+            "AND camera = ? AND label = ? AND start_day >= ? ORDER BY distance",
+            [query, K, camera, label, after],
+        )
+    ]
+
+
+def run(name: str, conn: sqlite3.Connection, search, queries: list) -> None:
+    filled = 0
+    start = time.perf_counter()
+
+    for query, filters in queries:
+        filled += len(search(conn, query, filters))
+
+    duration = time.perf_counter() - start
+    print(
+        f"{name}: {duration / len(queries) * 1000:.1f}ms per search, "
+        f"{filled / len(queries):.1f} of {K} results"
+    )
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect(os.path.join(tmp, "vectors.db"))
+        start = time.perf_counter()
+        build(conn)
+        print(f"built {ROW_COUNT} embeddings in {time.perf_counter() - start:.1f}s")
+
+        rng = np.random.default_rng(1)
+        queries = [
+            (
+                rng.standard_normal(DIMENSIONS, dtype=np.float32).tobytes(),
+                # one camera, one label and the last 30 days
+                (
+                    CAMERAS[i % len(CAMERAS)],
+                    LABELS[i % len(LABELS)],
+                    DAYS - 30,
+                ),
+            )
+            for i in range(QUERY_COUNT)
+        ]
+
+        run("post-filter", conn, post_filter, queries)
+        run("pre-filter", conn, pre_filter, queries)
+        conn.close()
@@ -0,0 +1,175 @@
+"""Compare codecs for detection messages sent through the zmq proxy.
+
+Usage: python benchmark_zmq.py [message_count] [subscriber_count]
+"""
+
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+
+from frigate.comms.zmq_proxy import (
+    JsonCodec,
+    MsgpackCodec,
+    Publisher,
+    Subscriber,
+    ZmqProxy,
+)
+
+MESSAGE_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+SUBSCRIBER_COUNT = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+OBJECT_COUNT = 5
+TOPIC = "detection/video"
+END_TOPIC = "_end"
+
+
+def tracked_object(camera: str, frame_time: float) -> dict:
+    box = [random.randint(0, 1920) for _ in range(4)]
+    return {
+        "id": f"{frame_time}-{random.randint(0, 999999):06d}",
+        "camera": camera,
+        "frame_time": frame_time,
+        "snapshot": {
+            "frame_time": frame_time,
+            "box": box,
+            "area": 10000,
+            "region": [0, 0, 320, 320],
+            "score": 0.8,
+            "attributes": [],
+            "current_estimated_speed": 0,
+            "velocity_angle": 0,
+            "path_data": [],
+            "recognized_license_plate": None,
+            "recognized_license_plate_score": None,
+        },
+        "label": "person",
+        "sub_label": None,
+        "top_score": 0.82,
+        "false_positive": False,
+        "start_time": frame_time - 10,
+        "end_time": None,
+        "score": 0.79,
+        "box": box,
+        "area": 10000,
+        "ratio": 0.5,
+        "region": [0, 0, 320, 320],
+        "active": True,
+        "stationary": False,
+        "motionless_count": 0,
+        "position_changes": 3,
+        "current_zones": ["front_yard"],
+        "entered_zones": ["front_yard", "driveway"],
+        "has_clip": True,
+        "has_snapshot": True,
+        "attributes": {},
+        "current_attributes": [],
+        "pending_loitering": False,
+        "max_severity": "alert",
+        "current_estimated_speed": 0,
+        "average_estimated_speed": 0,
+        "velocity_angle": 0,
+        "path_data": [[[0.5, 0.5], frame_time - i] for i in range(10)],
+        "recognized_license_plate": None,
+    }
+
+
+def detection_message(frame_time: float) -> tuple:
+    camera = "front_door"
+    return (
+        camera,
+        f"{camera}_frame{frame_time}",
+        frame_time,
+        [tracked_object(camera, frame_time) for _ in range(OBJECT_COUNT)],
+        [[random.randint(0, 1920) for _ in range(4)] for _ in range(3)],
+        [[0, 0, 320, 320], [320, 0, 640, 320]],
+    )
+
+
+def subscribe(ready: mp.Event, results: mp.Queue) -> None:
+    subscriber = Subscriber(TOPIC)
+    ready.set()
+    received = 0
+    cpu_start = None
+
+    while True:
+        payload = subscriber.check_for_update(timeout=2)
+
+        if payload is None:
+            # the end marker may be dropped if this subscriber fell behind
+            if cpu_start is not None:
+                break
+
+            continue
+
+        if cpu_start is None:
+            cpu_start = time.process_time()
+
+        # the end marker is an empty list
+        if payload == []:
+            break
+
+        received += 1
+
+    results.put((received, time.process_time() - (cpu_start or 0)))
+    subscriber.stop()
+
+
+def run(codec) -> None:
+    publisher = Publisher(TOPIC)
+    publisher.codec = codec
+    results: mp.Queue = mp.Queue()
+    subscribers = []
+
+    for _ in range(SUBSCRIBER_COUNT):
+        ready = mp.Event()
+        process = mp.Process(target=subscribe, args=(ready, results))
+        process.start()
+        ready.wait()
+        subscribers.append(process)
+
+    # give the subscriptions time to reach the publisher
+    time.sleep(1)
+
+    messages = [detection_message(time.time() + i) for i in range(100)]
+    size = sum(len(codec.encode(m)) for m in messages) / len(messages)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    for i in range(MESSAGE_COUNT):
+        publisher.publish(messages[i % len(messages)])
+
+        # pace the publisher so the high water mark doesn't drop messages
+        if i % 500 == 0:
+            time.sleep(0.01)
+
+    publish_cpu = time.process_time() - cpu_start
+    publisher.publish([], END_TOPIC)
+
+    subscriber_results = [results.get() for _ in subscribers]
+    wall = time.perf_counter() - wall_start
+
+    for process in subscribers:
+        process.join()
+
+    publisher.stop()
+    received = sum(r[0] for r in subscriber_results)
+    subscriber_cpu = sum(r[1] for r in subscriber_results)
+    print(
+        f"{codec.name.decode()}: {size:.0f} bytes/msg, "
+        f"{MESSAGE_COUNT / wall:.0f} msg/s, "
+        f"publisher cpu {publish_cpu / MESSAGE_COUNT * 1e6:.1f}us/msg, "
+        f"subscriber cpu {subscriber_cpu / max(received, 1) * 1e6:.1f}us/msg, "
+        f"received {received}/{MESSAGE_COUNT * SUBSCRIBER_COUNT}"
+    )
+
+
+if __name__ == "__main__":
+    os.makedirs("/tmp/cache", exist_ok=True)
+    proxy = ZmqProxy()
+
+    for codec in [JsonCodec, MsgpackCodec]:
+        run(codec)
+
+    proxy.stop()
@@ -59,7 +59,7 @@ from frigate.api.defs.tags import Tags
 from frigate.comms.event_metadata_updater import EventMetadataTypeEnum
 from frigate.config.classification import ObjectClassificationType
 from frigate.const import CLIPS_DIR, TRIGGER_DIR
-from frigate.embeddings import EmbeddingsContext
+from frigate.embeddings import MAX_SEARCH_K, SEARCH_K, EmbeddingsContext
 from frigate.models import Event, ReviewSegment, Timeline, Trigger
 from frigate.track.object_processing import TrackedObject
 from frigate.util.file import get_event_thumbnail_bytes
@@ -500,6 +500,47 @@ async def event_ids(ids: str, request: Request):
         )
 
 
+def _vector_search(
+    context: EmbeddingsContext,
+    query: Event | str,
+    search_types: list[str],
+    vector_filters: dict,
+    event_filters: list,
+    limit: int,
+) -> tuple[list[tuple[str, float]], list[tuple[str, float]]]:
+    """Run the vector searches, growing k while the event filters leave too few results."""
+    k = SEARCH_K
+
+    while True:
+        thumb_result = (
+            context.search_thumbnail(query, k=k, **vector_filters)
+            if "thumbnail" in search_types
+            else []
+        )
+        desc_result = (
+            context.search_description(query, k=k, **vector_filters)
+            if "description" in search_types and isinstance(query, str)
+            else []
+        )
+
+        # every matching embedding was returned already
+        if k >= MAX_SEARCH_K or (len(thumb_result) < k and len(desc_result) < k):
+            return thumb_result, desc_result
+
+        candidates = {r[0] for r in thumb_result} | {r[0] for r in desc_result}
+        matches = (
+            Event.select(Event.id)
+            .where(Event.id << list(candidates))
+            .where(reduce(operator.and_, event_filters))
+            .count()
+        )
+
+        if matches >= limit:
+            return thumb_result, desc_result
+
+        k = min(k * 4, MAX_SEARCH_K)
+
+
 @router.get(
     "/events/search",
     dependencies=[Depends(allow_any_authenticated())],
@@ -731,6 +772,14 @@ def events_search(
             event_filters.append((start_hour_fun > time_after))
             event_filters.append((start_hour_fun < time_before))
 
+    # Filters that sqlite-vec can apply during the vector search
+    vector_filters = {
+        "cameras": list(filtered) if cameras != "all" else None,
+        "labels": labels.split(",") if labels != "all" else None,
+        "after": after or None,
+        "before": before or None,
+    }
+
     # Perform semantic search
     search_results = {}
     if search_type == "similarity":
@@ -745,7 +794,9 @@ def events_search(
                 status_code=404,
             )
 
-        thumb_result = context.search_thumbnail(search_event)
+        thumb_result, _ = _vector_search(
+            context, search_event, ["thumbnail"], vector_filters, event_filters, limit
+        )
         thumb_ids = {result[0]: result[1] for result in thumb_result}
         search_results = {
             event_id: {"distance": distance, "source": "thumbnail"}
@@ -757,9 +808,11 @@ def events_search(
         # only save stats for multi-modal searches
         save_stats = "thumbnail" in search_types and "description" in search_types
 
-        if "thumbnail" in search_types:
-            thumb_result = context.search_thumbnail(query)
+        thumb_result, desc_result = _vector_search(
+            context, query, search_types, vector_filters, event_filters, limit
+        )
 
+        if "thumbnail" in search_types:
             thumb_distances = context.thumb_stats.normalize(
                 [result[1] for result in thumb_result], save_stats
             )
@@ -775,8 +828,6 @@ def events_search(
             )
 
         if "description" in search_types:
-            desc_result = context.search_description(query)
-
             desc_distances = context.desc_stats.normalize(
                 [result[1] for result in desc_result], save_stats
             )
@@ -1684,8 +1735,7 @@ async def delete_single_event(event_id: str, request: Request) -> dict:
     # If semantic search is enabled, update the index
     if request.app.frigate_config.semantic_search.enabled:
         context: EmbeddingsContext = request.app.embeddings
-        context.db.delete_embeddings_thumbnail(event_ids=[event_id])
-        context.db.delete_embeddings_description(event_ids=[event_id])
+        context.delete_embeddings([event_id])
 
     return {"success": True, "message": f"Event {event_id} deleted"}
 
@@ -1927,17 +1977,9 @@ def create_trigger_embedding(
                 )
 
             # Try to reuse existing embedding from database
-            cursor = context.db.execute_sql(
-                """
-                SELECT thumbnail_embedding FROM vec_thumbnails WHERE id = ?
-                """,
-                [body.data],
-            )
-
-            row = cursor.fetchone() if cursor else None
+            query_embedding = context.db.get_embedding("vec_thumbnails", body.data)
 
-            if row:
-                query_embedding = row[0]
+            if query_embedding:
                 embedding = np.frombuffer(query_embedding, dtype=np.float32)
             else:
                 # Generate new embedding
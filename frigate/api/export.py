@@ -47,6 +47,7 @@ from frigate.record.export import (
     PlaybackSourceEnum,
     RecordingExporter,
 )
+from frigate.util.media import recordings_overlap_clause
 from frigate.util.time import is_current_hour
 
 logger = logging.getLogger(__name__)
@@ -289,14 +290,7 @@ def export_recording(
     if playback_source == "recordings":
         recordings_count = (
             Recordings.select()
-            .where(
-                Recordings.start_time.between(start_time, end_time)
-                | Recordings.end_time.between(start_time, end_time)
-                | (
-                    (start_time > Recordings.start_time)
-                    & (end_time < Recordings.end_time)
-                )
-            )
+            .where(recordings_overlap_clause(start_time, end_time))
             .where(Recordings.camera == camera_name)
             .count()
         )
@@ -506,14 +500,7 @@ def export_recording_custom(
     if playback_source == "recordings":
         recordings_count = (
             Recordings.select()
-            .where(
-                Recordings.start_time.between(start_time, end_time)
-                | Recordings.end_time.between(start_time, end_time)
-                | (
-                    (start_time > Recordings.start_time)
-                    & (end_time < Recordings.end_time)
-                )
-            )
+            .where(recordings_overlap_clause(start_time, end_time))
             .where(Recordings.camera == camera_name)
             .count()
         )
@@ -47,6 +47,7 @@ from frigate.output.preview import get_most_recent_preview_frame
 from frigate.track.object_processing import TrackedObjectProcessor
 from frigate.util.file import get_event_thumbnail_bytes
 from frigate.util.image import get_image_from_recording
+from frigate.util.media import recordings_overlap_clause
 
 logger = logging.getLogger(__name__)
 
@@ -453,11 +454,7 @@ async def recording_clip(
             Recordings.start_time,
             Recordings.end_time,
         )
-        .where(
-            (Recordings.start_time.between(start_ts, end_ts))
-            | (Recordings.end_time.between(start_ts, end_ts))
-            | ((start_ts > Recordings.start_time) & (end_ts < Recordings.end_time))
-        )
+        .where(recordings_overlap_clause(start_ts, end_ts))
         .where(Recordings.camera == camera_name)
         .order_by(Recordings.start_time.asc())
     )
@@ -549,11 +546,7 @@ async def vod_ts(
             Recordings.end_time,
             Recordings.start_time,
         )
-        .where(
-            Recordings.start_time.between(start_ts, end_ts)
-            | Recordings.end_time.between(start_ts, end_ts)
-            | ((start_ts > Recordings.start_time) & (end_ts < Recordings.end_time))
-        )
+        .where(recordings_overlap_clause(start_ts, end_ts))
         .where(Recordings.camera == camera_name)
         .order_by(Recordings.start_time.asc())
         .iterator()
@@ -28,6 +28,7 @@ from frigate.api.defs.response.generic_response import GenericResponse
 from frigate.api.defs.tags import Tags
 from frigate.const import RECORD_DIR
 from frigate.models import Event, Recordings
+from frigate.util.media import recordings_overlap_clause
 from frigate.util.time import get_dst_transitions
 
 logger = logging.getLogger(__name__)
@@ -392,11 +393,7 @@ async def delete_recordings(
 
     # Build query to find overlapping recordings
     clauses = [
-        (
-            Recordings.start_time.between(start, end)
-            | Recordings.end_time.between(start, end)
-            | ((start > Recordings.start_time) & (end < Recordings.end_time))
-        ),
+        recordings_overlap_clause(start, end),
         (Recordings.camera << camera_list),
     ]
 
@@ -36,6 +36,7 @@ from frigate.api.defs.tags import Tags
 from frigate.embeddings import EmbeddingsContext
 from frigate.models import Recordings, ReviewSegment, UserReviewStatus
 from frigate.review.types import SeverityEnum
+from frigate.util.media import recordings_overlap_clause
 from frigate.util.time import get_dst_transitions
 
 logger = logging.getLogger(__name__)
@@ -548,14 +549,7 @@ def delete_reviews(body: ReviewModifyMultipleBody):
         camera_name = review["camera"]
         recordings = (
             Recordings.select(Recordings.id, Recordings.path)
-            .where(
-                Recordings.start_time.between(start_time, end_time)
-                | Recordings.end_time.between(start_time, end_time)
-                | (
-                    (start_time > Recordings.start_time)
-                    & (end_time < Recordings.end_time)
-                )
-            )
+            .where(recordings_overlap_clause(start_time, end_time))
             .where(Recordings.camera == camera_name)
             .dicts()
             .iterator()
@@ -20,11 +20,11 @@ from frigate.api.fastapi_app import create_fastapi_app
 from frigate.camera import CameraMetrics, PTZMetrics
 from frigate.camera.maintainer import CameraMaintainer
 from frigate.comms.base_communicator import Communicator
+from frigate.comms.detection_ring import create_detection_ring
 from frigate.comms.dispatcher import Dispatcher
 from frigate.comms.event_metadata_updater import EventMetadataPublisher
 from frigate.comms.inter_process import InterProcessCommunicator
 from frigate.comms.mqtt import MqttClient
-from frigate.comms.object_detector_signaler import DetectorProxy
 from frigate.comms.webpush import WebPushClient
 from frigate.comms.ws import WebSocketClient
 from frigate.comms.zmq_proxy import ZmqProxy
@@ -59,6 +59,7 @@ from frigate.models import (
     Previews,
     Recordings,
     RecordingsToDelete,
+    RecordingsUsage,
     Regions,
     ReviewSegment,
     Timeline,
@@ -72,6 +73,7 @@ from frigate.ptz.onvif import OnvifController
 from frigate.record.cleanup import RecordingCleanup
 from frigate.record.export import migrate_exports
 from frigate.record.record import RecordProcess
+from frigate.record.summary import DetectionAggregator
 from frigate.review.review import ReviewProcess
 from frigate.stats.emitter import StatsEmitter
 from frigate.stats.util import stats_init
@@ -93,6 +95,7 @@ class FrigateApp:
     ) -> None:
         self.metrics_manager = manager
         self.audio_process: Optional[mp.Process] = None
+        self.detection_aggregator: Optional[DetectionAggregator] = None
         self.stop_event = stop_event
         self.detection_queue: Queue = mp.Queue()
         self.detectors: dict[str, ObjectDetectProcess] = {}
@@ -243,6 +246,16 @@ class FrigateApp:
                 logger.info(f"go2rtc process pid: {proc.info['pid']}")
                 self.processes["go2rtc"] = proc.info["pid"]
 
+    def init_detection_aggregator(self) -> None:
+        if not self.config.record.aggregate_detections:
+            return
+
+        detection_aggregator = DetectionAggregator(self.config, self.stop_event)
+        self.detection_aggregator = detection_aggregator
+        detection_aggregator.start()
+        self.processes["detection_aggregator"] = detection_aggregator.pid or 0
+        logger.info(f"Detection aggregator started: {detection_aggregator.pid}")
+
     def init_recording_manager(self) -> None:
         recording_process = RecordProcess(self.config, self.stop_event)
         self.recording_process = recording_process
@@ -290,6 +303,7 @@ class FrigateApp:
             Previews,
             Recordings,
             RecordingsToDelete,
+            RecordingsUsage,
             Regions,
             ReviewSegment,
             Timeline,
@@ -311,23 +325,26 @@ class FrigateApp:
 
     def init_embeddings_client(self) -> None:
         # Create a client for other processes to use
-        self.embeddings = EmbeddingsContext(self.db)
+        self.embeddings = EmbeddingsContext(self.db, self.config)
 
     def init_inter_process_communicator(self) -> None:
         self.inter_process_communicator = InterProcessCommunicator()
-        self.inter_config_updater = CameraConfigUpdatePublisher()
+        self.inter_config_updater = CameraConfigUpdatePublisher(
+            list(self.config.cameras.keys())
+        )
         self.event_metadata_updater = EventMetadataPublisher()
         self.inter_zmq_proxy = ZmqProxy()
-        self.detection_proxy = DetectorProxy()
 
     def init_onvif(self) -> None:
         self.onvif_controller = OnvifController(self.config, self.ptz_metrics)
 
     def init_dispatcher(self) -> None:
         comms: list[Communicator] = []
+        self.mqtt_client: MqttClient | None = None
 
         if self.config.mqtt.enabled:
-            comms.append(MqttClient(self.config))
+            self.mqtt_client = MqttClient(self.config)
+            comms.append(self.mqtt_client)
 
         notification_cameras = [
             c
@@ -368,21 +385,16 @@ class FrigateApp:
             except FileExistsError:
                 shm_in = UntrackedSharedMemory(name=name)
 
-            try:
-                shm_out = UntrackedSharedMemory(
-                    name=f"out-{name}", create=True, size=20 * 6 * 4
-                )
-            except FileExistsError:
-                shm_out = UntrackedSharedMemory(name=f"out-{name}")
-
+            shm_out = create_detection_ring(name, len(self.config.detectors))
             self.detection_shms.append(shm_in)
             self.detection_shms.append(shm_out)
 
-        for name, detector_config in self.config.detectors.items():
+        for lane, (name, detector_config) in enumerate(self.config.detectors.items()):
             self.detectors[name] = ObjectDetectProcess(
                 name,
                 self.detection_queue,
                 list(self.config.cameras.keys()),
+                lane,
                 self.config,
                 detector_config,
                 self.stop_event,
@@ -475,6 +487,10 @@ class FrigateApp:
                 self.embeddings_metrics,
                 self.detectors,
                 self.processes,
+                [self.detected_frames_processor.detection_publisher],
+                self.inter_process_communicator,
+                self.mqtt_client,
+                self.embeddings,
             ),
             self.stop_event,
         )
@@ -544,6 +560,7 @@ class FrigateApp:
         self.init_queues()
         self.init_database()
         self.init_onvif()
+        self.init_detection_aggregator()
         self.init_recording_manager()
         self.init_review_segment_manager()
         self.init_go2rtc()
@@ -644,6 +661,10 @@ class FrigateApp:
         self.recording_process.terminate()
         self.recording_process.join()
 
+        if self.detection_aggregator:
+            self.detection_aggregator.terminate()
+            self.detection_aggregator.join()
+
         self.review_segment_process.terminate()
         self.review_segment_process.join()
 
@@ -666,7 +687,6 @@ class FrigateApp:
         self.inter_config_updater.stop()
         self.event_metadata_updater.stop()
         self.inter_zmq_proxy.stop()
-        self.detection_proxy.stop()
 
         while len(self.detection_shms) > 0:
             shm = self.detection_shms.pop()
@@ -13,6 +13,10 @@ class CameraMetrics:
     read_start: Synchronized
     audio_rms: Synchronized
     audio_dBFS: Synchronized
+    backpressure_level: Synchronized
+    effective_fps: Synchronized
+    throttled_fps: Synchronized
+    queue_full_fps: Synchronized
 
     frame_queue: mp.Queue
 
@@ -31,6 +35,10 @@ class CameraMetrics:
         self.read_start = manager.Value("d", 0)
         self.audio_rms = manager.Value("d", 0)
         self.audio_dBFS = manager.Value("d", 0)
+        self.backpressure_level = manager.Value("i", 0)
+        self.effective_fps = manager.Value("d", 0)
+        self.throttled_fps = manager.Value("d", 0)
+        self.queue_full_fps = manager.Value("d", 0)
 
         self.frame_queue = manager.Queue(maxsize=2)
 
@@ -0,0 +1,174 @@
+"""Adapt the work done for a camera to how fast downstream keeps up."""
+
+import logging
+import time
+from enum import Enum
+from typing import Any
+
+from frigate.camera import CameraMetrics
+from frigate.util.builtin import EventsPerSecond
+
+logger = logging.getLogger(__name__)
+
+# (frame stride, max regions per frame) for each level
+BACKPRESSURE_LEVELS: list[tuple[int, int | None]] = [
+    (1, None),
+    (2, None),
+    (2, 4),
+    (3, 2),
+    (4, 1),
+]
+BACKPRESSURE_WINDOW = 1.0  # seconds between evaluations
+OVERLOAD_WINDOWS = 2  # consecutive overloaded windows before raising the level
+RECOVERY_WINDOWS = 10  # consecutive idle windows before lowering the level
+HIGH_LOAD = 0.9
+LOW_LOAD = 0.6
+MAX_LAG_FRAMES = 3
+
+
+class DropReasonEnum(str, Enum):
+    queue_full = "queue_full"  # the tracked object processor was behind
+    throttled = "throttled"  # skipped by the controller
+
+
+class BackpressureController:
+    """Lowers detect fps and region count per camera when it falls behind.
+
+    The processing time of a frame is compared to the time available for it
+    at the current frame stride, along with how far behind the newest frame
+    is and whether the tracked object queue was full. The level is raised
+    quickly when overloaded and lowered slowly, only once the lower level is
+    expected to fit in the available time.
+    """
+
+    def __init__(self, camera_metrics: CameraMetrics) -> None:
+        self.camera_metrics = camera_metrics
+        self.level = 0
+        self.frame_counter = 0
+        self.overloaded_windows = 0
+        self.idle_windows = 0
+        self.drops = {reason: EventsPerSecond() for reason in DropReasonEnum}
+
+        for eps in self.drops.values():
+            eps.start()
+
+        self._reset_window(time.monotonic())
+
+    def _reset_window(self, now: float) -> None:
+        self.window_start = now
+        self.window_frames = 0
+        self.window_duration = 0.0
+        self.window_max_lag = 0.0
+        self.window_queue_full = False
+
+    @property
+    def frame_stride(self) -> int:
+        return BACKPRESSURE_LEVELS[self.level][0]
+
+    @property
+    def max_regions(self) -> int | None:
+        return BACKPRESSURE_LEVELS[self.level][1]
+
+    def should_process(self) -> bool:
+        """Returns False for frames that are skipped at the current level."""
+        self.frame_counter += 1
+
+        if self.frame_counter >= self.frame_stride:
+            self.frame_counter = 0
+            return True
+
+        self.drops[DropReasonEnum.throttled].update()
+        return False
+
+    def limit_regions(self, regions: list) -> list:
+        # regions of tracked objects come first so they are kept
+        if self.max_regions is None:
+            return regions
+
+        return regions[: self.max_regions]
+
+    def record_drop(self, reason: DropReasonEnum) -> None:
+        self.drops[reason].update()
+
+        if reason == DropReasonEnum.queue_full:
+            self.window_queue_full = True
+
+    def observe(
+        self, frame_time: float, duration: float, detect_fps: int, now: float
+    ) -> None:
+        """Record a processed frame and adjust the level once per window.
+
+        Args:
+            frame_time: Capture time of the frame.
+            duration: Seconds spent processing the frame.
+            detect_fps: Configured detect fps of the camera.
+            now: Current wall clock time.
+        """
+        self.window_frames += 1
+        self.window_duration += duration
+        self.window_max_lag = max(self.window_max_lag, now - frame_time)
+        monotonic_now = time.monotonic()
+
+        if monotonic_now - self.window_start < BACKPRESSURE_WINDOW:
+            return
+
+        frame_interval = 1 / max(detect_fps, 1)
+        average_duration = self.window_duration / self.window_frames
+        load = average_duration / (frame_interval * self.frame_stride)
+        overloaded = (
+            load > HIGH_LOAD
+            or self.window_queue_full
+            or self.window_max_lag > frame_interval * MAX_LAG_FRAMES
+        )
+
+        if overloaded:
+            self.overloaded_windows += 1
+            self.idle_windows = 0
+        else:
+            self.overloaded_windows = 0
+
+            if self.level > 0:
+                lower_stride = BACKPRESSURE_LEVELS[self.level - 1][0]
+
+                if average_duration / (frame_interval * lower_stride) < LOW_LOAD:
+                    self.idle_windows += 1
+                else:
+                    self.idle_windows = 0
+
+        if (
+            self.overloaded_windows >= OVERLOAD_WINDOWS
+            and self.level < len(BACKPRESSURE_LEVELS) - 1
+        ):
+            self.level += 1
+            self.overloaded_windows = 0
+            logger.debug(f"Raised backpressure level to {self.level}")
+        elif self.idle_windows >= RECOVERY_WINDOWS and self.level > 0:
+            self.level -= 1
+            self.idle_windows = 0
+            logger.debug(f"Lowered backpressure level to {self.level}")
+
+        self.camera_metrics.backpressure_level.value = self.level
+        self.camera_metrics.effective_fps.value = detect_fps / self.frame_stride
+        self.camera_metrics.throttled_fps.value = self.drops[
+            DropReasonEnum.throttled
+        ].eps()
+        self.camera_metrics.queue_full_fps.value = self.drops[
+            DropReasonEnum.queue_full
+        ].eps()
+        self._reset_window(monotonic_now)
+
+
+def get_backpressure_stats(camera_metrics: CameraMetrics) -> dict[str, Any]:
+    return {
+        "level": camera_metrics.backpressure_level.value,
+        "effective_fps": round(camera_metrics.effective_fps.value, 2),
+        "drops": {
+            "capture": round(camera_metrics.skipped_fps.value, 2),
+            DropReasonEnum.queue_full.value: round(
+                camera_metrics.queue_full_fps.value, 2
+            ),
+            DropReasonEnum.throttled.value: round(
+                camera_metrics.throttled_fps.value, 2
+            ),
+        },
+    }
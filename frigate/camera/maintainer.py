@@ -8,6 +8,7 @@ from multiprocessing.managers import DictProxy, SyncManager
 from multiprocessing.synchronize import Event as MpEvent
 
 from frigate.camera import CameraMetrics, PTZMetrics
+from frigate.comms.detection_ring import create_detection_ring
 from frigate.config import FrigateConfig
 from frigate.config.camera import CameraConfig
 from frigate.config.camera.updater import (
@@ -131,7 +132,7 @@ class CameraMaintainer(threading.Thread):
                         for det in self.config.detectors.values()
                     ]
                 )
-                UntrackedSharedMemory(name=f"out-{name}", create=True, size=20 * 6 * 4)
+                create_detection_ring(name, len(self.config.detectors))
                 UntrackedSharedMemory(
                     name=name,
                     create=True,
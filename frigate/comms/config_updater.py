@@ -7,7 +7,48 @@ from typing import Any
 
 import zmq
 
+from frigate.util.image import UntrackedSharedMemory
+
 SOCKET_PUB_SUB = "ipc:///tmp/cache/config"
+# how long to keep polling after a generation change for messages in flight
+UPDATE_GRACE_PERIOD = 1.0
+
+
+class UpdateGeneration:
+    """Counter in shared memory that changes whenever an update is published.
+
+    Reading it is a single integer read, so hot loops can skip polling the
+    config socket until something was published. The publisher creates and
+    unlinks the counters, subscribers only attach to them.
+    """
+
+    def __init__(self, name: str, create: bool = False) -> None:
+        shm_name = f"config-gen-{name}" if name else "config-gen"
+
+        if create:
+            try:
+                self.shm = UntrackedSharedMemory(name=shm_name, create=True, size=8)
+            except FileExistsError:
+                self.shm = UntrackedSharedMemory(name=shm_name)
+        else:
+            self.shm = UntrackedSharedMemory(name=shm_name)
+
+        assert self.shm.buf is not None
+        self.counter = self.shm.buf.cast("Q")
+
+    @property
+    def value(self) -> int:
+        return self.counter[0]
+
+    def increment(self) -> None:
+        self.counter[0] = (self.counter[0] + 1) % 2**64
+
+    def close(self) -> None:
+        self.counter.release()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.shm.unlink()
 
 
 class ConfigPublisher:
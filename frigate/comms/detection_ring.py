@@ -0,0 +1,268 @@
+"""Shared memory ring for passing detection results from detectors to cameras."""
+
+import errno
+import os
+import select
+import struct
+import time
+
+import numpy as np
+
+from frigate.const import CACHE_DIR, MAX_DETECTIONS
+from frigate.util.image import UntrackedSharedMemory
+
+RING_SLOTS = 4
+
+# header: number of lanes, one per detector process
+LANES = 0
+HEADER_SIZE = 4 * 8
+
+# lane header: results written by the detector, results read by the camera,
+# results dropped because the lane was full
+HEAD = 0
+TAIL = 1
+DROPPED = 2
+LANE_HEADER_SIZE = 4 * 8
+
+# per slot: request id, row count (uint64) and inference start, duration (float64)
+SLOT_META_SIZE = 4 * 8
+ROWS_SIZE = MAX_DETECTIONS * 6 * 4
+
+# wakeup message: lane and the head it was advanced to
+WAKEUP = struct.Struct("=II")
+
+
+def detection_ring_size(lanes: int) -> int:
+    return HEADER_SIZE + lanes * (
+        LANE_HEADER_SIZE + RING_SLOTS * (SLOT_META_SIZE + ROWS_SIZE)
+    )
+
+
+def detection_ring_fifo(name: str) -> str:
+    return os.path.join(CACHE_DIR, f"detection-{name}")
+
+
+def create_detection_ring(name: str, lanes: int) -> UntrackedSharedMemory:
+    """Create the shared memory and wakeup pipe of a camera's detection ring."""
+    try:
+        shm = UntrackedSharedMemory(
+            name=f"out-{name}", create=True, size=detection_ring_size(lanes)
+        )
+        np.ndarray((1,), dtype=np.uint64, buffer=shm.buf)[LANES] = lanes
+    except FileExistsError:
+        shm = UntrackedSharedMemory(name=f"out-{name}")
+
+    try:
+        os.mkfifo(detection_ring_fifo(name))
+    except FileExistsError:
+        pass
+
+    return shm
+
+
+class DetectionResultRing:
+    """Ring of detection results for a camera, with one lane per detector.
+
+    Every detector process writes to its own lane, so each lane has a single
+    producer and the camera process is its single consumer, neither side needs
+    a lock. Each result is written to its slot before the head is advanced.
+
+    The head is only read by the camera once the detector announced it through
+    a named pipe, which behaves like an eventfd between processes that do not
+    share file descriptors. Passing the head through the kernel makes the rows
+    written before it visible to the camera, the order in which the stores to
+    shared memory become visible is not guaranteed on weakly ordered CPUs.
+    """
+
+    def __init__(self, name: str, lane: int | None = None) -> None:
+        self.name = name
+        self.lane = lane
+        self.shm = UntrackedSharedMemory(name=f"out-{name}")
+        buf = self.shm.buf
+        self.lanes = int(np.ndarray((1,), dtype=np.uint64, buffer=buf)[LANES])
+        offset = HEADER_SIZE
+        self.header: np.ndarray = np.ndarray(
+            (self.lanes, 4), dtype=np.uint64, buffer=buf, offset=offset
+        )
+        offset += self.lanes * LANE_HEADER_SIZE
+        self.ids: np.ndarray = np.ndarray(
+            (self.lanes, RING_SLOTS, 2), dtype=np.uint64, buffer=buf, offset=offset
+        )
+        offset += self.lanes * RING_SLOTS * 2 * 8
+        self.timings: np.ndarray = np.ndarray(
+            (self.lanes, RING_SLOTS, 2), dtype=np.float64, buffer=buf, offset=offset
+        )
+        offset += self.lanes * RING_SLOTS * 2 * 8
+        self.rows: np.ndarray = np.ndarray(
+            (self.lanes, RING_SLOTS, MAX_DETECTIONS, 6),
+            dtype=np.float32,
+            buffer=buf,
+            offset=offset,
+        )
+        # heads announced to the camera through the pipe
+        self.announced = [0] * self.lanes
+        self.reader_fd: int | None = None
+        self.writer_fd: int | None = None
+
+    def write(
+        self, request_id: int, detections: np.ndarray, start: float, duration: float
+    ) -> bool:
+        """Write a result and wake up the camera, returns False if the lane is full."""
+        header = self.header[self.lane]
+        head = int(header[HEAD])
+
+        if head - int(header[TAIL]) >= RING_SLOTS:
+            header[DROPPED] += 1
+            return False
+
+        # detectors pad their output, only rows with a score are copied
+        scores = detections[:MAX_DETECTIONS, 1]
+        count = int(np.flatnonzero(scores > 0)[-1]) + 1 if scores.any() else 0
+        slot = head % RING_SLOTS
+        self.rows[self.lane, slot, :count] = detections[:count]
+        self.ids[self.lane, slot] = (request_id, count)
+        self.timings[self.lane, slot] = (start, duration)
+        header[HEAD] = head + 1
+        self._notify(head + 1)
+        return True
+
+    def reset(self) -> None:
+        """Discard results that were not read, called before a new request."""
+        # the pipe has to be open before the request is queued,
+        # the detector does not announce results while nobody is reading
+        self._open_reader()
+
+        if self.reader_fd is not None:
+            self._receive()
+
+        for lane in range(self.lanes):
+            self.header[lane, TAIL] = self.header[lane, HEAD]
+
+    def read(self, request_id: int, timeout: float) -> tuple[np.ndarray, float] | None:
+        """Wait for the result of a request, returns its rows and inference duration."""
+        deadline = time.monotonic() + timeout
+
+        while True:
+            for lane in range(self.lanes):
+                result = self._read_lane(lane, request_id)
+
+                if result is not None:
+                    return result
+
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                return None
+
+            self._wait(remaining)
+
+    def _read_lane(self, lane: int, request_id: int) -> tuple[np.ndarray, float] | None:
+        header = self.header[lane]
+
+        if self.reader_fd is None:
+            # without the pipe the head can only be polled
+            head = int(header[HEAD])
+        else:
+            head = min(self.announced[lane], int(header[HEAD]))
+
+        while header[TAIL] < head:
+            tail = int(header[TAIL])
+            slot = tail % RING_SLOTS
+            result_id, count = (int(v) for v in self.ids[lane, slot])
+            result = None
+
+            if result_id == request_id:
+                result = (
+                    self.rows[lane, slot, :count].copy(),
+                    self.timings[lane, slot][1],
+                )
+
+            header[TAIL] = tail + 1
+
+            if result is not None:
+                return result
+
+        return None
+
+    def _notify(self, head: int) -> None:
+        if self.writer_fd is None:
+            try:
+                self.writer_fd = os.open(
+                    detection_ring_fifo(self.name), os.O_WRONLY | os.O_NONBLOCK
+                )
+            except OSError:
+                # the camera has not opened the pipe yet, it will poll the ring
+                return
+
+        try:
+            # writes up to PIPE_BUF are atomic, messages are never interleaved
+            os.write(self.writer_fd, WAKEUP.pack(self.lane, head))
+        except BlockingIOError:
+            # the camera is not reading, a later head announces this one too
+            pass
+        except OSError as e:
+            if e.errno == errno.EPIPE:
+                # the camera was restarted, reopen on the next result
+                os.close(self.writer_fd)
+                self.writer_fd = None
+
+    def _open_reader(self) -> None:
+        if self.reader_fd is not None:
+            return
+
+        try:
+            # opening for writing as well keeps the pipe from reporting EOF
+            # while the detector does not have it open
+            self.reader_fd = os.open(
+                detection_ring_fifo(self.name), os.O_RDWR | os.O_NONBLOCK
+            )
+        except OSError:
+            pass
+
+    def _receive(self) -> None:
+        """Read the heads announced by the detectors."""
+        fd = self.reader_fd
+
+        if fd is None:
+            return
+
+        while True:
+            try:
+                data = os.read(fd, WAKEUP.size * 512)
+            except BlockingIOError:
+                return
+
+            for lane, head in WAKEUP.iter_unpack(data):
+                if lane < self.lanes:
+                    self.announced[lane] = max(self.announced[lane], head)
+
+            if len(data) < WAKEUP.size * 512:
+                return
+
+    def _wait(self, timeout: float) -> None:
+        self._open_reader()
+
+        if self.reader_fd is None:
+            time.sleep(min(timeout, 0.01))
+            return
+
+        readable, _, _ = select.select([self.reader_fd], [], [], timeout)
+
+        if readable:
+            self._receive()
+
+    def close(self) -> None:
+        for fd in (self.reader_fd, self.writer_fd):
+            if fd is not None:
+                os.close(fd)
+
+        self.reader_fd = None
+        self.writer_fd = None
+
+    def unlink(self) -> None:
+        self.shm.unlink()
+
+        try:
+            os.unlink(detection_ring_fifo(self.name))
+        except FileNotFoundError:
+            pass
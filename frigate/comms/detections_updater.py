@@ -3,7 +3,7 @@
 from enum import Enum
 from typing import Any
 
-from .zmq_proxy import Publisher, Subscriber
+from .zmq_proxy import MsgpackCodec, Publisher, Subscriber
 
 
 class DetectionTypeEnum(str, Enum):
@@ -14,21 +14,77 @@ class DetectionTypeEnum(str, Enum):
     lpr = "lpr"
 
 
+class DetectionProjectionEnum(str, Enum):
+    # same as video with objects reduced to SUMMARY_OBJECT_FIELDS
+    # and the regions reduced to their count
+    summary = "summary"
+
+
+# what recordings, previews and birdseye need to know about an object's activity
+SUMMARY_OBJECT_FIELDS = (
+    "label",
+    "frame_time",
+    "false_positive",
+    "motionless_count",
+    "position_changes",
+    "stationary",
+)
+
+
+def project_video_detection(
+    projection: DetectionProjectionEnum, payload: tuple
+) -> tuple:
+    """Reduce a video detection payload to the fields of a projection."""
+    camera, frame_name, frame_time, tracked_objects, motion_boxes, regions = payload
+
+    return (
+        camera,
+        frame_name,
+        frame_time,
+        [{k: o[k] for k in SUMMARY_OBJECT_FIELDS} for o in tracked_objects],
+        motion_boxes,
+        len(regions),
+    )
+
+
+def projection_topic_base(projection: DetectionProjectionEnum) -> str:
+    # kept outside of detection/ so prefix subscribers never receive projections
+    return f"detection_{projection.value}/"
+
+
 class DetectionPublisher(Publisher):
     """Simplifies receiving video and audio detections."""
 
     topic_base = "detection/"
+    codec = MsgpackCodec
 
     def __init__(self, topic: str) -> None:
         super().__init__(topic)
 
+    def publish(self, payload: Any, sub_topic: str = "") -> None:
+        super().publish(payload, sub_topic)
+
+        if f"{self.topic}{sub_topic}" == f"{self.topic_base}video":
+            for projection in DetectionProjectionEnum:
+                self._send(
+                    f"{projection_topic_base(projection)}video",
+                    project_video_detection(projection, payload),
+                )
+
 
 class DetectionSubscriber(Subscriber):
-    """Simplifies receiving video and audio detections."""
+    """Simplifies receiving video and audio detections.
+
+    When a projection is given, video detections are received in the
+    projected form instead of the full payload.
+    """
 
     topic_base = "detection/"
 
-    def __init__(self, topic: str) -> None:
+    def __init__(
+        self, topic: str, projection: DetectionProjectionEnum | None = None
+    ) -> None:
+        self.projection = projection
         super().__init__(topic)
 
     def check_for_update(
@@ -36,7 +92,30 @@ class DetectionSubscriber(Subscriber):
     ) -> tuple[str, Any] | tuple[None, None] | None:
         return super().check_for_update(timeout)
 
+    def _subscriptions(self) -> list[str]:
+        if self.projection is None:
+            return [self.topic]
+
+        topic = self.topic[len(self.topic_base) :]
+        subscriptions = []
+
+        if topic in (DetectionTypeEnum.all.value, DetectionTypeEnum.video.value):
+            subscriptions.append(
+                f"{projection_topic_base(self.projection)}{DetectionTypeEnum.video.value}"
+            )
+
+        if topic == DetectionTypeEnum.all.value:
+            subscriptions.extend(
+                f"{self.topic_base}{t.value}"
+                for t in DetectionTypeEnum
+                if t not in (DetectionTypeEnum.all, DetectionTypeEnum.video)
+            )
+        elif topic != DetectionTypeEnum.video.value:
+            subscriptions.append(self.topic)
+
+        return subscriptions
+
     def _return_object(self, topic: str, payload: Any) -> Any:
         if payload is None:
             return (None, None)
-        return (topic[len(self.topic_base) :], payload)
+        return (topic.split("/", 1)[1], payload)
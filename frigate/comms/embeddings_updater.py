@@ -1,11 +1,14 @@
 """Facilitates communication between processes."""
 
 import logging
+import threading
 from enum import Enum
 from typing import Any, Callable
 
 import zmq
 
+from .zmq_proxy import Publisher, Subscriber
+
 logger = logging.getLogger(__name__)
 
 
@@ -89,3 +92,47 @@ class EmbeddingsRequestor:
     def stop(self) -> None:
         self.socket.close()
         self.context.destroy()
+
+
+class EmbeddingsUpdateTypeEnum(str, Enum):
+    all = ""
+    upsert = "upsert"  # embeddings were written
+    delete = "delete"  # embeddings were removed
+    reindex = "reindex"  # the tables were replaced by a reindex
+
+
+class EmbeddingsUpdatePublisher(Publisher[tuple[str, list[str]]]):
+    """Publishes the ids of changed embeddings per table."""
+
+    topic_base = "embeddings/"
+
+    def __init__(self) -> None:
+        super().__init__()
+        # embeddings are written by the maintainer, batch and reindex threads,
+        # zmq sockets are not thread safe
+        self.lock = threading.Lock()
+
+    def publish(self, payload: tuple[str, list[str]], sub_topic: str = "") -> None:
+        with self.lock:
+            super().publish(payload, sub_topic)
+
+    def stop(self) -> None:
+        with self.lock:
+            super().stop()
+
+
+class EmbeddingsUpdateSubscriber(Subscriber):
+    """Receives the ids of changed embeddings per table."""
+
+    topic_base = "embeddings/"
+
+    def __init__(self, topic: EmbeddingsUpdateTypeEnum) -> None:
+        super().__init__(topic.value)
+
+    def _return_object(
+        self, topic: str, payload: tuple | None
+    ) -> tuple[str, Any] | tuple[None, None]:
+        if payload is None:
+            return (None, None)
+
+        return (topic, payload)
@@ -1,25 +1,129 @@
 """Facilitates communication between processes."""
 
+import bisect
+import json
 import logging
 import multiprocessing as mp
 import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from multiprocessing.synchronize import Event as MpEvent
-from typing import Any, Callable
+from typing import Any, Callable, cast
 
 import zmq
 
 from frigate.comms.base_communicator import Communicator
+from frigate.const import (
+    CLEAR_ONGOING_REVIEW_SEGMENTS,
+    INSERT_MANY_RECORDINGS,
+    INSERT_PREVIEW,
+    REQUEST_REGION_GRID,
+    UPSERT_REVIEW_SEGMENT,
+)
 
 logger = logging.getLogger(__name__)
 
 SOCKET_REP_REQ = "ipc:///tmp/cache/comms"
+SOCKET_PUSH_PULL = "ipc:///tmp/cache/comms_notify"
+NOTIFY_FLUSH_INTERVAL = 1.0  # seconds
+
+
+# handlers that only do database work run on the worker pool, topics that
+# share an ordering key are handled in the order they were received
+POOLED_TOPICS: dict[str, str] = {
+    INSERT_MANY_RECORDINGS: "recordings",
+    INSERT_PREVIEW: "previews",
+    REQUEST_REGION_GRID: "regions",
+    UPSERT_REVIEW_SEGMENT: "review_segments",
+    CLEAR_ONGOING_REVIEW_SEGMENTS: "review_segments",
+}
+POOL_WORKERS = 4
+SOCKET_REPLIES = "inproc://comms_replies"
+# upper bounds in milliseconds, the last bucket holds everything slower
+LATENCY_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LatencyHistogram:
+    """Counts request latencies in fixed buckets."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+
+    def observe(self, duration: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, duration * 1000)] += 1
+        self.total += duration
+
+    def to_dict(self) -> dict[str, Any]:
+        count = sum(self.counts)
+        return {
+            "count": count,
+            "avg_ms": round(self.total / count * 1000, 2) if count else 0,
+            "buckets": {
+                **{
+                    f"le_{bound}": self.counts[i]
+                    for i, bound in enumerate(LATENCY_BUCKETS)
+                },
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class OrderedWorkerPool:
+    """Runs jobs on a thread pool, jobs with the same key run one at a time in order."""
+
+    def __init__(self, workers: int) -> None:
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="comms_worker")
+        self.lock = threading.Lock()
+        self.queues: dict[str, deque[Callable[[], None]]] = {}
+
+    def submit(self, key: str, job: Callable[[], None]) -> None:
+        with self.lock:
+            queue = self.queues.get(key)
+
+            if queue is not None:
+                queue.append(job)
+                return
+
+            self.queues[key] = deque()
+
+        self.executor.submit(self._run, key, job)
+
+    def _run(self, key: str, job: Callable[[], None]) -> None:
+        while True:
+            try:
+                job()
+            except Exception:
+                logger.exception(f"Error handling {key} request")
+
+            with self.lock:
+                queue = self.queues[key]
+
+                if not queue:
+                    del self.queues[key]
+                    return
+
+                job = queue.popleft()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
 
 
 class InterProcessCommunicator(Communicator):
     def __init__(self) -> None:
         self.context = zmq.Context()
-        self.socket = self.context.socket(zmq.REP)
+        self.socket = self.context.socket(zmq.ROUTER)
         self.socket.bind(SOCKET_REP_REQ)
+        self.notify_socket = self.context.socket(zmq.PULL)
+        self.notify_socket.bind(SOCKET_PUSH_PULL)
+        # replies from the worker pool are sent back through the reader thread
+        self.reply_socket = self.context.socket(zmq.PULL)
+        self.reply_socket.bind(SOCKET_REPLIES)
+        self.worker_sockets = threading.local()
+        self.pool = OrderedWorkerPool(POOL_WORKERS)
+        self.latencies: dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
         self.stop_event: MpEvent = mp.Event()
 
     def publish(self, topic: str, payload: Any, retain: bool = False) -> None:
@@ -34,34 +138,119 @@ class InterProcessCommunicator(Communicator):
     def read(self) -> None:
         while not self.stop_event.is_set():
             while True:  # load all messages that are queued
-                has_message, _, _ = zmq.select([self.socket], [], [], 1)
+                has_message, _, _ = zmq.select(
+                    [self.socket, self.notify_socket, self.reply_socket], [], [], 1
+                )
 
                 if not has_message:
                     break
 
-                try:
-                    raw = self.socket.recv_json(flags=zmq.NOBLOCK)
-
-                    if isinstance(raw, list):
-                        (topic, value) = raw
-                        response = self._dispatcher(topic, value)
-                    else:
-                        logging.warning(
-                            f"Received unexpected data type in ZMQ recv_json: {type(raw)}"
-                        )
-                        response = None
-
-                    if response is not None:
-                        self.socket.send_json(response)
-                    else:
-                        self.socket.send_json([])
-                except zmq.ZMQError:
-                    break
+                if self.notify_socket in has_message:
+                    self.read_notifications()
+
+                if self.reply_socket in has_message:
+                    self.send_replies()
+
+                if self.socket in has_message:
+                    self.read_requests()
+
+    def read_requests(self) -> None:
+        """Handle queued requests inline or hand them to the worker pool."""
+        while True:
+            try:
+                frames = self.socket.recv_multipart(flags=zmq.NOBLOCK)
+            except zmq.ZMQError:
+                return
+
+            received = time.monotonic()
+            # everything before the body is the envelope used to route the reply
+            envelope = frames[:-1]
+
+            try:
+                raw = json.loads(frames[-1])
+            except ValueError:
+                raw = None
+
+            if not isinstance(raw, list):
+                logging.warning(
+                    f"Received unexpected data type in ZMQ recv_json: {type(raw)}"
+                )
+                self.socket.send_multipart([*envelope, b"[]"])
+                continue
+
+            (topic, value) = raw
+
+            if topic in POOLED_TOPICS:
+                self.pool.submit(
+                    POOLED_TOPICS[topic],
+                    partial(self._handle_pooled, envelope, topic, value, received),
+                )
+                continue
+
+            response = self._dispatcher(topic, value)
+            self.socket.send_multipart([*envelope, self._encode_response(response)])
+            self.latencies[topic].observe(time.monotonic() - received)
+
+    def send_replies(self) -> None:
+        while True:
+            try:
+                frames = self.reply_socket.recv_multipart(flags=zmq.NOBLOCK)
+            except zmq.ZMQError:
+                return
+
+            self.socket.send_multipart(frames)
+
+    def get_latency_stats(self) -> dict[str, dict[str, Any]]:
+        """Returns the request latency histogram of each topic."""
+        return {
+            topic: histogram.to_dict()
+            for topic, histogram in dict(self.latencies).items()
+        }
+
+    def _handle_pooled(
+        self, envelope: list[bytes], topic: str, value: Any, received: float
+    ) -> None:
+        response = None
+
+        try:
+            response = self._dispatcher(topic, value)
+        finally:
+            socket = getattr(self.worker_sockets, "socket", None)
+
+            if socket is None:
+                socket = self.context.socket(zmq.PUSH)
+                socket.connect(SOCKET_REPLIES)
+                self.worker_sockets.socket = socket
+
+            # always reply so the requesting process does not hang on an error
+            socket.send_multipart([*envelope, self._encode_response(response)])
+            self.latencies[topic].observe(time.monotonic() - received)
+
+    @staticmethod
+    def _encode_response(response: Any) -> bytes:
+        return json.dumps(response if response is not None else []).encode()
+
+    def read_notifications(self) -> None:
+        """Dispatch queued one way updates, these get no reply."""
+        while True:
+            try:
+                batch = cast(
+                    list[tuple[str, Any]],
+                    self.notify_socket.recv_json(flags=zmq.NOBLOCK),
+                )
+            except zmq.ZMQError:
+                return
+
+            for topic, value in batch:
+                self._dispatcher(topic, value)
 
     def stop(self) -> None:
         self.stop_event.set()
         self.reader_thread.join()
+        self.pool.shutdown()
         self.socket.close(linger=0)
+        self.notify_socket.close(linger=0)
+        self.reply_socket.close(linger=0)
         self.context.destroy(linger=0)
 
 
@@ -84,3 +273,54 @@ class InterProcessRequestor:
     def stop(self) -> None:
         self.socket.close(linger=0)
         self.context.destroy(linger=0)
+
+
+class InterProcessNotifier:
+    """Sends one way updates to InterProcessCommunicator without waiting for a reply.
+
+    Coalesced updates only keep the latest value per topic and are sent
+    together at most once per flush interval.
+    """
+
+    def __init__(self, flush_interval: float = NOTIFY_FLUSH_INTERVAL) -> None:
+        self.flush_interval = flush_interval
+        self.context = zmq.Context()
+        self.socket = self.context.socket(zmq.PUSH)
+        self.socket.connect(SOCKET_PUSH_PULL)
+        self.pending: dict[str, Any] = {}
+        self.last_flush = time.monotonic()
+
+    def send_data(self, topic: str, data: Any, coalesce: bool = False) -> None:
+        """Queues a coalesced update or sends the update right away."""
+        if coalesce:
+            self.pending[topic] = data
+        else:
+            # this value is newer than any that is waiting to be sent
+            self.pending.pop(topic, None)
+            self._send([(topic, data)])
+
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Sends all pending coalesced updates."""
+        self.last_flush = time.monotonic()
+
+        if not self.pending:
+            return
+
+        batch = list(self.pending.items())
+        self.pending.clear()
+        self._send(batch)
+
+    def _send(self, batch: list[tuple[str, Any]]) -> None:
+        try:
+            self.socket.send_json(batch, flags=zmq.NOBLOCK)
+        except zmq.ZMQError:
+            # the communicator is not keeping up, updates can be dropped
+            pass
+
+    def stop(self) -> None:
+        self.flush()
+        self.socket.close(linger=100)
+        self.context.destroy(linger=100)
@@ -1,5 +1,7 @@
 import logging
 import threading
+import time
+from collections import deque
 from typing import Any, Callable
 
 import paho.mqtt.client as mqtt
@@ -10,6 +12,9 @@ from frigate.config import FrigateConfig
 
 logger = logging.getLogger(__name__)
 
+MQTT_FLUSH_INTERVAL = 0.05  # seconds
+MQTT_RATE_WINDOW = 60  # seconds
+
 
 class MqttClient(Communicator):
     """Frigate wrapper for mqtt client."""
@@ -18,6 +23,17 @@ class MqttClient(Communicator):
         self.config = config
         self.mqtt_config = config.mqtt
         self.connected = False
+        self.pending: list[tuple[str, Any, bool]] = []
+        self.pending_lock = threading.Lock()
+        # last value sent for each retained topic, the broker already has it
+        self.last_retained: dict[str, Any] = {}
+        self.published_count = 0
+        self.suppressed_count = 0
+        self.batch_count = 0
+        # (flush time, messages published) for the rate window
+        self.recent_batches: deque[tuple[float, int]] = deque()
+        self.stop_event = threading.Event()
+        self.flush_thread: threading.Thread | None = None
 
     def subscribe(self, receiver: Callable) -> None:
         """Wrapper for allowing dispatcher to subscribe."""
@@ -30,16 +46,85 @@ class MqttClient(Communicator):
             logger.debug(f"Unable to publish to {topic}: client is not connected")
             return
 
-        self.client.publish(
-            f"{self.mqtt_config.topic_prefix}/{topic}",
-            payload,
-            qos=self.config.mqtt.qos,
-            retain=retain,
+        with self.pending_lock:
+            if retain:
+                if topic in self.last_retained and self.last_retained[topic] == payload:
+                    self.suppressed_count += 1
+                    return
+
+                self.last_retained[topic] = payload
+
+            self.pending.append((topic, payload, retain))
+
+    def flush(self) -> None:
+        """Publish everything queued since the last flush."""
+        with self.pending_lock:
+            pending = self.pending
+            self.pending = []
+
+        if not pending:
+            return
+
+        # only the latest value of a retained topic needs to be sent
+        last_retained_index = {
+            topic: i for i, (topic, _, retain) in enumerate(pending) if retain
+        }
+        published = 0
+
+        for i, (topic, payload, retain) in enumerate(pending):
+            if retain and last_retained_index[topic] != i:
+                continue
+
+            self.client.publish(
+                f"{self.mqtt_config.topic_prefix}/{topic}",
+                payload,
+                qos=self.config.mqtt.qos,
+                retain=retain,
+            )
+            published += 1
+
+        now = time.monotonic()
+        self.published_count += published
+        self.suppressed_count += len(pending) - published
+        self.batch_count += 1
+        self.recent_batches.append((now, published))
+
+        while (
+            self.recent_batches and self.recent_batches[0][0] < now - MQTT_RATE_WINDOW
+        ):
+            self.recent_batches.popleft()
+
+    def get_publish_stats(self) -> dict[str, Any]:
+        """Returns publish counts and the recent publish rate."""
+        now = time.monotonic()
+        recent = sum(
+            count
+            for flushed, count in list(self.recent_batches)
+            if flushed >= now - MQTT_RATE_WINDOW
         )
+        return {
+            "published": self.published_count,
+            "suppressed": self.suppressed_count,
+            "batches": self.batch_count,
+            "publish_rate": round(recent / MQTT_RATE_WINDOW, 2),
+        }
 
     def stop(self) -> None:
+        self.stop_event.set()
+
+        if self.flush_thread is not None:
+            self.flush_thread.join()
+
+        self.flush()
         self.client.disconnect()
 
+    def _flush_loop(self) -> None:
+        while not self.stop_event.wait(MQTT_FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Unable to publish to MQTT server: {e}")
+
     def _set_initial_topics(self) -> None:
         """Set initial state topics."""
         for camera_name, camera in self.config.cameras.items():
@@ -202,6 +287,11 @@ class MqttClient(Communicator):
 
         self.connected = True
         logger.debug("MQTT connected")
+
+        # the broker may have lost retained state, so send everything again
+        with self.pending_lock:
+            self.last_retained.clear()
+
         client.subscribe(f"{self.mqtt_config.topic_prefix}/#", qos=self.config.mqtt.qos)
         self._set_initial_topics()
 
@@ -320,6 +410,10 @@ class MqttClient(Communicator):
             # with connect_async, retries are handled automatically
             self.client.connect_async(self.mqtt_config.host, self.mqtt_config.port, 60)
             self.client.loop_start()
+            self.flush_thread = threading.Thread(
+                target=self._flush_loop, name="mqtt_flush", daemon=True
+            )
+            self.flush_thread.start()
         except Exception as e:
             logger.error(f"Unable to connect to MQTT server: {e}")
             return
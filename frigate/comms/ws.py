@@ -1,10 +1,12 @@
 """Websocket communicator."""
 
 import errno
+import itertools
 import json
 import logging
 import threading
-from typing import Any, Callable
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
 from wsgiref.simple_server import make_server
 
 from ws4py.server.wsgirefserver import (
@@ -20,8 +22,114 @@ from frigate.config import FrigateConfig
 
 logger = logging.getLogger(__name__)
 
+WS_FLUSH_INTERVAL = 0.1  # seconds
+WS_CLIENT_QUEUE_SIZE = 1000
+# every message on these topics is delivered, all other topics hold state
+# and only their latest value is sent
+WS_STREAM_TOPICS = [
+    "events",
+    "reviews",
+    "tracked_object_update",
+    "triggers",
+    "notification_test",
+    "+/audio/transcription",
+]
+WS_SUBSCRIBE = "subscribe"
+WS_UNSUBSCRIBE = "unsubscribe"
+
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """Match a topic against a pattern using mqtt style + and # wildcards."""
+    pattern_parts = pattern.split("/")
+    topic_parts = topic.split("/")
+
+    for i, part in enumerate(pattern_parts):
+        if part == "#":
+            return True
+
+        if i >= len(topic_parts) or (part != "+" and part != topic_parts[i]):
+            return False
+
+    return len(pattern_parts) == len(topic_parts)
+
+
+class ClientQueue:
+    """Messages waiting to be sent to a single client.
+
+    A newer value for a state topic replaces the queued one, and the oldest
+    messages are dropped once a slow client has too many queued.
+    """
+
+    def __init__(self, max_size: int = WS_CLIENT_QUEUE_SIZE) -> None:
+        self.max_size = max_size
+        self.messages: OrderedDict[Hashable, str] = OrderedDict()
+        self.condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, key: Hashable, message: str) -> None:
+        with self.condition:
+            if self.messages.pop(key, None) is not None:
+                self.dropped += 1
+
+            self.messages[key] = message
+
+            while len(self.messages) > self.max_size:
+                self.messages.popitem(last=False)
+                self.dropped += 1
+
+            self.condition.notify()
+
+    def get_all(self, timeout: float) -> list[str]:
+        with self.condition:
+            if not self.messages:
+                self.condition.wait(timeout)
+
+            messages = list(self.messages.values())
+            self.messages.clear()
+            return messages
+
 
 class WebSocket(WebSocket_):  # type: ignore[misc]
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # clients receive everything until they subscribe to specific topics
+        self.subscriptions: set[str] = {"#"}
+        self.send_queue = ClientQueue()
+
+    def opened(self) -> None:
+        # sends happen on a thread per client so a slow client can't block others
+        threading.Thread(
+            target=self._send_queued, name="websocket_sender", daemon=True
+        ).start()
+
+    def is_subscribed(self, topic: str) -> bool:
+        return any(topic_matches(pattern, topic) for pattern in self.subscriptions)
+
+    def update_subscriptions(self, command: str, patterns: Any) -> None:
+        if isinstance(patterns, str):
+            patterns = [patterns]
+
+        if not isinstance(patterns, list):
+            logger.warning(f"Invalid websocket {command} payload: {patterns}")
+            return
+
+        if command == WS_SUBSCRIBE:
+            # the first subscription replaces the default of receiving everything
+            if self.subscriptions == {"#"}:
+                self.subscriptions = set()
+
+            self.subscriptions.update(str(p) for p in patterns)
+        else:
+            self.subscriptions.difference_update(str(p) for p in patterns)
+
+    def _send_queued(self) -> None:
+        while not self.terminated:
+            for message in self.send_queue.get_all(timeout=1):
+                try:
+                    self.send(message)
+                except Exception:
+                    return
+
     def unhandled_error(self, error: Any) -> None:
         """
         Handles the unfriendly socket closures on the server side
@@ -39,6 +147,10 @@ class WebSocketClient(Communicator):
     def __init__(self, config: FrigateConfig) -> None:
         self.config = config
         self.websocket_server: WSGIServer | None = None
+        self.pending: OrderedDict[Hashable, tuple[str, Any]] = OrderedDict()
+        self.pending_lock = threading.Lock()
+        self.stream_ids = itertools.count()
+        self.stop_event = threading.Event()
 
     def subscribe(self, receiver: Callable) -> None:
         self._dispatcher = receiver
@@ -63,6 +175,12 @@ class WebSocketClient(Communicator):
                     )
                     return
 
+                if json_message["topic"] in (WS_SUBSCRIBE, WS_UNSUBSCRIBE):
+                    self.update_subscriptions(
+                        json_message["topic"], json_message["payload"]
+                    )
+                    return
+
                 logger.debug(
                     f"Publishing mqtt message from websockets at {json_message['topic']}."
                 )
@@ -85,30 +203,71 @@ class WebSocketClient(Communicator):
             target=self.websocket_server.serve_forever
         )
         self.websocket_thread.start()
+        self.flush_thread = threading.Thread(
+            target=self._flush_loop, name="websocket_flush"
+        )
+        self.flush_thread.start()
 
     def publish(self, topic: str, payload: Any, _: bool = False) -> None:
-        try:
-            ws_message = json.dumps(
-                {
-                    "topic": topic,
-                    "payload": payload,
-                }
-            )
-        except Exception:
-            # if the payload can't be decoded don't relay to clients
-            logger.debug(f"payload for {topic} wasn't text. Skipping...")
-            return
+        if any(topic_matches(pattern, topic) for pattern in WS_STREAM_TOPICS):
+            key: Hashable = next(self.stream_ids)
+        else:
+            key = topic
+
+        with self.pending_lock:
+            # keep messages in the order their latest value was published
+            self.pending.pop(key, None)
+            self.pending[key] = (topic, payload)
+
+    def flush(self) -> None:
+        """Encode pending messages once and queue them for subscribed clients."""
+        with self.pending_lock:
+            if not self.pending:
+                return
+
+            pending = self.pending
+            self.pending = OrderedDict()
 
         if self.websocket_server is None:
             logger.debug("Skipping message, websocket not connected yet")
             return
 
-        try:
-            self.websocket_server.manager.broadcast(ws_message)
-        except ConnectionResetError:
-            pass
+        with self.websocket_server.manager.lock:
+            clients = [
+                ws
+                for ws in self.websocket_server.manager.websockets.values()
+                if not ws.terminated
+            ]
+
+        for key, (topic, payload) in pending.items():
+            subscribed = [ws for ws in clients if ws.is_subscribed(topic)]
+
+            if not subscribed:
+                continue
+
+            try:
+                ws_message = json.dumps(
+                    {
+                        "topic": topic,
+                        "payload": payload,
+                    }
+                )
+            except Exception:
+                # if the payload can't be decoded don't relay to clients
+                logger.debug(f"payload for {topic} wasn't text. Skipping...")
+                continue
+
+            for ws in subscribed:
+                ws.send_queue.put(key, ws_message)
+
+    def _flush_loop(self) -> None:
+        while not self.stop_event.wait(WS_FLUSH_INTERVAL):
+            self.flush()
 
     def stop(self) -> None:
+        self.stop_event.set()
+        self.flush_thread.join()
+
         if self.websocket_server is not None:
             self.websocket_server.manager.close_all()
             self.websocket_server.manager.stop()
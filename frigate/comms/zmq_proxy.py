@@ -2,8 +2,10 @@
 
 import json
 import threading
-from typing import Generic, TypeVar
+from abc import ABC, abstractmethod
+from typing import Any, Generic, TypeVar
 
+import msgpack
 import zmq
 
 from frigate.const import FAST_QUEUE_TIMEOUT
@@ -47,6 +49,58 @@ class ZmqProxy:
         self.runner.join()
 
 
+class Codec(ABC):
+    """Serializes payloads sent through the proxy."""
+
+    # sent as its own frame so subscribers can decode any topic
+    name: bytes = b""
+
+    @staticmethod
+    @abstractmethod
+    def encode(payload: Any) -> bytes:
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def decode(data: bytes) -> Any:
+        pass
+
+
+class JsonCodec(Codec):
+    """Encodes payloads as json, tuples are decoded as lists."""
+
+    name = b"json"
+
+    @staticmethod
+    def encode(payload: Any) -> bytes:
+        return json.dumps(payload).encode()
+
+    @staticmethod
+    def decode(data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """Encodes payloads as msgpack, tuples are decoded as lists.
+
+    Unlike json, non string dict keys keep their type.
+    """
+
+    name = b"msgpack"
+
+    @staticmethod
+    def encode(payload: Any) -> bytes:
+        return bytes(msgpack.packb(payload))
+
+    @staticmethod
+    def decode(data: bytes) -> Any:
+        return msgpack.unpackb(data, strict_map_key=False)
+
+
+CODECS: dict[bytes, type[Codec]] = {
+    codec.name: codec for codec in (JsonCodec, MsgpackCodec)
+}
+
 T = TypeVar("T")
 
 
@@ -54,16 +108,38 @@ class Publisher(Generic[T]):
     """Publishes messages."""
 
     topic_base: str = ""
+    codec: type[Codec] = JsonCodec
 
     def __init__(self, topic: str = "") -> None:
         self.topic = f"{self.topic_base}{topic}"
         self.context = zmq.Context()
         self.socket = self.context.socket(zmq.PUB)
         self.socket.connect(SOCKET_PUB)
+        # full topic -> [messages, bytes] published
+        self.topic_stats: dict[str, list[int]] = {}
 
     def publish(self, payload: T, sub_topic: str = "") -> None:
         """Publish message."""
-        self.socket.send_string(f"{self.topic}{sub_topic} {json.dumps(payload)}")
+        self._send(f"{self.topic}{sub_topic}", payload)
+
+    def get_topic_stats(self) -> dict[str, dict[str, int]]:
+        """Returns the messages and bytes published per topic."""
+        return {
+            topic: {"messages": messages, "bytes": size}
+            for topic, (messages, size) in dict(self.topic_stats).items()
+        }
+
+    def _send(self, topic: str, payload: Any) -> None:
+        data = self.codec.encode(payload)
+        self.socket.send_multipart([topic.encode(), self.codec.name, data])
+
+        stats = self.topic_stats.get(topic)
+
+        if stats is None:
+            self.topic_stats[topic] = [1, len(data)]
+        else:
+            stats[0] += 1
+            stats[1] += len(data)
 
     def stop(self) -> None:
         self.socket.close(linger=0)
@@ -79,7 +155,10 @@ class Subscriber(Generic[T]):
         self.topic = f"{self.topic_base}{topic}"
         self.context = zmq.Context()
         self.socket = self.context.socket(zmq.SUB)
-        self.socket.setsockopt_string(zmq.SUBSCRIBE, self.topic)
+
+        for subscription in self._subscriptions():
+            self.socket.setsockopt_string(zmq.SUBSCRIBE, subscription)
+
         self.socket.connect(SOCKET_SUB)
 
     def check_for_update(self, timeout: float | None = FAST_QUEUE_TIMEOUT) -> T | None:
@@ -88,8 +167,10 @@ class Subscriber(Generic[T]):
             has_update, _, _ = zmq.select([self.socket], [], [], timeout)
 
             if has_update:
-                parts = self.socket.recv_string(flags=zmq.NOBLOCK).split(maxsplit=1)
-                return self._return_object(parts[0], json.loads(parts[1]))
+                topic, codec, payload = self.socket.recv_multipart(flags=zmq.NOBLOCK)
+                return self._return_object(
+                    topic.decode(), CODECS[codec].decode(payload)
+                )
         except zmq.ZMQError:
             pass
 
@@ -99,5 +180,9 @@ class Subscriber(Generic[T]):
         self.socket.close(linger=0)
         self.context.destroy(linger=0)
 
+    def _subscriptions(self) -> list[str]:
+        """Topic prefixes this subscriber receives."""
+        return [self.topic]
+
     def _return_object(self, topic: str, payload: T | None) -> T | None:
         return payload
@@ -105,6 +105,11 @@ class RecordConfig(FrigateBaseModel):
         title="Record cleanup interval",
         description="Minutes between cleanup passes that remove expired recording segments.",
     )
+    aggregate_detections: bool = Field(
+        default=False,
+        title="Aggregate detections in a separate process",
+        description="Keep per camera detection summaries for recording segments in a separate process using shared memory, instead of the recording process handling every detection. Global only.",
+    )
     continuous: RecordRetainConfig = Field(
         default_factory=RecordRetainConfig,
         title="Continuous retention",
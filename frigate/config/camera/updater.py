@@ -1,10 +1,16 @@
 """Convenience classes for updating configurations dynamically."""
 
+import time
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
-from frigate.comms.config_updater import ConfigPublisher, ConfigSubscriber
+from frigate.comms.config_updater import (
+    UPDATE_GRACE_PERIOD,
+    ConfigPublisher,
+    ConfigSubscriber,
+    UpdateGeneration,
+)
 from frigate.config import CameraConfig, FrigateConfig
 
 
@@ -42,15 +48,35 @@ class CameraConfigUpdateTopic:
 
 
 class CameraConfigUpdatePublisher:
-    def __init__(self):
+    def __init__(self, cameras: list[str]):
         self.publisher = ConfigPublisher()
+        # "" is changed for every camera, for subscribers to all cameras
+        self.generations: dict[str, UpdateGeneration] = {
+            name: UpdateGeneration(name, create=True) for name in ["", *cameras]
+        }
 
     def publish_update(self, topic: CameraConfigUpdateTopic, config: Any) -> None:
         self.publisher.publish(topic.topic, config)
 
+        if topic.camera not in self.generations:
+            self.generations[topic.camera] = UpdateGeneration(topic.camera, create=True)
+
+        self.generations[topic.camera].increment()
+        self.generations[""].increment()
+
+        if topic.update_type == CameraConfigUpdateEnum.remove:
+            # subscribers of the removed camera keep their mapping until they stop
+            generation = self.generations.pop(topic.camera)
+            generation.close()
+            generation.unlink()
+
     def stop(self) -> None:
         self.publisher.stop()
 
+        for generation in self.generations.values():
+            generation.close()
+            generation.unlink()
+
 
 class CameraConfigUpdateSubscriber:
     def __init__(
@@ -64,14 +90,22 @@ class CameraConfigUpdateSubscriber:
         self.topics = topics
 
         base_topic = "config/cameras"
+        generation_name = ""
 
         if len(self.camera_configs) == 1:
-            base_topic += f"/{list(self.camera_configs.keys())[0]}"
+            generation_name = list(self.camera_configs.keys())[0]
+            base_topic += f"/{generation_name}"
 
         self.subscriber = ConfigSubscriber(
             base_topic,
             exact=False,
         )
+        self.generation_name = generation_name
+        self.generation: UpdateGeneration | None = None
+        self.last_generation = 0
+        self.next_attach = 0.0
+        self.poll_until = 0.0
+        self._attach_generation()
 
     def __update_config(
         self, camera: str, update_type: CameraConfigUpdateEnum, updated_config: Any
@@ -124,9 +158,42 @@ class CameraConfigUpdateSubscriber:
         elif update_type == CameraConfigUpdateEnum.zones:
             config.zones = updated_config
 
+    def _attach_generation(self) -> None:
+        now = time.monotonic()
+
+        if now < self.next_attach:
+            return
+
+        try:
+            self.generation = UpdateGeneration(self.generation_name)
+        except FileNotFoundError:
+            # the publisher has not started yet, poll the socket until it has
+            self.next_attach = now + UPDATE_GRACE_PERIOD
+            return
+
+        self.last_generation = self.generation.value
+        # messages may be in flight while the subscriber starts
+        self.poll_until = now + UPDATE_GRACE_PERIOD
+
     def check_for_updates(self) -> dict[str, list[str]]:
         updated_topics: dict[str, list[str]] = {}
 
+        if self.generation is None:
+            self._attach_generation()
+
+        if self.generation is not None:
+            generation = self.generation.value
+
+            if generation != self.last_generation:
+                self.last_generation = generation
+                self.poll_until = time.monotonic() + UPDATE_GRACE_PERIOD
+            elif not self.poll_until:
+                return updated_topics
+            elif time.monotonic() > self.poll_until:
+                # a caller that checks less often than the grace period
+                # still receives a message that arrived after its last check
+                self.poll_until = 0.0
+
         # get all updates available
         while True:
             update_topic, update_config = self.subscriber.check_for_update()
@@ -149,3 +216,6 @@ class CameraConfigUpdateSubscriber:
 
     def stop(self) -> None:
         self.subscriber.stop()
+
+        if self.generation is not None:
+            self.generation.close()
@@ -21,6 +21,12 @@ class SemanticSearchModelEnum(str, Enum):
     jinav2 = "jinav2"
 
 
+class SemanticSearchQuantizationEnum(str, Enum):
+    none = "none"
+    int8 = "int8"
+    binary = "binary"
+
+
 class EnrichmentsDeviceEnum(str, Enum):
     GPU = "GPU"
     CPU = "CPU"
@@ -188,6 +194,22 @@ class SemanticSearchConfig(FrigateBaseModel):
         title="Device",
         description="This is an override, to target a specific device. See https://onnxruntime.ai/docs/execution-providers/ for more information",
     )
+    quantization: SemanticSearchQuantizationEnum = Field(
+        default=SemanticSearchQuantizationEnum.none,
+        title="Embedding quantization",
+        description="Store int8 or binary quantized embeddings for the nearest neighbor search and rerank the candidates with the full precision embeddings. Changing this requires a reindex.",
+    )
+    rerank_factor: int = Field(
+        default=4,
+        title="Rerank factor",
+        description="Number of quantized search candidates per requested result that are reranked with the full precision embeddings.",
+        ge=1,
+    )
+    memory_index: bool = Field(
+        default=False,
+        title="Keep thumbnail embeddings in memory",
+        description="Keep all thumbnail embeddings in memory so similarity searches are computed without reading the embeddings database. Uses about 3KB of memory per tracked object.",
+    )
 
 
 class TriggerConfig(FrigateBaseModel):
@@ -54,6 +54,10 @@ LABEL_NMS_MAP = {
 }
 LABEL_NMS_DEFAULT = 0.4
 
+# Detection constants
+
+MAX_DETECTIONS = 100
+
 # Audio constants
 
 AUDIO_DURATION = 0.975
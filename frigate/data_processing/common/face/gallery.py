@@ -0,0 +1,202 @@
+"""In-memory gallery of the embeddings of enrolled faces."""
+
+import threading
+
+import numpy as np
+from scipy import stats
+
+INITIAL_CAPACITY = 256
+CENTROID_CANDIDATES = 8
+TRIM_PROPORTION = 0.15
+
+
+class FaceGallery:
+    """Embeddings of enrolled face images grouped by identity.
+
+    Every image is a row of one matrix and every identity keeps the running
+    sum of its rows, so enrolling, deleting or moving images only updates the
+    identities involved. A face is matched in two steps: the normalized mean
+    of every identity shortlists candidates with one matrix product, then the
+    candidates are scored exactly with their trimmed mean embedding, the same
+    score a full rebuild of the face model gives.
+    """
+
+    def __init__(self, candidates: int = CENTROID_CANDIDATES) -> None:
+        self.candidates = candidates
+        self.samples: np.ndarray | None = None
+        self.sample_identities = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+        self.keys: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.names: list[str] = []
+        self.codes: dict[str, int] = {}
+        self.sums: np.ndarray | None = None
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.centroids: np.ndarray | None = None
+        # normalized trimmed means, computed when an identity is a candidate
+        self.trimmed: dict[int, np.ndarray] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def get_identities(self) -> dict[str, str]:
+        """Identity of every enrolled image by its key."""
+        with self.lock:
+            return {
+                key: self.names[self.sample_identities[position]]
+                for key, position in self.positions.items()
+            }
+
+    def update(
+        self,
+        added: list[tuple[str, str, np.ndarray]] | None = None,
+        moved: dict[str, tuple[str, str]] | None = None,
+        removed: list[str] | None = None,
+    ) -> None:
+        """Apply enrolled (key, name, embedding), moved key -> (key, name) and removed keys."""
+        with self.lock:
+            for key in removed or []:
+                self._remove(key)
+
+            for key, (new_key, name) in (moved or {}).items():
+                if key not in self.positions:
+                    continue
+
+                if new_key != key:
+                    self._remove(new_key)
+
+                position = self.positions.pop(key)
+
+                self.keys[position] = new_key
+                self.positions[new_key] = position
+                embedding = self.samples[position]
+                self._change_identity(self.sample_identities[position], embedding, -1)
+                self.sample_identities[position] = self._identity(name)
+                self._change_identity(self.sample_identities[position], embedding, 1)
+
+            for key, name, embedding in added or []:
+                self._remove(key)
+                self._add(key, name, np.asarray(embedding, dtype=np.float32).ravel())
+
+    def search(self, embedding: np.ndarray) -> tuple[str, float] | None:
+        """Identity with the most similar trimmed mean and its cosine similarity."""
+        query = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+
+        with self.lock:
+            if not self.keys or norm == 0:
+                return None
+
+            query = query / norm
+            enrolled = np.flatnonzero(self.counts > 0)
+            similarities = self.centroids[enrolled] @ query
+
+            if len(enrolled) > self.candidates:
+                shortlist = np.argpartition(-similarities, self.candidates - 1)
+                enrolled = enrolled[shortlist[: self.candidates]]
+
+            best: tuple[str, float] | None = None
+
+            for identity in enrolled.tolist():
+                similarity = float(self._trimmed_mean(identity) @ query)
+
+                if best is None or similarity > best[1]:
+                    best = (self.names[identity], similarity)
+
+            return best
+
+    def _add(self, key: str, name: str, embedding: np.ndarray) -> None:
+        if self.samples is None:
+            self.samples = np.empty((INITIAL_CAPACITY, len(embedding)), np.float32)
+
+        position = len(self.keys)
+        self._reserve(position + 1)
+        self.keys.append(key)
+        self.positions[key] = position
+        self.samples[position] = embedding
+        self.sample_identities[position] = self._identity(name)
+        self._change_identity(self.sample_identities[position], embedding, 1)
+
+    def _remove(self, key: str) -> None:
+        position = self.positions.pop(key, None)
+
+        if position is None:
+            return
+
+        self._change_identity(
+            self.sample_identities[position], self.samples[position], -1
+        )
+
+        # keep the rows dense by moving the last row into the gap
+        last = len(self.keys) - 1
+        last_key = self.keys.pop()
+
+        if position != last:
+            self.keys[position] = last_key
+            self.positions[last_key] = position
+            self.samples[position] = self.samples[last]
+            self.sample_identities[position] = self.sample_identities[last]
+
+    def _identity(self, name: str) -> int:
+        identity = self.codes.get(name)
+
+        if identity is None:
+            identity = len(self.names)
+            self.codes[name] = identity
+            self.names.append(name)
+            dimensions = self.samples.shape[1]
+
+            if self.sums is None:
+                self.sums = np.zeros((0, dimensions), dtype=np.float64)
+                self.centroids = np.zeros((0, dimensions), dtype=np.float32)
+
+            self.sums = np.vstack([self.sums, np.zeros((1, dimensions))])
+            self.centroids = np.vstack(
+                [self.centroids, np.zeros((1, dimensions), np.float32)]
+            )
+            self.counts = np.append(self.counts, 0)
+
+        return identity
+
+    def _change_identity(
+        self, identity: int, embedding: np.ndarray, count: int
+    ) -> None:
+        self.sums[identity] += count * embedding
+        self.counts[identity] += count
+        self.trimmed.pop(identity, None)
+        norm = np.linalg.norm(self.sums[identity])
+
+        if self.counts[identity] > 0 and norm > 0:
+            self.centroids[identity] = self.sums[identity] / norm
+        else:
+            self.centroids[identity] = 0
+
+    def _trimmed_mean(self, identity: int) -> np.ndarray:
+        trimmed = self.trimmed.get(identity)
+
+        if trimmed is None:
+            rows = self.samples[: len(self.keys)][
+                self.sample_identities[: len(self.keys)] == identity
+            ]
+            trimmed = stats.trim_mean(rows, TRIM_PROPORTION).astype(np.float32)
+            norm = np.linalg.norm(trimmed)
+            trimmed = trimmed / norm if norm > 0 else trimmed
+            self.trimmed[identity] = trimmed
+
+        return trimmed
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self.samples)
+
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+
+        samples = np.empty((capacity, self.samples.shape[1]), dtype=np.float32)
+        samples[: len(self.keys)] = self.samples[: len(self.keys)]
+        self.samples = samples
+        identities = np.empty(capacity, dtype=np.int32)
+        identities[: len(self.keys)] = self.sample_identities[: len(self.keys)]
+        self.sample_identities = identities
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import os
 import queue
@@ -6,15 +7,18 @@ from abc import ABC, abstractmethod
 
 import cv2
 import numpy as np
-from scipy import stats
 
 from frigate.config import FrigateConfig
 from frigate.const import FACE_DIR, MODEL_CACHE_DIR
 from frigate.embeddings.onnx.face_embedding import ArcfaceEmbedding, FaceNetEmbedding
 from frigate.log import redirect_output_to_logger
 
+from .gallery import FaceGallery
+
 logger = logging.getLogger(__name__)
 
+FaceFile = tuple[int, int, str]
+
 
 class FaceRecognizer(ABC):
     """Face recognition runner."""
@@ -23,16 +27,154 @@ class FaceRecognizer(ABC):
         self.config = config
         self.landmark_detector: cv2.face.FacemarkLBF = None
         self.init_landmark_detector()
+        self.gallery = FaceGallery()
+        self.gallery_outdated = True
+        self.model_builder_queue: queue.Queue | None = None
+        # size, modification time and content hash of every enrolled image
+        self.face_files: dict[str, FaceFile] = {}
 
     @abstractmethod
-    def build(self) -> None:
-        """Build face recognition model."""
+    def embed(self, face_image: np.ndarray) -> np.ndarray:
+        """Embedding of an aligned face."""
         pass
 
-    @abstractmethod
     def clear(self) -> None:
-        """Clear current built model."""
-        pass
+        """Mark the model as outdated after the face library changed.
+
+        The current gallery keeps being used until the next build has synced it
+        with the face library.
+        """
+        self.gallery_outdated = True
+
+    def run_build_task(self) -> None:
+        self.model_builder_queue = queue.Queue()
+        self.gallery_outdated = False
+        enrolled = self.gallery.get_identities()
+        face_files = dict(self.face_files)
+
+        def build_model():
+            # only images that are not in the gallery yet are embedded. Images
+            # are keyed by folder and file name and recognized by the hash of
+            # their content, so renamed faces are moved and faces replaced
+            # under the same name are embedded again
+            found: dict[str, FaceFile] = {}
+            changed: list[tuple[str, str, FaceFile, bytes]] = []
+
+            dir = FACE_DIR
+            for name in os.listdir(dir):
+                if name == "train":
+                    continue
+
+                face_folder = os.path.join(dir, name)
+
+                if not os.path.isdir(face_folder):
+                    continue
+
+                for image in os.listdir(face_folder):
+                    key = f"{name}/{image}"
+                    path = os.path.join(face_folder, image)
+
+                    try:
+                        stat = os.stat(path)
+                        known = face_files.get(key)
+
+                        if (
+                            key in enrolled
+                            and known is not None
+                            and known[:2] == (stat.st_size, stat.st_mtime_ns)
+                        ):
+                            found[key] = known
+                            continue
+
+                        with open(path, "rb") as f:
+                            data = f.read()
+                    except OSError:
+                        continue
+
+                    face_file = (
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        hashlib.sha256(data).hexdigest(),
+                    )
+
+                    if (
+                        key in enrolled
+                        and known is not None
+                        and known[2] == face_file[2]
+                    ):
+                        found[key] = face_file
+                    else:
+                        changed.append((key, name, face_file, data))
+
+            # enrolled images that are gone, by content
+            missing: dict[str, list[str]] = {}
+
+            for key in enrolled:
+                if key not in found and key in face_files:
+                    missing.setdefault(face_files[key][2], []).append(key)
+
+            added: list[tuple[str, str, np.ndarray]] = []
+            moved: dict[str, tuple[str, str]] = {}
+
+            for key, name, face_file, data in changed:
+                if missing.get(face_file[2]):
+                    moved[missing[face_file[2]].pop()] = (key, name)
+                    found[key] = face_file
+                    continue
+
+                img = cv2.imdecode(
+                    np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR
+                )
+
+                if img is None:
+                    continue
+
+                img = self.align_face(img, img.shape[1], img.shape[0])
+                added.append((key, name, self.embed(img)))
+                found[key] = face_file
+
+            removed = [key for key in enrolled if key not in found and key not in moved]
+            self.model_builder_queue.put((added, moved, removed, found))
+
+        thread = threading.Thread(target=build_model, daemon=True)
+        thread.start()
+
+    def build(self) -> None:
+        """Build or update the face recognition model."""
+        if not self.landmark_detector:
+            self.init_landmark_detector()
+            return None
+
+        if self.model_builder_queue is not None:
+            try:
+                # wait briefly only when there is no model to use meanwhile
+                added, moved, removed, face_files = self.model_builder_queue.get(
+                    block=not self.gallery, timeout=0.1
+                )
+                self.model_builder_queue = None
+            except queue.Empty:
+                return
+        else:
+            self.run_build_task()
+            return
+
+        self.gallery.update(added, moved, removed)
+        self.face_files = face_files
+        logger.debug(
+            f"Finished building {type(self).__name__} model, "
+            f"{len(added)} faces added, {len(moved)} moved, {len(removed)} removed"
+        )
+
+    def search(self, embedding: np.ndarray) -> tuple[str, float] | None:
+        """Most similar enrolled identity, building the model if needed."""
+        if (
+            not self.gallery
+            or self.gallery_outdated
+            or self.model_builder_queue is not None
+        ):
+            self.build()
+
+        return self.gallery.search(embedding)
 
     @abstractmethod
     def classify(self, face_image: np.ndarray) -> tuple[str, float] | None:
@@ -158,82 +300,19 @@ def similarity_to_confidence(
 class FaceNetRecognizer(FaceRecognizer):
     def __init__(self, config: FrigateConfig):
         super().__init__(config)
-        self.mean_embs: dict[int, np.ndarray] = {}
         self.face_embedder: FaceNetEmbedding = FaceNetEmbedding()
-        self.model_builder_queue: queue.Queue | None = None
-
-    def clear(self) -> None:
-        self.mean_embs = {}
-
-    def run_build_task(self) -> None:
-        self.model_builder_queue = queue.Queue()
-
-        def build_model():
-            face_embeddings_map: dict[str, list[np.ndarray]] = {}
-            idx = 0
-
-            dir = FACE_DIR
-            for name in os.listdir(dir):
-                if name == "train":
-                    continue
-
-                face_folder = os.path.join(dir, name)
-
-                if not os.path.isdir(face_folder):
-                    continue
-
-                face_embeddings_map[name] = []
-                for image in os.listdir(face_folder):
-                    img = cv2.imread(os.path.join(face_folder, image))
 
-                    if img is None:
-                        continue
-
-                    img = self.align_face(img, img.shape[1], img.shape[0])
-                    emb = self.face_embedder([img])[0].squeeze()
-                    face_embeddings_map[name].append(emb)
-
-                idx += 1
-
-            self.model_builder_queue.put(face_embeddings_map)
-
-        thread = threading.Thread(target=build_model, daemon=True)
-        thread.start()
-
-    def build(self):
-        if not self.landmark_detector:
-            self.init_landmark_detector()
-            return None
-
-        if self.model_builder_queue is not None:
-            try:
-                face_embeddings_map: dict[str, list[np.ndarray]] = (
-                    self.model_builder_queue.get(timeout=0.1)
-                )
-                self.model_builder_queue = None
-            except queue.Empty:
-                return
-        else:
-            self.run_build_task()
-            return
-
-        if not face_embeddings_map:
-            return
-
-        for name, embs in face_embeddings_map.items():
-            if embs:
-                self.mean_embs[name] = stats.trim_mean(embs, 0.15)
-
-        logger.debug("Finished building ArcFace model")
+    def embed(self, face_image: np.ndarray) -> np.ndarray:
+        return self.face_embedder([face_image])[0].squeeze()
 
     def classify(self, face_image):
         if not self.landmark_detector:
             return None
 
-        if not self.mean_embs:
+        if not self.gallery:
             self.build()
 
-            if not self.mean_embs:
+            if not self.gallery:
                 return None
 
         # face recognition is best run on grayscale images
@@ -243,24 +322,13 @@ class FaceNetRecognizer(FaceRecognizer):
 
         # align face and run recognition
         img = self.align_face(face_image, face_image.shape[1], face_image.shape[0])
-        embedding = self.face_embedder([img])[0].squeeze()
-
-        score = 0
-        label = ""
-
-        for name, mean_emb in self.mean_embs.items():
-            dot_product = np.dot(embedding, mean_emb)
-            magnitude_A = np.linalg.norm(embedding)
-            magnitude_B = np.linalg.norm(mean_emb)
+        result = self.search(self.embed(img))
 
-            cosine_similarity = dot_product / (magnitude_A * magnitude_B)
-            confidence = similarity_to_confidence(
-                cosine_similarity, median=0.5, range_width=0.6
-            )
+        if result is None:
+            return None
 
-            if confidence > score:
-                score = confidence
-                label = name
+        label, cosine_similarity = result
+        score = similarity_to_confidence(cosine_similarity, median=0.5, range_width=0.6)
 
         return label, max(0, round(score - blur_reduction, 2))
 
@@ -268,82 +336,19 @@ class FaceNetRecognizer(FaceRecognizer):
 class ArcFaceRecognizer(FaceRecognizer):
     def __init__(self, config: FrigateConfig):
         super().__init__(config)
-        self.mean_embs: dict[int, np.ndarray] = {}
         self.face_embedder: ArcfaceEmbedding = ArcfaceEmbedding(config.face_recognition)
-        self.model_builder_queue: queue.Queue | None = None
-
-    def clear(self) -> None:
-        self.mean_embs = {}
-
-    def run_build_task(self) -> None:
-        self.model_builder_queue = queue.Queue()
-
-        def build_model():
-            face_embeddings_map: dict[str, list[np.ndarray]] = {}
-            idx = 0
-
-            dir = FACE_DIR
-            for name in os.listdir(dir):
-                if name == "train":
-                    continue
-
-                face_folder = os.path.join(dir, name)
-
-                if not os.path.isdir(face_folder):
-                    continue
-
-                face_embeddings_map[name] = []
-                for image in os.listdir(face_folder):
-                    img = cv2.imread(os.path.join(face_folder, image))
-
-                    if img is None:
-                        continue
-
-                    img = self.align_face(img, img.shape[1], img.shape[0])
-                    emb = self.face_embedder([img])[0].squeeze()
-                    face_embeddings_map[name].append(emb)
-
-                idx += 1
-
-            self.model_builder_queue.put(face_embeddings_map)
-
-        thread = threading.Thread(target=build_model, daemon=True)
-        thread.start()
-
-    def build(self):
-        if not self.landmark_detector:
-            self.init_landmark_detector()
-            return None
 
-        if self.model_builder_queue is not None:
-            try:
-                face_embeddings_map: dict[str, list[np.ndarray]] = (
-                    self.model_builder_queue.get(timeout=0.1)
-                )
-                self.model_builder_queue = None
-            except queue.Empty:
-                return
-        else:
-            self.run_build_task()
-            return
-
-        if not face_embeddings_map:
-            return
-
-        for name, embs in face_embeddings_map.items():
-            if embs:
-                self.mean_embs[name] = stats.trim_mean(embs, 0.15)
-
-        logger.debug("Finished building ArcFace model")
+    def embed(self, face_image: np.ndarray) -> np.ndarray:
+        return self.face_embedder([face_image])[0].squeeze()
 
     def classify(self, face_image):
         if not self.landmark_detector:
             return None
 
-        if not self.mean_embs:
+        if not self.gallery:
             self.build()
 
-            if not self.mean_embs:
+            if not self.gallery:
                 return None
 
         # face recognition is best run on grayscale images
@@ -353,21 +358,12 @@ class ArcFaceRecognizer(FaceRecognizer):
 
         # align face and run recognition
         img = self.align_face(face_image, face_image.shape[1], face_image.shape[0])
-        embedding = self.face_embedder([img])[0].squeeze()
-
-        score = 0
-        label = ""
+        result = self.search(self.embed(img))
 
-        for name, mean_emb in self.mean_embs.items():
-            dot_product = np.dot(embedding, mean_emb)
-            magnitude_A = np.linalg.norm(embedding)
-            magnitude_B = np.linalg.norm(mean_emb)
-
-            cosine_similarity = dot_product / (magnitude_A * magnitude_B)
-            confidence = similarity_to_confidence(cosine_similarity)
+        if result is None:
+            return None
 
-            if confidence > score:
-                score = confidence
-                label = name
+        label, cosine_similarity = result
+        score = similarity_to_confidence(cosine_similarity)
 
         return label, max(0, round(score - blur_reduction, 2))
@@ -51,8 +51,6 @@ class LicensePlateProcessingMixin:
         # process plates that are stationary and have no position changes for 5 seconds
         self.stationary_scan_duration = 5
 
-        self.batch_size = 6
-
         # Object config
         self.lp_objects: list[str] = []
 
@@ -70,49 +68,65 @@ class LicensePlateProcessingMixin:
         self.similarity_threshold = 0.8
         self.cluster_threshold = 0.85
 
-    def _detect(self, image: np.ndarray) -> List[np.ndarray]:
+    def _detect(self, images: List[np.ndarray]) -> List[List[np.ndarray]]:
         """
-        Detect possible areas of text in the input image by first resizing and normalizing it,
+        Detect possible areas of text in the input images by first resizing and normalizing them,
         running a detection model, and filtering out low-probability regions.
 
+        Images that resize to the same shape are detected in a single batch, padding them to a
+        common shape would change the probability map near the edges of the smaller images.
+
         Args:
-            image (np.ndarray): The input image in which license plates will be detected.
+            images (List[np.ndarray]): The input images in which license plates will be detected.
 
         Returns:
-            List[np.ndarray]: A list of bounding box coordinates representing detected license plates.
+            List[List[np.ndarray]]: Bounding box coordinates of the detected text for each image.
         """
-        h, w = image.shape[:2]
+        results: List[List[np.ndarray]] = [[] for _ in images]
+        batches: dict[Tuple[int, ...], List[Tuple[int, np.ndarray]]] = {}
 
-        if sum([h, w]) < 64:
-            image = self._zero_pad(image)
+        for i, image in enumerate(images):
+            if sum(image.shape[:2]) < 64:
+                image = self._zero_pad(image)
 
-        resized_image = self._resize_image(image)
-        normalized_image = self._normalize_image(resized_image)
+            resized_image = self._resize_image(image)
+            normalized_image = self._normalize_image(resized_image)
 
-        if WRITE_DEBUG_IMAGES:
-            current_time = int(datetime.datetime.now().timestamp())
-            cv2.imwrite(
-                f"debug/frames/license_plate_resized_{current_time}.jpg",
-                resized_image,
-            )
+            if WRITE_DEBUG_IMAGES:
+                current_time = int(datetime.datetime.now().timestamp())
+                cv2.imwrite(
+                    f"debug/frames/license_plate_resized_{current_time}.jpg",
+                    resized_image,
+                )
 
-        try:
-            outputs = self.model_runner.detection_model([normalized_image])[0]
-        except Exception as e:
-            logger.warning(f"Error running LPR box detection model: {e}")
-            return []
+            batches.setdefault(normalized_image.shape, []).append((i, normalized_image))
 
-        outputs = outputs[0, :, :]
+        for batch in batches.values():
+            try:
+                outputs = self.model_runner.detection_model(
+                    [normalized_image for _, normalized_image in batch]
+                )
+            except Exception as e:
+                logger.warning(f"Error running LPR box detection model: {e}")
+                continue
 
-        if False:
-            current_time = int(datetime.datetime.now().timestamp())
-            cv2.imwrite(
-                f"debug/frames/probability_map_{current_time}.jpg",
-                (outputs * 255).astype(np.uint8),
-            )
+            for (i, _), output in zip(batch, outputs):
+                output = output[0, :, :]
+                h, w = images[i].shape[:2]
 
-        boxes, _ = self._boxes_from_bitmap(outputs, outputs > self.mask_thresh, w, h)
-        return self._filter_polygon(boxes, (h, w))
+                if False:
+                    current_time = int(datetime.datetime.now().timestamp())
+                    cv2.imwrite(
+                        f"debug/frames/probability_map_{current_time}.jpg",
+                        (output * 255).astype(np.uint8),
+                    )
+
+                boxes, _ = self._boxes_from_bitmap(
+                    output, output > self.mask_thresh, w, h
+                )
+                results[i] = self._filter_polygon(boxes, (h, w))
+
+        return results
 
     def _classify(
         self, images: List[np.ndarray]
@@ -127,15 +141,11 @@ class LicensePlateProcessingMixin:
             Tuple[List[np.ndarray], List[Tuple[str, float]]]: A tuple of rotated/normalized plate images
                                                             and classification results with confidence scores.
         """
-        num_images = len(images)
         indices = np.argsort([x.shape[1] / x.shape[0] for x in images])
-
-        for i in range(0, num_images, self.batch_size):
-            norm_images = []
-            for j in range(i, min(num_images, i + self.batch_size)):
-                norm_img = self._preprocess_classification_image(images[indices[j]])
-                norm_img = norm_img[np.newaxis, :]
-                norm_images.append(norm_img)
+        norm_images = [
+            self._preprocess_classification_image(images[i])[np.newaxis, :]
+            for i in indices
+        ]
 
         try:
             outputs = self.model_runner.classification_model(norm_images)
@@ -146,76 +156,85 @@ class LicensePlateProcessingMixin:
         return self._process_classification_output(images, outputs)
 
     def _recognize(
-        self, camera: string, images: List[np.ndarray]
-    ) -> Tuple[List[str], List[List[float]]]:
+        self, camera: string, groups: List[List[np.ndarray]]
+    ) -> List[Tuple[List[str], List[List[float]]]]:
         """
         Recognize the characters on the detected license plates using the recognition model.
 
+        The images of each group are padded to the width of the widest image in the group,
+        or to the input width of the model if it has a fixed one. Groups that are padded
+        to the same width are recognized in a single batch.
+
         Args:
-            images (List[np.ndarray]): A list of images of license plates to recognize.
+            camera (str): Camera identifier.
+            groups (List[List[np.ndarray]]): Groups of images of license plates to recognize.
 
         Returns:
-            Tuple[List[str], List[List[float]]]: A tuple of recognized license plate texts and confidence scores.
+            List[Tuple[List[str], List[List[float]]]]: Recognized license plate texts and confidence
+                                                       scores for each group.
         """
         input_shape = [3, 48, 320]
-        num_images = len(images)
+        input_h, input_w = input_shape[1], input_shape[2]
+        results: List[Tuple[List[str], List[List[float]]]] = [([], []) for _ in groups]
+        batches: dict[int, List[Tuple[int, float]]] = {}
+        model_input_w = self.model_runner.recognition_model.runner.get_input_width()
 
-        for index in range(0, num_images, self.batch_size):
-            input_h, input_w = input_shape[1], input_shape[2]
+        for index, images in enumerate(groups):
+            if not images:
+                continue
+
+            # calculate the maximum aspect ratio in the group
             max_wh_ratio = input_w / input_h
-            norm_images = []
 
-            # calculate the maximum aspect ratio in the current batch
-            for i in range(index, min(num_images, index + self.batch_size)):
-                h, w = images[i].shape[0:2]
+            for image in images:
+                h, w = image.shape[0:2]
                 max_wh_ratio = max(max_wh_ratio, w * 1.0 / h)
 
-            # preprocess the images based on the max aspect ratio
-            for i in range(index, min(num_images, index + self.batch_size)):
-                norm_image = self._preprocess_recognition_image(
-                    camera, images[i], max_wh_ratio
-                )
-                norm_image = norm_image[np.newaxis, :]
-                norm_images.append(norm_image)
+            padded_w = (
+                model_input_w
+                if isinstance(model_input_w, int) and model_input_w > 0
+                else int(input_h * max_wh_ratio)
+            )
+            batches.setdefault(padded_w, []).append((index, max_wh_ratio))
 
-        try:
-            outputs = self.model_runner.recognition_model(norm_images)
-        except Exception as e:
-            logger.warning(f"Error running LPR recognition model: {e}")
-            return [], []
+        for batch in batches.values():
+            # preprocess the images based on the max aspect ratio of their group
+            norm_images = [
+                self._preprocess_recognition_image(camera, image, max_wh_ratio)[
+                    np.newaxis, :
+                ]
+                for index, max_wh_ratio in batch
+                for image in groups[index]
+            ]
+
+            try:
+                outputs = self.model_runner.recognition_model(norm_images)
+            except Exception as e:
+                logger.warning(f"Error running LPR recognition model: {e}")
+                continue
 
-        return self.ctc_decoder(outputs)
+            texts, confidences = self.ctc_decoder(outputs)
+            start = 0
 
-    def _process_license_plate(
-        self, camera: str, id: str, image: np.ndarray
-    ) -> Tuple[List[str], List[List[float]], List[int]]:
+            for index, _ in batch:
+                end = start + len(groups[index])
+                results[index] = (texts[start:end], confidences[start:end])
+                start = end
+
+        return results
+
+    def _group_text_boxes(self, image: np.ndarray, boxes: List[np.ndarray]):
         """
-        Complete pipeline for detecting, classifying, and recognizing license plates in the input image.
-        Combines multi-line plates into a single plate string, grouping boxes by vertical alignment and ordering top to bottom,
-        but only combines boxes if their average confidence scores meet the threshold and their heights are similar.
+        Merge nearby text boxes and group them by vertical alignment and height similarity.
 
         Args:
-            camera (str): Camera identifier.
-            id (str): Event identifier.
-            image (np.ndarray): The input image in which to detect, classify, and recognize license plates.
+            image (np.ndarray): The image the boxes were detected in.
+            boxes (List[np.ndarray]): Boxes found by the detection model.
 
         Returns:
-            Tuple[List[str], List[List[float]], List[int]]: Detected license plate texts, character-level confidence scores for each plate (flattened into a single list per plate), and areas of the plates.
+            Tuple[List[np.ndarray], List[List[int]]]: The sorted boxes and the indices of the boxes
+                                                       in each group, ordered top to bottom.
         """
-        if (
-            self.model_runner.detection_model.runner is None
-            or self.model_runner.classification_model.runner is None
-            or self.model_runner.recognition_model.runner is None
-        ):
-            # we might still be downloading the models
-            logger.debug("Model runners not loaded")
-            return [], [], []
-
-        boxes = self._detect(image)
-        if len(boxes) == 0:
-            logger.debug(f"{camera}: No boxes found by OCR detector model")
-            return [], [], []
-
         if len(boxes) > 0:
             plate_left = np.min([np.min(box[:, 0]) for box in boxes])
             plate_right = np.max([np.max(box[:, 0]) for box in boxes])
@@ -280,58 +299,122 @@ class LicensePlateProcessingMixin:
                 current_group = [box_info[i]]
         initial_groups.append(current_group)
 
-        # Step 2: Process each initial group, filter by confidence
-        all_license_plates = []
-        all_confidences = []
-        all_areas = []
-        processed_indices = set()
-
-        recognition_threshold = self.lpr_config.recognition_threshold
-
+        groups = []
         for group in initial_groups:
             # Sort group by y-coordinate (top to bottom)
             group.sort(key=lambda x: x[0])
-            group_indices = [item[3] for item in group]
+            groups.append([item[3] for item in group])
+
+        return boxes, groups
+
+    def _process_license_plate(
+        self, camera: str, id: str, image: np.ndarray
+    ) -> Tuple[List[str], List[List[float]], List[int]]:
+        """
+        Complete pipeline for detecting, classifying, and recognizing license plates in the input image.
+
+        Args:
+            camera (str): Camera identifier.
+            id (str): Event identifier.
+            image (np.ndarray): The input image in which to detect, classify, and recognize license plates.
 
-            # Skip if all indices in this group have already been processed
-            if all(idx in processed_indices for idx in group_indices):
+        Returns:
+            Tuple[List[str], List[List[float]], List[int]]: Detected license plate texts, character-level confidence scores for each plate (flattened into a single list per plate), and areas of the plates.
+        """
+        return self._process_license_plates(camera, [id], [image])[0]
+
+    def _process_license_plates(
+        self, camera: str, ids: List[str], images: List[np.ndarray]
+    ) -> List[Tuple[List[str], List[List[float]], List[int]]]:
+        """
+        Complete pipeline for detecting, classifying, and recognizing license plates in a batch of images.
+        Combines multi-line plates into a single plate string, grouping boxes by vertical alignment and ordering top to bottom,
+        but only combines boxes if their average confidence scores meet the threshold and their heights are similar.
+
+        Text is detected in all images at once and the text boxes of all images are recognized at once,
+        the results are the same as processing the images one by one.
+
+        Args:
+            camera (str): Camera identifier.
+            ids (List[str]): Event identifier of each image.
+            images (List[np.ndarray]): The input images in which to detect, classify, and recognize license plates.
+
+        Returns:
+            List[Tuple[List[str], List[List[float]], List[int]]]: For each image, detected license plate texts, character-level confidence scores for each plate (flattened into a single list per plate), and areas of the plates.
+        """
+        results = [([], [], []) for _ in images]
+
+        if (
+            self.model_runner.detection_model.runner is None
+            or self.model_runner.classification_model.runner is None
+            or self.model_runner.recognition_model.runner is None
+        ):
+            # we might still be downloading the models
+            logger.debug("Model runners not loaded")
+            return results
+
+        current_time = int(datetime.datetime.now().timestamp())
+        # (image index, indices of the boxes, cropped images of the boxes)
+        groups: List[Tuple[int, List[int], List[np.ndarray]]] = []
+
+        for image_index, (id, image, boxes) in enumerate(
+            zip(ids, images, self._detect(images))
+        ):
+            if len(boxes) == 0:
+                logger.debug(f"{camera}: No boxes found by OCR detector model")
                 continue
 
-            # Crop images for the group
-            group_boxes = [boxes[i] for i in group_indices]
-            group_plate_images = [
-                self._crop_license_plate(image, box) for box in group_boxes
-            ]
+            boxes, group_indices_list = self._group_text_boxes(image, boxes)
 
-            if WRITE_DEBUG_IMAGES:
-                for i, img in enumerate(group_plate_images):
-                    cv2.imwrite(
-                        f"debug/frames/license_plate_cropped_{current_time}_{group_indices[i] + 1}.jpg",
-                        img,
-                    )
+            for group_indices in group_indices_list:
+                # Crop images for the group
+                group_plate_images = [
+                    self._crop_license_plate(image, boxes[i]) for i in group_indices
+                ]
 
-            if self.config.lpr.debug_save_plates:
-                logger.debug(f"{camera}: Saving plates for event {id}")
-                Path(os.path.join(CLIPS_DIR, f"lpr/{camera}/{id}")).mkdir(
-                    parents=True, exist_ok=True
-                )
-                for i, img in enumerate(group_plate_images):
-                    cv2.imwrite(
-                        os.path.join(
-                            CLIPS_DIR,
-                            f"lpr/{camera}/{id}/{current_time}_{group_indices[i] + 1}.jpg",
-                        ),
-                        img,
+                if WRITE_DEBUG_IMAGES:
+                    for i, img in enumerate(group_plate_images):
+                        cv2.imwrite(
+                            f"debug/frames/license_plate_cropped_{current_time}_{group_indices[i] + 1}.jpg",
+                            img,
+                        )
+
+                if self.config.lpr.debug_save_plates:
+                    logger.debug(f"{camera}: Saving plates for event {id}")
+                    Path(os.path.join(CLIPS_DIR, f"lpr/{camera}/{id}")).mkdir(
+                        parents=True, exist_ok=True
                     )
+                    for i, img in enumerate(group_plate_images):
+                        cv2.imwrite(
+                            os.path.join(
+                                CLIPS_DIR,
+                                f"lpr/{camera}/{id}/{current_time}_{group_indices[i] + 1}.jpg",
+                            ),
+                            img,
+                        )
+
+                groups.append((image_index, group_indices, group_plate_images))
+
+        if not groups:
+            return results
 
-            # Recognize text in each cropped image
-            results, confidences = self._recognize(camera, group_plate_images)
+        # Step 2: Recognize text in the cropped images of all groups, filter by confidence
+        recognized = self._recognize(camera, [group[2] for group in groups])
+        all_license_plates = [[] for _ in images]
+        all_confidences = [[] for _ in images]
+        all_areas = [[] for _ in images]
 
-            if not results:
+        recognition_threshold = self.lpr_config.recognition_threshold
+
+        for (image_index, group_indices, group_plate_images), (
+            results_text,
+            confidences,
+        ) in zip(groups, recognized):
+            if not results_text:
                 continue
 
             if not confidences:
-                confidences = [[0.0] for _ in results]
+                confidences = [[0.0] for _ in results_text]
 
             # Compute average confidence for each box's recognized text
             avg_confidences = []
@@ -340,22 +423,20 @@ class LicensePlateProcessingMixin:
                 avg_confidences.append(avg_conf)
 
             # Filter boxes based on the recognition threshold
-            qualifying_indices = []
+            qualifying_images = []
             qualifying_results = []
             qualifying_confidences = []
             for i, (avg_conf, result, conf_list) in enumerate(
-                zip(avg_confidences, results, confidences)
+                zip(avg_confidences, results_text, confidences)
             ):
                 if avg_conf >= recognition_threshold:
-                    qualifying_indices.append(group_indices[i])
+                    qualifying_images.append(group_plate_images[i])
                     qualifying_results.append(result)
                     qualifying_confidences.append(conf_list)
 
             if not qualifying_results:
                 continue
 
-            processed_indices.update(qualifying_indices)
-
             # Combine the qualifying results into a single plate string
             combined_plate = " ".join(qualifying_results)
 
@@ -388,31 +469,32 @@ class LicensePlateProcessingMixin:
                 )
 
             # Compute the combined area for qualifying boxes
-            qualifying_boxes = [boxes[i] for i in qualifying_indices]
-            qualifying_plate_images = [
-                self._crop_license_plate(image, box) for box in qualifying_boxes
-            ]
-            group_areas = [
-                img.shape[0] * img.shape[1] for img in qualifying_plate_images
-            ]
+            group_areas = [img.shape[0] * img.shape[1] for img in qualifying_images]
             combined_area = sum(group_areas)
 
-            all_license_plates.append(combined_plate)
-            all_confidences.append(flat_confidences)
-            all_areas.append(combined_area)
+            all_license_plates[image_index].append(combined_plate)
+            all_confidences[image_index].append(flat_confidences)
+            all_areas[image_index].append(combined_area)
 
         # Step 3: Sort the combined plates
-        if all_license_plates:
-            sorted_data = sorted(
-                zip(all_license_plates, all_confidences, all_areas),
-                key=lambda x: (x[2], len(x[0]), sum(x[1]) / len(x[1]) if x[1] else 0),
-                reverse=True,
-            )
-
-            if sorted_data:
-                return map(list, zip(*sorted_data))
+        for image_index in range(len(images)):
+            if all_license_plates[image_index]:
+                sorted_data = sorted(
+                    zip(
+                        all_license_plates[image_index],
+                        all_confidences[image_index],
+                        all_areas[image_index],
+                    ),
+                    key=lambda x: (
+                        x[2],
+                        len(x[0]),
+                        sum(x[1]) / len(x[1]) if x[1] else 0,
+                    ),
+                    reverse=True,
+                )
+                results[image_index] = tuple(map(list, zip(*sorted_data)))
 
-        return [], [], []
+        return results
 
     def _resize_image(self, image: np.ndarray) -> np.ndarray:
         """
@@ -844,15 +926,11 @@ class LicensePlateProcessingMixin:
             for i, idx in enumerate(outputs.argmax(axis=1))
         ]
 
-        for i in range(0, len(images), self.batch_size):
-            for j in range(len(outputs)):
-                label, score = outputs[j]
-                results[indices[i + j]] = [label, score]
-                # make sure we have high confidence if we need to flip a box
-                if "180" in label and score >= 0.7:
-                    images[indices[i + j]] = cv2.rotate(
-                        images[indices[i + j]], cv2.ROTATE_180
-                    )
+        for j, (label, score) in enumerate(outputs):
+            results[indices[j]] = [label, score]
+            # make sure we have high confidence if we need to flip a box
+            if "180" in label and score >= 0.7:
+                images[indices[j]] = cv2.rotate(images[indices[j]], cv2.ROTATE_180)
 
         return images, results
 
@@ -1180,13 +1258,82 @@ class LicensePlateProcessingMixin:
         self, obj_data: dict[str, Any], frame: np.ndarray, dedicated_lpr: bool = False
     ):
         """Look for license plates in image."""
+        self.lpr_process_objects([obj_data], frame, dedicated_lpr)
+
+    def lpr_process_objects(
+        self,
+        objects: list[dict[str, Any]],
+        frame: np.ndarray,
+        dedicated_lpr: bool = False,
+    ):
+        """Look for the license plates of the objects in a frame.
+
+        The plates of all objects are cropped first and then detected and recognized
+        in shared batches, a camera watching a road often has several cars in a frame.
+        """
         self.metrics.alpr_pps.value = self.plates_rec_second.eps()
         self.metrics.yolov9_lpr_pps.value = self.plates_det_second.eps()
+        # camera -> (object data, id, plate box, license plate frame) of each plate
+        plates: dict[str, list[Tuple[Any, str, Any, np.ndarray]]] = {}
+
+        for obj_data in objects:
+            plate = self._get_license_plate_frame(obj_data, frame, dedicated_lpr)
+
+            if plate is not None:
+                camera, id, plate_box, license_plate_frame = plate
+                plates.setdefault(camera, []).append(
+                    (obj_data, id, plate_box, license_plate_frame)
+                )
+
+        for camera, camera_plates in plates.items():
+            ids = [id for _, id, _, _ in camera_plates]
+            logger.debug(f"{camera}: Running plate recognition for ids: {ids}.")
+
+            # run detection, returns results sorted by confidence, best first
+            start = datetime.datetime.now().timestamp()
+            results = self._process_license_plates(
+                camera, ids, [plate[3] for plate in camera_plates]
+            )
+            plate_duration = (datetime.datetime.now().timestamp() - start) / len(
+                camera_plates
+            )
+
+            for (obj_data, id, plate_box, _), (
+                license_plates,
+                confidences,
+                areas,
+            ) in zip(camera_plates, results):
+                self.plates_rec_second.update()
+                self.plate_rec_speed.update(plate_duration)
+                self._handle_license_plates(
+                    obj_data,
+                    frame,
+                    dedicated_lpr,
+                    camera,
+                    id,
+                    plate_box,
+                    license_plates,
+                    confidences,
+                    areas,
+                    start,
+                )
+
+    def _get_license_plate_frame(
+        self, obj_data: dict[str, Any], frame: np.ndarray, dedicated_lpr: bool
+    ) -> Optional[Tuple[str, str, Any, np.ndarray]]:
+        """
+        Crop the license plate of an object, or find it in the frame of a dedicated LPR camera.
+
+        Returns:
+            Optional[Tuple[str, str, Any, np.ndarray]]: The camera, id, box of the plate in the frame
+                                                         and the enlarged plate image for OCR, or None
+                                                         if there is no plate to recognize.
+        """
         camera = obj_data if dedicated_lpr else obj_data["camera"]
         current_time = int(datetime.datetime.now().timestamp())
 
         if not self.config.cameras[camera].lpr.enabled:
-            return
+            return None
 
         # dedicated LPR cam without frigate+
         if dedicated_lpr:
@@ -1216,14 +1363,14 @@ class LicensePlateProcessingMixin:
 
             if not license_plate:
                 logger.debug(f"{camera}: Detected no license plates in full frame.")
-                return
+                return None
 
             license_plate_area = (license_plate[2] - license_plate[0]) * (
                 license_plate[3] - license_plate[1]
             )
             if license_plate_area < self.config.cameras[camera].lpr.min_area:
                 logger.debug(f"{camera}: License plate area below minimum threshold.")
-                return
+                return None
 
             plate_box = license_plate
 
@@ -1252,7 +1399,7 @@ class LicensePlateProcessingMixin:
                 logger.debug(
                     f"{camera}: Not a processing license plate for non car/motorcycle object."
                 )
-                return
+                return None
 
             # don't run for non-stationary objects with no position changes to avoid processing uncertain moving objects
             # zero position_changes is the initial state after registering a new tracked object
@@ -1263,7 +1410,7 @@ class LicensePlateProcessingMixin:
                 logger.debug(
                     f"{camera}: Skipping LPR for non-stationary {obj_data['label']} object {id} with no position changes.  (Detected in {self.config.cameras[camera].detect.min_initialized + 1} concurrent frames, threshold to run is {self.config.cameras[camera].detect.min_initialized + 2} frames)"
                 )
-                return
+                return None
 
             # run for stationary objects for a limited time after they become stationary
             if obj_data.get("stationary") == True:
@@ -1286,7 +1433,7 @@ class LicensePlateProcessingMixin:
                         )
 
                     if time_since_stationary > self.stationary_scan_duration:
-                        return
+                        return None
 
             license_plate: Optional[dict[str, Any]] = None
 
@@ -1296,7 +1443,7 @@ class LicensePlateProcessingMixin:
                 car_box = obj_data.get("box")
 
                 if not car_box:
-                    return
+                    return None
 
                 rgb = cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420)
 
@@ -1329,7 +1476,7 @@ class LicensePlateProcessingMixin:
                     logger.debug(
                         f"{camera}: Detected no license plates for car/motorcycle object."
                     )
-                    return
+                    return None
 
                 license_plate_area = max(
                     0,
@@ -1341,7 +1488,7 @@ class LicensePlateProcessingMixin:
                 # double the value because we've doubled the size of the car
                 if license_plate_area < self.config.cameras[camera].lpr.min_area * 2:
                     logger.debug(f"{camera}: License plate is less than min_area")
-                    return
+                    return None
 
                 # Scale back to original car coordinates and then to frame
                 plate_box_in_car = (
@@ -1368,7 +1515,7 @@ class LicensePlateProcessingMixin:
                     and obj_data.get("label") != "license_plate"
                 ):
                     logger.debug(f"{camera}: No attributes to parse.")
-                    return
+                    return None
 
                 if obj_data.get("label") in self.lp_objects:
                     attributes: list[dict[str, Any]] = obj_data.get(
@@ -1385,7 +1532,7 @@ class LicensePlateProcessingMixin:
 
                     # no license plates detected in this frame
                     if not license_plate:
-                        return
+                        return None
 
                 # we are using dedicated lpr with frigate+
                 if obj_data.get("label") == "license_plate":
@@ -1402,7 +1549,7 @@ class LicensePlateProcessingMixin:
                     logger.debug(
                         f"{camera}: Area for license plate box {area(license_plate_box)} is less than min_area {self.config.cameras[camera].lpr.min_area}"
                     )
-                    return
+                    return None
 
                 license_plate_frame = cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420)
 
@@ -1443,15 +1590,23 @@ class LicensePlateProcessingMixin:
                     license_plate_frame,
                 )
 
-        logger.debug(f"{camera}: Running plate recognition for id: {id}.")
+        return camera, id, plate_box, license_plate_frame
 
-        # run detection, returns results sorted by confidence, best first
-        start = datetime.datetime.now().timestamp()
-        license_plates, confidences, areas = self._process_license_plate(
-            camera, id, license_plate_frame
-        )
-        self.plates_rec_second.update()
-        self.plate_rec_speed.update(datetime.datetime.now().timestamp() - start)
+    def _handle_license_plates(
+        self,
+        obj_data: dict[str, Any],
+        frame: np.ndarray,
+        dedicated_lpr: bool,
+        camera: str,
+        id: str,
+        plate_box: Any,
+        license_plates: List[str],
+        confidences: List[List[float]],
+        areas: List[int],
+        start: float,
+    ):
+        """Pick the best plate recognized for an object, then cluster and publish it."""
+        current_time = int(datetime.datetime.now().timestamp())
 
         if license_plates:
             for plate, confidence, text_area in zip(license_plates, confidences, areas):
@@ -4,6 +4,7 @@ import datetime
 import logging
 import os
 import threading
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -344,14 +345,17 @@ class ObjectDescriptionProcessor(PostProcessorApi):
 
         # Embed the description
         if self.config.semantic_search.enabled:
-            self.embeddings.embed_description(event.id, description)
-
-            # Check semantic trigger for this description
-            if self.semantic_trigger_processor is not None:
-                self.semantic_trigger_processor.process_data(
+            # Check semantic trigger for this description once it is embedded
+            self.embeddings.queue_description(
+                event.id,
+                description,
+                partial(
+                    self.semantic_trigger_processor.queue_object,
                     {"event_id": event.id, "camera": event.camera, "type": "text"},
-                    PostProcessDataEnum.tracked_object,
                 )
+                if self.semantic_trigger_processor is not None
+                else None,
+            )
 
         # Update inference timing metrics
         self.object_desc_speed.update(datetime.datetime.now().timestamp() - start)
@@ -4,6 +4,7 @@ import datetime
 import json
 import logging
 import os
+import queue
 from typing import Any
 
 import cv2
@@ -21,7 +22,7 @@ from frigate.data_processing.types import PostProcessDataEnum
 from frigate.db.sqlitevecq import SqliteVecQueueDatabase
 from frigate.embeddings.util import ZScoreNormalization
 from frigate.models import Event, Trigger
-from frigate.util.builtin import cosine_distance
+from frigate.util.builtin import EventsPerSecond, InferenceSpeed
 from frigate.util.file import get_event_thumbnail_bytes
 
 from ..post.api import PostProcessorApi
@@ -31,6 +32,41 @@ logger = logging.getLogger(__name__)
 
 WRITE_DEBUG_IMAGES = False
 
+# embeddings of the tracked object that each trigger type is compared with
+TRIGGER_EMBEDDING_TYPES = {
+    "thumbnail": "thumbnail",
+    "text": "thumbnail",
+    "description": "description",
+}
+
+
+class TriggerMatrix:
+    """Normalized embeddings of triggers to score an embedding against all of them.
+
+    Distances are cosine distances like the ones returned by sqlite-vec.
+    """
+
+    def __init__(self, rows: list[tuple]) -> None:
+        """Build from rows of (name, type, data, threshold, embedding)."""
+        self.names: list[str] = [row[0] for row in rows]
+        self.types: list[str] = [row[1] for row in rows]
+        self.data: list[str] = [row[2] for row in rows]
+        self.thresholds = np.array([row[3] for row in rows], dtype=np.float64)
+        embeddings = np.stack([np.frombuffer(row[4], dtype=np.float32) for row in rows])
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        self.matrix = embeddings / np.where(norms == 0, 1, norms)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def distances(self, embedding: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(embedding)
+
+        if norm == 0:
+            return np.ones(len(self.names), dtype=np.float64)
+
+        return 1 - (self.matrix @ (embedding / norm)).astype(np.float64)
+
 
 class SemanticTriggerProcessor(PostProcessorApi):
     def __init__(
@@ -47,7 +83,16 @@ class SemanticTriggerProcessor(PostProcessorApi):
         self.embeddings = embeddings
         self.requestor = requestor
         self.sub_label_publisher = sub_label_publisher
-        self.trigger_embeddings: list[np.ndarray] = []
+        self.trigger_matrices: dict[
+            str, tuple[tuple[tuple, ...], dict[str, TriggerMatrix]]
+        ] = {}
+        self.trigger_matching_speed = InferenceSpeed(
+            self.metrics.trigger_matching_speed
+        )
+        self.trigger_matching_eps = EventsPerSecond()
+        self.trigger_matching_eps.start()
+        # objects queued by the embedding batch threads
+        self.queued_objects: queue.Queue[dict[str, Any]] = queue.Queue()
 
         self.thumb_stats = ZScoreNormalization()
         self.desc_stats = ZScoreNormalization()
@@ -61,206 +106,207 @@ class SemanticTriggerProcessor(PostProcessorApi):
         except FileNotFoundError:
             pass
 
-    def process_data(
-        self, data: dict[str, Any], data_type: PostProcessDataEnum
-    ) -> None:
-        event_id = data["event_id"]
-        camera = data["camera"]
-        process_type = data["type"]
-
-        if self.config.cameras[camera].semantic_search.triggers is None:
-            return
-
-        triggers = (
+    def _get_trigger_matrices(self, camera: str) -> dict[str, TriggerMatrix]:
+        """Matrices of the enabled triggers of a camera by the embeddings they match."""
+        camera_triggers = self.config.cameras[camera].semantic_search.triggers
+        enabled = {name for name, t in camera_triggers.items() if t.enabled}
+        rows = tuple(
             Trigger.select(
-                Trigger.camera,
                 Trigger.name,
-                Trigger.data,
                 Trigger.type,
-                Trigger.embedding,
+                Trigger.data,
                 Trigger.threshold,
+                Trigger.embedding,
             )
-            .where(Trigger.camera == camera)
-            .dicts()
-            .iterator()
+            .where(Trigger.camera == camera, Trigger.name.in_(enabled))
+            .order_by(Trigger.name)
+            .tuples()
         )
 
-        for trigger in triggers:
-            if (
-                trigger["name"]
-                not in self.config.cameras[camera].semantic_search.triggers
-                or not self.config.cameras[camera]
-                .semantic_search.triggers[trigger["name"]]
-                .enabled
-            ):
-                logger.debug(
-                    f"Trigger {trigger['name']} is disabled for camera {camera}"
-                )
+        # triggers are edited by the api, so the rows are compared on every
+        # event and the matrices are only rebuilt when they changed
+        cached = self.trigger_matrices.get(camera)
+
+        if cached is not None and cached[0] == rows:
+            return cached[1]
+
+        grouped: dict[str, list[tuple]] = {}
+
+        for row in rows:
+            if not row[4]:
+                logger.debug(f"Trigger {row[0]} for camera {camera} has no embedding")
                 continue
 
-            logger.debug(
-                f"Processing {trigger['type']} trigger for {event_id} on {trigger['camera']}: {trigger['name']}"
-            )
+            grouped.setdefault(TRIGGER_EMBEDDING_TYPES[row[1]], []).append(row)
 
-            trigger_embedding = np.frombuffer(trigger["embedding"], dtype=np.float32)
+        matrices = {
+            kind: TriggerMatrix(kind_rows) for kind, kind_rows in grouped.items()
+        }
+        self.trigger_matrices[camera] = (rows, matrices)
+        return matrices
 
-            # Get embeddings based on type
-            thumbnail_embedding = None
-            description_embedding = None
+    def queue_object(self, data: dict[str, Any]) -> None:
+        """Queue an object to be processed on the maintainer thread.
 
-            if process_type == "image":
-                cursor = self.db.execute_sql(
-                    """
-                    SELECT thumbnail_embedding FROM vec_thumbnails WHERE id = ?
-                    """,
-                    [event_id],
-                )
-                row = cursor.fetchone() if cursor else None
-                if row:
-                    thumbnail_embedding = np.frombuffer(row[0], dtype=np.float32)
-
-            if process_type == "text":
-                cursor = self.db.execute_sql(
-                    """
-                    SELECT description_embedding FROM vec_descriptions WHERE id = ?
-                    """,
-                    [event_id],
-                )
-                row = cursor.fetchone() if cursor else None
-                if row:
-                    description_embedding = np.frombuffer(row[0], dtype=np.float32)
+        Called from the embedding batch threads once an embedding is stored,
+        the requestor and publisher sockets are only used by the maintainer.
+        """
+        self.queued_objects.put(data)
 
-            # Skip processing if we don't have any embeddings
-            if thumbnail_embedding is None and description_embedding is None:
-                logger.debug(f"No embeddings found for {event_id}")
+    def process_queued_objects(self) -> None:
+        while True:
+            try:
+                data = self.queued_objects.get_nowait()
+            except queue.Empty:
                 return
 
-            # Determine which embedding to compare based on trigger type
-            if (
-                trigger["type"] in ["text", "thumbnail"]
-                and thumbnail_embedding is not None
-            ):
-                data_embedding = thumbnail_embedding
-                normalized_distance = self.thumb_stats.normalize(
-                    [cosine_distance(data_embedding, trigger_embedding)],
-                    save_stats=False,
-                )[0]
-            elif trigger["type"] == "description" and description_embedding is not None:
-                data_embedding = description_embedding
-                normalized_distance = self.desc_stats.normalize(
-                    [cosine_distance(data_embedding, trigger_embedding)],
-                    save_stats=False,
-                )[0]
-
-            else:
-                continue
+            self.process_data(data, PostProcessDataEnum.tracked_object)
 
-            similarity = 1 - normalized_distance
+    def process_data(
+        self, data: dict[str, Any], data_type: PostProcessDataEnum
+    ) -> None:
+        self.metrics.trigger_matching_eps.value = self.trigger_matching_eps.eps()
+        event_id = data["event_id"]
+        camera = data["camera"]
+        process_type = data["type"]
+
+        if self.config.cameras[camera].semantic_search.triggers is None:
+            return
+
+        start = datetime.datetime.now().timestamp()
+
+        if process_type == "image":
+            kind = "thumbnail"
+            table = "vec_thumbnails"
+            stats = self.thumb_stats
+        elif process_type == "text":
+            kind = "description"
+            table = "vec_descriptions"
+            stats = self.desc_stats
+        else:
+            return
+
+        matrix = self._get_trigger_matrices(camera).get(kind)
 
+        if matrix is None:
+            logger.debug(f"No enabled {kind} triggers for camera {camera}")
+            return
+
+        embedding = self.db.get_embedding(table, event_id)
+
+        # Skip processing if we don't have any embeddings
+        if not embedding:
+            logger.debug(f"No embeddings found for {event_id}")
+            return
+
+        # all triggers are scored with one matrix product
+        normalized_distances = stats.normalize(
+            matrix.distances(np.frombuffer(embedding, dtype=np.float32)),
+            save_stats=False,
+        )
+        similarities = 1 - normalized_distances
+        activated = np.flatnonzero(similarities >= matrix.thresholds)
+
+        self.trigger_matching_speed.update(datetime.datetime.now().timestamp() - start)
+        self.trigger_matching_eps.update()
+
+        for i, name in enumerate(matrix.names):
             logger.debug(
-                f"Trigger {trigger['name']} ({trigger['data'] if trigger['type'] == 'text' or trigger['type'] == 'description' else 'image'}): "
-                f"normalized distance: {normalized_distance:.4f}, "
-                f"similarity: {similarity:.4f}, threshold: {trigger['threshold']}"
+                f"Trigger {name} ({matrix.data[i] if matrix.types[i] == 'text' or matrix.types[i] == 'description' else 'image'}): "
+                f"normalized distance: {normalized_distances[i]:.4f}, "
+                f"similarity: {similarities[i]:.4f}, threshold: {matrix.thresholds[i]}"
             )
 
-            # Check if similarity meets threshold
-            if similarity >= trigger["threshold"]:
-                logger.debug(
-                    f"Trigger {trigger['name']} activated with similarity {similarity:.4f}"
-                )
+        for i in activated.tolist():
+            self._activate_trigger(
+                camera,
+                event_id,
+                matrix.names[i],
+                matrix.types[i],
+                float(similarities[i]),
+            )
 
-                # Update the trigger's last_triggered and triggering_event_id
-                Trigger.update(
-                    last_triggered=datetime.datetime.now(), triggering_event_id=event_id
-                ).where(
-                    Trigger.camera == camera, Trigger.name == trigger["name"]
-                ).execute()
-
-                # Always publish MQTT message
-                self.requestor.send_data(
-                    "triggers",
-                    json.dumps(
-                        {
-                            "name": trigger["name"],
-                            "camera": camera,
-                            "event_id": event_id,
-                            "type": trigger["type"],
-                            "score": similarity,
-                        }
-                    ),
-                )
+        if WRITE_DEBUG_IMAGES:
+            for similarity in similarities.tolist():
+                self._write_debug_image(event_id, similarity)
 
-                friendly_name = (
-                    self.config.cameras[camera]
-                    .semantic_search.triggers[trigger["name"]]
-                    .friendly_name
-                )
+    def _activate_trigger(
+        self,
+        camera: str,
+        event_id: str,
+        name: str,
+        trigger_type: str,
+        similarity: float,
+    ) -> None:
+        logger.debug(f"Trigger {name} activated with similarity {similarity:.4f}")
+
+        # Update the trigger's last_triggered and triggering_event_id
+        Trigger.update(
+            last_triggered=datetime.datetime.now(), triggering_event_id=event_id
+        ).where(Trigger.camera == camera, Trigger.name == name).execute()
+
+        # Always publish MQTT message
+        self.requestor.send_data(
+            "triggers",
+            json.dumps(
+                {
+                    "name": name,
+                    "camera": camera,
+                    "event_id": event_id,
+                    "type": trigger_type,
+                    "score": similarity,
+                }
+            ),
+        )
 
-                if (
-                    self.config.cameras[camera]
-                    .semantic_search.triggers[trigger["name"]]
-                    .actions
-                ):
-                    # handle actions for the trigger
-                    # notifications already handled by webpush
-                    if (
-                        "sub_label"
-                        in self.config.cameras[camera]
-                        .semantic_search.triggers[trigger["name"]]
-                        .actions
-                    ):
-                        self.sub_label_publisher.publish(
-                            (event_id, friendly_name, similarity),
-                            EventMetadataTypeEnum.sub_label,
-                        )
-                    if (
-                        "attribute"
-                        in self.config.cameras[camera]
-                        .semantic_search.triggers[trigger["name"]]
-                        .actions
-                    ):
-                        self.sub_label_publisher.publish(
-                            (
-                                event_id,
-                                trigger["name"],
-                                trigger["type"],
-                                similarity,
-                            ),
-                            EventMetadataTypeEnum.attribute.value,
-                        )
-
-            if WRITE_DEBUG_IMAGES:
-                try:
-                    event: Event = Event.get(Event.id == event_id)
-                except DoesNotExist:
-                    return
-
-                # Skip the event if not an object
-                if event.data.get("type") != "object":
-                    return
-
-                thumbnail_bytes = get_event_thumbnail_bytes(event)
-
-                nparr = np.frombuffer(thumbnail_bytes, np.uint8)
-                thumbnail = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-                font_scale = 0.5
-                font = cv2.FONT_HERSHEY_SIMPLEX
-                cv2.putText(
-                    thumbnail,
-                    f"{similarity:.4f}",
-                    (10, 30),
-                    font,
-                    fontScale=font_scale,
-                    color=(0, 255, 0),
-                    thickness=2,
-                )
+        trigger_config = self.config.cameras[camera].semantic_search.triggers[name]
 
-                current_time = int(datetime.datetime.now().timestamp())
-                cv2.imwrite(
-                    f"debug/frames/trigger-{event_id}_{current_time}.jpg",
-                    thumbnail,
+        if trigger_config.actions:
+            # handle actions for the trigger
+            # notifications already handled by webpush
+            if "sub_label" in trigger_config.actions:
+                self.sub_label_publisher.publish(
+                    (event_id, trigger_config.friendly_name, similarity),
+                    EventMetadataTypeEnum.sub_label,
                 )
+            if "attribute" in trigger_config.actions:
+                self.sub_label_publisher.publish(
+                    (event_id, name, trigger_type, similarity),
+                    EventMetadataTypeEnum.attribute.value,
+                )
+
+    def _write_debug_image(self, event_id: str, similarity: float) -> None:
+        try:
+            event: Event = Event.get(Event.id == event_id)
+        except DoesNotExist:
+            return
+
+        # Skip the event if not an object
+        if event.data.get("type") != "object":
+            return
+
+        thumbnail_bytes = get_event_thumbnail_bytes(event)
+
+        nparr = np.frombuffer(thumbnail_bytes, np.uint8)
+        thumbnail = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+        font_scale = 0.5
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        cv2.putText(
+            thumbnail,
+            f"{similarity:.4f}",
+            (10, 30),
+            font,
+            fontScale=font_scale,
+            color=(0, 255, 0),
+            thickness=2,
+        )
+
+        current_time = int(datetime.datetime.now().timestamp())
+        cv2.imwrite(
+            f"debug/frames/trigger-{event_id}_{current_time}.jpg",
+            thumbnail,
+        )
 
     def handle_request(self, topic, request_data):
         return None
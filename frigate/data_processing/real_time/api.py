@@ -36,6 +36,22 @@ class RealTimeProcessorApi(ABC):
         """
         pass
 
+    def process_objects(self, objects: list[dict[str, Any]], frame: np.ndarray) -> None:
+        """Processes the frame with the data of all updated objects in it.
+
+        Processors that can batch their work across objects should override this,
+        by default each object is processed on its own.
+
+        Args:
+            objects (list): containing data about each updated object in frame.
+            frame (ndarray): full yuv frame.
+
+        Returns:
+            None.
+        """
+        for obj_data in objects:
+            self.process_frame(obj_data, frame)
+
     @abstractmethod
     def handle_request(
         self, topic: str, request_data: dict[str, Any]
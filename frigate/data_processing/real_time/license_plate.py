@@ -66,6 +66,10 @@ class LicensePlateRealTimeProcessor(LicensePlateProcessingMixin, RealTimeProcess
         """Look for license plates in image."""
         self.lpr_process(obj_data, frame, dedicated_lpr)
 
+    def process_objects(self, objects: list[dict[str, Any]], frame: np.ndarray):
+        """Look for the license plates of all objects in the frame at once."""
+        self.lpr_process_objects(objects, frame)
+
     def handle_request(self, topic, request_data) -> dict[str, Any] | None:
         return
 
@@ -14,6 +14,13 @@ class DataProcessorMetrics:
     image_embeddings_eps: Synchronized
     text_embeddings_speed: Synchronized
     text_embeddings_eps: Synchronized
+    image_embeddings_batch_size: Synchronized
+    image_embeddings_queue_delay: Synchronized
+    image_embeddings_decode_speed: Synchronized
+    image_embeddings_preprocess_speed: Synchronized
+    image_embeddings_inference_speed: Synchronized
+    text_embeddings_batch_size: Synchronized
+    text_embeddings_queue_delay: Synchronized
     face_rec_speed: Synchronized
     face_rec_fps: Synchronized
     alpr_speed: Synchronized
@@ -24,6 +31,8 @@ class DataProcessorMetrics:
     review_desc_dps: Synchronized
     object_desc_speed: Synchronized
     object_desc_dps: Synchronized
+    trigger_matching_speed: Synchronized
+    trigger_matching_eps: Synchronized
     classification_speeds: dict[str, Synchronized]
     classification_cps: dict[str, Synchronized]
 
@@ -32,6 +41,13 @@ class DataProcessorMetrics:
         self.image_embeddings_eps = manager.Value("d", 0.0)
         self.text_embeddings_speed = manager.Value("d", 0.0)
         self.text_embeddings_eps = manager.Value("d", 0.0)
+        self.image_embeddings_batch_size = manager.Value("d", 0.0)
+        self.image_embeddings_queue_delay = manager.Value("d", 0.0)
+        self.image_embeddings_decode_speed = manager.Value("d", 0.0)
+        self.image_embeddings_preprocess_speed = manager.Value("d", 0.0)
+        self.image_embeddings_inference_speed = manager.Value("d", 0.0)
+        self.text_embeddings_batch_size = manager.Value("d", 0.0)
+        self.text_embeddings_queue_delay = manager.Value("d", 0.0)
         self.face_rec_speed = manager.Value("d", 0.0)
         self.face_rec_fps = manager.Value("d", 0.0)
         self.alpr_speed = manager.Value("d", 0.0)
@@ -42,6 +58,8 @@ class DataProcessorMetrics:
         self.review_desc_dps = manager.Value("d", 0.0)
         self.object_desc_speed = manager.Value("d", 0.0)
         self.object_desc_dps = manager.Value("d", 0.0)
+        self.trigger_matching_speed = manager.Value("d", 0.0)
+        self.trigger_matching_eps = manager.Value("d", 0.0)
         self.classification_speeds = manager.dict()
         self.classification_cps = manager.dict()
 
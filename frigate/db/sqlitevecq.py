@@ -1,14 +1,57 @@
+import logging
 import re
 import sqlite3
+import threading
 
 from playhouse.sqliteq import SqliteQueueDatabase
 
+logger = logging.getLogger(__name__)
+
+# embeddings table and the name of its vector column
+EMBEDDINGS_TABLES = {
+    "vec_thumbnails": "thumbnail_embedding",
+    "vec_descriptions": "description_embedding",
+}
+EMBEDDINGS_METADATA_COLUMNS = "camera, label, start_day"
+# metadata of an embedding, selected from its event aliased as e
+EMBEDDINGS_METADATA_SELECT = (
+    "coalesce(e.camera, ''), coalesce(e.label, ''), "
+    "coalesce(CAST(e.start_time / 86400 AS INTEGER), 0)"
+)
+EMBEDDINGS_DAY = 86400
+# quantized tables keep the float embedding in an auxiliary column for reranking
+EMBEDDINGS_FULL_COLUMN = "full_embedding"
+# vec0 type of the vector column for each quantization
+EMBEDDINGS_VECTOR_TYPES = {
+    "none": "FLOAT[768] distance_metric=cosine",
+    "int8": "INT8[768] distance_metric=cosine",
+    "binary": "BIT[768]",
+}
+REINDEX_SUFFIX = "_reindex"
+# embeddings copied per transaction when the reindex tables are swapped in
+EMBEDDINGS_SWAP_CHUNK = 256
+
+
+def quantize_embedding_sql(quantization: str, value: str) -> str:
+    """SQL expression converting a float embedding to the quantized vector type."""
+    if quantization == "int8":
+        # cosine distance ignores scale, unit vectors use the full int8 range
+        return f"vec_quantize_int8(vec_normalize({value}), 'unit')"
+
+    if quantization == "binary":
+        return f"vec_quantize_binary({value})"
+
+    return value
+
 
 class SqliteVecQueueDatabase(SqliteQueueDatabase):
     def __init__(self, *args, load_vec_extension: bool = False, **kwargs) -> None:
         self.load_vec_extension: bool = load_vec_extension
         # no extension necessary, sqlite will load correctly for each platform
         self.sqlite_vec_path = "/usr/local/lib/vec0"
+        self.embeddings_metadata: dict[str, bool] = {}
+        self.transaction_lock = threading.Lock()
+        self.transaction_conn: sqlite3.Connection | None = None
         super().__init__(*args, **kwargs)
 
     def _connect(self, *args, **kwargs) -> sqlite3.Connection:
@@ -21,6 +64,16 @@ class SqliteVecQueueDatabase(SqliteQueueDatabase):
 
         return conn
 
+    def stop(self) -> bool:
+        stopped = super().stop()
+
+        with self.transaction_lock:
+            if self.transaction_conn is not None:
+                self.transaction_conn.close()
+                self.transaction_conn = None
+
+        return stopped
+
     def _load_vec_extension(self, conn: sqlite3.Connection) -> None:
         conn.enable_load_extension(True)
         conn.load_extension(self.sqlite_vec_path)
@@ -45,25 +98,282 @@ class SqliteVecQueueDatabase(SqliteQueueDatabase):
         ids = ",".join(["?" for _ in event_ids])
         self.execute_sql(f"DELETE FROM vec_descriptions WHERE id IN ({ids})", event_ids)
 
-    def drop_embeddings_tables(self) -> None:
-        self.execute_sql("""
-            DROP TABLE vec_descriptions;
-        """)
-        self.execute_sql("""
-            DROP TABLE vec_thumbnails;
-        """)
+    def drop_embeddings_tables(self, suffix: str = "") -> None:
+        for table in EMBEDDINGS_TABLES:
+            self._write(f"DROP TABLE IF EXISTS {table}{suffix};")
+            self.embeddings_metadata.pop(f"{table}{suffix}", None)
 
-    def create_embeddings_tables(self) -> None:
+    def create_embeddings_tables(
+        self, suffix: str = "", quantization: str = "none"
+    ) -> None:
+        for table, column in EMBEDDINGS_TABLES.items():
+            self._write(
+                self.embeddings_table_sql(f"{table}{suffix}", column, quantization)
+            )
+            self.embeddings_metadata.pop(f"{table}{suffix}", None)
+
+    def embeddings_table_sql(
+        self, name: str, column: str, quantization: str = "none"
+    ) -> str:
         """Create vec0 virtual table for embeddings"""
-        self.execute_sql("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS vec_thumbnails USING vec0(
-                id TEXT PRIMARY KEY,
-                thumbnail_embedding FLOAT[768] distance_metric=cosine
-            );
-        """)
-        self.execute_sql("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS vec_descriptions USING vec0(
+        # the metadata columns let searches filter inside the KNN query
+        full = f", +{EMBEDDINGS_FULL_COLUMN} BLOB" if quantization != "none" else ""
+        return f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING vec0(
                 id TEXT PRIMARY KEY,
-                description_embedding FLOAT[768] distance_metric=cosine
+                {column} {EMBEDDINGS_VECTOR_TYPES[quantization]},
+                camera TEXT partition key,
+                label TEXT,
+                start_day INTEGER{full}
             );
-        """)
+        """
+
+    def embeddings_tables_exist(self, suffix: str = "") -> bool:
+        names = [f"{table}{suffix}" for table in EMBEDDINGS_TABLES]
+        rows = self.execute_sql(
+            "SELECT count(*) FROM sqlite_master WHERE name IN ({})".format(
+                ",".join(["?"] * len(names))
+            ),
+            names,
+        ).fetchone()
+        return rows[0] == len(names)
+
+    def embeddings_have_metadata(self, name: str) -> bool:
+        """Tables created before metadata columns were added need a reindex."""
+        if self.embeddings_metadata.get(name):
+            return True
+
+        # only positive results are cached, the tables may be rebuilt by
+        # a reindex in another process
+        row = self.execute_sql(
+            "SELECT sql FROM sqlite_master WHERE name = ?", [name]
+        ).fetchone()
+        self.embeddings_metadata[name] = bool(row) and "start_day" in row[0]
+        return self.embeddings_metadata[name]
+
+    def embeddings_quantization(self, name: str) -> str:
+        """Quantization of the vector column of an embeddings table.
+
+        Not cached since a reindex in the embeddings process can change it.
+        """
+        row = self.execute_sql(
+            "SELECT sql FROM sqlite_master WHERE name = ?", [name]
+        ).fetchone()
+        match = (
+            re.search(r"_embedding\s+(int8|bit)\b", row[0], re.IGNORECASE)
+            if row
+            else None
+        )
+
+        if not match:
+            return "none"
+
+        return "int8" if match.group(1).lower() == "int8" else "binary"
+
+    def get_embedding(self, table: str, event_id: str) -> bytes | None:
+        """Full precision embedding of an object, None if it has none."""
+        source = self._embeddings_source(
+            EMBEDDINGS_TABLES[table], self.embeddings_quantization(table)
+        )
+        cursor = self.execute_sql(
+            f"SELECT {source} FROM {table} WHERE id = ?", [event_id]
+        )
+        row = cursor.fetchone() if cursor else None
+        return row[0] if row else None
+
+    def select_embeddings(
+        self, table: str, event_ids: list[str] | None = None
+    ) -> sqlite3.Cursor:
+        """Cursor over (id, full precision embedding[, camera, label, start_day]) rows."""
+        source = self._embeddings_source(
+            EMBEDDINGS_TABLES[table], self.embeddings_quantization(table)
+        )
+        columns = f"id, {source}"
+
+        if self.embeddings_have_metadata(table):
+            columns += f", {EMBEDDINGS_METADATA_COLUMNS}"
+
+        if event_ids is None:
+            return self.execute_sql(f"SELECT {columns} FROM {table}")
+
+        return self.execute_sql(
+            f"SELECT {columns} FROM {table} WHERE id IN ({','.join(['?'] * len(event_ids))})",
+            event_ids,
+        )
+
+    def upsert_embeddings(
+        self, table: str, ids: list[str], embeddings: list[bytes], suffix: str = ""
+    ) -> None:
+        """Insert or replace serialized embeddings and wait until they are written."""
+        self._transaction(
+            self._upsert_statements(f"{table}{suffix}", table, ids, embeddings)
+        )
+
+    def swap_embeddings_tables(self, suffix: str) -> None:
+        """Replace the embeddings tables with the ones built under suffix.
+
+        The new embeddings are copied into the live tables in chunks, each in
+        its own short transaction, so other writes are not held up by the
+        copy. Searches see a mix of old and new embeddings until the copy is
+        done, as they saw the old ones for the whole reindex. vec0 tables can
+        not be renamed, so when the quantization changes the live tables are
+        recreated first, keeping the embeddings written during the reindex
+        for objects created in the meantime, and searches miss the objects
+        not copied yet. Embeddings of objects deleted in the meantime are
+        removed once the copy is done.
+        """
+        for table, column in EMBEDDINGS_TABLES.items():
+            shadow = f"{table}{suffix}"
+            quantization = self.embeddings_quantization(shadow)
+            recreate = (
+                not self.embeddings_have_metadata(table)
+                or self.embeddings_quantization(table) != quantization
+            )
+
+            if recreate:
+                self._recreate_embeddings_table(table, column, shadow, quantization)
+
+            cursor = self.execute_sql(
+                f"SELECT id, {self._embeddings_source(column, quantization)} "
+                f"FROM {shadow} WHERE id IN (SELECT id FROM event)"
+            )
+
+            while rows := cursor.fetchmany(EMBEDDINGS_SWAP_CHUNK):
+                # embeddings written since the table was recreated are newer
+                self._transaction(
+                    self._upsert_statements(
+                        table,
+                        table,
+                        [row[0] for row in rows],
+                        [row[1] for row in rows],
+                        only_missing=recreate,
+                    )
+                )
+
+            self._transaction(
+                [
+                    (
+                        f"DELETE FROM {table} WHERE id NOT IN (SELECT id FROM event)",
+                        None,
+                    ),
+                    (f"DROP TABLE {shadow}", None),
+                ]
+            )
+            self.embeddings_metadata.pop(table, None)
+            self.embeddings_metadata.pop(shadow, None)
+
+    def _recreate_embeddings_table(
+        self, table: str, column: str, shadow: str, quantization: str
+    ) -> None:
+        live_source = self._embeddings_source(
+            column, self.embeddings_quantization(table)
+        )
+        carried_columns, carried_values = self._embeddings_values(
+            column, quantization, f"t.{live_source}"
+        )
+        self._transaction(
+            [
+                # removing the embeddings the new table has keeps the insert
+                # from reading the table it writes to, which would lose the
+                # vector types of quantized values
+                (f"DELETE FROM {table} WHERE id IN (SELECT id FROM {shadow})", None),
+                (
+                    f"INSERT INTO {shadow}(id, {carried_columns}, {EMBEDDINGS_METADATA_COLUMNS}) "
+                    f"SELECT t.id, {carried_values}, {EMBEDDINGS_METADATA_SELECT} "
+                    f"FROM {table} t LEFT JOIN event e ON e.id = t.id",
+                    None,
+                ),
+                (f"DROP TABLE IF EXISTS {table}", None),
+                (self.embeddings_table_sql(table, column, quantization), None),
+            ]
+        )
+        self.embeddings_metadata.pop(table, None)
+
+    def _upsert_statements(
+        self,
+        name: str,
+        table: str,
+        ids: list[str],
+        embeddings: list[bytes],
+        only_missing: bool = False,
+    ) -> list[tuple[str, list | None]]:
+        column = EMBEDDINGS_TABLES[table]
+        rows = ", ".join(["(?, ?)"] * len(ids))
+        where = (
+            f" WHERE v.column1 NOT IN (SELECT id FROM {name})" if only_missing else ""
+        )
+        items = []
+
+        for event_id, embedding in zip(ids, embeddings):
+            items.append(event_id)
+            items.append(embedding)
+
+        if self.embeddings_have_metadata(name):
+            columns, values = self._embeddings_values(
+                column, self.embeddings_quantization(name), "v.column2"
+            )
+            insert = (
+                f"INSERT INTO {name}(id, {columns}, {EMBEDDINGS_METADATA_COLUMNS}) "
+                f"SELECT v.column1, {values}, {EMBEDDINGS_METADATA_SELECT} "
+                f"FROM (VALUES {rows}) v LEFT JOIN event e ON e.id = v.column1{where}"
+            )
+        else:
+            insert = (
+                f"INSERT INTO {name}(id, {column}) "
+                f"SELECT v.column1, v.column2 FROM (VALUES {rows}) v{where}"
+            )
+
+        if only_missing:
+            return [(insert, items)]
+
+        # vec0 does not support INSERT OR REPLACE
+        return [
+            (
+                f"DELETE FROM {name} WHERE id IN ({','.join(['?'] * len(ids))})",
+                list(ids),
+            ),
+            (insert, items),
+        ]
+
+    @staticmethod
+    def _embeddings_source(column: str, quantization: str) -> str:
+        # column holding the float embedding
+        return column if quantization == "none" else EMBEDDINGS_FULL_COLUMN
+
+    @staticmethod
+    def _embeddings_values(
+        column: str, quantization: str, source: str
+    ) -> tuple[str, str]:
+        # columns and values storing the float embedding selected by source
+        if quantization == "none":
+            return column, source
+
+        return (
+            f"{column}, {EMBEDDINGS_FULL_COLUMN}",
+            f"{quantize_embedding_sql(quantization, source)}, {source}",
+        )
+
+    def _transaction(self, statements: list[tuple[str, list | None]]) -> None:
+        # transactions run on their own connection, writes queued by other
+        # threads would otherwise run inside them and be lost on a rollback
+        with self.transaction_lock:
+            if self.transaction_conn is None:
+                self.transaction_conn = self._connect()
+
+            conn = self.transaction_conn
+            conn.execute("BEGIN IMMEDIATE")
+
+            try:
+                for sql, params in statements:
+                    conn.execute(sql, params or [])
+
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+
+                raise
+
+    def _write(self, sql: str, params: list | None = None) -> None:
+        # wait for the writer thread so errors are raised to the caller
+        list(self.execute_sql(sql, params))
@@ -3,6 +3,8 @@ import os
 
 import numpy as np
 
+from frigate.const import MAX_DETECTIONS
+
 try:
     from tflite_runtime.interpreter import Interpreter, load_delegate
 except ModuleNotFoundError:
@@ -30,10 +32,10 @@ def tflite_detect_raw(self, tensor_input):
     scores = self.interpreter.tensor(self.tensor_output_details[2]["index"])()[0]
     count = int(self.interpreter.tensor(self.tensor_output_details[3]["index"])()[0])
 
-    detections = np.zeros((20, 6), np.float32)
+    detections = np.zeros((max(min(count, MAX_DETECTIONS), 20), 6), np.float32)
 
     for i in range(count):
-        if scores[i] < 0.4 or i == 20:
+        if scores[i] < 0.4 or i == MAX_DETECTIONS:
             break
         detections[i] = [
             class_ids[i],
@@ -5,6 +5,7 @@ import json
 import logging
 import os
 import threading
+import time
 from json.decoder import JSONDecodeError
 from multiprocessing.synchronize import Event as MpEvent
 from typing import Any, Union
@@ -12,21 +13,38 @@ from typing import Any, Union
 import regex
 from pathvalidate import ValidationError, sanitize_filename
 
-from frigate.comms.embeddings_updater import EmbeddingsRequestEnum, EmbeddingsRequestor
+from frigate.comms.embeddings_updater import (
+    EmbeddingsRequestEnum,
+    EmbeddingsRequestor,
+    EmbeddingsUpdateSubscriber,
+    EmbeddingsUpdateTypeEnum,
+)
 from frigate.config import FrigateConfig
 from frigate.const import CONFIG_DIR, FACE_DIR, PROCESS_PRIORITY_HIGH
 from frigate.data_processing.types import DataProcessorMetrics
-from frigate.db.sqlitevecq import SqliteVecQueueDatabase
+from frigate.db.sqlitevecq import (
+    EMBEDDINGS_DAY,
+    EMBEDDINGS_FULL_COLUMN,
+    EMBEDDINGS_TABLES,
+    SqliteVecQueueDatabase,
+    quantize_embedding_sql,
+)
 from frigate.models import Event
 from frigate.util.builtin import serialize
 from frigate.util.classification import kickoff_model_training
 from frigate.util.process import FrigateProcess
 
 from .maintainer import EmbeddingMaintainer
+from .query_cache import QueryEmbeddingCache
 from .util import ZScoreNormalization
+from .vector_index import VectorIndex
 
 logger = logging.getLogger(__name__)
 
+SEARCH_K = 100
+MAX_SEARCH_K = 4096  # largest k supported by sqlite-vec
+INDEX_LOAD_BATCH = 10_000
+
 
 class EmbeddingProcess(FrigateProcess):
     def __init__(
@@ -55,12 +73,27 @@ class EmbeddingProcess(FrigateProcess):
 
 
 class EmbeddingsContext:
-    def __init__(self, db: SqliteVecQueueDatabase):
+    def __init__(self, db: SqliteVecQueueDatabase, config: FrigateConfig):
         self.db = db
+        self.config = config
+        self.query_cache = QueryEmbeddingCache()
         self.thumb_stats = ZScoreNormalization()
         self.desc_stats = ZScoreNormalization()
         self.requestor = EmbeddingsRequestor()
 
+        # thumbnail embeddings kept in memory, searches use sqlite-vec until loaded
+        self.thumbnail_index: VectorIndex | None = None
+        self.index_stop = threading.Event()
+        self.index_thread: threading.Thread | None = None
+
+        if config.semantic_search.memory_index:
+            self.index_thread = threading.Thread(
+                target=self._maintain_thumbnail_index,
+                name="embeddings_index",
+                daemon=True,
+            )
+            self.index_thread.start()
+
         # load stats from disk
         stats_file = os.path.join(CONFIG_DIR, ".search_stats.json")
         try:
@@ -87,23 +120,103 @@ class EmbeddingsContext:
         with open(os.path.join(CONFIG_DIR, ".search_stats.json"), "w") as f:
             json.dump(contents, f)
         self.requestor.stop()
+        self.index_stop.set()
+
+        if self.index_thread is not None:
+            self.index_thread.join()
+
+    def delete_embeddings(self, event_ids: list[str]) -> None:
+        self.db.delete_embeddings_thumbnail(event_ids=event_ids)
+        self.db.delete_embeddings_description(event_ids=event_ids)
+
+        if self.thumbnail_index is not None:
+            self.thumbnail_index.remove(event_ids)
+
+    def _maintain_thumbnail_index(self) -> None:
+        """Load the thumbnail index and apply updates of the embeddings tables."""
+        # subscribe before loading so no update is missed
+        subscriber = EmbeddingsUpdateSubscriber(EmbeddingsUpdateTypeEnum.all)
+        reload = True
+
+        while not self.index_stop.is_set():
+            try:
+                if reload:
+                    self.thumbnail_index = self._load_thumbnail_index()
+                    reload = False
+
+                topic, payload = subscriber.check_for_update(timeout=1)
+
+                if topic is None:
+                    continue
+
+                table, event_ids = payload
+
+                if table != "vec_thumbnails":
+                    continue
+
+                if topic.endswith(EmbeddingsUpdateTypeEnum.reindex.value):
+                    reload = True
+                elif topic.endswith(EmbeddingsUpdateTypeEnum.delete.value):
+                    self.thumbnail_index.remove(event_ids)
+                elif topic.endswith(EmbeddingsUpdateTypeEnum.upsert.value):
+                    self.thumbnail_index.upsert(
+                        self.db.select_embeddings(table, event_ids).fetchall()
+                    )
+            except Exception as e:
+                logger.error(f"Failed to update the thumbnail embeddings index: {e}")
+                self.index_stop.wait(5)
+
+        subscriber.stop()
+
+    def _load_thumbnail_index(self) -> VectorIndex:
+        start = time.monotonic()
+        index = VectorIndex()
+        cursor = self.db.select_embeddings("vec_thumbnails")
+
+        while rows := cursor.fetchmany(INDEX_LOAD_BATCH):
+            index.upsert(rows)
+
+        logger.debug(
+            f"Loaded {len(index)} thumbnail embeddings into memory in {time.monotonic() - start:.1f}s"
+        )
+        return index
+
+    def _search_embedding(self, query: str) -> bytes | None:
+        """Embed a text query, reusing the embedding of recent identical queries."""
+        model = f"{self.config.semantic_search.model}:{self.config.semantic_search.model_size}"
+        query_embedding = self.query_cache.get(model, query)
+
+        if query_embedding is not None:
+            return query_embedding
+
+        data = self.requestor.send_data(
+            EmbeddingsRequestEnum.generate_search.value, query
+        )
+
+        if not data:
+            return None
+
+        query_embedding = serialize(data)
+        self.query_cache.put(model, query, query_embedding)
+        return query_embedding
 
     def search_thumbnail(
-        self, query: Union[Event, str], event_ids: list[str] = None
+        self,
+        query: Union[Event, str],
+        event_ids: list[str] = None,
+        k: int = SEARCH_K,
+        **filters: Any,
     ) -> list[tuple[str, float]]:
+        index = self.thumbnail_index
+
         if query.__class__ == Event:
-            cursor = self.db.execute_sql(
-                """
-                SELECT thumbnail_embedding FROM vec_thumbnails WHERE id = ?
-                """,
-                [query.id],
+            query_embedding = (
+                index.get(query.id)
+                if index is not None
+                else self.db.get_embedding("vec_thumbnails", query.id)
             )
 
-            row = cursor.fetchone() if cursor else None
-
-            if row:
-                query_embedding = row[0]
-            else:
+            if not query_embedding:
                 # If no embedding found, generate it and return it
                 data = self.requestor.send_data(
                     EmbeddingsRequestEnum.embed_thumbnail.value,
@@ -115,77 +228,124 @@ class EmbeddingsContext:
 
                 query_embedding = serialize(data)
         else:
-            data = self.requestor.send_data(
-                EmbeddingsRequestEnum.generate_search.value, query
-            )
+            query_embedding = self._search_embedding(query)
 
-            if not data:
+            if not query_embedding:
                 return []
 
-            query_embedding = serialize(data)
-
-        sql_query = """
-            SELECT
-                id,
-                distance
-            FROM vec_thumbnails
-            WHERE thumbnail_embedding MATCH ?
-                AND k = 100
-        """
-
-        # Add the IN clause if event_ids is provided and not empty
-        # this is the only filter supported by sqlite-vec as of 0.1.3
-        # but it seems to be broken in this version
-        if event_ids:
-            sql_query += " AND id IN ({})".format(",".join("?" * len(event_ids)))
+        if index is not None:
+            return self._search_index(index, query_embedding, event_ids, k, **filters)
 
-        # order by distance DESC is not implemented in this version of sqlite-vec
-        # when it's implemented, we can use cosine similarity
-        sql_query += " ORDER BY distance"
+        return self._search_table(
+            "vec_thumbnails", query_embedding, event_ids, k, **filters
+        )
 
-        parameters = [query_embedding] + event_ids if event_ids else [query_embedding]
+    def search_description(
+        self,
+        query_text: str,
+        event_ids: list[str] = None,
+        k: int = SEARCH_K,
+        **filters: Any,
+    ) -> list[tuple[str, float]]:
+        query_embedding = self._search_embedding(query_text)
 
-        results = self.db.execute_sql(sql_query, parameters).fetchall()
+        if not query_embedding:
+            return []
 
-        return results
+        return self._search_table(
+            "vec_descriptions", query_embedding, event_ids, k, **filters
+        )
 
-    def search_description(
-        self, query_text: str, event_ids: list[str] = None
+    def _search_index(
+        self,
+        index: VectorIndex,
+        query_embedding: bytes,
+        event_ids: list[str] | None,
+        k: int,
+        cameras: list[str] | None = None,
+        labels: list[str] | None = None,
+        after: float | None = None,
+        before: float | None = None,
     ) -> list[tuple[str, float]]:
-        data = self.requestor.send_data(
-            EmbeddingsRequestEnum.generate_search.value, query_text
+        return index.search(
+            query_embedding,
+            k,
+            event_ids,
+            cameras,
+            labels,
+            int(after // EMBEDDINGS_DAY) if after is not None else None,
+            int(before // EMBEDDINGS_DAY) if before is not None else None,
         )
 
-        if not data:
-            return []
-
-        query_embedding = serialize(data)
+    def _search_table(
+        self,
+        table: str,
+        query_embedding: bytes,
+        event_ids: list[str] | None,
+        k: int,
+        cameras: list[str] | None = None,
+        labels: list[str] | None = None,
+        after: float | None = None,
+        before: float | None = None,
+    ) -> list[tuple[str, float]]:
+        """Find the k nearest embeddings that match the filters.
 
-        # Prepare the base SQL query
-        sql_query = """
-            SELECT
-                id,
-                distance
-            FROM vec_descriptions
-            WHERE description_embedding MATCH ?
-                AND k = 100
+        The filters are evaluated by sqlite-vec during the KNN search when
+        the table has metadata columns, otherwise they are left to the caller.
+        Quantized tables are searched for rerank_factor * k candidates, which
+        are reranked by the distance of their full precision embeddings.
         """
+        filters_sql = ""
+        filter_parameters: list[Any] = []
 
-        # Add the IN clause if event_ids is provided and not empty
-        # this is the only filter supported by sqlite-vec as of 0.1.3
-        # but it seems to be broken in this version
         if event_ids:
-            sql_query += " AND id IN ({})".format(",".join("?" * len(event_ids)))
+            filters_sql += " AND id IN ({})".format(",".join("?" * len(event_ids)))
+            filter_parameters += event_ids
+
+        if self.db.embeddings_have_metadata(table):
+            # camera is the partition key, k results are returned per camera
+            if cameras:
+                filters_sql += " AND camera IN ({})".format(
+                    ",".join("?" * len(cameras))
+                )
+                filter_parameters += cameras
+
+            if labels:
+                filters_sql += " AND label IN ({})".format(",".join("?" * len(labels)))
+                filter_parameters += labels
+
+            if after is not None:
+                filters_sql += " AND start_day >= ?"
+                filter_parameters.append(int(after // EMBEDDINGS_DAY))
 
-        # order by distance DESC is not implemented in this version of sqlite-vec
-        # when it's implemented, we can use cosine similarity
-        sql_query += " ORDER BY distance"
+            if before is not None:
+                filters_sql += " AND start_day <= ?"
+                filter_parameters.append(int(before // EMBEDDINGS_DAY))
 
-        parameters = [query_embedding] + event_ids if event_ids else [query_embedding]
+        column = EMBEDDINGS_TABLES[table]
+        quantization = self.db.embeddings_quantization(table)
 
-        results = self.db.execute_sql(sql_query, parameters).fetchall()
+        if quantization == "none":
+            # order by distance DESC is not implemented in this version of sqlite-vec
+            # when it's implemented, we can use cosine similarity
+            sql_query = f"SELECT id, distance FROM {table} WHERE {column} MATCH ? AND k = ?{filters_sql} ORDER BY distance"
+            parameters = [query_embedding, min(k, MAX_SEARCH_K)]
+        else:
+            candidates = min(
+                k * self.config.semantic_search.rerank_factor, MAX_SEARCH_K
+            )
+            sql_query = (
+                f"SELECT id, vec_distance_cosine({EMBEDDINGS_FULL_COLUMN}, ?) AS distance "
+                f"FROM (SELECT id, {EMBEDDINGS_FULL_COLUMN} FROM {table} "
+                f"WHERE {column} MATCH {quantize_embedding_sql(quantization, '?')} "
+                f"AND k = ?{filters_sql}) ORDER BY distance"
+            )
+            parameters = [query_embedding, query_embedding, candidates]
 
-        return results
+        results = self.db.execute_sql(
+            sql_query, parameters + filter_parameters
+        ).fetchall()
+        return sorted(results, key=lambda r: r[1])[:k]
 
     def register_face(self, face_name: str, image_data: bytes) -> dict[str, Any]:
         return self.requestor.send_data(
@@ -287,6 +447,7 @@ class EmbeddingsContext:
         )
 
     def reindex_embeddings(self) -> dict[str, Any]:
+        self.query_cache.clear()
         return self.requestor.send_data(EmbeddingsRequestEnum.reindex.value, {})
 
     def start_classification_training(self, model_name: str) -> dict[str, Any]:
@@ -0,0 +1,116 @@
+"""Micro-batching of embeddings for live tracked objects."""
+
+import logging
+import threading
+import time
+from multiprocessing.sharedctypes import Synchronized
+from typing import Any, Callable
+
+from frigate.util.builtin import InferenceSpeed
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BATCH_SIZE = 8
+EMBEDDING_BATCH_DELAY = 0.2  # seconds the oldest item waits for the batch to fill
+
+
+class EmbeddingBatcher:
+    """Groups embeddings of tracked objects into batches bounded by size and delay.
+
+    A batch is embedded on a background thread once max_size items are queued
+    or the oldest item has waited max_delay seconds. Queuing an object that is
+    already waiting replaces its input. Callbacks run after the batch has been
+    written so they can read the embeddings back from the database.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        embed: Callable[[dict[str, Any]], Any],
+        batch_size_metric: Synchronized,
+        queue_delay_metric: Synchronized,
+        max_size: int = EMBEDDING_BATCH_SIZE,
+        max_delay: float = EMBEDDING_BATCH_DELAY,
+    ) -> None:
+        self.name = name
+        self.embed = embed
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.batch_size = InferenceSpeed(batch_size_metric)
+        self.queue_delay = InferenceSpeed(queue_delay_metric)
+        # event id -> (input, time queued, callbacks), in the order queued
+        self.pending: dict[str, tuple[Any, float, list[Callable[[], None]]]] = {}
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.thread = threading.Thread(
+            target=self._run, name=f"embeddings_batch_{name}", daemon=True
+        )
+        self.thread.start()
+
+    def add(
+        self, event_id: str, item: Any, callback: Callable[[], None] | None = None
+    ) -> None:
+        with self.condition:
+            _, queued_at, callbacks = self.pending.get(
+                event_id, (None, time.monotonic(), [])
+            )
+
+            if callback is not None:
+                callbacks.append(callback)
+
+            self.pending[event_id] = (item, queued_at, callbacks)
+            self.condition.notify()
+
+    def stop(self) -> None:
+        """Embed the queued items and stop the batching thread."""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+        self.thread.join()
+
+    def _next_batch(self) -> list[tuple[str, Any, float, list]] | None:
+        with self.condition:
+            while True:
+                if len(self.pending) >= self.max_size or (
+                    self.pending and self.stopped
+                ):
+                    break
+
+                if self.stopped:
+                    return None
+
+                timeout = None
+
+                if self.pending:
+                    oldest = next(iter(self.pending.values()))[1]
+                    timeout = oldest + self.max_delay - time.monotonic()
+
+                    if timeout <= 0:
+                        break
+
+                self.condition.wait(timeout)
+
+            event_ids = list(self.pending)[: self.max_size]
+            return [(id, *self.pending.pop(id)) for id in event_ids]
+
+    def _run(self) -> None:
+        while (batch := self._next_batch()) is not None:
+            now = time.monotonic()
+            self.batch_size.update(len(batch))
+            self.queue_delay.update(
+                sum(now - queued_at for _, _, queued_at, _ in batch) / len(batch)
+            )
+
+            try:
+                self.embed({event_id: item for event_id, item, _, _ in batch})
+            except Exception as e:
+                logger.error(f"Failed to embed batch of {len(batch)} {self.name}: {e}")
+                continue
+
+            for _, _, _, callbacks in batch:
+                for callback in callbacks:
+                    try:
+                        callback()
+                    except Exception as e:
+                        logger.error(f"Error after embedding {self.name}: {e}")
@@ -2,16 +2,23 @@
 
 import datetime
 import io
+import json
 import logging
 import os
+import queue
 import threading
 import time
+from typing import Any, Callable
 
 import numpy as np
 from peewee import DoesNotExist, IntegrityError
 from PIL import Image
 from playhouse.shortcuts import model_to_dict
 
+from frigate.comms.embeddings_updater import (
+    EmbeddingsUpdatePublisher,
+    EmbeddingsUpdateTypeEnum,
+)
 from frigate.comms.inter_process import InterProcessRequestor
 from frigate.config import FrigateConfig
 from frigate.config.classification import SemanticSearchModelEnum
@@ -22,18 +29,26 @@ from frigate.const import (
     UPDATE_MODEL_STATE,
 )
 from frigate.data_processing.types import DataProcessorMetrics
-from frigate.db.sqlitevecq import SqliteVecQueueDatabase
+from frigate.db.sqlitevecq import (
+    EMBEDDINGS_TABLES,
+    REINDEX_SUFFIX,
+    SqliteVecQueueDatabase,
+)
 from frigate.models import Event, Trigger
 from frigate.types import ModelStatusTypesEnum
 from frigate.util.builtin import EventsPerSecond, InferenceSpeed, serialize
 from frigate.util.file import get_event_thumbnail_bytes
 
+from .batcher import EmbeddingBatcher
 from .genai_embedding import GenAIEmbedding
 from .onnx.jina_v1_embedding import JinaV1ImageEmbedding, JinaV1TextEmbedding
 from .onnx.jina_v2_embedding import JinaV2Embedding
 
 logger = logging.getLogger(__name__)
 
+REINDEX_CHECKPOINT_FILE = os.path.join(CONFIG_DIR, ".reindex_checkpoint.json")
+REINDEX_READ_AHEAD = 2  # batches read ahead of inference
+
 
 def get_metadata(event: Event) -> dict:
     """Extract valid event metadata."""
@@ -80,6 +95,7 @@ class Embeddings:
         self.db = db
         self.metrics = metrics
         self.requestor = InterProcessRequestor()
+        self.update_publisher = EmbeddingsUpdatePublisher()
 
         self.image_inference_speed = InferenceSpeed(self.metrics.image_embeddings_speed)
         self.image_eps = EventsPerSecond()
@@ -92,8 +108,32 @@ class Embeddings:
         self.reindex_thread = None
         self.reindex_running = False
 
+        # live tracked objects are embedded in micro-batches
+        self.thumbnail_batcher = EmbeddingBatcher(
+            "thumbnails",
+            self.batch_embed_thumbnail,
+            self.metrics.image_embeddings_batch_size,
+            self.metrics.image_embeddings_queue_delay,
+        )
+        self.description_batcher = EmbeddingBatcher(
+            "descriptions",
+            self.batch_embed_description,
+            self.metrics.text_embeddings_batch_size,
+            self.metrics.text_embeddings_queue_delay,
+        )
+
         # Create tables if they don't exist
-        self.db.create_embeddings_tables()
+        quantization = self.config.semantic_search.quantization.value
+        self.db.create_embeddings_tables(quantization=quantization)
+
+        if not self.db.embeddings_have_metadata("vec_thumbnails"):
+            logger.info(
+                "Reindex tracked object embeddings to apply semantic search filters during the vector search"
+            )
+        elif self.db.embeddings_quantization("vec_thumbnails") != quantization:
+            logger.info(
+                f"Reindex tracked object embeddings to apply the {quantization} semantic search quantization"
+            )
 
         models = self.get_model_definitions()
 
@@ -133,6 +173,7 @@ class Embeddings:
                 requestor=self.requestor,
                 device=config.semantic_search.device
                 or ("GPU" if config.semantic_search.model_size == "large" else "CPU"),
+                metrics=self.metrics,
             )
             self.text_embedding = lambda input_data: self.embedding(
                 input_data, embedding_type="text"
@@ -152,8 +193,32 @@ class Embeddings:
                 requestor=self.requestor,
                 device=config.semantic_search.device
                 or ("GPU" if config.semantic_search.model_size == "large" else "CPU"),
+                metrics=self.metrics,
             )
 
+    def queue_thumbnail(
+        self,
+        event_id: str,
+        thumbnail: bytes,
+        callback: Callable[[], None] | None = None,
+    ) -> None:
+        """Embed a thumbnail with the next batch, callback runs once it is stored."""
+        self.thumbnail_batcher.add(event_id, thumbnail, callback)
+
+    def queue_description(
+        self,
+        event_id: str,
+        description: str,
+        callback: Callable[[], None] | None = None,
+    ) -> None:
+        """Embed a description with the next batch, callback runs once it is stored."""
+        self.description_batcher.add(event_id, description, callback)
+
+    def stop(self) -> None:
+        self.thumbnail_batcher.stop()
+        self.description_batcher.stop()
+        self.update_publisher.stop()
+
     def update_stats(self) -> None:
         self.metrics.image_embeddings_eps.value = self.image_eps.eps()
         self.metrics.text_embeddings_eps.value = self.text_eps.eps()
@@ -203,17 +268,13 @@ class Embeddings:
         @param: upsert If embedding should be upserted into vec DB
         """
         start = datetime.datetime.now().timestamp()
-        # Convert thumbnail bytes to PIL Image
         embedding = self.vision_embedding([thumbnail])[0]
 
+        if embedding is None:
+            raise ValueError(f"Unable to decode thumbnail for {event_id}")
+
         if upsert:
-            self.db.execute_sql(
-                """
-                INSERT OR REPLACE INTO vec_thumbnails(id, thumbnail_embedding)
-                VALUES(?, ?)
-                """,
-                (event_id, serialize(embedding)),
-            )
+            self._upsert_embeddings("vec_thumbnails", [event_id], [embedding])
 
         self.image_inference_speed.update(datetime.datetime.now().timestamp() - start)
         self.image_eps.update()
@@ -221,52 +282,68 @@ class Embeddings:
         return embedding
 
     def batch_embed_thumbnail(
-        self, event_thumbs: dict[str, bytes], upsert: bool = True
-    ) -> list[np.ndarray]:
+        self,
+        event_thumbs: dict[str, bytes | Image.Image],
+        upsert: bool = True,
+        reindex: bool = False,
+    ) -> dict[str, np.ndarray]:
         """Embed thumbnails and optionally insert into DB.
 
-        @param: event_thumbs Map of Event IDs in DB to thumbnail bytes in jpg format
+        @param: event_thumbs Map of Event IDs in DB to thumbnail bytes in jpg format or decoded images
         @param: upsert If embedding should be upserted into vec DB
+        @param: reindex If the thumbnails are a batch of the reindex
+        @return: Map of Event IDs to embeddings, corrupt thumbnails are skipped
         """
         start = datetime.datetime.now().timestamp()
-        valid_ids = []
-        valid_thumbs = []
-        for eid, thumb in event_thumbs.items():
-            try:
-                img = Image.open(io.BytesIO(thumb))
-                img.verify()  # Will raise if corrupt
-                valid_ids.append(eid)
-                valid_thumbs.append(thumb)
-            except Exception as e:
+        event_ids = list(event_thumbs)
+        thumbs = list(event_thumbs.values())
+
+        if not isinstance(self.config.semantic_search.model, SemanticSearchModelEnum):
+            # genai providers upload the encoded thumbnails, onnx models
+            # skip the ones they fail to decode while preprocessing
+            event_ids = []
+            thumbs = []
+
+            for eid, thumb in event_thumbs.items():
+                try:
+                    if not isinstance(thumb, Image.Image):
+                        Image.open(io.BytesIO(thumb)).verify()  # Will raise if corrupt
+
+                    event_ids.append(eid)
+                    thumbs.append(thumb)
+                except Exception as e:
+                    logger.warning(f"Skipping corrupt thumbnail for event {eid}: {e}")
+
+        embeddings = {}
+
+        if thumbs:
+            for eid, embedding in zip(event_ids, self.vision_embedding(thumbs)):
+                if embedding is None:
+                    logger.warning(f"Skipping corrupt thumbnail for event {eid}")
+                else:
+                    embeddings[eid] = embedding
+
+        if not embeddings:
+            if reindex:
                 logger.warning(
-                    f"Embeddings reindexing: Skipping corrupt thumbnail for event {eid}: {e}"
+                    "Embeddings reindexing: No valid thumbnails to embed in this batch."
                 )
+            else:
+                # live batches often hold a single corrupt thumbnail
+                logger.debug("No valid thumbnails to embed in this batch.")
 
-        if not valid_thumbs:
-            logger.warning(
-                "Embeddings reindexing: No valid thumbnails to embed in this batch."
-            )
-            return []
-
-        embeddings = self.vision_embedding(valid_thumbs)
+            return {}
 
         if upsert:
-            items = []
-            for i in range(len(valid_ids)):
-                items.append(valid_ids[i])
-                items.append(serialize(embeddings[i]))
-                self.image_eps.update()
-
-            self.db.execute_sql(
-                """
-                INSERT OR REPLACE INTO vec_thumbnails(id, thumbnail_embedding)
-                VALUES {}
-                """.format(", ".join(["(?, ?)"] * len(valid_ids))),
-                items,
+            self._upsert_embeddings(
+                "vec_thumbnails", list(embeddings), list(embeddings.values())
             )
 
+        for _ in embeddings:
+            self.image_eps.update()
+
         duration = datetime.datetime.now().timestamp() - start
-        self.text_inference_speed.update(duration / len(valid_ids))
+        self.image_inference_speed.update(duration / len(embeddings))
 
         return embeddings
 
@@ -277,13 +354,7 @@ class Embeddings:
         embedding = self.text_embedding([description])[0]
 
         if upsert:
-            self.db.execute_sql(
-                """
-                INSERT OR REPLACE INTO vec_descriptions(id, description_embedding)
-                VALUES(?, ?)
-                """,
-                (event_id, serialize(embedding)),
-            )
+            self._upsert_embeddings("vec_descriptions", [event_id], [embedding])
 
         self.text_inference_speed.update(datetime.datetime.now().timestamp() - start)
         self.text_eps.update()
@@ -301,42 +372,37 @@ class Embeddings:
             embeddings.append(self.text_embedding([desc])[0])
 
         if upsert:
-            ids = list(event_descriptions.keys())
-            items = []
-
-            for i in range(len(ids)):
-                items.append(ids[i])
-                items.append(serialize(embeddings[i]))
-                self.text_eps.update()
-
-            self.db.execute_sql(
-                """
-                INSERT OR REPLACE INTO vec_descriptions(id, description_embedding)
-                VALUES {}
-                """.format(", ".join(["(?, ?)"] * len(ids))),
-                items,
+            self._upsert_embeddings(
+                "vec_descriptions", list(event_descriptions), embeddings
             )
 
-        self.text_inference_speed.update(datetime.datetime.now().timestamp() - start)
-
-        return embeddings
+        for _ in embeddings:
+            self.text_eps.update()
 
-    def reindex(self) -> None:
-        logger.info("Indexing tracked object embeddings...")
+        self.text_inference_speed.update(
+            (datetime.datetime.now().timestamp() - start) / max(len(embeddings), 1)
+        )
 
-        self.db.drop_embeddings_tables()
-        logger.debug("Dropped embeddings tables.")
-        self.db.create_embeddings_tables()
-        logger.debug("Created embeddings tables.")
+        return embeddings
 
-        # Delete the saved stats file
-        if os.path.exists(os.path.join(CONFIG_DIR, ".search_stats.json")):
-            os.remove(os.path.join(CONFIG_DIR, ".search_stats.json"))
+    def _upsert_embeddings(
+        self, table: str, event_ids: list[str], embeddings: list[np.ndarray]
+    ) -> None:
+        self.db.upsert_embeddings(table, event_ids, [serialize(e) for e in embeddings])
+        self.update_publisher.publish(
+            (table, event_ids), EmbeddingsUpdateTypeEnum.upsert.value
+        )
 
-        st = time.time()
+    def reindex(self) -> None:
+        """Rebuild the embeddings of all tracked objects.
 
-        # Get total count of events to process
-        total_events = Event.select().count()
+        Embeddings are written to shadow tables which replace the live tables
+        once every object is indexed, so search keeps working meanwhile. Events
+        are paged by (start_time, id) and a checkpoint is saved after each
+        batch, so an interrupted reindex resumes where it stopped. Thumbnails
+        are read on a separate thread while the previous batch is embedded.
+        """
+        logger.info("Indexing tracked object embeddings...")
 
         if not isinstance(self.config.semantic_search.model, SemanticSearchModelEnum):
             batch_size = 1
@@ -344,73 +410,126 @@ class Embeddings:
             batch_size = 4
         else:
             batch_size = 32
-        current_page = 1
-
-        totals = {
-            "thumbnails": 0,
-            "descriptions": 0,
-            "processed_objects": total_events - 1 if total_events < batch_size else 0,
-            "total_objects": total_events,
-            "time_remaining": 0 if total_events < batch_size else -1,
-            "status": "indexing",
-        }
 
+        checkpoint = self._load_reindex_checkpoint()
+
+        if checkpoint is None:
+            self.db.drop_embeddings_tables(REINDEX_SUFFIX)
+            self.db.create_embeddings_tables(
+                REINDEX_SUFFIX, self.config.semantic_search.quantization.value
+            )
+            logger.debug("Created reindex embeddings tables.")
+
+            # Delete the saved stats file
+            if os.path.exists(os.path.join(CONFIG_DIR, ".search_stats.json")):
+                os.remove(os.path.join(CONFIG_DIR, ".search_stats.json"))
+
+            total_events = Event.select().count()
+            cursor = None
+            totals = {
+                "thumbnails": 0,
+                "descriptions": 0,
+                "processed_objects": total_events - 1
+                if total_events < batch_size
+                else 0,
+                "total_objects": total_events,
+                "time_remaining": 0 if total_events < batch_size else -1,
+                "status": "indexing",
+            }
+        else:
+            cursor = checkpoint["cursor"]
+            totals = checkpoint["totals"]
+            total_events = (
+                totals["processed_objects"]
+                + self._reindex_events(cursor, batch_size=None).count()
+            )
+            totals["total_objects"] = total_events
+            totals["status"] = "indexing"
+            logger.info(
+                "Resuming embeddings reindex after %d tracked objects",
+                totals["processed_objects"],
+            )
+
+        st = time.time()
+        processed_at_start = totals["processed_objects"]
         self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
 
-        events = (
-            Event.select()
-            .order_by(Event.start_time.desc())
-            .paginate(current_page, batch_size)
+        batches: queue.Queue = queue.Queue(maxsize=REINDEX_READ_AHEAD)
+        stop_reading = threading.Event()
+        reader = threading.Thread(
+            target=self._read_reindex_batches,
+            args=(cursor, batch_size, batches, stop_reading),
+            name="embeddings_reindex_reader",
+            daemon=True,
         )
+        reader.start()
 
-        while events:
-            event: Event
-            batch_thumbs = {}
-            batch_descs = {}
-            for event in events:
-                totals["processed_objects"] += 1
+        try:
+            while (batch := batches.get()) is not None:
+                if isinstance(batch, Exception):
+                    raise batch
+
+                count, batch_thumbs, batch_descs, cursor = batch
+                totals["processed_objects"] += count
+                totals["descriptions"] += len(batch_descs)
+
+                # run batch embedding
+                if batch_thumbs:
+                    embeddings = self.batch_embed_thumbnail(
+                        batch_thumbs, upsert=False, reindex=True
+                    )
+                    totals["thumbnails"] += len(embeddings)
+
+                    if embeddings:
+                        self.db.upsert_embeddings(
+                            "vec_thumbnails",
+                            list(embeddings),
+                            [serialize(e) for e in embeddings.values()],
+                            REINDEX_SUFFIX,
+                        )
 
-                if description := event.data.get("description", "").strip():
-                    batch_descs[event.id] = description
-                    totals["descriptions"] += 1
+                if batch_descs:
+                    embeddings = self.batch_embed_description(batch_descs, upsert=False)
+                    self.db.upsert_embeddings(
+                        "vec_descriptions",
+                        list(batch_descs),
+                        [serialize(e) for e in embeddings],
+                        REINDEX_SUFFIX,
+                    )
 
-                if thumbnail := get_event_thumbnail_bytes(event):
-                    batch_thumbs[event.id] = thumbnail
-                    totals["thumbnails"] += 1
+                self._save_reindex_checkpoint(cursor, totals)
 
-            # run batch embedding
-            if batch_thumbs:
-                self.batch_embed_thumbnail(batch_thumbs)
+                # report progress every batch so we don't spam the logs
+                progress = (totals["processed_objects"] / total_events) * 100
+                logger.debug(
+                    "Processed %d/%d events (%.2f%% complete) | Thumbnails: %d, Descriptions: %d",
+                    totals["processed_objects"],
+                    total_events,
+                    progress,
+                    totals["thumbnails"],
+                    totals["descriptions"],
+                )
 
-            if batch_descs:
-                self.batch_embed_description(batch_descs)
+                # Calculate time remaining
+                elapsed_time = time.time() - st
+                avg_time_per_event = elapsed_time / max(
+                    totals["processed_objects"] - processed_at_start, 1
+                )
+                remaining_events = total_events - totals["processed_objects"]
+                time_remaining = avg_time_per_event * remaining_events
+                totals["time_remaining"] = int(time_remaining)
 
-            # report progress every batch so we don't spam the logs
-            progress = (totals["processed_objects"] / total_events) * 100
-            logger.debug(
-                "Processed %d/%d events (%.2f%% complete) | Thumbnails: %d, Descriptions: %d",
-                totals["processed_objects"],
-                total_events,
-                progress,
-                totals["thumbnails"],
-                totals["descriptions"],
-            )
+                self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
+        finally:
+            stop_reading.set()
+            reader.join()
+
+        self.db.swap_embeddings_tables(REINDEX_SUFFIX)
+        self._clear_reindex_checkpoint()
 
-            # Calculate time remaining
-            elapsed_time = time.time() - st
-            avg_time_per_event = elapsed_time / totals["processed_objects"]
-            remaining_events = total_events - totals["processed_objects"]
-            time_remaining = avg_time_per_event * remaining_events
-            totals["time_remaining"] = int(time_remaining)
-
-            self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
-
-            # Move to the next page
-            current_page += 1
-            events = (
-                Event.select()
-                .order_by(Event.start_time.desc())
-                .paginate(current_page, batch_size)
+        for table in EMBEDDINGS_TABLES:
+            self.update_publisher.publish(
+                (table, []), EmbeddingsUpdateTypeEnum.reindex.value
             )
 
         logger.info(
@@ -423,6 +542,129 @@ class Embeddings:
 
         self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
 
+    def _reindex_events(
+        self, cursor: tuple[float, str] | None, batch_size: int | None
+    ) -> Any:
+        """Events after the cursor, newest first, using keyset pagination."""
+        query = Event.select(
+            Event.id, Event.camera, Event.start_time, Event.thumbnail, Event.data
+        )
+
+        if cursor is not None:
+            start_time, event_id = cursor
+            query = query.where(
+                (Event.start_time < start_time)
+                | ((Event.start_time == start_time) & (Event.id < event_id))
+            )
+
+        query = query.order_by(Event.start_time.desc(), Event.id.desc())
+
+        if batch_size is not None:
+            query = query.limit(batch_size)
+
+        return query
+
+    def _read_reindex_batches(
+        self,
+        cursor: tuple[float, str] | None,
+        batch_size: int,
+        batches: queue.Queue,
+        stop_event: threading.Event,
+    ) -> None:
+        """Read thumbnails for the reindex ahead of inference."""
+        result: Any = None
+
+        try:
+            while not stop_event.is_set():
+                events = list(self._reindex_events(cursor, batch_size))
+
+                if not events:
+                    break
+
+                batch_thumbs = {}
+                batch_descs = {}
+
+                for event in events:
+                    if description := (event.data or {}).get("description", "").strip():
+                        batch_descs[event.id] = description
+
+                    if thumbnail := get_event_thumbnail_bytes(event):
+                        batch_thumbs[event.id] = thumbnail
+
+                cursor = (events[-1].start_time, events[-1].id)
+
+                if not self._put_reindex_batch(
+                    batches,
+                    (len(events), batch_thumbs, batch_descs, cursor),
+                    stop_event,
+                ):
+                    return
+        except Exception as e:
+            logger.error(f"Failed to read tracked objects for reindex: {e}")
+            result = e
+
+        self._put_reindex_batch(batches, result, stop_event)
+
+    def _put_reindex_batch(
+        self, batches: queue.Queue, batch: Any, stop_event: threading.Event
+    ) -> bool:
+        while not stop_event.is_set():
+            try:
+                batches.put(batch, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def _load_reindex_checkpoint(self) -> dict[str, Any] | None:
+        """Load the checkpoint of an interrupted reindex with the same model."""
+        try:
+            with open(REINDEX_CHECKPOINT_FILE, "r") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            not isinstance(checkpoint, dict)
+            or checkpoint.get("model") != self.config.semantic_search.model
+            or checkpoint.get("model_size") != self.config.semantic_search.model_size
+            or not isinstance(checkpoint.get("cursor"), list)
+            or not isinstance(checkpoint.get("totals"), dict)
+            or not self.db.embeddings_tables_exist(REINDEX_SUFFIX)
+            or not self.db.embeddings_have_metadata(f"vec_thumbnails{REINDEX_SUFFIX}")
+            or self.db.embeddings_quantization(f"vec_thumbnails{REINDEX_SUFFIX}")
+            != self.config.semantic_search.quantization.value
+        ):
+            self._clear_reindex_checkpoint()
+            return None
+
+        checkpoint["cursor"] = tuple(checkpoint["cursor"])
+        return checkpoint
+
+    def _save_reindex_checkpoint(
+        self, cursor: tuple[float, str], totals: dict[str, Any]
+    ) -> None:
+        try:
+            with open(REINDEX_CHECKPOINT_FILE, "w") as f:
+                json.dump(
+                    {
+                        "model": self.config.semantic_search.model,
+                        "model_size": self.config.semantic_search.model_size,
+                        "cursor": list(cursor),
+                        "totals": totals,
+                    },
+                    f,
+                )
+        except OSError as e:
+            logger.warning(f"Unable to save embeddings reindex checkpoint: {e}")
+
+    def _clear_reindex_checkpoint(self) -> None:
+        try:
+            os.remove(REINDEX_CHECKPOINT_FILE)
+        except FileNotFoundError:
+            pass
+
     def start_reindex(self) -> bool:
         """Start reindexing in a separate thread if not already running."""
         with self.reindex_lock:
@@ -633,13 +875,9 @@ class Embeddings:
         elif trigger.type == "thumbnail":
             # For image triggers, trigger.data should be an image ID
             # Try to get embedding from vec_thumbnails table first
-            cursor = self.db.execute_sql(
-                "SELECT thumbnail_embedding FROM vec_thumbnails WHERE id = ?",
-                [trigger.data],
-            )
-            row = cursor.fetchone() if cursor else None
-            if row:
-                return row[0]  # Already in bytes format
+            embedding = self.db.get_embedding("vec_thumbnails", trigger.data)
+            if embedding:
+                return embedding  # Already in bytes format
             else:
                 logger.debug(
                     f"No thumbnail embedding found for image ID: {trigger.data}, generating from saved trigger thumbnail"
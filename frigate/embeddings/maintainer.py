@@ -2,15 +2,21 @@
 
 import base64
 import datetime
+import itertools
 import logging
 import threading
+from functools import partial
 from multiprocessing.synchronize import Event as MpEvent
-from typing import Any
+from typing import Any, Callable
 
 from peewee import DoesNotExist
 
 from frigate.comms.config_updater import ConfigSubscriber
-from frigate.comms.detections_updater import DetectionSubscriber, DetectionTypeEnum
+from frigate.comms.detections_updater import (
+    DetectionProjectionEnum,
+    DetectionSubscriber,
+    DetectionTypeEnum,
+)
 from frigate.comms.embeddings_updater import (
     EmbeddingsRequestEnum,
     EmbeddingsResponder,
@@ -70,6 +76,8 @@ from .embeddings import Embeddings
 logger = logging.getLogger(__name__)
 
 MAX_THUMBNAILS = 10
+# max tracked object updates read at once
+MAX_QUEUED_UPDATES = 50
 
 
 class EmbeddingMaintainer(threading.Thread):
@@ -139,7 +147,9 @@ class EmbeddingMaintainer(threading.Thread):
             RecordingsDataTypeEnum.saved
         )
         self.review_subscriber = ReviewDataSubscriber("")
-        self.detection_subscriber = DetectionSubscriber(DetectionTypeEnum.video.value)
+        self.detection_subscriber = DetectionSubscriber(
+            DetectionTypeEnum.video.value, DetectionProjectionEnum.summary
+        )
         self.embeddings_responder = EmbeddingsResponder()
         self.frame_manager = SharedMemoryFrameManager()
 
@@ -280,6 +290,10 @@ class EmbeddingMaintainer(threading.Thread):
             self._expire_dedicated_lpr()
             self._process_finalized()
             self._process_event_metadata()
+            self._process_queued_triggers()
+
+        if self.config.semantic_search.enabled:
+            self.embeddings.stop()
 
         self.config_updater.stop()
         self.enrichment_config_subscriber.stop()
@@ -424,18 +438,44 @@ class EmbeddingMaintainer(threading.Thread):
         if update is None:
             return
 
-        source_type, _, camera, frame_name, data = update
+        # the objects updated in a frame are published one after another, read
+        # the queued updates so processors can handle the objects of a frame at once
+        updates = [update]
 
-        logger.debug(
-            f"Received update - source_type: {source_type}, camera: {camera}, data label: {data.get('label') if data else 'None'}"
-        )
+        while len(updates) < MAX_QUEUED_UPDATES:
+            update = self.event_subscriber.check_for_update(timeout=0)
+
+            if update is None:
+                break
+
+            updates.append(update)
+
+        tracked_updates: list[tuple[str, str, dict[str, Any]]] = []
 
-        if not camera or source_type != EventTypeEnum.tracked_object:
+        for source_type, _, camera, frame_name, data in updates:
             logger.debug(
-                f"Skipping update - camera: {camera}, source_type: {source_type}"
+                f"Received update - source_type: {source_type}, camera: {camera}, data label: {data.get('label') if data else 'None'}"
             )
-            return
 
+            if not camera or source_type != EventTypeEnum.tracked_object:
+                logger.debug(
+                    f"Skipping update - camera: {camera}, source_type: {source_type}"
+                )
+                continue
+
+            tracked_updates.append((camera, frame_name, data))
+
+        for (camera, frame_name), frame_updates in itertools.groupby(
+            tracked_updates, key=lambda update: update[:2]
+        ):
+            self._process_frame_objects(
+                camera, frame_name, [data for _, _, data in frame_updates]
+            )
+
+    def _process_frame_objects(
+        self, camera: str, frame_name: str, objects: list[dict[str, Any]]
+    ) -> None:
+        """Process the tracked objects updated in a frame."""
         if self.config.semantic_search.enabled:
             self.embeddings.update_stats()
 
@@ -450,6 +490,8 @@ class EmbeddingMaintainer(threading.Thread):
             )
             return
 
+        yuv_frame = None
+
         # Create our own thumbnail based on the bounding box and the frame time
         try:
             yuv_frame = self.frame_manager.get(
@@ -466,23 +508,24 @@ class EmbeddingMaintainer(threading.Thread):
             return
 
         logger.debug(
-            f"Processing {len(self.realtime_processors)} realtime processors for object {data.get('id')} (label: {data.get('label')})"
+            f"Processing {len(self.realtime_processors)} realtime processors for objects {[data.get('id') for data in objects]}"
         )
         for processor in self.realtime_processors:
-            logger.debug(f"Calling process_frame on {processor.__class__.__name__}")
-            processor.process_frame(data, yuv_frame)
+            logger.debug(f"Calling process_objects on {processor.__class__.__name__}")
+            processor.process_objects(objects, yuv_frame)
 
         for processor in self.post_processors:
             if isinstance(processor, ObjectDescriptionProcessor):
-                processor.process_data(
-                    {
-                        "camera": camera,
-                        "data": data,
-                        "state": "update",
-                        "yuv_frame": yuv_frame,
-                    },
-                    PostProcessDataEnum.tracked_object,
-                )
+                for data in objects:
+                    processor.process_data(
+                        {
+                            "camera": camera,
+                            "data": data,
+                            "state": "update",
+                            "yuv_frame": yuv_frame,
+                        },
+                        PostProcessDataEnum.tracked_object,
+                    )
 
         self.frame_manager.close(frame_name)
 
@@ -501,6 +544,7 @@ class EmbeddingMaintainer(threading.Thread):
                 processor.expire_object(event_id, camera)
 
             thumbnail: bytes | None = None
+            thumbnail_queued = False
 
             if updated_db:
                 try:
@@ -515,8 +559,12 @@ class EmbeddingMaintainer(threading.Thread):
                 # Extract valid thumbnail
                 thumbnail = get_event_thumbnail_bytes(event)
 
-                # Embed the thumbnail
-                self._embed_thumbnail(event_id, thumbnail)
+                # Embed the thumbnail, image triggers are queued once it is stored
+                thumbnail_queued = self._embed_thumbnail(
+                    event_id,
+                    thumbnail,
+                    partial(self._queue_image_triggers, event_id, camera),
+                )
 
             # call any defined post processors
             for processor in self.post_processors:
@@ -543,10 +591,11 @@ class EmbeddingMaintainer(threading.Thread):
                 elif isinstance(processor, AudioTranscriptionPostProcessor):
                     continue
                 elif isinstance(processor, SemanticTriggerProcessor):
-                    processor.process_data(
-                        {"event_id": event_id, "camera": camera, "type": "image"},
-                        PostProcessDataEnum.tracked_object,
-                    )
+                    if not thumbnail_queued:
+                        processor.process_data(
+                            {"event_id": event_id, "camera": camera, "type": "image"},
+                            PostProcessDataEnum.tracked_object,
+                        )
                 elif isinstance(processor, ObjectDescriptionProcessor):
                     if not updated_db:
                         # Still need to cleanup tracked events even if not processing
@@ -700,9 +749,29 @@ class EmbeddingMaintainer(threading.Thread):
 
         self.frame_manager.close(frame_name)
 
-    def _embed_thumbnail(self, event_id: str, thumbnail: bytes) -> None:
-        """Embed the thumbnail for an event."""
-        if not self.config.semantic_search.enabled:
-            return
+    def _embed_thumbnail(
+        self,
+        event_id: str,
+        thumbnail: bytes | None,
+        callback: Callable[[], None] | None = None,
+    ) -> bool:
+        """Queue the thumbnail of an event for embedding, returns True if queued."""
+        if not self.config.semantic_search.enabled or not thumbnail:
+            return False
+
+        self.embeddings.queue_thumbnail(event_id, thumbnail, callback)
+        return True
+
+    def _queue_image_triggers(self, event_id: str, camera: str) -> None:
+        # runs on the thumbnail batch thread
+        for processor in self.post_processors:
+            if isinstance(processor, SemanticTriggerProcessor):
+                processor.queue_object(
+                    {"event_id": event_id, "camera": camera, "type": "image"}
+                )
 
-        self.embeddings.embed_thumbnail(event_id, thumbnail)
+    def _process_queued_triggers(self) -> None:
+        """Process the triggers of objects whose embeddings were stored."""
+        for processor in self.post_processors:
+            if isinstance(processor, SemanticTriggerProcessor):
+                processor.process_queued_objects()
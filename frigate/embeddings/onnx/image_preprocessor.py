@@ -0,0 +1,107 @@
+"""Parallel decoding and preprocessing of images for vision embedding models."""
+
+import io
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import numpy as np
+import requests
+from PIL import Image
+
+from frigate.data_processing.types import DataProcessorMetrics
+from frigate.util.builtin import InferenceSpeed
+
+logger = logging.getLogger(__name__)
+
+PREPROCESS_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def decode_image(image: Any) -> np.ndarray:
+    """Decode encoded bytes, a url or a PIL image to an RGB array."""
+    if isinstance(image, str) and image.startswith("http"):
+        image = requests.get(image).content
+
+    if isinstance(image, bytes):
+        # decoded with PIL like the reference preprocessing of the models
+        try:
+            image = Image.open(io.BytesIO(image))
+            image.load()
+        except OSError as e:
+            raise ValueError(f"unable to decode image: {e}")
+
+    if isinstance(image, Image.Image):
+        return np.asarray(image.convert("RGB"))
+
+    if isinstance(image, np.ndarray):
+        return image
+
+    raise ValueError(f"unsupported image type {type(image).__name__}")
+
+
+class ImagePreprocessor:
+    """Decodes and transforms a batch of images into one model input tensor.
+
+    Every image is decoded once and transformed straight into its slot of a
+    preallocated batch tensor on a thread pool, Pillow and NumPy release the
+    GIL so the images are processed in parallel. Images that can't be decoded
+    are left out of the batch.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, ...],
+        transform: Callable[[np.ndarray, np.ndarray], None],
+        metrics: DataProcessorMetrics | None = None,
+        workers: int = PREPROCESS_WORKERS,
+    ) -> None:
+        """transform writes a decoded RGB image into an array of the given shape."""
+        self.shape = shape
+        self.transform = transform
+        self.executor = ThreadPoolExecutor(
+            workers, thread_name_prefix="embeddings_preprocess"
+        )
+        self.decode_speed: InferenceSpeed | None = None
+        self.preprocess_speed: InferenceSpeed | None = None
+
+        if metrics is not None:
+            self.decode_speed = InferenceSpeed(metrics.image_embeddings_decode_speed)
+            self.preprocess_speed = InferenceSpeed(
+                metrics.image_embeddings_preprocess_speed
+            )
+
+    def __call__(self, images: list[Any]) -> tuple[np.ndarray, list[int]]:
+        """Returns the batch tensor and the indexes of the images in it."""
+        batch = np.empty((len(images), *self.shape), dtype=np.float32)
+
+        def process(i: int) -> tuple[float, float] | None:
+            start = time.monotonic()
+
+            try:
+                decoded = decode_image(images[i])
+            except Exception as e:
+                logger.warning(f"Skipping image that could not be decoded: {e}")
+                return None
+
+            decoded_at = time.monotonic()
+            self.transform(decoded, batch[i])
+            return decoded_at - start, time.monotonic() - decoded_at
+
+        if len(images) == 1:
+            timings = [process(0)]
+        else:
+            timings = list(self.executor.map(process, range(len(images))))
+
+        valid = [i for i, timing in enumerate(timings) if timing is not None]
+
+        if valid and self.decode_speed is not None:
+            # time spent per image by a worker in each stage
+            self.decode_speed.update(sum(timings[i][0] for i in valid) / len(valid))
+            self.preprocess_speed.update(sum(timings[i][1] for i in valid) / len(valid))
+
+        if len(valid) != len(images):
+            batch = batch[valid]
+
+        return batch, valid
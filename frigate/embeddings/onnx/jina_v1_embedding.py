@@ -3,13 +3,17 @@
 import logging
 import os
 import threading
+import time
 import warnings
 
+import numpy as np
+from PIL import Image
 from transformers import AutoFeatureExtractor, AutoTokenizer
 from transformers.utils.logging import disable_progress_bar
 
 from frigate.comms.inter_process import InterProcessRequestor
 from frigate.const import MODEL_CACHE_DIR, UPDATE_MODEL_STATE
+from frigate.data_processing.types import DataProcessorMetrics
 from frigate.detectors.detection_runners import BaseModelRunner, get_optimized_runner
 
 # importing this without pytorch or others causes a warning
@@ -17,9 +21,11 @@ from frigate.detectors.detection_runners import BaseModelRunner, get_optimized_r
 # suppressed by setting env TRANSFORMERS_NO_ADVISORY_WARNINGS=1
 from frigate.embeddings.types import EnrichmentModelTypeEnum
 from frigate.types import ModelStatusTypesEnum
+from frigate.util.builtin import InferenceSpeed
 from frigate.util.downloader import ModelDownloader
 
 from .base_embedding import BaseEmbedding
+from .image_preprocessor import ImagePreprocessor
 
 warnings.filterwarnings(
     "ignore",
@@ -156,6 +162,7 @@ class JinaV1ImageEmbedding(BaseEmbedding):
         model_size: str,
         requestor: InterProcessRequestor,
         device: str = "AUTO",
+        metrics: DataProcessorMetrics | None = None,
     ):
         model_file = (
             "vision_model_fp16.onnx"
@@ -176,8 +183,14 @@ class JinaV1ImageEmbedding(BaseEmbedding):
         self.device = device
         self.download_path = os.path.join(MODEL_CACHE_DIR, self.model_name)
         self.feature_extractor = None
+        self.image_preprocessor: ImagePreprocessor | None = None
+        self.metrics = metrics
+        self.image_inference_speed = (
+            InferenceSpeed(metrics.image_embeddings_inference_speed)
+            if metrics is not None
+            else None
+        )
         self.runner: BaseModelRunner | None = None
-        self._lock = threading.Lock()
         files_names = list(self.download_urls.keys())
         if not all(
             os.path.exists(os.path.join(self.download_path, n)) for n in files_names
@@ -212,6 +225,7 @@ class JinaV1ImageEmbedding(BaseEmbedding):
             self.feature_extractor = AutoFeatureExtractor.from_pretrained(
                 f"{MODEL_CACHE_DIR}/{self.model_name}",
             )
+            self.image_preprocessor = self._create_image_preprocessor()
 
             self.runner = get_optimized_runner(
                 os.path.join(self.download_path, self.model_file),
@@ -219,10 +233,67 @@ class JinaV1ImageEmbedding(BaseEmbedding):
                 model_type=EnrichmentModelTypeEnum.jina_v1.value,
             )
 
+    def _create_image_preprocessor(self) -> ImagePreprocessor:
+        """Preprocess images the same way as the CLIP feature extractor."""
+        extractor = self.feature_extractor
+        self.resize_size = extractor.size["shortest_edge"]
+        crop_size = (extractor.crop_size["height"], extractor.crop_size["width"])
+        self.rescale_factor = np.float32(extractor.rescale_factor)
+        self.image_mean = np.array(extractor.image_mean, dtype=np.float32)[
+            :, np.newaxis, np.newaxis
+        ]
+        self.image_std = np.array(extractor.image_std, dtype=np.float32)[
+            :, np.newaxis, np.newaxis
+        ]
+        self.resample = Image.Resampling(extractor.resample)
+        return ImagePreprocessor((3, *crop_size), self._transform_image, self.metrics)
+
+    def _transform_image(self, image: np.ndarray, out: np.ndarray) -> None:
+        """Resize the shortest edge, center crop, rescale and normalize."""
+        height, width = image.shape[:2]
+        size = self.resize_size
+
+        if height <= width:
+            resized = (int(size * width / height), size)
+        else:
+            resized = (size, int(size * height / width))
+
+        # resampled with PIL like the feature extractor, the embeddings of
+        # other filters differ noticeably on detailed images
+        image = np.asarray(Image.fromarray(image).resize(resized, self.resample))
+
+        crop_height, crop_width = out.shape[1:]
+        top = (resized[1] - crop_height) // 2
+        left = (resized[0] - crop_width) // 2
+
+        # (H, W, C) -> (C, H, W)
+        out[:] = image[top : top + crop_height, left : left + crop_width].transpose(
+            2, 0, 1
+        )
+        out *= self.rescale_factor
+        out -= self.image_mean
+        out /= self.image_std
+
     def _preprocess_inputs(self, raw_inputs):
-        with self._lock:
-            processed_images = [self._process_image(img) for img in raw_inputs]
-            return [
-                self.feature_extractor(images=image, return_tensors="np")
-                for image in processed_images
-            ]
+        return self.image_preprocessor(raw_inputs)
+
+    def __call__(self, inputs: list) -> list[np.ndarray | None]:
+        """Embed the images, images that can't be decoded get no embedding."""
+        self._load_model_and_utils()
+        pixel_values, valid = self._preprocess_inputs(inputs)
+
+        if not valid:
+            return [None] * len(inputs)
+
+        start = time.monotonic()
+        outputs = self.runner.run({"pixel_values": pixel_values})[0]
+
+        if self.image_inference_speed is not None:
+            self.image_inference_speed.update((time.monotonic() - start) / len(valid))
+
+        results: list[np.ndarray | None] = [None] * len(inputs)
+
+        for i, embedding in zip(valid, self._postprocess_outputs(outputs)):
+            results[i] = embedding
+
+        return results
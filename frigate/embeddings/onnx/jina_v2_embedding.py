@@ -1,9 +1,9 @@
 """JinaV2 Embeddings."""
 
-import io
 import logging
 import os
 import threading
+import time
 
 import numpy as np
 from PIL import Image
@@ -12,12 +12,15 @@ from transformers.utils.logging import disable_progress_bar, set_verbosity_error
 
 from frigate.comms.inter_process import InterProcessRequestor
 from frigate.const import MODEL_CACHE_DIR, UPDATE_MODEL_STATE
+from frigate.data_processing.types import DataProcessorMetrics
 from frigate.detectors.detection_runners import get_optimized_runner
 from frigate.embeddings.types import EnrichmentModelTypeEnum
 from frigate.types import ModelStatusTypesEnum
+from frigate.util.builtin import InferenceSpeed
 from frigate.util.downloader import ModelDownloader
 
 from .base_embedding import BaseEmbedding
+from .image_preprocessor import ImagePreprocessor
 
 # disables the progress bar and download logging for downloading tokenizers and image processors
 disable_progress_bar()
@@ -32,6 +35,7 @@ class JinaV2Embedding(BaseEmbedding):
         requestor: InterProcessRequestor,
         device: str = "AUTO",
         embedding_type: str = None,
+        metrics: DataProcessorMetrics | None = None,
     ):
         model_file = (
             "model_fp16.onnx" if model_size == "large" else "model_quantized.onnx"
@@ -54,6 +58,14 @@ class JinaV2Embedding(BaseEmbedding):
         self.tokenizer = None
         self.image_processor = None
         self.runner = None
+        self.image_preprocessor = ImagePreprocessor(
+            (3, 512, 512), self._transform_image, metrics
+        )
+        self.image_inference_speed = (
+            InferenceSpeed(metrics.image_embeddings_inference_speed)
+            if metrics is not None
+            else None
+        )
 
         # Lock to prevent concurrent calls (text and vision share this instance)
         self._call_lock = threading.Lock()
@@ -141,31 +153,23 @@ class JinaV2Embedding(BaseEmbedding):
                 model_type=EnrichmentModelTypeEnum.jina_v2.value,
             )
 
-    def _preprocess_image(self, image_data: bytes | Image.Image) -> np.ndarray:
-        """
-        Manually preprocess a single image from bytes or PIL.Image to (3, 512, 512).
-        """
-        if isinstance(image_data, bytes):
-            image = Image.open(io.BytesIO(image_data))
-        else:
-            image = image_data
-
-        if image.mode != "RGB":
-            image = image.convert("RGB")
-
-        image = image.resize((512, 512), Image.Resampling.LANCZOS)
-
-        # Convert to numpy array, normalize to [0, 1], and transpose to (channels, height, width)
-        image_array = np.array(image, dtype=np.float32) / 255.0
-        image_array = np.transpose(image_array, (2, 0, 1))  # (H, W, C) -> (C, H, W)
+    def _transform_image(self, image: np.ndarray, out: np.ndarray) -> None:
+        """Resize a decoded RGB image to (3, 512, 512) normalized to [0, 1]."""
+        # resampled with PIL like the reference preprocessing of the model
+        image = np.asarray(
+            Image.fromarray(image).resize((512, 512), Image.Resampling.LANCZOS)
+        )
 
-        return image_array
+        # (H, W, C) -> (C, H, W)
+        out[:] = image.transpose(2, 0, 1)
+        out *= 1 / 255.0
 
     def _preprocess_inputs(self, raw_inputs):
         """
         Preprocess inputs into a list of real input tensors (no dummies).
         - For text: Returns list of input_ids.
-        - For vision: Returns list of pixel_values.
+        - For vision: Returns the batch of pixel_values and the indexes of the
+          images in it.
         """
         if not isinstance(raw_inputs, list):
             raw_inputs = [raw_inputs]
@@ -176,11 +180,7 @@ class JinaV2Embedding(BaseEmbedding):
                 input_ids = self.tokenizer([text], return_tensors="np")["input_ids"]
                 processed.append(input_ids)
         elif self.embedding_type == "vision":
-            for img in raw_inputs:
-                pixel_values = self._preprocess_image(img)
-                processed.append(
-                    pixel_values[np.newaxis, ...]
-                )  # Add batch dim: (1, 3, 512, 512)
+            return self.image_preprocessor(raw_inputs)
         else:
             raise ValueError(
                 f"Invalid embedding_type: {self.embedding_type}. Must be 'text' or 'vision'."
@@ -205,7 +205,8 @@ class JinaV2Embedding(BaseEmbedding):
 
     def __call__(
         self, inputs: list[str] | list[Image.Image] | list[str], embedding_type=None
-    ) -> list[np.ndarray]:
+    ) -> list[np.ndarray | None]:
+        """Embed the inputs, images that can't be decoded get no embedding."""
         # Lock the entire call to prevent race conditions when text and vision
         # embeddings are called concurrently from different threads
         with self._call_lock:
@@ -217,22 +218,28 @@ class JinaV2Embedding(BaseEmbedding):
 
             self._load_model_and_utils()
             processed = self._preprocess_inputs(inputs)
-            batch_size = len(processed)
 
             # Prepare ONNX inputs with matching batch sizes
             onnx_inputs = {}
             if self.embedding_type == "text":
+                batch_size = len(processed)
                 onnx_inputs["input_ids"] = np.stack([x[0] for x in processed])
                 onnx_inputs["pixel_values"] = np.zeros(
                     (batch_size, 3, 512, 512), dtype=np.float32
                 )
             elif self.embedding_type == "vision":
-                onnx_inputs["input_ids"] = np.zeros((batch_size, 16), dtype=np.int64)
-                onnx_inputs["pixel_values"] = np.stack([x[0] for x in processed])
+                pixel_values, valid = processed
+
+                if not valid:
+                    return [None] * len(inputs)
+
+                onnx_inputs["input_ids"] = np.zeros((len(valid), 16), dtype=np.int64)
+                onnx_inputs["pixel_values"] = pixel_values
             else:
                 raise ValueError("Invalid embedding type")
 
             # Run inference
+            start = time.monotonic()
             outputs = self.runner.run(onnx_inputs)
             if self.embedding_type == "text":
                 embeddings = outputs[2]  # text embeddings
@@ -242,4 +249,18 @@ class JinaV2Embedding(BaseEmbedding):
                 raise ValueError("Invalid embedding type")
 
             embeddings = self._postprocess_outputs(embeddings)
-            return [embedding for embedding in embeddings]
+
+            if self.embedding_type == "text":
+                return [embedding for embedding in embeddings]
+
+            if self.image_inference_speed is not None:
+                self.image_inference_speed.update(
+                    (time.monotonic() - start) / len(valid)
+                )
+
+            results: list[np.ndarray | None] = [None] * len(inputs)
+
+            for i, embedding in zip(valid, embeddings):
+                results[i] = embedding
+
+            return results
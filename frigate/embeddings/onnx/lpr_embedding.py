@@ -87,8 +87,8 @@ class PaddleOCRDetection(BaseEmbedding):
     def _preprocess_inputs(self, raw_inputs):
         preprocessed = []
         for x in raw_inputs:
-            preprocessed.append(x)
-        return [{"x": preprocessed[0]}]
+            preprocessed.append({"x": x})
+        return preprocessed
 
 
 class PaddleOCRClassification(BaseEmbedding):
@@ -0,0 +1,74 @@
+"""LRU cache of text query embeddings for semantic search."""
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+QUERY_CACHE_SIZE = 256
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of serialized query embeddings keyed by model and query text.
+
+    Entries of a different model are dropped as soon as a lookup is made with
+    a new model, so a model change never returns embeddings from the old one.
+    """
+
+    def __init__(self, max_size: int = QUERY_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.entries: OrderedDict[str, bytes] = OrderedDict()
+        self.model: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        # the tokenizers are case sensitive, only whitespace is normalized
+        return " ".join(query.split())
+
+    def get(self, model: str, query: str) -> bytes | None:
+        key = self.normalize(query)
+
+        with self.lock:
+            if model != self.model:
+                self.entries.clear()
+                self.model = model
+
+            embedding = self.entries.get(key)
+
+            if embedding is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, model: str, query: str, embedding: bytes) -> None:
+        key = self.normalize(query)
+
+        with self.lock:
+            if model != self.model:
+                self.entries.clear()
+                self.model = model
+
+            self.entries[key] = embedding
+            self.entries.move_to_end(key)
+
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
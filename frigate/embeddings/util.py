@@ -2,6 +2,8 @@
 
 import math
 
+import numpy as np
+
 
 class ZScoreNormalization:
     def __init__(self, scale_factor: float = 1.0, bias: float = 0.0):
@@ -22,11 +24,13 @@ class ZScoreNormalization:
     def stddev(self):
         return math.sqrt(self.variance) if self.variance > 0 else 0.0
 
-    def normalize(self, distances: list[float], save_stats: bool):
+    def normalize(self, distances: list[float] | np.ndarray, save_stats: bool):
         if save_stats:
             self._update(distances)
         if self.stddev == 0:
             return distances
+        if isinstance(distances, np.ndarray):
+            return (distances - self.mean) / self.stddev * self.scale_factor + self.bias
         return [
             (x - self.mean) / self.stddev * self.scale_factor + self.bias
             for x in distances
@@ -0,0 +1,200 @@
+"""In-memory index of embeddings for exact similarity search with NumPy."""
+
+import threading
+from typing import Any
+
+import numpy as np
+
+INITIAL_CAPACITY = 1024
+
+
+class VectorIndex:
+    """Matrix of normalized embeddings with their ids and search metadata.
+
+    Distances are cosine distances like the ones returned by sqlite-vec, so
+    results of both can be mixed. Removed rows are replaced by the last row to
+    keep the matrix dense.
+    """
+
+    def __init__(self, dimensions: int = 768) -> None:
+        self.dimensions = dimensions
+        self.matrix = np.empty((INITIAL_CAPACITY, dimensions), dtype=np.float32)
+        self.cameras = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+        self.labels = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+        self.days = np.empty(INITIAL_CAPACITY, dtype=np.int32)
+        self.ids: list[str] = []
+        self.positions: dict[str, int] = {}
+        # camera and label names are stored as codes into these lists
+        self.codes: dict[str, int] = {}
+        self.names: list[str] = []
+        # filters can only be applied when the table had metadata
+        self.has_metadata = True
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def upsert(self, rows: list[tuple]) -> None:
+        """Add or replace rows of (id, embedding[, camera, label, start_day])."""
+        if not rows:
+            return
+
+        embeddings = np.frombuffer(
+            b"".join(row[1] for row in rows), dtype=np.float32
+        ).reshape(len(rows), self.dimensions)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.where(norms == 0, 1, norms)
+
+        with self.lock:
+            for row, embedding in zip(rows, embeddings):
+                event_id = row[0]
+                position = self.positions.get(event_id)
+
+                if position is None:
+                    position = len(self.ids)
+                    self._reserve(position + 1)
+                    self.ids.append(event_id)
+                    self.positions[event_id] = position
+
+                self.matrix[position] = embedding
+
+                if len(row) > 2:
+                    self.cameras[position] = self._code(row[2])
+                    self.labels[position] = self._code(row[3])
+                    self.days[position] = row[4]
+                else:
+                    self.has_metadata = False
+
+    def remove(self, event_ids: list[str]) -> None:
+        with self.lock:
+            for event_id in event_ids:
+                position = self.positions.pop(event_id, None)
+
+                if position is None:
+                    continue
+
+                last = len(self.ids) - 1
+                last_id = self.ids.pop()
+
+                if position != last:
+                    self.ids[position] = last_id
+                    self.positions[last_id] = position
+                    self.matrix[position] = self.matrix[last]
+                    self.cameras[position] = self.cameras[last]
+                    self.labels[position] = self.labels[last]
+                    self.days[position] = self.days[last]
+
+    def get(self, event_id: str) -> bytes | None:
+        """Normalized embedding of an object."""
+        with self.lock:
+            position = self.positions.get(event_id)
+            return None if position is None else self.matrix[position].tobytes()
+
+    def search(
+        self,
+        query: bytes,
+        k: int,
+        event_ids: list[str] | None = None,
+        cameras: list[str] | None = None,
+        labels: list[str] | None = None,
+        after_day: int | None = None,
+        before_day: int | None = None,
+    ) -> list[tuple[str, float]]:
+        """Find the k nearest embeddings that match the filters."""
+        query_embedding = np.frombuffer(query, dtype=np.float32)
+        norm = np.linalg.norm(query_embedding)
+
+        if norm > 0:
+            query_embedding = query_embedding / norm
+
+        with self.lock:
+            count = len(self.ids)
+            candidates: np.ndarray | None = None
+
+            if event_ids:
+                candidates = np.array(
+                    [self.positions[i] for i in event_ids if i in self.positions],
+                    dtype=np.int64,
+                )
+
+            if self.has_metadata and (
+                cameras or labels or after_day is not None or before_day is not None
+            ):
+                mask = np.ones(count, dtype=bool)
+
+                if cameras:
+                    mask &= np.isin(self.cameras[:count], self._codes(cameras))
+
+                if labels:
+                    mask &= np.isin(self.labels[:count], self._codes(labels))
+
+                if after_day is not None:
+                    mask &= self.days[:count] >= after_day
+
+                if before_day is not None:
+                    mask &= self.days[:count] <= before_day
+
+                candidates = (
+                    np.flatnonzero(mask)
+                    if candidates is None
+                    else candidates[mask[candidates]]
+                )
+
+            if candidates is None:
+                distances = 1 - self.matrix[:count] @ query_embedding
+            else:
+                distances = 1 - self.matrix[candidates] @ query_embedding
+
+            if len(distances) > k:
+                nearest = np.argpartition(distances, k - 1)[:k]
+            else:
+                nearest = np.arange(len(distances))
+
+            nearest = nearest[np.argsort(distances[nearest])]
+            positions = nearest if candidates is None else candidates[nearest]
+            return [
+                (self.ids[p], float(d))
+                for p, d in zip(positions.tolist(), distances[nearest].tolist())
+            ]
+
+    def get_stats(self) -> dict[str, Any]:
+        with self.lock:
+            return {
+                "count": len(self.ids),
+                "memory": self.matrix.nbytes
+                + self.cameras.nbytes
+                + self.labels.nbytes
+                + self.days.nbytes,
+            }
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self.matrix)
+
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+
+        matrix = np.empty((capacity, self.dimensions), dtype=np.float32)
+        matrix[: len(self.ids)] = self.matrix[: len(self.ids)]
+        self.matrix = matrix
+
+        for name in ("cameras", "labels", "days"):
+            array = np.empty(capacity, dtype=np.int32)
+            array[: len(self.ids)] = getattr(self, name)[: len(self.ids)]
+            setattr(self, name, array)
+
+    def _code(self, name: str) -> int:
+        code = self.codes.get(name)
+
+        if code is None:
+            code = len(self.names)
+            self.codes[name] = code
+            self.names.append(name)
+
+        return code
+
+    def _codes(self, names: list[str]) -> list[int]:
+        # names that were never stored match nothing
+        return [self.codes[n] for n in names if n in self.codes]
@@ -11,7 +11,7 @@ from typing import Tuple
 import numpy as np
 
 from frigate.comms.detections_updater import DetectionPublisher, DetectionTypeEnum
-from frigate.comms.inter_process import InterProcessRequestor
+from frigate.comms.inter_process import InterProcessNotifier, InterProcessRequestor
 from frigate.config import CameraConfig, CameraInput, FfmpegConfig, FrigateConfig
 from frigate.config.camera.updater import (
     CameraConfigUpdateEnum,
@@ -169,6 +169,7 @@ class AudioEventMaintainer(threading.Thread):
 
         # create communication for audio detections
         self.requestor = InterProcessRequestor()
+        self.notifier = InterProcessNotifier()
         self.config_subscriber = CameraConfigUpdateSubscriber(
             None,
             {self.camera_config.name: self.camera_config},
@@ -242,9 +243,11 @@ class AudioEventMaintainer(threading.Thread):
             )
 
         # send audio activity update
-        self.requestor.send_data(
+        # updates without detections only expire old ones and can be coalesced
+        self.notifier.send_data(
             UPDATE_AUDIO_ACTIVITY,
             {self.camera_config.name: {"detections": audio_detections}},
+            coalesce=len(audio_detections) == 0,
         )
 
         # run audio transcription
@@ -272,8 +275,12 @@ class AudioEventMaintainer(threading.Thread):
         else:
             dBFS = 0
 
-        self.requestor.send_data(f"{self.camera_config.name}/audio/dBFS", float(dBFS))
-        self.requestor.send_data(f"{self.camera_config.name}/audio/rms", float(rms))
+        self.notifier.send_data(
+            f"{self.camera_config.name}/audio/dBFS", float(dBFS), coalesce=True
+        )
+        self.notifier.send_data(
+            f"{self.camera_config.name}/audio/rms", float(rms), coalesce=True
+        )
 
         return float(rms), float(dBFS)
 
@@ -362,6 +369,7 @@ class AudioEventMaintainer(threading.Thread):
                 )
         self.logpipe.close()
         self.requestor.stop()
+        self.notifier.stop()
         self.config_subscriber.stop()
         self.detection_publisher.stop()
 
@@ -8,9 +8,13 @@ from multiprocessing.synchronize import Event as MpEvent
 from pathlib import Path
 from typing import Any
 
+from frigate.comms.embeddings_updater import (
+    EmbeddingsUpdatePublisher,
+    EmbeddingsUpdateTypeEnum,
+)
 from frigate.config import FrigateConfig
 from frigate.const import CLIPS_DIR
-from frigate.db.sqlitevecq import SqliteVecQueueDatabase
+from frigate.db.sqlitevecq import EMBEDDINGS_TABLES, SqliteVecQueueDatabase
 from frigate.models import Event, Timeline
 from frigate.util.file import delete_event_snapshot, delete_event_thumbnail
 
@@ -31,6 +35,7 @@ class EventCleanup(threading.Thread):
         self.camera_keys = list(self.config.cameras.keys())
         self.removed_camera_labels: list[str] = None
         self.camera_labels: dict[str, dict[str, Any]] = {}
+        self.embeddings_updater: EmbeddingsUpdatePublisher | None = None
 
     def get_removed_camera_labels(self) -> list[Event]:
         """Get a list of distinct labels for removed cameras."""
@@ -324,6 +329,9 @@ class EventCleanup(threading.Thread):
         return events_to_update
 
     def run(self) -> None:
+        if self.config.semantic_search.enabled:
+            self.embeddings_updater = EmbeddingsUpdatePublisher()
+
         # only expire events every 5 minutes
         while not self.stop_event.wait(300):
             events_with_expired_clips = self.expire_clips()
@@ -361,6 +369,15 @@ class EventCleanup(threading.Thread):
                     if self.config.semantic_search.enabled:
                         self.db.delete_embeddings_description(event_ids=chunk)
                         self.db.delete_embeddings_thumbnail(event_ids=chunk)
+
+                        for table in EMBEDDINGS_TABLES:
+                            self.embeddings_updater.publish(
+                                (table, chunk), EmbeddingsUpdateTypeEnum.delete.value
+                            )
+
                         logger.debug(f"Deleted {len(ids_to_delete)} embeddings")
 
+        if self.embeddings_updater is not None:
+            self.embeddings_updater.stop()
+
         logger.info("Exiting event cleanup...")
@@ -21,6 +21,7 @@ from frigate.jobs.manager import (
 )
 from frigate.models import Recordings
 from frigate.types import JobStatusTypesEnum
+from frigate.util.media import recordings_overlap_clause
 
 logger = logging.getLogger(__name__)
 
@@ -294,19 +295,8 @@ class MotionSearchRunner(threading.Thread):
         recordings = list(
             Recordings.select()
             .where(
-                (
-                    Recordings.start_time.between(
-                        self.job.start_time_range, self.job.end_time_range
-                    )
-                )
-                | (
-                    Recordings.end_time.between(
-                        self.job.start_time_range, self.job.end_time_range
-                    )
-                )
-                | (
-                    (self.job.start_time_range > Recordings.start_time)
-                    & (self.job.end_time_range < Recordings.end_time)
+                recordings_overlap_clause(
+                    self.job.start_time_range, self.job.end_time_range
                 )
             )
             .where(Recordings.camera == camera_name)
@@ -81,6 +81,19 @@ class Recordings(Model):
     motion_heatmap = JSONField(null=True)  # 16x16 grid, 256 values (0-255)
 
 
+class RecordingsUsage(Model):
+    """Per camera / per day totals of Recordings, maintained by db triggers."""
+
+    camera = CharField(max_length=20)
+    day = IntegerField()  # days since epoch of the segment start time
+    segment_count = IntegerField(default=0)
+    segment_size = FloatField(default=0)  # this should be stored as MB
+    duration = FloatField(default=0)  # sum of end_time - start_time
+
+    class Meta:
+        primary_key = CompositeKey("camera", "day")
+
+
 class ExportCase(Model):
     id = CharField(null=False, primary_key=True, max_length=30)
     name = CharField(index=True, max_length=100)
@@ -1,5 +1,6 @@
 import datetime
 import logging
+import os
 import queue
 import threading
 import time
@@ -9,12 +10,8 @@ from multiprocessing import Queue, Value
 from multiprocessing.synchronize import Event as MpEvent
 
 import numpy as np
-import zmq
 
-from frigate.comms.object_detector_signaler import (
-    ObjectDetectorPublisher,
-    ObjectDetectorSubscriber,
-)
+from frigate.comms.detection_ring import DetectionResultRing
 from frigate.config import FrigateConfig
 from frigate.const import PROCESS_PRIORITY_HIGH
 from frigate.detectors import create_detector
@@ -116,6 +113,7 @@ class DetectorRunner(FrigateProcess):
         name,
         detection_queue: Queue,
         cameras: list[str],
+        lane: int,
         avg_speed: Value,
         start_time: Value,
         config: FrigateConfig,
@@ -125,30 +123,28 @@ class DetectorRunner(FrigateProcess):
         super().__init__(stop_event, PROCESS_PRIORITY_HIGH, name=name, daemon=True)
         self.detection_queue = detection_queue
         self.cameras = cameras
+        self.lane = lane
         self.avg_speed = avg_speed
         self.start_time = start_time
         self.config = config
         self.detector_config = detector_config
-        self.outputs: dict = {}
+        self.outputs: dict[str, DetectionResultRing] = {}
 
     def create_output_shm(self, name: str):
-        out_shm = UntrackedSharedMemory(name=f"out-{name}", create=False)
-        out_np = np.ndarray((20, 6), dtype=np.float32, buffer=out_shm.buf)
-        self.outputs[name] = {"shm": out_shm, "np": out_np}
+        self.outputs[name] = DetectionResultRing(name, self.lane)
 
     def run(self) -> None:
         self.pre_run_setup(self.config.logger)
 
         frame_manager = SharedMemoryFrameManager()
         object_detector = LocalObjectDetector(detector_config=self.detector_config)
-        detector_publisher = ObjectDetectorPublisher()
 
         for name in self.cameras:
             self.create_output_shm(name)
 
         while not self.stop_event.is_set():
             try:
-                connection_id = self.detection_queue.get(timeout=1)
+                connection_id, request_id = self.detection_queue.get(timeout=1)
             except queue.Empty:
                 continue
             input_frame = frame_manager.get(
@@ -166,21 +162,23 @@ class DetectorRunner(FrigateProcess):
                 continue
 
             # detect and send the output
-            self.start_time.value = datetime.datetime.now().timestamp()
+            start = datetime.datetime.now().timestamp()
+            self.start_time.value = start
             detections = object_detector.detect_raw(input_frame)
-            duration = datetime.datetime.now().timestamp() - self.start_time.value
+            duration = datetime.datetime.now().timestamp() - start
             frame_manager.close(connection_id)
 
             if connection_id not in self.outputs:
                 self.create_output_shm(connection_id)
 
-            self.outputs[connection_id]["np"][:] = detections[:]
-            detector_publisher.publish(connection_id)
+            self.outputs[connection_id].write(request_id, detections, start, duration)
             self.start_time.value = 0.0
 
             self.avg_speed.value = (self.avg_speed.value * 9 + duration) / 10
 
-        detector_publisher.stop()
+        for output in self.outputs.values():
+            output.close()
+
         logger.info("Exited detection process...")
 
 
@@ -190,6 +188,7 @@ class AsyncDetectorRunner(FrigateProcess):
         name,
         detection_queue: Queue,
         cameras: list[str],
+        lane: int,
         avg_speed: Value,
         start_time: Value,
         config: FrigateConfig,
@@ -199,29 +198,28 @@ class AsyncDetectorRunner(FrigateProcess):
         super().__init__(stop_event, PROCESS_PRIORITY_HIGH, name=name, daemon=True)
         self.detection_queue = detection_queue
         self.cameras = cameras
+        self.lane = lane
         self.avg_speed = avg_speed
         self.start_time = start_time
         self.config = config
         self.detector_config = detector_config
-        self.outputs: dict = {}
+        self.outputs: dict[str, DetectionResultRing] = {}
         self._frame_manager: SharedMemoryFrameManager | None = None
-        self._publisher: ObjectDetectorPublisher | None = None
         self._detector: AsyncLocalObjectDetector | None = None
         self.send_times = deque()
 
     def create_output_shm(self, name: str):
-        out_shm = UntrackedSharedMemory(name=f"out-{name}", create=False)
-        out_np = np.ndarray((20, 6), dtype=np.float32, buffer=out_shm.buf)
-        self.outputs[name] = {"shm": out_shm, "np": out_np}
+        self.outputs[name] = DetectionResultRing(name, self.lane)
 
     def _detect_worker(self) -> None:
         logger.info("Starting Detect Worker Thread")
         while not self.stop_event.is_set():
             try:
-                connection_id = self.detection_queue.get(timeout=1)
+                request = self.detection_queue.get(timeout=1)
             except queue.Empty:
                 continue
 
+            connection_id = request[0]
             input_frame = self._frame_manager.get(
                 connection_id,
                 (
@@ -238,17 +236,20 @@ class AsyncDetectorRunner(FrigateProcess):
 
             # mark start time and send to accelerator
             self.send_times.append(time.perf_counter())
-            self._detector.async_send_input(input_frame, connection_id)
+            # the request is passed through so the result can be matched to it
+            self._detector.async_send_input(input_frame, request)
 
     def _result_worker(self) -> None:
         logger.info("Starting Result Worker Thread")
         while not self.stop_event.is_set():
-            connection_id, detections = self._detector.async_receive_output()
+            request, detections = self._detector.async_receive_output()
 
             # Handle timeout case (queue.Empty) - just continue
-            if connection_id is None:
+            if request is None:
                 continue
 
+            connection_id, request_id = request
+
             if not self.send_times:
                 # guard; shouldn't happen if send/recv are balanced
                 continue
@@ -261,10 +262,13 @@ class AsyncDetectorRunner(FrigateProcess):
             if connection_id not in self.outputs:
                 self.create_output_shm(connection_id)
 
-            # write results and publish
-            if detections is not None:
-                self.outputs[connection_id]["np"][:] = detections[:]
-            self._publisher.publish(connection_id)
+            # write results and wake up the camera
+            if detections is None:
+                detections = np.zeros((0, 6), np.float32)
+
+            self.outputs[connection_id].write(
+                request_id, detections, time.time() - duration, duration
+            )
 
             # update timers
             self.avg_speed.value = (self.avg_speed.value * 9 + duration) / 10
@@ -274,7 +278,6 @@ class AsyncDetectorRunner(FrigateProcess):
         self.pre_run_setup(self.config.logger)
 
         self._frame_manager = SharedMemoryFrameManager()
-        self._publisher = ObjectDetectorPublisher()
         self._detector = AsyncLocalObjectDetector(
             detector_config=self.detector_config, stop_event=self.stop_event
         )
@@ -302,7 +305,8 @@ class AsyncDetectorRunner(FrigateProcess):
             # Shutdown the AsyncDetector
             self._detector.detect_api.shutdown()
 
-            self._publisher.stop()
+            for output in self.outputs.values():
+                output.close()
         except Exception as e:
             logger.error(f"Error during async detector shutdown: {e}")
         finally:
@@ -315,12 +319,14 @@ class ObjectDetectProcess:
         name: str,
         detection_queue: Queue,
         cameras: list[str],
+        lane: int,
         config: FrigateConfig,
         detector_config: BaseDetectorConfig,
         stop_event: MpEvent,
     ):
         self.name = name
         self.cameras = cameras
+        self.lane = lane
         self.detection_queue = detection_queue
         self.avg_inference_speed = Value("d", 0.01)
         self.detection_start = Value("d", 0.0)
@@ -354,6 +360,7 @@ class ObjectDetectProcess:
                 f"frigate.detector:{self.name}",
                 self.detection_queue,
                 self.cameras,
+                self.lane,
                 self.avg_inference_speed,
                 self.detection_start,
                 self.config,
@@ -365,6 +372,7 @@ class ObjectDetectProcess:
                 f"frigate.detector:{self.name}",
                 self.detection_queue,
                 self.cameras,
+                self.lane,
                 self.avg_inference_speed,
                 self.detection_start,
                 self.config,
@@ -394,9 +402,10 @@ class RemoteObjectDetector:
             dtype=np.uint8,
             buffer=self.shm.buf,
         )
-        self.out_shm = UntrackedSharedMemory(name=f"out-{self.name}", create=False)
-        self.out_np_shm = np.ndarray((20, 6), dtype=np.float32, buffer=self.out_shm.buf)
-        self.detector_subscriber = ObjectDetectorSubscriber(name)
+        self.results = DetectionResultRing(self.name)
+        # ids are unique per process so results of a previous camera process
+        # that arrive late are never mistaken for a new request
+        self.request_id = os.getpid() << 32
 
     def detect(self, tensor_input, threshold=0.4):
         detections = []
@@ -404,25 +413,20 @@ class RemoteObjectDetector:
         if self.stop_event.is_set():
             return detections
 
-        # Drain any stale detection results from the ZMQ buffer before making a new request
-        # This prevents reading detection results from a previous request
-        # NOTE: This should never happen, but can in some rare cases
-        while True:
-            try:
-                self.detector_subscriber.socket.recv_string(flags=zmq.NOBLOCK)
-            except zmq.Again:
-                break
+        # discard results of requests that timed out
+        self.results.reset()
+        self.request_id += 1
 
         # copy input to shared memory
         self.np_shm[:] = tensor_input[:]
-        self.detection_queue.put(self.name)
-        result = self.detector_subscriber.check_for_update()
+        self.detection_queue.put((self.name, self.request_id))
+        result = self.results.read(self.request_id, timeout=5)
 
         # if it timed out
         if result is None:
             return detections
 
-        for d in self.out_np_shm:
+        for d in result[0]:
             if d[1] < threshold:
                 break
             detections.append(
@@ -432,6 +436,6 @@ class RemoteObjectDetector:
         return detections
 
     def cleanup(self):
-        self.detector_subscriber.stop()
+        self.results.close()
         self.shm.unlink()
-        self.out_shm.unlink()
+        self.results.unlink()
@@ -16,7 +16,11 @@ from ws4py.server.wsgirefserver import (
 from ws4py.server.wsgiutils import WebSocketWSGIApplication
 
 from frigate.comms.config_updater import ConfigSubscriber
-from frigate.comms.detections_updater import DetectionSubscriber, DetectionTypeEnum
+from frigate.comms.detections_updater import (
+    DetectionProjectionEnum,
+    DetectionSubscriber,
+    DetectionTypeEnum,
+)
 from frigate.comms.ws import WebSocket
 from frigate.config import FrigateConfig
 from frigate.config.camera.updater import (
@@ -128,7 +132,10 @@ class OutputProcess(FrigateProcess):
         websocket_server.initialize_websockets_manager()
         websocket_thread = threading.Thread(target=websocket_server.serve_forever)
 
-        detection_subscriber = DetectionSubscriber(DetectionTypeEnum.video.value)
+        # previews and birdseye only need the activity of the tracked objects
+        detection_subscriber = DetectionSubscriber(
+            DetectionTypeEnum.video.value, DetectionProjectionEnum.summary
+        )
         config_subscriber = CameraConfigUpdateSubscriber(
             self.config,
             self.config.cameras,
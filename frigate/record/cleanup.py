@@ -2,22 +2,36 @@
 
 import datetime
 import itertools
+import json
 import logging
 import os
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing.synchronize import Event as MpEvent
 from pathlib import Path
+from typing import Optional
 
+from peewee import fn
 from playhouse.sqlite_ext import SqliteExtDatabase
 
 from frigate.config import CameraConfig, FrigateConfig, RetainModeEnum
-from frigate.const import CACHE_DIR, CLIPS_DIR, MAX_WAL_SIZE, RECORD_DIR
+from frigate.const import CACHE_DIR, CLIPS_DIR, CONFIG_DIR, MAX_WAL_SIZE, RECORD_DIR
 from frigate.models import Previews, Recordings, ReviewSegment, UserReviewStatus
+from frigate.review.types import SeverityEnum
 from frigate.util.builtin import clear_and_unlink
-from frigate.util.media import remove_empty_directories
+from frigate.util.media import recordings_overlap_clause, remove_empty_directories
 
 logger = logging.getLogger(__name__)
 
+# retention is swept in windows of recording time so each pass has a bounded cost
+SWEEP_WINDOW_SECONDS = 3600
+# max windows swept per camera each cycle, the rest continues on the next cycle
+SWEEP_MAX_WINDOWS = 24
+# number of rows deleted per statement to keep write transactions short
+SWEEP_DELETE_CHUNK_SIZE = 1000
+SWEEP_UNLINK_WORKERS = 4
+SWEEP_CURSOR_FILE = os.path.join(CONFIG_DIR, ".recording_cleanup.json")
+
 
 class RecordingCleanup(threading.Thread):
     """Cleanup existing recordings based on retention config."""
@@ -26,6 +40,66 @@ class RecordingCleanup(threading.Thread):
         super().__init__(name="recording_cleanup")
         self.config = config
         self.stop_event = stop_event
+        self.sweep_cursors: dict[str, float] = self.load_sweep_cursors()
+        self.sweep_pending = False
+        self.unlink_executor = ThreadPoolExecutor(
+            max_workers=SWEEP_UNLINK_WORKERS,
+            thread_name_prefix="recording_cleanup_unlink",
+        )
+
+    def load_sweep_cursors(self) -> dict[str, float]:
+        """Load the per camera retention sweep cursors saved by a previous run."""
+        try:
+            with open(SWEEP_CURSOR_FILE, "r") as f:
+                cursors = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(cursors, dict):
+            return {}
+
+        return {
+            camera: float(cursor)
+            for camera, cursor in cursors.items()
+            if camera in self.config.cameras and isinstance(cursor, (int, float))
+        }
+
+    def save_sweep_cursors(self) -> None:
+        """Persist the sweep cursors so a restart resumes the current pass."""
+        try:
+            with open(SWEEP_CURSOR_FILE, "w") as f:
+                json.dump(self.sweep_cursors, f)
+        except OSError as e:
+            logger.debug(f"Unable to save recording cleanup progress: {e}")
+
+    def unlink_path(self, path: Path) -> bool:
+        """Remove a file, returns whether it is gone."""
+        try:
+            path.unlink(missing_ok=True)
+            return True
+        except OSError as e:
+            logger.error(f"Unable to remove expired recording {path}: {e}")
+            return False
+
+    def expire_in_chunks(self, model, ids: list[str], paths: list[Path]) -> None:
+        """Remove files and then their rows in small chunks.
+
+        Each chunk's files are removed on the unlink thread pool before its rows
+        are deleted, so a crash never leaves files without a row to expire them
+        and live writes are not blocked by a long delete.
+        """
+        for i in range(0, len(ids), SWEEP_DELETE_CHUNK_SIZE):
+            removed = self.unlink_executor.map(
+                self.unlink_path, paths[i : i + SWEEP_DELETE_CHUNK_SIZE]
+            )
+            expired = [
+                row_id
+                for row_id, gone in zip(ids[i : i + SWEEP_DELETE_CHUNK_SIZE], removed)
+                if gone
+            ]
+
+            if expired:
+                model.delete().where(model.id << expired).execute()
 
     def clean_tmp_previews(self) -> None:
         """delete any previews in the cache that are more than 1 hour old."""
@@ -104,16 +178,107 @@ class RecordingCleanup(threading.Thread):
 
         return maybe_empty_dirs
 
+    def get_next_sweep_time(self, camera: str, after: float) -> Optional[float]:
+        """Get the start of the next recording or preview at or after a time."""
+        next_recording = (
+            Recordings.select(fn.MIN(Recordings.start_time))
+            .where(Recordings.camera == camera, Recordings.start_time >= after)
+            .scalar()
+        )
+        next_preview = (
+            Previews.select(fn.MIN(Previews.start_time))
+            .where(Previews.camera == camera, Previews.start_time >= after)
+            .scalar()
+        )
+        times = [t for t in (next_recording, next_preview) if t is not None]
+        return min(times) if times else None
+
+    def get_window_reviews(
+        self, config: CameraConfig, window_start: float, window_end: float
+    ) -> list[ReviewSegment]:
+        """Get the reviews that could keep recordings in a sweep window."""
+        max_pre_capture = max(
+            config.record.get_review_pre_capture(severity) for severity in SeverityEnum
+        )
+        max_post_capture = max(
+            config.record.get_review_post_capture(severity) for severity in SeverityEnum
+        )
+        return list(
+            ReviewSegment.select(
+                ReviewSegment.start_time,
+                ReviewSegment.end_time,
+                ReviewSegment.severity,
+            )
+            .where(
+                ReviewSegment.camera == config.name,
+                ReviewSegment.start_time < window_end + max_pre_capture,
+                ReviewSegment.end_time.is_null()
+                | (ReviewSegment.end_time >= window_start - max_post_capture),
+            )
+            .order_by(ReviewSegment.start_time)
+            .namedtuples()
+        )
+
+    def sweep_camera_recordings(
+        self,
+        continuous_expire_date: float,
+        motion_expire_date: float,
+        config: CameraConfig,
+    ) -> tuple[set[Path], bool]:
+        """Sweep a bounded number of windows of a camera's recordings.
+
+        Returns the directories that may now be empty and whether the pass
+        reached the expire date. An unfinished pass resumes from the saved
+        cursor on the next cycle.
+        """
+        sweep_end = max(continuous_expire_date, motion_expire_date)
+        cursor = self.sweep_cursors.get(config.name)
+
+        if cursor is None:
+            cursor = self.get_next_sweep_time(config.name, 0)
+
+        maybe_empty_dirs: set[Path] = set()
+        windows = 0
+
+        while (
+            cursor is not None
+            and cursor < sweep_end
+            and windows < SWEEP_MAX_WINDOWS
+            and not self.stop_event.is_set()
+        ):
+            window_end = min(cursor + SWEEP_WINDOW_SECONDS, sweep_end)
+            maybe_empty_dirs |= self.expire_existing_camera_recordings(
+                continuous_expire_date,
+                motion_expire_date,
+                config,
+                self.get_window_reviews(config, cursor, window_end),
+                cursor,
+                window_end,
+            )
+            windows += 1
+            # skip over gaps without any recordings
+            cursor = self.get_next_sweep_time(config.name, window_end)
+
+        if cursor is None or cursor >= sweep_end:
+            self.sweep_cursors.pop(config.name, None)
+            return maybe_empty_dirs, True
+
+        self.sweep_cursors[config.name] = cursor
+        return maybe_empty_dirs, False
+
     def expire_existing_camera_recordings(
         self,
         continuous_expire_date: float,
         motion_expire_date: float,
         config: CameraConfig,
-        reviews: ReviewSegment,
+        reviews: list[ReviewSegment],
+        window_start: float,
+        window_end: float,
     ) -> set[Path]:
-        """Delete recordings for existing camera based on retention config."""
-        # Get the timestamp for cutoff of retained days
+        """Delete recordings for existing camera based on retention config.
 
+        Only recordings and previews starting within the window are checked.
+        """
         # Get recordings to check for expiration
         recordings: Recordings = (
             Recordings.select(
@@ -127,6 +292,8 @@ class RecordingCleanup(threading.Thread):
             )
             .where(
                 (Recordings.camera == config.name)
+                & (Recordings.start_time >= window_start)
+                & (Recordings.start_time < window_end)
                 & (
                     (
                         (Recordings.end_time < continuous_expire_date)
@@ -146,8 +313,8 @@ class RecordingCleanup(threading.Thread):
         # loop over recordings and see if they overlap with any non-expired reviews
         # TODO: expire segments based on segment stats according to config
         review_start = 0
-        deleted_recordings = set()
-        kept_recordings: list[tuple[float, float]] = []
+        deleted_recordings = []
+        deleted_paths = []
         recording: Recordings
         for recording in recordings:
             keep = False
@@ -198,23 +365,15 @@ class RecordingCleanup(threading.Thread):
                 or (mode == RetainModeEnum.active_objects and recording.objects == 0)
             ):
                 recording_path = Path(recording.path)
-                recording_path.unlink(missing_ok=True)
-                deleted_recordings.add(recording.id)
+                deleted_paths.append(recording_path)
+                deleted_recordings.append(recording.id)
                 maybe_empty_dirs.add(recording_path.parent)
-            else:
-                kept_recordings.append((recording.start_time, recording.end_time))
 
         # expire recordings
         logger.debug(f"Expiring {len(deleted_recordings)} recordings")
-        # delete up to 100,000 at a time
-        max_deletes = 100000
-        deleted_recordings_list = list(deleted_recordings)
-        for i in range(0, len(deleted_recordings_list), max_deletes):
-            Recordings.delete().where(
-                Recordings.id << deleted_recordings_list[i : i + max_deletes]
-            ).execute()
+        self.expire_in_chunks(Recordings, deleted_recordings, deleted_paths)
 
-        previews: list[Previews] = (
+        previews: list[Previews] = list(
             Previews.select(
                 Previews.id,
                 Previews.start_time,
@@ -223,17 +382,36 @@ class RecordingCleanup(threading.Thread):
             )
             .where(
                 (Previews.camera == config.name)
+                & (Previews.start_time >= window_start)
+                & (Previews.start_time < window_end)
                 & (Previews.end_time < continuous_expire_date)
                 & (Previews.end_time < motion_expire_date)
             )
             .order_by(Previews.start_time)
             .namedtuples()
-            .iterator()
+        )
+
+        if not previews:
+            return maybe_empty_dirs
+
+        # any recording still stored after expiring this window is a reason
+        # to keep the preview, including recordings in windows not yet swept
+        kept_recordings: list[tuple[float, float]] = list(
+            Recordings.select(Recordings.start_time, Recordings.end_time)
+            .where(
+                (Recordings.camera == config.name)
+                & recordings_overlap_clause(
+                    previews[0].start_time, max(p.end_time for p in previews)
+                )
+            )
+            .order_by(Recordings.start_time)
+            .tuples()
         )
 
         # expire previews
         recording_start = 0
-        deleted_previews = set()
+        deleted_previews = []
+        deleted_paths = []
         for preview in previews:
             keep = False
             # look for a reason to keep this preview
@@ -262,19 +440,13 @@ class RecordingCleanup(threading.Thread):
             # Delete previews without any relevant recordings
             if not keep:
                 preview_path = Path(preview.path)
-                preview_path.unlink(missing_ok=True)
-                deleted_previews.add(preview.id)
+                deleted_paths.append(preview_path)
+                deleted_previews.append(preview.id)
                 maybe_empty_dirs.add(preview_path.parent)
 
         # expire previews
         logger.debug(f"Expiring {len(deleted_previews)} previews")
-        # delete up to 100,000 at a time
-        max_deletes = 100000
-        deleted_previews_list = list(deleted_previews)
-        for i in range(0, len(deleted_previews_list), max_deletes):
-            Previews.delete().where(
-                Previews.id << deleted_previews_list[i : i + max_deletes]
-            ).execute()
+        self.expire_in_chunks(Previews, deleted_previews, deleted_paths)
 
         return maybe_empty_dirs
 
@@ -305,24 +477,20 @@ class RecordingCleanup(threading.Thread):
 
         maybe_empty_dirs = set()
 
-        deleted_recordings = set()
+        deleted_recordings = []
+        deleted_paths = []
         for recording in no_camera_recordings:
             recording_path = Path(recording.path)
-            recording_path.unlink(missing_ok=True)
-            deleted_recordings.add(recording.id)
+            deleted_paths.append(recording_path)
+            deleted_recordings.append(recording.id)
             maybe_empty_dirs.add(recording_path.parent)
 
         logger.debug(f"Expiring {len(deleted_recordings)} recordings")
-        # delete up to 100,000 at a time
-        max_deletes = 100000
-        deleted_recordings_list = list(deleted_recordings)
-        for i in range(0, len(deleted_recordings_list), max_deletes):
-            Recordings.delete().where(
-                Recordings.id << deleted_recordings_list[i : i + max_deletes]
-            ).execute()
+        self.expire_in_chunks(Recordings, deleted_recordings, deleted_paths)
         logger.debug("End deleted cameras.")
 
         logger.debug("Start all cameras.")
+        sweep_pending = False
         for camera, config in self.config.cameras.items():
             logger.debug(f"Start camera: {camera}.")
             now = datetime.datetime.now()
@@ -340,29 +508,16 @@ class RecordingCleanup(threading.Thread):
                 )
             ).timestamp()
 
-            # Get all the reviews to check against
-            reviews: ReviewSegment = (
-                ReviewSegment.select(
-                    ReviewSegment.start_time,
-                    ReviewSegment.end_time,
-                    ReviewSegment.severity,
-                )
-                .where(
-                    ReviewSegment.camera == camera,
-                    # need to ensure segments for all reviews starting
-                    # before the expire date are included
-                    ReviewSegment.start_time < motion_expire_date,
-                )
-                .order_by(ReviewSegment.start_time)
-                .namedtuples()
-            )
-
-            maybe_empty_dirs |= self.expire_existing_camera_recordings(
-                continuous_expire_date, motion_expire_date, config, reviews
+            camera_dirs, finished = self.sweep_camera_recordings(
+                continuous_expire_date, motion_expire_date, config
             )
+            maybe_empty_dirs |= camera_dirs
+            sweep_pending |= not finished
             logger.debug(f"End camera: {camera}.")
 
         logger.debug("End all cameras.")
+        self.sweep_pending = sweep_pending
+        self.save_sweep_cursors()
         logger.debug("End expire recordings.")
 
         return maybe_empty_dirs
@@ -376,8 +531,13 @@ class RecordingCleanup(threading.Thread):
 
             self.clean_tmp_previews()
 
-            if counter == 0:
-                self.clean_tmp_clips()
+            # keep sweeping every minute until a large backlog is caught up
+            if counter == 0 or self.sweep_pending:
+                if counter == 0:
+                    self.clean_tmp_clips()
+
                 maybe_empty_dirs = self.expire_recordings()
                 remove_empty_directories(Path(RECORD_DIR), maybe_empty_dirs)
                 self.truncate_wal()
+
+        self.unlink_executor.shutdown(wait=True)
@@ -28,6 +28,7 @@ from frigate.ffmpeg_presets import (
     parse_preset_hardware_acceleration_encode,
 )
 from frigate.models import Export, Previews, Recordings
+from frigate.util.media import recordings_overlap_clause
 from frigate.util.time import is_current_hour
 
 logger = logging.getLogger(__name__)
@@ -203,14 +204,7 @@ class RecordingExporter(threading.Thread):
                     Recordings.start_time,
                     Recordings.end_time,
                 )
-                .where(
-                    Recordings.start_time.between(self.start_time, self.end_time)
-                    | Recordings.end_time.between(self.start_time, self.end_time)
-                    | (
-                        (self.start_time > Recordings.start_time)
-                        & (self.end_time < Recordings.end_time)
-                    )
-                )
+                .where(recordings_overlap_clause(self.start_time, self.end_time))
                 .where(Recordings.camera == self.camera)
                 .order_by(Recordings.start_time.asc())
             )
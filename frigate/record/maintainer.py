@@ -13,10 +13,13 @@ from multiprocessing.synchronize import Event as MpEvent
 from pathlib import Path
 from typing import Any, Optional, Tuple
 
-import numpy as np
 import psutil
 
-from frigate.comms.detections_updater import DetectionSubscriber, DetectionTypeEnum
+from frigate.comms.detections_updater import (
+    DetectionProjectionEnum,
+    DetectionSubscriber,
+    DetectionTypeEnum,
+)
 from frigate.comms.inter_process import InterProcessRequestor
 from frigate.comms.recordings_updater import (
     RecordingsDataPublisher,
@@ -37,6 +40,17 @@ from frigate.const import (
     RECORD_DIR,
 )
 from frigate.models import Recordings, ReviewSegment
+from frigate.record.summary import (
+    ACTIVE_COUNT,
+    AUDIO_ACTIVE_COUNT,
+    AUDIO_COUNT,
+    DBFS_SUM,
+    MOTION_COUNT,
+    REGION_COUNT,
+    DetectionSummaries,
+    DetectionSummary,
+    motion_grid_to_heatmap,
+)
 from frigate.review.types import SeverityEnum
 from frigate.util.services import get_video_properties
 
@@ -92,12 +106,20 @@ class RecordingMaintainer(threading.Thread):
             self.config.cameras,
             [CameraConfigUpdateEnum.add, CameraConfigUpdateEnum.record],
         )
-        self.detection_subscriber = DetectionSubscriber(DetectionTypeEnum.all.value)
         self.recordings_publisher = RecordingsDataPublisher()
 
         self.stop_event = stop_event
-        self.object_recordings_info: dict[str, list] = defaultdict(list)
-        self.audio_recordings_info: dict[str, list] = defaultdict(list)
+
+        if self.config.record.aggregate_detections:
+            # written by the detection aggregator
+            self.summaries: dict[str, DetectionSummary] = {}
+            self.detection_summaries: Optional[DetectionSummaries] = None
+            self.detection_subscriber: Optional[DetectionSubscriber] = None
+        else:
+            self.detection_summaries = DetectionSummaries(self.config, shared=False)
+            self.detection_subscriber = DetectionSubscriber(
+                DetectionTypeEnum.all.value, DetectionProjectionEnum.summary
+            )
         self.end_time_cache: dict[str, Tuple[datetime.datetime, float]] = {}
         self.unexpected_cache_files_logged: bool = False
 
@@ -202,10 +224,7 @@ class RecordingMaintainer(threading.Thread):
                 grouped_recordings[camera], key=lambda s: s["start_time"]
             )
 
-            camera_info = self.object_recordings_info[camera]
-            most_recently_processed_frame_time = (
-                camera_info[-1][0] if len(camera_info) > 0 else 0
-            )
+            most_recently_processed_frame_time = self._latest_frame_time(camera)
 
             processed_segment_count = len(
                 list(
@@ -248,22 +267,6 @@ class RecordingMaintainer(threading.Thread):
 
         tasks = []
         for camera, recordings in grouped_recordings.items():
-            # clear out all the object recording info for old frames
-            while (
-                len(self.object_recordings_info[camera]) > 0
-                and self.object_recordings_info[camera][0][0]
-                < recordings[0]["start_time"].timestamp()
-            ):
-                self.object_recordings_info[camera].pop(0)
-
-            # clear out all the audio recording info for old frames
-            while (
-                len(self.audio_recordings_info[camera]) > 0
-                and self.audio_recordings_info[camera][0][0]
-                < recordings[0]["start_time"].timestamp()
-            ):
-                self.audio_recordings_info[camera].pop(0)
-
             # get all reviews with the end time after the start of the oldest cache file
             # or with end_time None
             reviews: ReviewSegment = (
@@ -382,10 +385,7 @@ class RecordingMaintainer(threading.Thread):
         # and avoid any DB calls
         if highest is not None:
             # assume that empty means the relevant recording info has not been received yet
-            camera_info = self.object_recordings_info[camera]
-            most_recently_processed_frame_time = (
-                camera_info[-1][0] if len(camera_info) > 0 else 0
-            )
+            most_recently_processed_frame_time = self._latest_frame_time(camera)
 
             # ensure delayed segment info does not lead to lost segments
             if (
@@ -446,125 +446,53 @@ class RecordingMaintainer(threading.Thread):
         # if it ends more than the configured pre_capture for the camera
         # BUT only if continuous/motion is NOT enabled (otherwise wait for processing)
         elif highest is None:
-            camera_info = self.object_recordings_info[camera]
-            most_recently_processed_frame_time = (
-                camera_info[-1][0] if len(camera_info) > 0 else 0
-            )
+            most_recently_processed_frame_time = self._latest_frame_time(camera)
             retain_cutoff = datetime.datetime.fromtimestamp(
                 most_recently_processed_frame_time - record_config.event_pre_capture
             ).astimezone(datetime.timezone.utc)
             if end_time < retain_cutoff:
                 self.drop_segment(cache_path)
 
-    def _compute_motion_heatmap(
-        self, camera: str, motion_boxes: list[tuple[int, int, int, int]]
-    ) -> dict[str, int] | None:
-        """Compute a 16x16 motion intensity heatmap from motion boxes.
-
-        Returns a sparse dict mapping cell index (as string) to intensity (1-255).
-        Only cells with motion are included.
-
-        Args:
-            camera: Camera name to get detect dimensions from.
-            motion_boxes: List of (x1, y1, x2, y2) pixel coordinates.
-
-        Returns:
-            Sparse dict like {"45": 3, "46": 5}, or None if no boxes.
-        """
-        if not motion_boxes:
-            return None
-
-        camera_config = self.config.cameras.get(camera)
-        if not camera_config:
-            return None
-
-        frame_width = camera_config.detect.width
-        frame_height = camera_config.detect.height
-
-        if frame_width <= 0 or frame_height <= 0:
-            return None
-
-        GRID_SIZE = 16
-        counts: dict[int, int] = {}
-
-        for box in motion_boxes:
-            if len(box) < 4:
-                continue
-            x1, y1, x2, y2 = box
+    def _summary(self, camera: str) -> Optional[DetectionSummary]:
+        if self.detection_summaries is not None:
+            if camera not in self.config.cameras:
+                return None
 
-            # Convert pixel coordinates to grid cells
-            grid_x1 = max(0, int((x1 / frame_width) * GRID_SIZE))
-            grid_y1 = max(0, int((y1 / frame_height) * GRID_SIZE))
-            grid_x2 = min(GRID_SIZE - 1, int((x2 / frame_width) * GRID_SIZE))
-            grid_y2 = min(GRID_SIZE - 1, int((y2 / frame_height) * GRID_SIZE))
+            return self.detection_summaries[camera]
 
-            for y in range(grid_y1, grid_y2 + 1):
-                for x in range(grid_x1, grid_x2 + 1):
-                    idx = y * GRID_SIZE + x
-                    counts[idx] = min(255, counts.get(idx, 0) + 1)
+        if camera not in self.summaries:
+            try:
+                self.summaries[camera] = DetectionSummary(camera)
+            except FileNotFoundError:
+                # the aggregator has not created the summary yet
+                return None
 
-        if not counts:
-            return None
+        return self.summaries[camera]
 
-        # Convert to string keys for JSON storage
-        return {str(k): v for k, v in counts.items()}
+    def _latest_frame_time(self, camera: str) -> float:
+        summary = self._summary(camera)
+        return summary.latest_frame_time if summary is not None else 0
 
     def segment_stats(
         self, camera: str, start_time: datetime.datetime, end_time: datetime.datetime
     ) -> SegmentInfo:
-        video_frame_count = 0
-        active_count = 0
-        region_count = 0
-        motion_count = 0
-        all_motion_boxes: list[tuple[int, int, int, int]] = []
-
-        for frame in self.object_recordings_info[camera]:
-            # frame is after end time of segment
-            if frame[0] > end_time.timestamp():
-                break
-            # frame is before start time of segment
-            if frame[0] < start_time.timestamp():
-                continue
-
-            video_frame_count += 1
-            active_count += len(
-                [
-                    o
-                    for o in frame[1]
-                    if not o["false_positive"] and o["motionless_count"] == 0
-                ]
-            )
-            motion_count += len(frame[2])
-            region_count += len(frame[3])
-            # Collect motion boxes for heatmap computation
-            all_motion_boxes.extend(frame[2])
-
-        audio_values = []
-        for frame in self.audio_recordings_info[camera]:
-            # frame is after end time of segment
-            if frame[0] > end_time.timestamp():
-                break
-
-            # frame is before start time of segment
-            if frame[0] < start_time.timestamp():
-                continue
-
-            # add active audio label count to count of active objects
-            active_count += len(frame[2])
-
-            # add sound level to audio values
-            audio_values.append(frame[1])
+        summary = self._summary(camera)
 
-        average_dBFS = 0 if not audio_values else np.average(audio_values)
+        if summary is None:
+            return SegmentInfo(0, 0, 0, 0)
 
-        motion_heatmap = self._compute_motion_heatmap(camera, all_motion_boxes)
+        totals, motion_grid = summary.totals(
+            start_time.timestamp(), end_time.timestamp()
+        )
+        audio_count = totals[AUDIO_COUNT]
+        average_dBFS = totals[DBFS_SUM] / audio_count if audio_count else 0
 
         return SegmentInfo(
-            motion_count,
-            active_count,
-            region_count,
+            int(totals[MOTION_COUNT]),
+            int(totals[ACTIVE_COUNT] + totals[AUDIO_ACTIVE_COUNT]),
+            int(totals[REGION_COUNT]),
             round(average_dBFS),
-            motion_heatmap,
+            motion_grid_to_heatmap(motion_grid),
         )
 
     async def move_segment(
@@ -680,62 +608,17 @@ class RecordingMaintainer(threading.Thread):
             # check if there is an updated config
             self.config_subscriber.check_for_updates()
 
-            stale_frame_count = 0
-            stale_frame_count_threshold = 10
-            # empty the object recordings info queue
-            while True:
-                (topic, data) = self.detection_subscriber.check_for_update(
-                    timeout=FAST_QUEUE_TIMEOUT
-                )
-
-                if not topic:
-                    break
-
-                if topic == DetectionTypeEnum.video.value:
-                    (
-                        camera,
-                        _,
-                        frame_time,
-                        current_tracked_objects,
-                        motion_boxes,
-                        regions,
-                    ) = data
-
-                    if self.config.cameras[camera].record.enabled:
-                        self.object_recordings_info[camera].append(
-                            (
-                                frame_time,
-                                current_tracked_objects,
-                                motion_boxes,
-                                regions,
-                            )
-                        )
-                elif topic == DetectionTypeEnum.audio.value:
-                    (
-                        camera,
-                        frame_time,
-                        dBFS,
-                        audio_detections,
-                    ) = data
-
-                    if self.config.cameras[camera].record.enabled:
-                        self.audio_recordings_info[camera].append(
-                            (
-                                frame_time,
-                                dBFS,
-                                audio_detections,
-                            )
-                        )
-                elif (
-                    topic == DetectionTypeEnum.api.value or DetectionTypeEnum.lpr.value
-                ):
-                    continue
+            if self.detection_subscriber is not None:
+                # add the detections since the last run to the summaries
+                while True:
+                    (topic, data) = self.detection_subscriber.check_for_update(
+                        timeout=FAST_QUEUE_TIMEOUT
+                    )
 
-                if frame_time < run_start - stale_frame_count_threshold:
-                    stale_frame_count += 1
+                    if not topic:
+                        break
 
-            if stale_frame_count > 0:
-                logger.debug(f"Found {stale_frame_count} old frames.")
+                    self.detection_summaries.handle_detection(topic, data)
 
             try:
                 asyncio.run(self.move_files())
@@ -749,6 +632,13 @@ class RecordingMaintainer(threading.Thread):
 
         self.requestor.stop()
         self.config_subscriber.stop()
-        self.detection_subscriber.stop()
         self.recordings_publisher.stop()
+
+        if self.detection_subscriber is not None:
+            self.detection_subscriber.stop()
+            self.detection_summaries.close()
+        else:
+            for summary in self.summaries.values():
+                summary.close()
+
         logger.info("Exiting recording maintenance...")
@@ -0,0 +1,384 @@
+"""Aggregate detections into per camera summaries in shared memory."""
+
+import logging
+import math
+import time
+from multiprocessing.synchronize import Event as MpEvent
+from typing import Any, Optional
+
+import numpy as np
+
+from frigate.comms.detections_updater import (
+    DetectionProjectionEnum,
+    DetectionSubscriber,
+    DetectionTypeEnum,
+)
+from frigate.config import FrigateConfig
+from frigate.config.camera.updater import (
+    CameraConfigUpdateEnum,
+    CameraConfigUpdateSubscriber,
+)
+from frigate.const import AUDIO_DURATION, MAX_SEGMENT_DURATION, PROCESS_PRIORITY_HIGH
+from frigate.util.image import UntrackedSharedMemory
+from frigate.util.process import FrigateProcess
+
+logger = logging.getLogger(__name__)
+
+MOTION_HEATMAP_GRID_SIZE = 16
+MOTION_HEATMAP_MAX_INTENSITY = 255
+
+
+def get_motion_grid(
+    motion_boxes: list[tuple[int, int, int, int]],
+    frame_width: int,
+    frame_height: int,
+) -> Optional[np.ndarray]:
+    """Count how many motion boxes cover each cell of a 16x16 grid.
+
+    Each box is converted to an inclusive range of grid cells and added to a
+    2D difference array, which is then integrated with prefix sums.
+    """
+    if frame_width <= 0 or frame_height <= 0:
+        return None
+
+    boxes = [box[:4] for box in motion_boxes if len(box) >= 4]
+
+    if not boxes:
+        return None
+
+    grid_size = MOTION_HEATMAP_GRID_SIZE
+    coords = np.asarray(boxes, dtype=np.float64)
+    scale = np.array([frame_width, frame_height, frame_width, frame_height])
+    cells = np.trunc(coords / scale * grid_size).astype(np.int64)
+    x1 = np.maximum(0, cells[:, 0])
+    y1 = np.maximum(0, cells[:, 1])
+    x2 = np.minimum(grid_size - 1, cells[:, 2])
+    y2 = np.minimum(grid_size - 1, cells[:, 3])
+
+    # boxes entirely outside of the frame don't cover any cells
+    valid = (x1 <= x2) & (y1 <= y2)
+
+    if not valid.any():
+        return None
+
+    x1, y1, x2, y2 = x1[valid], y1[valid], x2[valid] + 1, y2[valid] + 1
+    diff = np.zeros((grid_size + 1, grid_size + 1), dtype=np.int32)
+    np.add.at(diff, (y1, x1), 1)
+    np.add.at(diff, (y1, x2), -1)
+    np.add.at(diff, (y2, x1), -1)
+    np.add.at(diff, (y2, x2), 1)
+    return diff.cumsum(axis=0).cumsum(axis=1)[:grid_size, :grid_size]
+
+
+def motion_grid_to_heatmap(grid: Optional[np.ndarray]) -> dict[str, int] | None:
+    """Convert a 16x16 grid of motion counts to the sparse heatmap stored in the db."""
+    if grid is None:
+        return None
+
+    flat = grid.ravel()
+    cells = np.flatnonzero(flat)
+
+    if cells.size == 0:
+        return None
+
+    # Convert to string keys for JSON storage
+    intensity = np.minimum(flat[cells], MOTION_HEATMAP_MAX_INTENSITY)
+    return {str(k): int(v) for k, v in zip(cells.tolist(), intensity.tolist())}
+
+
+SUMMARY_SECONDS = MAX_SEGMENT_DURATION
+AUDIO_SLOTS = math.ceil(SUMMARY_SECONDS / AUDIO_DURATION)
+
+# header fields
+LATEST_FRAME_TIME = 0
+LATEST_AUDIO_TIME = 1
+FRAME_SLOTS = 2
+FRAME_WRITES = 3
+AUDIO_WRITES = 4
+HEADER_FIELDS = 8
+
+# frame fields
+FRAME_TIME = 0
+FRAME_ACTIVE = 1
+FRAME_MOTION = 2
+FRAME_REGIONS = 3
+FRAME_FIELDS = 4
+
+# audio fields
+AUDIO_TIME = 0
+AUDIO_DBFS = 1
+AUDIO_ACTIVE = 2
+AUDIO_FIELDS = 3
+
+# fields of the totals of a time range
+FRAME_COUNT = 0
+ACTIVE_COUNT = 1
+MOTION_COUNT = 2
+REGION_COUNT = 3
+AUDIO_COUNT = 4
+DBFS_SUM = 5
+AUDIO_ACTIVE_COUNT = 6
+TOTAL_FIELDS = 7
+
+
+def active_object_count(tracked_objects: list[dict[str, Any]]) -> int:
+    """Count the objects that moved in the current frame and are not false positives."""
+    return sum(
+        1
+        for o in tracked_objects
+        if not o["false_positive"] and o["motionless_count"] == 0
+    )
+
+
+class DetectionSummary:
+    """Rolling record of a camera's frames and audio levels.
+
+    Every frame and audio level is kept with its exact timestamp, so the totals
+    of a recording segment only include what happened within the segment. The
+    motion grid of each frame is capped at 255 per cell, which does not change
+    the stored heatmap since it is capped at the same intensity.
+
+    A shared summary is written by the detection aggregator and other processes
+    attach to it to read totals without handling every detection message.
+    """
+
+    def __init__(
+        self,
+        camera: str,
+        create: bool = False,
+        fps: int = 5,
+        shared: bool = True,
+    ) -> None:
+        name = f"summary-{camera}"
+        self.shm: Optional[UntrackedSharedMemory] = None
+
+        if create:
+            frame_slots = SUMMARY_SECONDS * max(fps, 1)
+            size = self._size(frame_slots)
+
+            if shared:
+                try:
+                    self.shm = UntrackedSharedMemory(name=name, create=True, size=size)
+                except FileExistsError:
+                    self.shm = UntrackedSharedMemory(name=name)
+
+                buf = self.shm.buf
+            else:
+                buf = bytearray(size)
+
+            header = np.ndarray((HEADER_FIELDS,), dtype=np.float64, buffer=buf)
+
+            if header[FRAME_SLOTS] == 0:
+                header[FRAME_SLOTS] = frame_slots
+        else:
+            self.shm = UntrackedSharedMemory(name=name)
+            buf = self.shm.buf
+
+        self.header = np.ndarray((HEADER_FIELDS,), dtype=np.float64, buffer=buf)
+        frame_slots = int(self.header[FRAME_SLOTS])
+        offset = HEADER_FIELDS * 8
+        self.frames = np.ndarray(
+            (frame_slots, FRAME_FIELDS), dtype=np.float64, buffer=buf, offset=offset
+        )
+        offset += frame_slots * FRAME_FIELDS * 8
+        self.audio = np.ndarray(
+            (AUDIO_SLOTS, AUDIO_FIELDS), dtype=np.float64, buffer=buf, offset=offset
+        )
+        offset += AUDIO_SLOTS * AUDIO_FIELDS * 8
+        self.grids = np.ndarray(
+            (frame_slots, MOTION_HEATMAP_GRID_SIZE, MOTION_HEATMAP_GRID_SIZE),
+            dtype=np.uint8,
+            buffer=buf,
+            offset=offset,
+        )
+
+    @staticmethod
+    def _size(frame_slots: int) -> int:
+        return (
+            HEADER_FIELDS * 8
+            + frame_slots * FRAME_FIELDS * 8
+            + AUDIO_SLOTS * AUDIO_FIELDS * 8
+            + frame_slots * MOTION_HEATMAP_GRID_SIZE**2
+        )
+
+    @property
+    def latest_frame_time(self) -> float:
+        return float(self.header[LATEST_FRAME_TIME])
+
+    def add_video(
+        self,
+        frame_time: float,
+        active_count: int,
+        motion_count: int,
+        region_count: int,
+        motion_grid: Optional[np.ndarray],
+    ) -> None:
+        writes = int(self.header[FRAME_WRITES])
+        slot = writes % len(self.frames)
+        # the slot is not part of any range while it is being replaced
+        self.frames[slot, FRAME_TIME] = np.nan
+        self.frames[slot, FRAME_ACTIVE] = active_count
+        self.frames[slot, FRAME_MOTION] = motion_count
+        self.frames[slot, FRAME_REGIONS] = region_count
+
+        if motion_grid is None:
+            self.grids[slot] = 0
+        else:
+            self.grids[slot] = np.minimum(motion_grid, MOTION_HEATMAP_MAX_INTENSITY)
+
+        self.frames[slot, FRAME_TIME] = frame_time
+        self.header[FRAME_WRITES] = writes + 1
+        self.header[LATEST_FRAME_TIME] = max(self.latest_frame_time, frame_time)
+
+    def add_audio(self, frame_time: float, dBFS: float, active_count: int) -> None:
+        writes = int(self.header[AUDIO_WRITES])
+        slot = writes % AUDIO_SLOTS
+        self.audio[slot, AUDIO_TIME] = np.nan
+        self.audio[slot, AUDIO_DBFS] = dBFS
+        self.audio[slot, AUDIO_ACTIVE] = active_count
+        self.audio[slot, AUDIO_TIME] = frame_time
+        self.header[AUDIO_WRITES] = writes + 1
+        self.header[LATEST_AUDIO_TIME] = max(self.header[LATEST_AUDIO_TIME], frame_time)
+
+    def totals(
+        self, start_time: float, end_time: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Sum the frames and audio levels within a time range, both ends included.
+
+        Returns the TOTAL_FIELDS of the range and the summed motion grid.
+        """
+        times = self.frames[:, FRAME_TIME]
+        frames = (times >= start_time) & (times <= end_time)
+        audio_times = self.audio[:, AUDIO_TIME]
+        audio = self.audio[(audio_times >= start_time) & (audio_times <= end_time)]
+        totals = np.zeros(TOTAL_FIELDS)
+        totals[FRAME_COUNT] = frames.sum()
+        totals[ACTIVE_COUNT : REGION_COUNT + 1] = self.frames[
+            frames, FRAME_ACTIVE : FRAME_REGIONS + 1
+        ].sum(axis=0)
+        totals[AUDIO_COUNT] = len(audio)
+        totals[DBFS_SUM] = audio[:, AUDIO_DBFS].sum()
+        totals[AUDIO_ACTIVE_COUNT] = audio[:, AUDIO_ACTIVE].sum()
+        return totals, self.grids[frames].sum(axis=0, dtype=np.int64)
+
+    def close(self) -> None:
+        del self.header, self.frames, self.audio, self.grids
+
+        if self.shm is not None:
+            self.shm.close()
+
+    def unlink(self) -> None:
+        if self.shm is not None:
+            self.shm.unlink()
+
+
+class DetectionSummaries:
+    """Adds the detections of every camera to its summary."""
+
+    def __init__(self, config: FrigateConfig, shared: bool) -> None:
+        self.config = config
+        self.shared = shared
+        self.summaries: dict[str, DetectionSummary] = {}
+
+    def __getitem__(self, camera: str) -> DetectionSummary:
+        if camera not in self.summaries:
+            # sized for the frames at the detect fps when the camera is added
+            self.summaries[camera] = DetectionSummary(
+                camera,
+                create=True,
+                fps=self.config.cameras[camera].detect.fps,
+                shared=self.shared,
+            )
+
+        return self.summaries[camera]
+
+    def __contains__(self, camera: str) -> bool:
+        return camera in self.summaries
+
+    def _motion_grid(
+        self, camera: str, motion_boxes: list[tuple[int, int, int, int]]
+    ) -> Optional[np.ndarray]:
+        if not motion_boxes:
+            return None
+
+        detect_config = self.config.cameras[camera].detect
+        return get_motion_grid(motion_boxes, detect_config.width, detect_config.height)
+
+    def handle_detection(self, topic: str, data: tuple) -> None:
+        """Add a detection of the summary projection to its camera's summary."""
+        if topic == DetectionTypeEnum.video.value:
+            camera, _, frame_time, tracked_objects, motion_boxes, region_count = data
+
+            if camera not in self.config.cameras:
+                return
+
+            self[camera].add_video(
+                frame_time,
+                active_object_count(tracked_objects),
+                len(motion_boxes),
+                region_count,
+                self._motion_grid(camera, motion_boxes),
+            )
+        elif topic == DetectionTypeEnum.audio.value:
+            camera, frame_time, dBFS, audio_detections = data
+
+            if camera not in self.config.cameras:
+                return
+
+            self[camera].add_audio(frame_time, dBFS, len(audio_detections))
+
+    def close(self) -> None:
+        for summary in self.summaries.values():
+            summary.close()
+            summary.unlink()
+
+        self.summaries.clear()
+
+
+class DetectionAggregator(FrigateProcess):
+    """Consumes the detection bus once and maintains a summary per camera."""
+
+    def __init__(self, config: FrigateConfig, stop_event: MpEvent) -> None:
+        super().__init__(
+            stop_event,
+            PROCESS_PRIORITY_HIGH,
+            name="frigate.detection_aggregator",
+            daemon=True,
+        )
+        self.config = config
+        self.summaries = DetectionSummaries(config, shared=True)
+
+    def run(self) -> None:
+        self.pre_run_setup(self.config.logger)
+        detection_subscriber = DetectionSubscriber(
+            DetectionTypeEnum.all.value, DetectionProjectionEnum.summary
+        )
+        config_subscriber = CameraConfigUpdateSubscriber(
+            self.config,
+            self.config.cameras,
+            [CameraConfigUpdateEnum.add, CameraConfigUpdateEnum.detect],
+        )
+        last_config_check = 0.0
+
+        # summaries are created before the first detection so readers can attach
+        for camera in self.config.cameras:
+            self.summaries[camera]
+
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+
+            if now - last_config_check > 1:
+                config_subscriber.check_for_updates()
+                last_config_check = now
+
+            (topic, data) = detection_subscriber.check_for_update(timeout=1)
+
+            if not topic:
+                continue
+
+            self.summaries.handle_detection(topic, data)
+
+        detection_subscriber.stop()
+        config_subscriber.stop()
+        self.summaries.close()
+        logger.info("Exiting detection aggregator...")
@@ -6,11 +6,15 @@ import shutil
 import time
 from json import JSONDecodeError
 from multiprocessing.managers import DictProxy
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import requests
 from requests.exceptions import RequestException
 
+from frigate.camera.backpressure import get_backpressure_stats
+from frigate.comms.inter_process import InterProcessCommunicator
+from frigate.comms.mqtt import MqttClient
+from frigate.comms.zmq_proxy import Publisher
 from frigate.config import FrigateConfig
 from frigate.const import CACHE_DIR, CLIPS_DIR, RECORD_DIR
 from frigate.data_processing.types import DataProcessorMetrics
@@ -33,6 +37,9 @@ from frigate.util.services import (
 )
 from frigate.version import VERSION
 
+if TYPE_CHECKING:
+    from frigate.embeddings import EmbeddingsContext
+
 
 def get_latest_version(config: FrigateConfig) -> str:
     if not config.telemetry.version_check:
@@ -59,6 +66,10 @@ def stats_init(
     embeddings_metrics: DataProcessorMetrics | None,
     detectors: dict[str, ObjectDetectProcess],
     processes: dict[str, int],
+    publishers: list[Publisher] | None = None,
+    inter_process_communicator: InterProcessCommunicator | None = None,
+    mqtt_client: MqttClient | None = None,
+    embeddings: "EmbeddingsContext | None" = None,
 ) -> StatsTrackingTypes:
     stats_tracking: StatsTrackingTypes = {
         "camera_metrics": camera_metrics,
@@ -68,6 +79,10 @@ def stats_init(
         "latest_frigate_version": get_latest_version(config),
         "last_updated": int(time.time()),
         "processes": processes,
+        "publishers": publishers or [],
+        "inter_process_communicator": inter_process_communicator,
+        "mqtt_client": mqtt_client,
+        "embeddings": embeddings,
     }
     return stats_tracking
 
@@ -391,6 +406,7 @@ def stats_snapshot(
             "ffmpeg_pid": ffmpeg_pid,
             "audio_rms": round(camera_stats.audio_rms.value, 4),
             "audio_dBFS": round(camera_stats.audio_dBFS.value, 4),
+            "backpressure": get_backpressure_stats(camera_stats),
             **connection_quality,
         }
 
@@ -424,6 +440,43 @@ def stats_snapshot(
                     ),
                 }
             )
+            stats["embeddings_batching"] = {
+                "image": {
+                    "batch_size": round(
+                        embeddings_metrics.image_embeddings_batch_size.value, 2
+                    ),
+                    "queue_delay": round(
+                        embeddings_metrics.image_embeddings_queue_delay.value * 1000, 2
+                    ),
+                },
+                "text": {
+                    "batch_size": round(
+                        embeddings_metrics.text_embeddings_batch_size.value, 2
+                    ),
+                    "queue_delay": round(
+                        embeddings_metrics.text_embeddings_queue_delay.value * 1000, 2
+                    ),
+                },
+            }
+
+            # onnx models time each stage of embedding a thumbnail
+            if embeddings_metrics.image_embeddings_inference_speed.value > 0.0:
+                stats["image_embedding_stages"] = {
+                    "decode": round(
+                        embeddings_metrics.image_embeddings_decode_speed.value * 1000,
+                        2,
+                    ),
+                    "preprocess": round(
+                        embeddings_metrics.image_embeddings_preprocess_speed.value
+                        * 1000,
+                        2,
+                    ),
+                    "inference": round(
+                        embeddings_metrics.image_embeddings_inference_speed.value
+                        * 1000,
+                        2,
+                    ),
+                }
 
         if config.face_recognition.enabled:
             stats["embeddings"]["face_recognition_speed"] = round(
@@ -465,6 +518,14 @@ def stats_snapshot(
                 embeddings_metrics.object_desc_dps.value, 2
             )
 
+        if embeddings_metrics.trigger_matching_speed.value > 0.0:
+            stats["embeddings"]["trigger_matching_speed"] = round(
+                embeddings_metrics.trigger_matching_speed.value * 1000, 2
+            )
+            stats["embeddings"]["trigger_matching_events_per_second"] = round(
+                embeddings_metrics.trigger_matching_eps.value, 2
+            )
+
         for key in embeddings_metrics.classification_speeds.keys():
             stats["embeddings"][f"{key}_classification_speed"] = round(
                 embeddings_metrics.classification_speeds[key].value * 1000, 2
@@ -505,4 +566,24 @@ def stats_snapshot(
             "pid": pid,
         }
 
+    stats["bus"] = {}
+    for publisher in stats_tracking["publishers"]:
+        stats["bus"].update(publisher.get_topic_stats())
+
+    if stats_tracking["inter_process_communicator"] is not None:
+        stats["request_latencies"] = stats_tracking[
+            "inter_process_communicator"
+        ].get_latency_stats()
+
+    if stats_tracking["mqtt_client"] is not None:
+        stats["mqtt"] = stats_tracking["mqtt_client"].get_publish_stats()
+
+    if config.semantic_search.enabled and stats_tracking["embeddings"] is not None:
+        stats["search_query_cache"] = stats_tracking[
+            "embeddings"
+        ].query_cache.get_stats()
+
+        if (index := stats_tracking["embeddings"].thumbnail_index) is not None:
+            stats["embeddings_index"] = index.get_stats()
+
     return stats
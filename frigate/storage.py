@@ -1,23 +1,25 @@
 """Handle storage retention and usage."""
 
+import datetime
 import logging
+import math
 import shutil
 import threading
 from pathlib import Path
 
-from peewee import SQL, fn
+from peewee import fn
+from playhouse.sqlite_ext import SqliteExtDatabase
 
 from frigate.config import FrigateConfig
 from frigate.const import RECORD_DIR, REPLAY_CAMERA_PREFIX
-from frigate.models import Event, Recordings
+from frigate.models import Event, Recordings, RecordingsUsage
 from frigate.util.builtin import clear_and_unlink
 
 logger = logging.getLogger(__name__)
-bandwidth_equation = Recordings.segment_size / (
-    Recordings.end_time - Recordings.start_time
-)
 
 MAX_CALCULATED_BANDWIDTH = 10000  # 10Gb/hr
+BANDWIDTH_SEGMENT_COUNT = 100
+USAGE_VERIFY_INTERVAL = 86400
 
 
 class StorageMaintainer(threading.Thread):
@@ -39,38 +41,43 @@ class StorageMaintainer(threading.Thread):
             # cameras with < 50 segments should be refreshed to keep size accurate
             # when few segments are available
             if self.camera_storage_stats.get(camera, {}).get("needs_refresh", True):
-                self.camera_storage_stats[camera] = {
-                    "needs_refresh": (
-                        Recordings.select(fn.COUNT("*"))
-                        .where(Recordings.camera == camera, Recordings.segment_size > 0)
-                        .scalar()
-                        < 50
+                # walk back through the daily totals until enough segments are found
+                segment_count = 0
+                segment_size = 0.0
+                duration = 0.0
+
+                for usage in (
+                    RecordingsUsage.select(
+                        RecordingsUsage.segment_count,
+                        RecordingsUsage.segment_size,
+                        RecordingsUsage.duration,
                     )
-                }
+                    .where(RecordingsUsage.camera == camera)
+                    .order_by(RecordingsUsage.day.desc())
+                    .namedtuples()
+                    .iterator()
+                ):
+                    segment_count += usage.segment_count
+                    segment_size += usage.segment_size
+                    duration += usage.duration
+
+                    if segment_count >= BANDWIDTH_SEGMENT_COUNT:
+                        break
 
-                # calculate MB/hr from last 100 segments
-                try:
-                    # Subquery to get last 100 segments, then average their bandwidth
-                    last_100 = (
-                        Recordings.select(bandwidth_equation.alias("bw"))
-                        .where(Recordings.camera == camera, Recordings.segment_size > 0)
-                        .order_by(Recordings.start_time.desc())
-                        .limit(100)
-                        .alias("recent")
-                    )
+                self.camera_storage_stats[camera] = {
+                    "needs_refresh": segment_count < 50
+                }
 
-                    bandwidth = round(
-                        Recordings.select(fn.AVG(SQL("bw"))).from_(last_100).scalar()
-                        * 3600,
-                        2,
-                    )
+                # calculate MB/hr from the most recent segments
+                if duration > 0:
+                    bandwidth = round(segment_size / duration * 3600, 2)
 
                     if bandwidth > MAX_CALCULATED_BANDWIDTH:
                         logger.warning(
                             f"{camera} has a bandwidth of {bandwidth} MB/hr which exceeds the expected maximum. This typically indicates an issue with the cameras recordings."
                         )
                         bandwidth = MAX_CALCULATED_BANDWIDTH
-                except TypeError:
+                else:
                     bandwidth = 0
 
                 self.camera_storage_stats[camera]["bandwidth"] = bandwidth
@@ -79,23 +86,26 @@ class StorageMaintainer(threading.Thread):
     def calculate_camera_usages(self) -> dict[str, dict]:
         """Calculate the storage usage of each camera."""
         usages: dict[str, dict] = {}
+        camera_storage = {
+            row.camera: row.usage
+            for row in RecordingsUsage.select(
+                RecordingsUsage.camera,
+                fn.SUM(RecordingsUsage.segment_size).alias("usage"),
+            )
+            .group_by(RecordingsUsage.camera)
+            .namedtuples()
+        }
 
         for camera in self.config.cameras.keys():
             # Skip replay cameras
             if camera.startswith(REPLAY_CAMERA_PREFIX):
                 continue
 
-            camera_storage = (
-                Recordings.select(fn.SUM(Recordings.segment_size))
-                .where(Recordings.camera == camera, Recordings.segment_size != 0)
-                .scalar()
-            )
-
             camera_key = (
                 getattr(self.config.cameras[camera], "friendly_name", None) or camera
             )
             usages[camera_key] = {
-                "usage": camera_storage,
+                "usage": camera_storage.get(camera),
                 "bandwidth": self.camera_storage_stats.get(camera, {}).get(
                     "bandwidth", 0
                 ),
@@ -103,6 +113,88 @@ class StorageMaintainer(threading.Thread):
 
         return usages
 
+    def verify_usage_aggregates(self, rebuild: bool = True) -> list[str]:
+        """Compare the usage aggregates against the recordings table.
+
+        Returns the cameras whose aggregates were out of sync, and rebuilds
+        them from the recordings table when rebuild is set.
+        """
+        day = (Recordings.start_time / 86400).cast("INTEGER")
+        expected: dict[tuple[str, int], tuple[int, float, float]] = {
+            (row.camera, row.day): (row.count, row.size, row.duration)
+            for row in Recordings.select(
+                Recordings.camera,
+                day.alias("day"),
+                fn.COUNT("*").alias("count"),
+                fn.SUM(Recordings.segment_size).alias("size"),
+                fn.SUM(Recordings.end_time - Recordings.start_time).alias("duration"),
+            )
+            .where(Recordings.segment_size > 0)
+            .group_by(Recordings.camera, day)
+            .namedtuples()
+        }
+        actual: dict[tuple[str, int], tuple[int, float, float]] = {
+            (row.camera, row.day): (row.segment_count, row.segment_size, row.duration)
+            for row in RecordingsUsage.select().namedtuples()
+        }
+
+        out_of_sync: set[str] = set()
+
+        for key in expected.keys() | actual.keys():
+            expected_totals = expected.get(key, (0, 0.0, 0.0))
+            actual_totals = actual.get(key, (0, 0.0, 0.0))
+
+            if expected_totals[0] != actual_totals[0] or not all(
+                math.isclose(e, a, rel_tol=1e-6, abs_tol=0.01)
+                for e, a in zip(expected_totals[1:], actual_totals[1:])
+            ):
+                out_of_sync.add(key[0])
+
+        if out_of_sync and rebuild:
+            logger.warning(
+                f"Rebuilding storage usage for out of sync cameras: {sorted(out_of_sync)}"
+            )
+
+            for camera in out_of_sync:
+                self.rebuild_camera_usage(camera)
+
+        return sorted(out_of_sync)
+
+    def rebuild_camera_usage(self, camera: str) -> None:
+        """Replace the usage aggregates of a camera in a single transaction."""
+        day = (Recordings.start_time / 86400).cast("INTEGER")
+        delete = RecordingsUsage.delete().where(RecordingsUsage.camera == camera)
+        rebuild = RecordingsUsage.insert_from(
+            Recordings.select(
+                Recordings.camera,
+                day,
+                fn.COUNT("*"),
+                fn.SUM(Recordings.segment_size),
+                fn.SUM(Recordings.end_time - Recordings.start_time),
+            )
+            .where(Recordings.camera == camera, Recordings.segment_size > 0)
+            .group_by(Recordings.camera, day),
+            [
+                RecordingsUsage.camera,
+                RecordingsUsage.day,
+                RecordingsUsage.segment_count,
+                RecordingsUsage.segment_size,
+                RecordingsUsage.duration,
+            ],
+        ).on_conflict_replace()
+
+        # the queue database doesn't support transactions, a dedicated
+        # connection holds the write lock so recordings written by the
+        # triggers can't land between the delete and the rebuild
+        db = SqliteExtDatabase(RecordingsUsage._meta.database.database, timeout=60)
+
+        try:
+            with db.atomic("IMMEDIATE"):
+                for query in (delete, rebuild):
+                    db.execute_sql(*query.sql())
+        finally:
+            db.close()
+
     def check_storage_needs_cleanup(self) -> bool:
         """Return if storage needs cleanup."""
         # currently runs cleanup if less than 1 hour of space is left
@@ -280,8 +372,17 @@ class StorageMaintainer(threading.Thread):
 
     def run(self):
         """Check every 5 minutes if storage needs to be cleaned up."""
+        self.verify_usage_aggregates()
+        last_verified = datetime.datetime.now().timestamp()
         self.calculate_camera_bandwidth()
         while not self.stop_event.wait(300):
+            if (
+                datetime.datetime.now().timestamp() - last_verified
+                > USAGE_VERIFY_INTERVAL
+            ):
+                self.verify_usage_aggregates()
+                last_verified = datetime.datetime.now().timestamp()
+
             if not self.camera_storage_stats or True in [
                 r["needs_refresh"] for r in self.camera_storage_stats.values()
             ]:
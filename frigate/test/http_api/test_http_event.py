@@ -219,6 +219,41 @@ class TestHttpApp(BaseTestHttp):
             assert len(events) == 1
             assert events[0]["id"] == event_id
 
+    def test_events_search_grows_k_until_filters_match(self):
+        event_id = "123456.search.k"
+
+        def search_thumbnail(query, k, **filters):
+            # embeddings of objects the event filters remove come first
+            results = [(f"missing.{i}", 0.01) for i in range(k)]
+            return results + [(event_id, 0.5)] if k > 100 else results
+
+        mock_embeddings = Mock()
+        mock_embeddings.search_thumbnail.side_effect = search_thumbnail
+
+        self.app.frigate_config.semantic_search.enabled = True
+        self.app.embeddings = mock_embeddings
+
+        with AuthTestClient(self.app) as client:
+            super().insert_mock_event(event_id)
+
+            events = client.get(
+                "/events/search",
+                params={
+                    "search_type": "similarity",
+                    "event_id": event_id,
+                    "cameras": "front_door",
+                    "labels": "Mock",
+                    "limit": 1,
+                },
+            ).json()
+
+        assert [e["id"] for e in events] == [event_id]
+        assert mock_embeddings.search_thumbnail.call_count == 2
+        _, kwargs = mock_embeddings.search_thumbnail.call_args
+        assert kwargs["k"] == 400
+        assert kwargs["cameras"] == ["front_door"]
+        assert kwargs["labels"] == ["Mock"]
+
     def test_get_good_event(self):
         id = "123456.random"
 
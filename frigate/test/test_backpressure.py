@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from frigate.camera import backpressure
+from frigate.camera.backpressure import (
+    BACKPRESSURE_LEVELS,
+    OVERLOAD_WINDOWS,
+    RECOVERY_WINDOWS,
+    BackpressureController,
+    DropReasonEnum,
+)
+
+
+class TestBackpressureController(unittest.TestCase):
+    def setUp(self):
+        self.clock = 1000.0
+        self.time_patch = patch.object(
+            backpressure.time, "monotonic", side_effect=lambda: self.clock
+        )
+        self.time_patch.start()
+        self.controller = BackpressureController(MagicMock())
+
+    def tearDown(self):
+        self.time_patch.stop()
+
+    def _run_window(self, duration: float, fps: int = 10, queue_full=False):
+        """Process one second of frames that each take duration seconds."""
+        for _ in range(fps):
+            if not self.controller.should_process():
+                continue
+
+            if queue_full:
+                self.controller.record_drop(DropReasonEnum.queue_full)
+
+            self.controller.observe(self.clock, duration, fps, self.clock)
+
+        self.clock += backpressure.BACKPRESSURE_WINDOW
+        # an extra observation closes the window
+        self.controller.observe(self.clock, duration, fps, self.clock)
+
+    def test_level_raises_when_overloaded(self):
+        for _ in range(OVERLOAD_WINDOWS):
+            self._run_window(0.2)
+
+        self.assertEqual(self.controller.level, 1)
+        self.assertEqual(self.controller.frame_stride, 2)
+
+    def test_single_spike_is_ignored(self):
+        self._run_window(0.2)
+        self._run_window(0.01)
+        self._run_window(0.2)
+        self.assertEqual(self.controller.level, 0)
+
+    def test_queue_full_counts_as_overload(self):
+        for _ in range(OVERLOAD_WINDOWS):
+            self._run_window(0.01, queue_full=True)
+
+        self.assertEqual(self.controller.level, 1)
+
+    def test_level_lowers_slowly_when_idle(self):
+        self.controller.level = 2
+
+        for _ in range(RECOVERY_WINDOWS - 1):
+            self._run_window(0.01)
+
+        self.assertEqual(self.controller.level, 2)
+        self._run_window(0.01)
+        self.assertEqual(self.controller.level, 1)
+
+    def test_level_is_kept_when_lower_level_would_overload(self):
+        # fits at a stride of 2 frames but not at every frame
+        self.controller.level = 1
+
+        for _ in range(RECOVERY_WINDOWS * 2):
+            self._run_window(0.08)
+
+        self.assertEqual(self.controller.level, 1)
+
+    def test_regions_are_limited(self):
+        regions = list(range(10))
+        self.assertEqual(self.controller.limit_regions(regions), regions)
+
+        self.controller.level = len(BACKPRESSURE_LEVELS) - 1
+        self.assertEqual(self.controller.limit_regions(regions), [0])
+
+    def test_skipped_frames(self):
+        self.controller.level = 3
+        processed = [self.controller.should_process() for _ in range(12)]
+        self.assertEqual(processed.count(True), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from frigate.comms.config_updater import UpdateGeneration
+from frigate.config.camera.updater import (
+    CameraConfigUpdateEnum,
+    CameraConfigUpdatePublisher,
+    CameraConfigUpdateSubscriber,
+    CameraConfigUpdateTopic,
+)
+
+
+class TestCameraConfigUpdates(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("/tmp/cache", exist_ok=True)
+        self.camera = f"test_camera_{os.getpid()}"
+        self.publisher = CameraConfigUpdatePublisher([self.camera, "other"])
+        self.camera_config = MagicMock()
+        self.subscriber = CameraConfigUpdateSubscriber(
+            None, {self.camera: self.camera_config}, [CameraConfigUpdateEnum.enabled]
+        )
+        self.all_subscriber = CameraConfigUpdateSubscriber(
+            MagicMock(),
+            {self.camera: MagicMock(), "other": MagicMock()},
+            [CameraConfigUpdateEnum.enabled],
+        )
+
+    def tearDown(self):
+        self.subscriber.stop()
+        self.all_subscriber.stop()
+        self.publisher.stop()
+
+    def _wait_for_update(self, subscriber: CameraConfigUpdateSubscriber) -> dict:
+        for _ in range(100):
+            updates = subscriber.check_for_updates()
+
+            if updates:
+                return updates
+
+            time.sleep(0.01)
+
+        self.fail("no update received")
+
+    def test_socket_is_only_polled_after_a_publish(self):
+        # let the startup grace period expire
+        self.subscriber.poll_until = time.monotonic()
+        time.sleep(0.01)
+        self.subscriber.check_for_updates()
+        self.subscriber.subscriber = MagicMock(wraps=self.subscriber.subscriber)
+
+        for _ in range(100):
+            self.assertEqual(self.subscriber.check_for_updates(), {})
+
+        self.subscriber.subscriber.check_for_update.assert_not_called()
+
+        self.publisher.publish_update(
+            CameraConfigUpdateTopic(CameraConfigUpdateEnum.enabled, self.camera),
+            False,
+        )
+
+        self.assertEqual(
+            self._wait_for_update(self.subscriber), {"enabled": [self.camera]}
+        )
+        self.assertFalse(self.camera_config.enabled)
+
+    def test_all_camera_subscribers_see_every_camera(self):
+        # the subscription needs a moment to connect before publishing
+        time.sleep(0.2)
+        self.publisher.publish_update(
+            CameraConfigUpdateTopic(CameraConfigUpdateEnum.enabled, "other"), True
+        )
+
+        self.assertEqual(
+            self._wait_for_update(self.all_subscriber), {"enabled": ["other"]}
+        )
+        self.assertEqual(self.subscriber.check_for_updates(), {})
+
+    def test_update_arriving_after_the_grace_period(self):
+        time.sleep(0.2)
+        topic = CameraConfigUpdateTopic(CameraConfigUpdateEnum.enabled, self.camera)
+        # the generation changes before the message reaches the subscriber
+        self.publisher.generations[self.camera].increment()
+        self.assertEqual(self.subscriber.check_for_updates(), {})
+
+        self.publisher.publisher.publish(topic.topic, False)
+        time.sleep(0.2)
+        # the caller only checks again after the grace period
+        self.subscriber.poll_until = time.monotonic() - 1
+
+        self.assertEqual(
+            self.subscriber.check_for_updates(), {"enabled": [self.camera]}
+        )
+        self.assertEqual(self.subscriber.poll_until, 0.0)
+
+    def test_subscriber_started_before_the_publisher(self):
+        camera = f"{self.camera}_new"
+        subscriber = CameraConfigUpdateSubscriber(
+            None, {camera: MagicMock()}, [CameraConfigUpdateEnum.enabled]
+        )
+
+        try:
+            self.assertIsNone(subscriber.generation)
+            self.publisher.publish_update(
+                CameraConfigUpdateTopic(CameraConfigUpdateEnum.enabled, camera), True
+            )
+            subscriber.next_attach = 0.0
+            subscriber.check_for_updates()
+            self.assertIsNotNone(subscriber.generation)
+        finally:
+            subscriber.stop()
+
+    def test_publisher_unlinks_generations(self):
+        self.publisher.publish_update(
+            CameraConfigUpdateTopic(CameraConfigUpdateEnum.remove, "other"), None
+        )
+
+        with self.assertRaises(FileNotFoundError):
+            UpdateGeneration("other")
+
+        self.publisher.stop()
+
+        for name in ["", self.camera]:
+            with self.assertRaises(FileNotFoundError):
+                UpdateGeneration(name)
+
+        self.publisher = CameraConfigUpdatePublisher([])
+
+
+class TestUpdateGeneration(unittest.TestCase):
+    def test_generation_is_shared(self):
+        name = f"test_generation_{os.getpid()}"
+        writer = UpdateGeneration(name, create=True)
+        reader = UpdateGeneration(name)
+
+        try:
+            self.assertEqual(reader.value, 0)
+            writer.increment()
+            writer.increment()
+            self.assertEqual(reader.value, 2)
+        finally:
+            reader.close()
+            writer.close()
+            writer.unlink()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import multiprocessing as mp
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from frigate.comms.detection_ring import (
+    HEAD,
+    RING_SLOTS,
+    TAIL,
+    DetectionResultRing,
+    create_detection_ring,
+)
+from frigate.const import MAX_DETECTIONS
+
+
+def _detections(count: int, score: float = 0.9) -> np.ndarray:
+    detections = np.zeros((max(count, 20), 6), np.float32)
+    detections[:count] = [1, score, 0.1, 0.2, 0.3, 0.4]
+    return detections
+
+
+def _write_later(name: str, request_id: int, count: int) -> None:
+    time.sleep(0.2)
+    ring = DetectionResultRing(name, 0)
+    ring.write(request_id, _detections(count), time.time(), 0.01)
+    ring.close()
+
+
+def _write_many(name: str, lane: int, request_ids: list[int]) -> None:
+    ring = DetectionResultRing(name, lane)
+
+    for request_id in request_ids:
+        # wait for the camera to read the lane instead of dropping results
+        while not ring.write(request_id, _detections(request_id % 50), 0, 0):
+            time.sleep(0.001)
+
+    ring.close()
+
+
+class TestDetectionResultRing(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("/tmp/cache", exist_ok=True)
+        self.name = f"test_ring_{os.getpid()}"
+        self.shm = create_detection_ring(self.name, 2)
+        self.consumer = DetectionResultRing(self.name)
+        self.producer = DetectionResultRing(self.name, 0)
+
+    def tearDown(self):
+        self.consumer.close()
+        self.producer.close()
+        self.consumer.unlink()
+
+    def test_results_are_not_capped_at_20(self):
+        self.consumer.reset()
+        self.producer.write(1, _detections(50), time.time(), 0.02)
+
+        rows, duration = self.consumer.read(1, timeout=1)
+        self.assertEqual(rows.shape, (50, 6))
+        self.assertAlmostEqual(duration, 0.02)
+
+        self.producer.write(2, _detections(MAX_DETECTIONS + 10), time.time(), 0.02)
+        rows, _ = self.consumer.read(2, timeout=1)
+        self.assertEqual(len(rows), MAX_DETECTIONS)
+
+    def test_padding_is_not_copied(self):
+        self.producer.write(1, _detections(0), time.time(), 0.01)
+        rows, _ = self.consumer.read(1, timeout=1)
+        self.assertEqual(len(rows), 0)
+
+    def test_stale_results_are_skipped(self):
+        self.producer.write(1, _detections(3), time.time(), 0.01)
+        self.producer.write(2, _detections(5), time.time(), 0.01)
+
+        rows, _ = self.consumer.read(2, timeout=1)
+        self.assertEqual(len(rows), 5)
+        self.assertIsNone(self.consumer.read(3, timeout=0.1))
+
+    def test_full_ring_drops_results(self):
+        for i in range(RING_SLOTS):
+            self.assertTrue(self.producer.write(i, _detections(1), time.time(), 0))
+
+        self.assertFalse(self.producer.write(99, _detections(1), time.time(), 0))
+
+        self.consumer.reset()
+        self.assertTrue(self.producer.write(100, _detections(2), time.time(), 0))
+        rows, _ = self.consumer.read(100, timeout=1)
+        self.assertEqual(len(rows), 2)
+
+    def test_consumer_is_woken_across_processes(self):
+        self.consumer.reset()
+        # open the pipe before the producer writes so the wakeup is delivered
+        self.assertIsNone(self.consumer.read(7, timeout=0.01))
+
+        process = mp.Process(target=_write_later, args=(self.name, 7, 25))
+        start = time.monotonic()
+        process.start()
+        result = self.consumer.read(7, timeout=5)
+        elapsed = time.monotonic() - start
+        process.join()
+
+        self.assertIsNotNone(result)
+        self.assertEqual(len(result[0]), 25)
+        self.assertLess(elapsed, 2)
+
+    def test_unannounced_results_are_not_read(self):
+        self.consumer.reset()
+        # the rows and head were stored, but the wakeup did not arrive yet
+        with patch.object(self.producer, "_notify"):
+            self.producer.write(3, _detections(4), time.time(), 0.01)
+
+        self.assertIsNone(self.consumer.read(3, timeout=0.05))
+
+        self.producer.write(4, _detections(6), time.time(), 0.01)
+        rows, _ = self.consumer.read(4, timeout=1)
+        self.assertEqual(len(rows), 6)
+
+    def test_detectors_write_to_their_own_lane(self):
+        self.consumer.reset()
+        request_ids = [list(range(1, 200, 2)), list(range(2, 200, 2))]
+        processes = [
+            mp.Process(target=_write_many, args=(self.name, lane, ids))
+            for lane, ids in enumerate(request_ids)
+        ]
+
+        for process in processes:
+            process.start()
+
+        received = {}
+        deadline = time.monotonic() + 10
+
+        while len(received) < 199 and time.monotonic() < deadline:
+            self.consumer._wait(0.1)
+
+            for lane in range(2):
+                while True:
+                    header = self.consumer.header[lane]
+                    head = min(self.consumer.announced[lane], int(header[HEAD]))
+
+                    if header[TAIL] >= head:
+                        break
+
+                    slot = int(header[TAIL]) % RING_SLOTS
+                    request_id, count = (int(v) for v in self.consumer.ids[lane, slot])
+                    received[request_id] = count
+                    header[TAIL] += 1
+
+        for process in processes:
+            process.join()
+
+        self.assertEqual(
+            received, {request_id: request_id % 50 for request_id in range(1, 200)}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
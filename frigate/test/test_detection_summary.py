@@ -0,0 +1,155 @@
+import os
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from frigate.comms.detections_updater import DetectionTypeEnum
+from frigate.record.summary import (
+    ACTIVE_COUNT,
+    AUDIO_ACTIVE_COUNT,
+    AUDIO_COUNT,
+    DBFS_SUM,
+    FRAME_COUNT,
+    MOTION_COUNT,
+    SUMMARY_SECONDS,
+    DetectionSummaries,
+    DetectionSummary,
+)
+
+
+def _tracked_object(false_positive: bool, motionless_count: int) -> dict:
+    return {
+        "label": "person",
+        "frame_time": 1000.5,
+        "false_positive": false_positive,
+        "motionless_count": motionless_count,
+        "position_changes": 1,
+        "stationary": motionless_count > 10,
+    }
+
+
+def _config(camera: str) -> MagicMock:
+    camera_config = MagicMock()
+    camera_config.detect.width = 1280
+    camera_config.detect.height = 720
+    camera_config.detect.fps = 5
+    config = MagicMock()
+    config.cameras = {camera: camera_config}
+    return config
+
+
+class TestDetectionSummary(unittest.TestCase):
+    def setUp(self):
+        self.camera = f"test_summary_{os.getpid()}"
+        self.writer = DetectionSummary(self.camera, create=True, fps=2)
+        self.reader = DetectionSummary(self.camera)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        self.writer.unlink()
+
+    def test_totals_cover_frames_in_range(self):
+        grid = np.ones((16, 16), dtype=np.int32)
+
+        for i in range(40):
+            # two frames per second
+            self.writer.add_video(1000.25 + i / 2, 1, 2, 1, grid)
+
+        self.writer.add_audio(1005.5, -40, 1)
+        self.writer.add_audio(1006.5, -20, 0)
+
+        self.assertEqual(self.reader.latest_frame_time, 1019.75)
+
+        totals, motion_grid = self.reader.totals(1000, 1010)
+        self.assertEqual(totals[FRAME_COUNT], 20)
+        self.assertEqual(totals[ACTIVE_COUNT], 20)
+        self.assertEqual(totals[MOTION_COUNT], 40)
+        self.assertEqual(totals[AUDIO_COUNT], 2)
+        self.assertEqual(totals[DBFS_SUM], -60)
+        self.assertEqual(totals[AUDIO_ACTIVE_COUNT], 1)
+        self.assertTrue((motion_grid == 20).all())
+
+        self.assertEqual(self.reader.totals(1010, 1020)[0][FRAME_COUNT], 20)
+
+    def test_fractional_segment_boundaries(self):
+        grid = np.ones((16, 16), dtype=np.int32)
+        self.writer.add_video(100.2, 0, 0, 1, None)
+        self.writer.add_video(100.7, 1, 3, 1, grid)
+        self.writer.add_audio(100.6, -30, 1)
+
+        before, before_grid = self.reader.totals(90.5, 100.5)
+        self.assertEqual(before[FRAME_COUNT], 1)
+        self.assertEqual(before[MOTION_COUNT], 0)
+        self.assertEqual(before[AUDIO_COUNT], 0)
+        self.assertEqual(before_grid.sum(), 0)
+
+        after, after_grid = self.reader.totals(100.5, 110.5)
+        self.assertEqual(after[FRAME_COUNT], 1)
+        self.assertEqual(after[ACTIVE_COUNT], 1)
+        self.assertEqual(after[MOTION_COUNT], 3)
+        self.assertEqual(after[AUDIO_ACTIVE_COUNT], 1)
+        self.assertEqual(after_grid.sum(), 256)
+
+    def test_old_frames_are_replaced(self):
+        self.writer.add_video(1000, 1, 0, 0, None)
+
+        for i in range(SUMMARY_SECONDS * 2):
+            self.writer.add_video(2000 + i, 3, 0, 0, None)
+
+        self.assertEqual(self.reader.totals(1000, 1001)[0][FRAME_COUNT], 0)
+        self.assertEqual(self.reader.totals(2000, 2001)[0][ACTIVE_COUNT], 6)
+
+    def test_local_summary(self):
+        summary = DetectionSummary(self.camera, create=True, shared=False)
+        summary.add_video(1000.5, 2, 1, 1, None)
+
+        self.assertEqual(summary.totals(1000, 1001)[0][ACTIVE_COUNT], 2)
+        # the shared summary is not written to
+        self.assertEqual(self.reader.totals(1000, 1001)[0][FRAME_COUNT], 0)
+        summary.close()
+
+
+class TestDetectionSummaries(unittest.TestCase):
+    def test_handle_detection(self):
+        camera = f"test_aggregator_{os.getpid()}"
+        summaries = DetectionSummaries(_config(camera), shared=True)
+
+        try:
+            summaries.handle_detection(
+                DetectionTypeEnum.video.value,
+                (
+                    camera,
+                    "frame",
+                    1000.5,
+                    [
+                        _tracked_object(False, 0),
+                        _tracked_object(False, 0),
+                        _tracked_object(False, 20),
+                        _tracked_object(True, 0),
+                    ],
+                    [(0, 0, 100, 100)],
+                    3,
+                ),
+            )
+            summaries.handle_detection(
+                DetectionTypeEnum.audio.value, (camera, 1000.7, -30, ["speech"])
+            )
+            summaries.handle_detection(
+                DetectionTypeEnum.video.value, ("unknown", "frame", 1000.5, [], [], 0)
+            )
+
+            reader = DetectionSummary(camera)
+            totals, motion_grid = reader.totals(1000, 1001)
+            reader.close()
+            self.assertEqual(totals[ACTIVE_COUNT], 2)
+            self.assertEqual(totals[AUDIO_ACTIVE_COUNT], 1)
+            self.assertEqual(motion_grid.sum(), 6)
+            self.assertNotIn("unknown", summaries)
+        finally:
+            summaries.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
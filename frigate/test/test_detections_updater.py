@@ -0,0 +1,125 @@
+import os
+import time
+import unittest
+
+from frigate.comms.detections_updater import (
+    SUMMARY_OBJECT_FIELDS,
+    DetectionProjectionEnum,
+    DetectionPublisher,
+    DetectionSubscriber,
+    DetectionTypeEnum,
+    project_video_detection,
+)
+from frigate.comms.zmq_proxy import ZmqProxy
+
+
+def _tracked_object(id: str, false_positive: bool, motionless_count: int) -> dict:
+    return {
+        "id": id,
+        "label": "person",
+        "frame_time": 1.0,
+        "false_positive": false_positive,
+        "motionless_count": motionless_count,
+        "position_changes": 1,
+        "stationary": motionless_count > 5,
+        "snapshot": {"frame_time": 1.0},
+        "path_data": [[[0.5, 0.5], 1.0]],
+    }
+
+
+VIDEO_PAYLOAD = (
+    "front_door",
+    "front_door_frame1.0",
+    1.0,
+    [
+        _tracked_object("active", False, 0),
+        _tracked_object("stationary", False, 10),
+        _tracked_object("false_positive", True, 0),
+    ],
+    [[0, 0, 10, 10]],
+    [[0, 0, 320, 320], [320, 0, 640, 320]],
+)
+
+
+class TestDetectionProjections(unittest.TestCase):
+    def test_summary_projection(self):
+        camera, frame_name, frame_time, objects, motion_boxes, regions = (
+            project_video_detection(DetectionProjectionEnum.summary, VIDEO_PAYLOAD)
+        )
+        self.assertEqual(
+            (camera, frame_name, frame_time, motion_boxes, regions),
+            ("front_door", "front_door_frame1.0", 1.0, [[0, 0, 10, 10]], 2),
+        )
+        self.assertEqual([o["motionless_count"] for o in objects], [0, 10, 0])
+        self.assertTrue(all(set(o) == set(SUMMARY_OBJECT_FIELDS) for o in objects))
+
+
+class TestDetectionSubscriptions(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("/tmp/cache", exist_ok=True)
+        self.proxy = ZmqProxy()
+
+    def tearDown(self):
+        self.proxy.stop()
+
+    def _drain(self, subscriber: DetectionSubscriber) -> list:
+        updates = []
+
+        while True:
+            topic, payload = subscriber.check_for_update(timeout=0.2)
+
+            if topic is None:
+                return updates
+
+            updates.append((topic, payload))
+
+    def test_projected_subscribers(self):
+        publisher = DetectionPublisher(DetectionTypeEnum.all.value)
+        full = DetectionSubscriber(DetectionTypeEnum.all.value)
+        summary = DetectionSubscriber(
+            DetectionTypeEnum.all.value, DetectionProjectionEnum.summary
+        )
+        video_summary = DetectionSubscriber(
+            DetectionTypeEnum.video.value, DetectionProjectionEnum.summary
+        )
+        subscribers = [full, summary, video_summary]
+
+        try:
+            # wait for the subscriptions to propagate through the proxy
+            for _ in range(50):
+                publisher.publish(["sync"], "audio")
+
+                if all(self._drain(s) for s in subscribers[:2]):
+                    break
+
+                time.sleep(0.05)
+
+            self._drain(video_summary)
+            publisher.publish(VIDEO_PAYLOAD, DetectionTypeEnum.video.value)
+            publisher.publish(["front_door", 1.0, -20, []], "audio")
+
+            self.assertEqual(
+                [t for t, _ in self._drain(full)],
+                ["video", "audio"],
+            )
+            summary_updates = self._drain(summary)
+            self.assertEqual([t for t, _ in summary_updates], ["video", "audio"])
+            self.assertEqual(len(summary_updates[0][1][3]), 3)
+            self.assertEqual([t for t, _ in self._drain(video_summary)], ["video"])
+
+            stats = publisher.get_topic_stats()
+            self.assertEqual(stats["detection/video"]["messages"], 1)
+            self.assertEqual(stats["detection_summary/video"]["messages"], 1)
+            self.assertLess(
+                stats["detection_summary/video"]["bytes"],
+                stats["detection/video"]["bytes"],
+            )
+        finally:
+            publisher.stop()
+
+            for subscriber in subscribers:
+                subscriber.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
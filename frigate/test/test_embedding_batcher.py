@@ -0,0 +1,88 @@
+import multiprocessing as mp
+import threading
+import time
+import unittest
+
+from frigate.embeddings.batcher import EmbeddingBatcher
+
+
+class TestEmbeddingBatcher(unittest.TestCase):
+    def setUp(self):
+        self.batches: list[dict] = []
+        self.embedded = threading.Event()
+        self.batch_size = mp.Value("d", 0.0)
+        self.queue_delay = mp.Value("d", 0.0)
+
+    def _embed(self, items: dict) -> None:
+        self.batches.append(items)
+        self.embedded.set()
+
+    def _batcher(self, max_size: int = 4, max_delay: float = 10) -> EmbeddingBatcher:
+        batcher = EmbeddingBatcher(
+            "thumbnails",
+            self._embed,
+            self.batch_size,
+            self.queue_delay,
+            max_size=max_size,
+            max_delay=max_delay,
+        )
+        self.addCleanup(batcher.stop)
+        return batcher
+
+    def test_full_batch_is_embedded_immediately(self):
+        batcher = self._batcher(max_size=3)
+
+        for i in range(3):
+            batcher.add(f"event-{i}", i)
+
+        self.assertTrue(self.embedded.wait(2))
+        self.assertEqual(self.batches, [{"event-0": 0, "event-1": 1, "event-2": 2}])
+        self.assertEqual(self.batch_size.value, 3)
+
+    def test_partial_batch_is_embedded_after_delay(self):
+        batcher = self._batcher(max_delay=0.1)
+        start = time.monotonic()
+        batcher.add("event-0", "a")
+        batcher.add("event-0", "b")
+
+        self.assertTrue(self.embedded.wait(2))
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        # queuing an object again replaces its input
+        self.assertEqual(self.batches, [{"event-0": "b"}])
+        self.assertGreaterEqual(self.queue_delay.value, 0.1)
+
+    def test_callbacks_run_after_embedding(self):
+        batcher = self._batcher(max_size=2)
+        order = []
+        done = threading.Event()
+
+        batcher.add("event-0", 0, lambda: order.append(len(self.batches)))
+        batcher.add("event-1", 1, done.set)
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(order, [1])
+
+    def test_stop_embeds_queued_items(self):
+        batcher = self._batcher()
+        batcher.add("event-0", 0)
+        batcher.add("event-1", 1)
+        batcher.stop()
+
+        self.assertEqual(self.batches, [{"event-0": 0, "event-1": 1}])
+
+    def test_failed_batch_skips_callbacks(self):
+        def fail(items: dict) -> None:
+            raise RuntimeError("inference failed")
+
+        batcher = EmbeddingBatcher(
+            "descriptions", fail, self.batch_size, self.queue_delay, max_size=1
+        )
+        callback = threading.Event()
+        batcher.add("event-0", "a person", callback.set)
+        batcher.stop()
+
+        self.assertFalse(callback.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
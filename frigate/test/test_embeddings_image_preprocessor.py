@@ -0,0 +1,161 @@
+import io
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+from PIL import Image
+from transformers import CLIPImageProcessor
+
+from frigate.config import FrigateConfig
+from frigate.embeddings.embeddings import Embeddings
+from frigate.embeddings.onnx.image_preprocessor import ImagePreprocessor, decode_image
+from frigate.embeddings.onnx.jina_v1_embedding import JinaV1ImageEmbedding
+from frigate.embeddings.onnx.jina_v2_embedding import JinaV2Embedding
+
+
+def _image(width: int, height: int) -> Image.Image:
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)
+    pixels = np.stack(
+        [
+            np.broadcast_to(x, (height, width)),
+            np.broadcast_to(y[:, np.newaxis], (height, width)),
+            np.full((height, width), 128, dtype=np.float32),
+        ],
+        axis=2,
+    )
+    return Image.fromarray(pixels.astype(np.uint8))
+
+
+def _textured_image(width: int, height: int) -> Image.Image:
+    # noise and fine stripes, where different resampling filters disagree most
+    rng = np.random.default_rng(width * height)
+    pixels = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    pixels[::2, :, 0] = 255
+    pixels[:, ::3, 1] = 0
+    return Image.fromarray(pixels)
+
+
+def _encode(image: Image.Image, format: str = "PNG") -> bytes:
+    buf = io.BytesIO()
+    image.save(buf, format=format)
+    return buf.getvalue()
+
+
+class TestImagePreprocessor(unittest.TestCase):
+    def test_decode_image(self):
+        image = _image(30, 20)
+
+        self.assertTrue(np.array_equal(decode_image(_encode(image)), np.asarray(image)))
+        self.assertTrue(
+            np.array_equal(
+                decode_image(image.convert("L")),
+                np.asarray(image.convert("L").convert("RGB")),
+            )
+        )
+
+        with self.assertRaises(ValueError):
+            decode_image(b"not an image")
+
+    def test_batch_skips_images_that_fail_to_decode(self):
+        metrics = MagicMock()
+        preprocessor = ImagePreprocessor(
+            (2,),
+            lambda image, out: out.__setitem__(slice(None), image.shape[:2]),
+            metrics,
+        )
+
+        batch, valid = preprocessor([_encode(_image(4, 3)), b"corrupt", _image(5, 6)])
+
+        self.assertEqual(valid, [0, 2])
+        self.assertEqual(batch.tolist(), [[3, 4], [6, 5]])
+        self.assertGreater(metrics.image_embeddings_decode_speed.value, 0)
+
+
+class TestVisionModelPreprocessing(unittest.TestCase):
+    def test_jinav1_matches_clip_feature_extractor(self):
+        extractor = CLIPImageProcessor(
+            size={"shortest_edge": 224},
+            crop_size={"height": 224, "width": 224},
+        )
+        model = JinaV1ImageEmbedding.__new__(JinaV1ImageEmbedding)
+        model.feature_extractor = extractor
+        model.metrics = None
+        preprocessor = model._create_image_preprocessor()
+
+        for image, format in [
+            (_image(175, 120), "PNG"),
+            (_textured_image(175, 120), "PNG"),
+            (_textured_image(100, 175), "JPEG"),
+            (_textured_image(400, 300), "WEBP"),
+        ]:
+            encoded = _encode(image, format)
+            expected = extractor(
+                images=Image.open(io.BytesIO(encoded)), return_tensors="np"
+            )["pixel_values"]
+            batch, _ = preprocessor([encoded])
+
+            self.assertEqual(batch.shape, expected.shape)
+            self.assertLess(np.abs(batch - expected).max(), 1e-5)
+
+    def test_jinav2_matches_pil_resize(self):
+        model = JinaV2Embedding.__new__(JinaV2Embedding)
+        preprocessor = ImagePreprocessor((3, 512, 512), model._transform_image)
+
+        for image, format in [
+            (_image(175, 120), "PNG"),
+            (_textured_image(175, 120), "JPEG"),
+            (_textured_image(800, 600), "WEBP"),
+        ]:
+            encoded = _encode(image, format)
+            expected = (
+                np.asarray(
+                    Image.open(io.BytesIO(encoded))
+                    .convert("RGB")
+                    .resize((512, 512), Image.Resampling.LANCZOS),
+                    dtype=np.float32,
+                ).transpose(2, 0, 1)
+                / 255.0
+            )
+            batch, _ = preprocessor([encoded])
+
+            self.assertLess(np.abs(batch[0] - expected).max(), 1e-6)
+
+
+class TestBatchEmbedThumbnail(unittest.TestCase):
+    def test_thumbnails_that_fail_to_decode_are_skipped(self):
+        embeddings = Embeddings.__new__(Embeddings)
+        embeddings.config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "cameras": {
+                    "front_door": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"height": 1080, "width": 1920, "fps": 5},
+                    }
+                },
+            }
+        )
+        embeddings.db = MagicMock()
+        embeddings.update_publisher = MagicMock()
+        embeddings.image_eps = MagicMock()
+        embeddings.image_inference_speed = MagicMock()
+        embeddings.vision_embedding = lambda thumbs: [
+            np.ones(768, np.float32) if t != b"corrupt" else None for t in thumbs
+        ]
+
+        result = embeddings.batch_embed_thumbnail({"a": b"corrupt", "b": b"jpeg"})
+
+        self.assertEqual(list(result), ["b"])
+        self.assertEqual(embeddings.db.upsert_embeddings.call_args.args[1], ["b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
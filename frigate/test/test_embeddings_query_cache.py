@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from frigate.config import FrigateConfig
+from frigate.embeddings import EmbeddingsContext
+from frigate.embeddings.query_cache import QueryEmbeddingCache
+from frigate.util.builtin import serialize
+
+
+class TestQueryEmbeddingCache(unittest.TestCase):
+    def test_least_recently_used_query_is_evicted(self):
+        cache = QueryEmbeddingCache(max_size=2)
+        cache.put("jinav1", "person", b"a")
+        cache.put("jinav1", "car", b"b")
+        self.assertEqual(cache.get("jinav1", "person"), b"a")
+        cache.put("jinav1", "dog", b"c")
+
+        self.assertIsNone(cache.get("jinav1", "car"))
+        self.assertEqual(cache.get("jinav1", "person"), b"a")
+        self.assertEqual(cache.get("jinav1", "dog"), b"c")
+
+    def test_whitespace_is_normalized(self):
+        cache = QueryEmbeddingCache()
+        cache.put("jinav1", "red  car ", b"a")
+
+        self.assertEqual(cache.get("jinav1", " red car"), b"a")
+        self.assertIsNone(cache.get("jinav1", "Red car"))
+
+    def test_model_change_invalidates_entries(self):
+        cache = QueryEmbeddingCache()
+        cache.put("jinav1", "person", b"a")
+
+        self.assertIsNone(cache.get("jinav2", "person"))
+        self.assertIsNone(cache.get("jinav1", "person"))
+        self.assertEqual(
+            cache.get_stats(), {"size": 0, "hits": 0, "misses": 2, "hit_rate": 0.0}
+        )
+
+
+class TestEmbeddingsContextQueryCache(unittest.TestCase):
+    def setUp(self):
+        config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "semantic_search": {"enabled": True},
+                "cameras": {
+                    "front_door": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"height": 1080, "width": 1920, "fps": 5},
+                    }
+                },
+            }
+        )
+        self.db = MagicMock()
+        self.db.execute_sql.return_value.fetchall.return_value = [("event", 0.1)]
+        self.db.embeddings_quantization.return_value = "none"
+
+        with patch("frigate.embeddings.EmbeddingsRequestor"):
+            self.context = EmbeddingsContext(self.db, config)
+
+        self.context.requestor.send_data.return_value = [0.5] * 768
+
+    def test_search_types_share_query_embedding(self):
+        self.context.search_thumbnail("person walking")
+        self.context.search_description("person walking")
+        self.context.search_description("person  walking")
+
+        self.context.requestor.send_data.assert_called_once()
+        query_embedding = self.db.execute_sql.call_args.args[1][0]
+        self.assertEqual(query_embedding, serialize([0.5] * 768))
+        self.assertEqual(self.context.query_cache.get_stats()["hits"], 2)
+
+    def test_failed_embedding_is_not_cached(self):
+        self.context.requestor.send_data.return_value = None
+        self.assertEqual(self.context.search_description("person"), [])
+        self.assertEqual(self.context.query_cache.get_stats()["size"], 0)
+
+    def test_reindex_clears_cache(self):
+        self.context.search_description("person")
+        self.context.reindex_embeddings()
+
+        self.assertEqual(self.context.query_cache.get_stats()["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
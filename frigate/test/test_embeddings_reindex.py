@@ -0,0 +1,378 @@
+import base64
+import io
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from peewee_migrate import Router
+from PIL import Image
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.config import FrigateConfig
+from frigate.config.classification import (
+    SemanticSearchModelEnum,
+    SemanticSearchQuantizationEnum,
+)
+from frigate.db import sqlitevecq
+from frigate.db.sqlitevecq import (
+    EMBEDDINGS_FULL_COLUMN,
+    REINDEX_SUFFIX,
+    SqliteVecQueueDatabase,
+)
+from frigate.embeddings import embeddings as embeddings_module
+from frigate.embeddings.embeddings import Embeddings
+from frigate.models import Event
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+from frigate.util.builtin import deserialize, serialize
+
+
+class PlainVecDatabase(SqliteVecQueueDatabase):
+    """Stores embeddings in regular tables since vec0 is not loaded in tests."""
+
+    def _connect(self, *args, **kwargs) -> sqlite3.Connection:
+        conn = super()._connect(*args, **kwargs)
+        # numpy versions of the sqlite-vec functions used for quantization
+        conn.create_function(
+            "vec_normalize",
+            1,
+            lambda v: (_vector(v) / np.linalg.norm(_vector(v))).tobytes(),
+        )
+        conn.create_function(
+            "vec_quantize_int8",
+            2,
+            lambda v, _: np.round(_vector(v) * 127).astype(np.int8).tobytes(),
+        )
+        conn.create_function(
+            "vec_quantize_binary",
+            1,
+            lambda v: np.packbits(_vector(v) > 0, bitorder="little").tobytes(),
+        )
+        return conn
+
+    def embeddings_table_sql(
+        self, name: str, column: str, quantization: str = "none"
+    ) -> str:
+        vector_type = {"none": "BLOB", "int8": "INT8", "binary": "BIT"}[quantization]
+        return (
+            f"CREATE TABLE IF NOT EXISTS {name} (id TEXT PRIMARY KEY, {column} {vector_type}, "
+            f"camera TEXT, label TEXT, start_day INTEGER, {EMBEDDINGS_FULL_COLUMN} BLOB)"
+        )
+
+
+def _vector(value: bytes) -> np.ndarray:
+    return np.frombuffer(value, dtype=np.float32)
+
+
+def _thumbnail() -> str:
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8), (255, 0, 0)).save(buf, format="JPEG")
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+class TestEmbeddingsReindex(unittest.TestCase):
+    def setUp(self):
+        migrate_db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(migrate_db)
+        router.run()
+        migrate_db.close()
+        self.db = PlainVecDatabase(TEST_DB)
+        self.db.bind([Event])
+        self.db.create_embeddings_tables()
+
+        self.test_dir = tempfile.mkdtemp()
+        self.checkpoint_file = os.path.join(self.test_dir, ".reindex_checkpoint.json")
+        self.checkpoint_patch = patch.object(
+            embeddings_module, "REINDEX_CHECKPOINT_FILE", self.checkpoint_file
+        )
+        self.checkpoint_patch.start()
+
+        self.thumbnail = _thumbnail()
+        self.embedded: list[bytes] = []
+        self.fail_after: int | None = None
+
+    def tearDown(self):
+        self.checkpoint_patch.stop()
+        self.db.stop()
+
+        if not self.db.is_closed():
+            self.db.close()
+
+        try:
+            for file in TEST_DB_CLEANUPS:
+                os.remove(file)
+        except OSError:
+            pass
+
+    def _embeddings(
+        self,
+        model: SemanticSearchModelEnum,
+        quantization: SemanticSearchQuantizationEnum = SemanticSearchQuantizationEnum.none,
+    ) -> Embeddings:
+        config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "semantic_search": {
+                    "enabled": True,
+                    "model": model,
+                    "quantization": quantization,
+                },
+                "cameras": {
+                    "front_door": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"height": 1080, "width": 1920, "fps": 5},
+                    }
+                },
+            }
+        )
+        embeddings = Embeddings.__new__(Embeddings)
+        embeddings.config = config
+        embeddings.db = self.db
+        embeddings.requestor = MagicMock()
+        embeddings.update_publisher = MagicMock()
+        embeddings.image_inference_speed = MagicMock()
+        embeddings.text_inference_speed = MagicMock()
+        embeddings.image_eps = MagicMock()
+        embeddings.text_eps = MagicMock()
+        embeddings.reindex_lock = threading.Lock()
+        embeddings.vision_embedding = self._vision_embedding
+        embeddings.text_embedding = lambda texts: [
+            np.full(768, 0.5, np.float32) for _ in texts
+        ]
+        return embeddings
+
+    def _vision_embedding(self, images: list) -> list[np.ndarray]:
+        if self.fail_after is not None and len(self.embedded) >= self.fail_after:
+            raise RuntimeError("inference failed")
+
+        self.assertTrue(all(isinstance(i, bytes) for i in images))
+        self.embedded.extend(images)
+        return [np.full(768, 0.25, np.float32) for _ in images]
+
+    def _insert_events(
+        self, count: int, start_time: float = 1000, prefix: str = "event"
+    ) -> None:
+        for i in range(count):
+            Event.insert(
+                id=f"{prefix}-{i:03d}",
+                label="person",
+                camera="front_door",
+                # pairs of events share a start time to exercise the id tiebreak
+                start_time=start_time + i // 2,
+                end_time=start_time + i // 2 + 20,
+                top_score=1,
+                score=1,
+                false_positive=False,
+                zones=[],
+                thumbnail=self.thumbnail,
+                region=[],
+                box=[],
+                area=0,
+                data={"description": f"person {i}"},
+            ).execute()
+
+    def _ids(self, table: str) -> set[str]:
+        return {row[0] for row in self.db.execute_sql(f"SELECT id FROM {table}")}
+
+    def test_reindex_swaps_in_new_tables(self):
+        self._insert_events(10)
+        # a stale embedding of a deleted object and one written during reindex
+        self.db.upsert_embeddings(
+            "vec_thumbnails",
+            ["deleted", "event-003"],
+            [serialize([0.0] * 768), serialize([0.0] * 768)],
+        )
+
+        embeddings = self._embeddings(SemanticSearchModelEnum.jinav1)
+        embeddings.reindex()
+
+        self.assertEqual(
+            self._ids("vec_thumbnails"), {f"event-{i:03d}" for i in range(10)}
+        )
+        self.assertEqual(len(self._ids("vec_descriptions")), 10)
+        self.assertFalse(self.db.embeddings_tables_exist(REINDEX_SUFFIX))
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+        embeddings.update_publisher.publish.assert_any_call(
+            ("vec_thumbnails", []), "reindex"
+        )
+
+        (embedding,) = self.db.execute_sql(
+            "SELECT thumbnail_embedding FROM vec_thumbnails WHERE id = 'event-003'"
+        ).fetchone()
+        self.assertAlmostEqual(deserialize(embedding)[0], 0.25)
+
+    def test_embeddings_store_event_metadata(self):
+        self._insert_events(2, start_time=86400 * 3 + 10)
+        self.db.upsert_embeddings(
+            "vec_thumbnails",
+            ["event-000", "event-001"],
+            [serialize([0.0] * 768), serialize([1.0] * 768)],
+        )
+        self.db.upsert_embeddings(
+            "vec_thumbnails", ["event-001"], [serialize([0.5] * 768)]
+        )
+
+        rows = self.db.execute_sql(
+            "SELECT id, thumbnail_embedding, camera, label, start_day FROM vec_thumbnails ORDER BY id"
+        ).fetchall()
+        self.assertEqual(
+            [(r[0], r[2], r[3], r[4]) for r in rows],
+            [
+                ("event-000", "front_door", "person", 3),
+                ("event-001", "front_door", "person", 3),
+            ],
+        )
+        self.assertAlmostEqual(deserialize(rows[1][1])[0], 0.5)
+
+        # embeddings carried over by the swap keep their metadata
+        self.db.create_embeddings_tables(REINDEX_SUFFIX)
+        self.db.swap_embeddings_tables(REINDEX_SUFFIX)
+        self.assertEqual(
+            self.db.execute_sql(
+                "SELECT count(*) FROM vec_thumbnails WHERE camera = 'front_door' AND start_day = 3"
+            ).fetchone()[0],
+            2,
+        )
+
+    def test_reindex_applies_quantization(self):
+        self._insert_events(6)
+        embedding = serialize(np.linspace(-1, 1, 768))
+        self.fail_after = 4
+        embeddings = self._embeddings(
+            SemanticSearchModelEnum.jinav2, SemanticSearchQuantizationEnum.int8
+        )
+
+        with self.assertRaises(RuntimeError):
+            embeddings.reindex()
+
+        self.assertEqual(
+            self.db.embeddings_quantization(f"vec_thumbnails{REINDEX_SUFFIX}"), "int8"
+        )
+
+        # an object created during the reindex is embedded in the float
+        # tables and quantized when it is carried over
+        self._insert_events(1, start_time=5000, prefix="new")
+        self.db.upsert_embeddings("vec_thumbnails", ["new-000"], [embedding])
+        self.fail_after = None
+        embeddings.reindex()
+
+        self.assertEqual(self.db.embeddings_quantization("vec_thumbnails"), "int8")
+        self.assertEqual(self.db.embeddings_quantization("vec_descriptions"), "int8")
+        self.assertEqual(self.db.get_embedding("vec_thumbnails", "new-000"), embedding)
+        (quantized,) = self.db.execute_sql(
+            "SELECT thumbnail_embedding FROM vec_thumbnails WHERE id = 'new-000'"
+        ).fetchone()
+        self.assertEqual(len(quantized), 768)
+
+        self.db.upsert_embeddings("vec_descriptions", ["event-000"], [embedding])
+        self.assertEqual(
+            self.db.get_embedding("vec_descriptions", "event-000"), embedding
+        )
+
+    def test_reindex_resumes_from_checkpoint(self):
+        self._insert_events(10)
+        self.fail_after = 4
+        embeddings = self._embeddings(SemanticSearchModelEnum.jinav2)
+
+        with self.assertRaises(RuntimeError):
+            embeddings.reindex()
+
+        # the live tables are untouched until the reindex completes
+        self.assertEqual(self._ids("vec_thumbnails"), set())
+        self.assertTrue(os.path.exists(self.checkpoint_file))
+        self.assertEqual(len(self._ids(f"vec_thumbnails{REINDEX_SUFFIX}")), 4)
+
+        self.fail_after = None
+        self.embedded.clear()
+        embeddings.reindex()
+
+        self.assertEqual(len(self.embedded), 6)
+        self.assertEqual(len(self._ids("vec_thumbnails")), 10)
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+        progress = embeddings.requestor.send_data.call_args.args[1]
+        self.assertEqual(progress["processed_objects"], 10)
+        self.assertEqual(progress["status"], "completed")
+
+    def test_swap_copies_in_chunks(self):
+        self._insert_events(10)
+        transactions = []
+        transaction = self.db._transaction
+
+        def record(statements):
+            transactions.append(statements)
+            transaction(statements)
+
+        with (
+            patch.object(sqlitevecq, "EMBEDDINGS_SWAP_CHUNK", 4),
+            patch.object(self.db, "_transaction", side_effect=record),
+        ):
+            self._embeddings(SemanticSearchModelEnum.jinav1).reindex()
+
+        self.assertEqual(len(self._ids("vec_thumbnails")), 10)
+        self.assertEqual(len(self._ids("vec_descriptions")), 10)
+        copies = [
+            statements[-1][1]
+            for statements in transactions
+            if statements[-1][0].startswith(
+                ("INSERT INTO vec_thumbnails(", "INSERT INTO vec_descriptions(")
+            )
+        ]
+        # ten embeddings per table in chunks of four
+        self.assertEqual([len(items) // 2 for items in copies], [4, 4, 2] * 2)
+
+    def test_failed_transaction_keeps_queued_writes(self):
+        self._insert_events(1)
+        writer = threading.Thread(
+            target=lambda: (
+                Event.update(label="car").where(Event.id == "event-000").execute()
+            )
+        )
+
+        def queue_write() -> int:
+            # another thread writes while the transaction is open
+            writer.start()
+            writer.join(0.5)
+            return 0
+
+        self.db._transaction([("SELECT 1", None)])
+        self.db.transaction_conn.create_function("queue_write", 0, queue_write)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            self.db._transaction(
+                [
+                    ("SELECT queue_write()", None),
+                    ("INSERT INTO missing_table VALUES (1)", None),
+                ]
+            )
+
+        writer.join()
+        self.assertEqual(Event.get(Event.id == "event-000").label, "car")
+
+    def test_checkpoint_of_other_model_is_discarded(self):
+        self._insert_events(6)
+        self.fail_after = 4
+
+        with self.assertRaises(RuntimeError):
+            self._embeddings(SemanticSearchModelEnum.jinav2).reindex()
+
+        self.fail_after = None
+        self.embedded.clear()
+        self._embeddings(SemanticSearchModelEnum.jinav1).reindex()
+
+        self.assertEqual(len(self.embedded), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
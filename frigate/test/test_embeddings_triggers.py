@@ -0,0 +1,208 @@
+import json
+import logging
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.comms.event_metadata_updater import EventMetadataTypeEnum
+from frigate.config import FrigateConfig
+from frigate.data_processing.types import PostProcessDataEnum
+from frigate.embeddings import EmbeddingsContext  # noqa: F401
+from frigate.models import Trigger
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+def _embedding(*values: float) -> bytes:
+    return np.array(values, dtype=np.float32).tobytes()
+
+
+class TestSemanticTriggerProcessor(unittest.TestCase):
+    def setUp(self):
+        self.db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(self.db)
+        router.run()
+        self.db.bind([Trigger])
+        self.config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "semantic_search": {"enabled": True},
+                "cameras": {
+                    "front_door": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"height": 1080, "width": 1920, "fps": 5},
+                        "semantic_search": {
+                            "triggers": {
+                                "red_car": {
+                                    "type": "thumbnail",
+                                    "data": "event-1",
+                                    "threshold": 0.9,
+                                    "actions": ["sub_label"],
+                                },
+                                "blue_car": {
+                                    "type": "thumbnail",
+                                    "data": "event-2",
+                                    "threshold": 0.9,
+                                },
+                                "disabled_car": {
+                                    "type": "thumbnail",
+                                    "data": "event-3",
+                                    "enabled": False,
+                                    "threshold": 0.1,
+                                },
+                                "delivery": {
+                                    "type": "description",
+                                    "data": "a delivery driver",
+                                    "threshold": 0.5,
+                                },
+                            }
+                        },
+                    }
+                },
+            }
+        )
+
+        for name, trigger_type, embedding in [
+            ("red_car", "thumbnail", _embedding(2, 0, 0)),
+            ("blue_car", "thumbnail", _embedding(0, 1, 0)),
+            ("disabled_car", "thumbnail", _embedding(1, 0, 0)),
+            ("delivery", "description", _embedding(1, 0, 0)),
+        ]:
+            Trigger.create(
+                camera="front_door",
+                name=name,
+                type=trigger_type,
+                data="",
+                threshold=self.config.cameras["front_door"]
+                .semantic_search.triggers[name]
+                .threshold,
+                model="jinav1",
+                embedding=embedding,
+                triggering_event_id="",
+                last_triggered=None,
+            )
+
+        self.vec_db = MagicMock()
+        self.vec_db.get_embedding.return_value = _embedding(1, 0.1, 0)
+        self.requestor = MagicMock()
+        self.publisher = MagicMock()
+
+        from frigate.data_processing.post.semantic_trigger import (
+            SemanticTriggerProcessor,
+        )
+
+        with patch(
+            "frigate.data_processing.post.semantic_trigger.open",
+            side_effect=FileNotFoundError,
+        ):
+            self.processor = SemanticTriggerProcessor(
+                self.vec_db,
+                self.config,
+                self.requestor,
+                self.publisher,
+                MagicMock(),
+                None,
+            )
+
+    def tearDown(self):
+        if not self.db.is_closed():
+            self.db.close()
+
+        try:
+            for file in TEST_DB_CLEANUPS:
+                os.remove(file)
+        except OSError:
+            pass
+
+    def _process(self, process_type: str = "image") -> None:
+        self.processor.process_data(
+            {"event_id": "event-9", "camera": "front_door", "type": process_type},
+            PostProcessDataEnum.tracked_object,
+        )
+
+    def test_all_triggers_are_scored_with_one_embedding(self):
+        self._process()
+
+        self.vec_db.get_embedding.assert_called_once_with("vec_thumbnails", "event-9")
+        self.requestor.send_data.assert_called_once()
+        payload = json.loads(self.requestor.send_data.call_args.args[1])
+        self.assertEqual(payload["name"], "red_car")
+        self.assertAlmostEqual(payload["score"], 1 / np.sqrt(1.01), places=5)
+        self.publisher.publish.assert_called_once_with(
+            ("event-9", None, payload["score"]), EventMetadataTypeEnum.sub_label
+        )
+        self.assertEqual(
+            Trigger.get(Trigger.name == "red_car").triggering_event_id, "event-9"
+        )
+        self.assertEqual(
+            list(self.processor.trigger_matrices["front_door"][1]),
+            ["thumbnail", "description"],
+        )
+
+    def test_description_embeddings_match_description_triggers(self):
+        self._process("text")
+
+        self.vec_db.get_embedding.assert_called_once_with("vec_descriptions", "event-9")
+        payload = json.loads(self.requestor.send_data.call_args.args[1])
+        self.assertEqual(payload["name"], "delivery")
+
+    def test_matrices_are_rebuilt_when_triggers_change(self):
+        self._process()
+        matrices = self.processor.trigger_matrices["front_door"][1]
+        self._process()
+        self.assertIs(self.processor.trigger_matrices["front_door"][1], matrices)
+
+        Trigger.update(embedding=_embedding(1, 0.1, 0)).where(
+            Trigger.name == "blue_car"
+        ).execute()
+        self.requestor.reset_mock()
+        self._process()
+
+        self.assertEqual(
+            sorted(
+                json.loads(c.args[1])["name"]
+                for c in self.requestor.send_data.call_args_list
+            ),
+            ["blue_car", "red_car"],
+        )
+
+    def test_queued_objects_are_processed_by_the_caller(self):
+        thread = threading.Thread(
+            target=self.processor.queue_object,
+            args=({"event_id": "event-9", "camera": "front_door", "type": "image"},),
+        )
+        thread.start()
+        thread.join()
+
+        # the batch thread only queues the object
+        self.requestor.send_data.assert_not_called()
+        self.vec_db.get_embedding.assert_not_called()
+
+        self.processor.process_queued_objects()
+        self.requestor.send_data.assert_called_once()
+        self.publisher.publish.assert_called_once()
+
+        self.processor.process_queued_objects()
+        self.requestor.send_data.assert_called_once()
+
+    def test_missing_embedding_is_skipped(self):
+        self.vec_db.get_embedding.return_value = None
+        self._process()
+
+        self.requestor.send_data.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
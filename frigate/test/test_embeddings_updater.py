@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+import unittest
+
+from frigate.comms.embeddings_updater import (
+    EmbeddingsUpdatePublisher,
+    EmbeddingsUpdateSubscriber,
+    EmbeddingsUpdateTypeEnum,
+)
+from frigate.comms.zmq_proxy import ZmqProxy
+
+
+class TestEmbeddingsUpdatePublisher(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("/tmp/cache", exist_ok=True)
+        self.proxy = ZmqProxy()
+        self.publisher = EmbeddingsUpdatePublisher()
+        self.subscriber = EmbeddingsUpdateSubscriber(EmbeddingsUpdateTypeEnum.all)
+
+    def tearDown(self):
+        self.subscriber.stop()
+        self.publisher.stop()
+        self.proxy.stop()
+
+    def _drain(self) -> list:
+        updates = []
+
+        while True:
+            topic, payload = self.subscriber.check_for_update(timeout=0.2)
+
+            if topic is None:
+                return updates
+
+            updates.append((topic, payload))
+
+    def test_publish_from_several_threads(self):
+        # wait for the subscription to propagate through the proxy
+        for _ in range(50):
+            self.publisher.publish(("sync", []), EmbeddingsUpdateTypeEnum.delete.value)
+
+            if self._drain():
+                break
+
+            time.sleep(0.05)
+
+        def publish(table: str) -> None:
+            for i in range(200):
+                self.publisher.publish(
+                    (table, [f"event-{i}"]), EmbeddingsUpdateTypeEnum.upsert.value
+                )
+
+        threads = [
+            threading.Thread(target=publish, args=(f"table-{i}",)) for i in range(4)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        updates = self._drain()
+        self.assertEqual(len(updates), 800)
+        self.assertTrue(all(topic == "embeddings/upsert" for topic, _ in updates))
+
+        for i in range(4):
+            self.assertEqual(
+                [
+                    ids[0]
+                    for table, ids in (p for _, p in updates)
+                    if table == f"table-{i}"
+                ],
+                [f"event-{n}" for n in range(200)],
+            )
+        self.assertEqual(
+            self.publisher.get_topic_stats()["embeddings/upsert"]["messages"], 800
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from frigate.config import FrigateConfig
+from frigate.embeddings import EmbeddingsContext
+from frigate.embeddings.vector_index import INITIAL_CAPACITY, VectorIndex
+
+
+def _embedding(*values: float) -> bytes:
+    return np.array(values, dtype=np.float32).tobytes()
+
+
+class TestVectorIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = VectorIndex(dimensions=2)
+        self.index.upsert(
+            [
+                ("east", _embedding(2, 0), "front_door", "person", 10),
+                ("north", _embedding(0, 1), "front_door", "car", 11),
+                ("north_east", _embedding(1, 1), "back_yard", "person", 12),
+            ]
+        )
+
+    def test_search_returns_cosine_distances(self):
+        results = self.index.search(_embedding(1, 0), k=2)
+
+        self.assertEqual([r[0] for r in results], ["east", "north_east"])
+        self.assertAlmostEqual(results[0][1], 0.0, places=6)
+        self.assertAlmostEqual(results[1][1], 1 - np.sqrt(0.5), places=6)
+
+    def test_filters_are_applied_before_ranking(self):
+        self.assertEqual(
+            self.index.search(_embedding(1, 0), k=1, cameras=["back_yard"])[0][0],
+            "north_east",
+        )
+        self.assertEqual(
+            self.index.search(_embedding(1, 0), k=5, labels=["car"], after_day=11),
+            [("north", 1.0)],
+        )
+        self.assertEqual(
+            [
+                r[0]
+                for r in self.index.search(
+                    _embedding(1, 0), k=5, event_ids=["north", "east"], before_day=10
+                )
+            ],
+            ["east"],
+        )
+        self.assertEqual(self.index.search(_embedding(1, 0), 5, cameras=["x"]), [])
+
+    def test_upsert_replaces_and_remove_keeps_matrix_dense(self):
+        self.index.upsert([("east", _embedding(0, -1), "front_door", "person", 10)])
+        self.index.remove(["north", "missing"])
+
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.get("north"), None)
+        self.assertEqual(self.index.get("east"), _embedding(0, -1))
+        self.assertEqual(
+            [r[0] for r in self.index.search(_embedding(1, 1), k=5)],
+            ["north_east", "east"],
+        )
+
+    def test_index_grows(self):
+        rows = [
+            (f"event-{i}", _embedding(1, i), "front_door", "person", 0)
+            for i in range(INITIAL_CAPACITY + 1)
+        ]
+        self.index.upsert(rows)
+
+        self.assertEqual(len(self.index), INITIAL_CAPACITY + 4)
+        self.assertEqual(self.index.search(_embedding(0, 1), k=1)[0][0], "north")
+        self.assertEqual(
+            self.index.get_stats()["memory"], 2 * INITIAL_CAPACITY * (2 * 4 + 3 * 4)
+        )
+
+    def test_filters_are_ignored_without_metadata(self):
+        self.index.upsert([("west", _embedding(-1, 0))])
+
+        self.assertEqual(len(self.index.search(_embedding(1, 0), 5, cameras=["x"])), 4)
+
+
+class TestEmbeddingsContextIndex(unittest.TestCase):
+    def setUp(self):
+        self.config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "semantic_search": {"enabled": True, "memory_index": True},
+                "cameras": {
+                    "front_door": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"height": 1080, "width": 1920, "fps": 5},
+                    }
+                },
+            }
+        )
+        self.db = MagicMock()
+        self.updates: list = []
+        self.applied = threading.Event()
+
+    def _check_for_update(self, timeout: float):
+        if self.updates:
+            return self.updates.pop(0)
+
+        self.applied.set()
+        self.context.index_stop.wait(0.05)
+        return (None, None)
+
+    def _select_embeddings(self, table: str, event_ids: list[str] | None = None):
+        rows = {
+            "a": ("a", _embedding(*[1] * 768), "front_door", "person", 1),
+            "b": ("b", _embedding(*[-1] * 768), "front_door", "person", 1),
+        }
+        cursor = MagicMock()
+        selected = [rows[i] for i in (event_ids or ["a"])]
+        cursor.fetchmany.side_effect = [selected, []]
+        cursor.fetchall.return_value = selected
+        return cursor
+
+    def test_index_is_loaded_and_updated(self):
+        self.db.select_embeddings.side_effect = self._select_embeddings
+        self.updates = [
+            ("embeddings/upsert", ["vec_thumbnails", ["b"]]),
+            ("embeddings/upsert", ["vec_descriptions", ["c"]]),
+            ("embeddings/delete", ["vec_thumbnails", ["a"]]),
+        ]
+
+        with (
+            patch("frigate.embeddings.EmbeddingsRequestor"),
+            patch("frigate.embeddings.EmbeddingsUpdateSubscriber") as subscriber,
+        ):
+            subscriber.return_value.check_for_update.side_effect = (
+                self._check_for_update
+            )
+            self.context = EmbeddingsContext(self.db, self.config)
+            self.assertTrue(self.applied.wait(2))
+
+        self.assertEqual(self.context.thumbnail_index.ids, ["b"])
+        self.context.requestor.send_data.return_value = [-1.0] * 768
+
+        results = self.context.search_thumbnail("person", cameras=["front_door"])
+
+        self.assertEqual([r[0] for r in results], ["b"])
+        self.db.execute_sql.assert_not_called()
+        self.context.index_stop.set()
+        self.context.index_thread.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+from scipy import stats
+
+# isort: off
+# the face model is imported by the embeddings maintainer, import it first
+from frigate.embeddings import EmbeddingsContext  # noqa: F401
+from frigate.data_processing.common.face import model as face_model
+from frigate.data_processing.common.face.gallery import FaceGallery
+from frigate.data_processing.common.face.model import FaceRecognizer
+# isort: on
+
+
+def _exact_match(samples: dict[str, list[np.ndarray]], embedding: np.ndarray):
+    """Best identity the way the face model scored faces before the gallery."""
+    best = ("", -1.0)
+
+    for name, embs in samples.items():
+        mean_emb = stats.trim_mean(embs, 0.15)
+        similarity = np.dot(embedding, mean_emb) / (
+            np.linalg.norm(embedding) * np.linalg.norm(mean_emb)
+        )
+
+        if similarity > best[1]:
+            best = (name, similarity)
+
+    return best
+
+
+class TestFaceGallery(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.centers = rng.standard_normal((40, 16)).astype(np.float32)
+        self.samples = {
+            f"person_{i}": [
+                c + rng.standard_normal(16).astype(np.float32) * 0.3 for _ in range(5)
+            ]
+            for i, c in enumerate(self.centers)
+        }
+        self.queries = [
+            c + rng.standard_normal(16).astype(np.float32) * 0.5 for c in self.centers
+        ]
+        self.gallery = FaceGallery(candidates=4)
+        self.gallery.update(
+            [
+                (f"{name}-{i}.webp", name, emb)
+                for name, embs in self.samples.items()
+                for i, emb in enumerate(embs)
+            ]
+        )
+
+    def test_search_matches_exact_trimmed_mean_scores(self):
+        self.assertEqual(len(self.gallery), 200)
+
+        for query in self.queries:
+            name, similarity = self.gallery.search(query)
+            expected_name, expected_similarity = _exact_match(self.samples, query)
+
+            self.assertEqual(name, expected_name)
+            self.assertAlmostEqual(similarity, expected_similarity, places=5)
+
+    def test_incremental_updates_match_a_rebuilt_gallery(self):
+        rng = np.random.default_rng(1)
+        new_sample = self.centers[3] + rng.standard_normal(16).astype(np.float32)
+        self.gallery.update(
+            added=[("person_3-new.webp", "person_3", new_sample)],
+            moved={
+                f"person_1-{i}.webp": (f"renamed-{i}.webp", "renamed") for i in range(5)
+            },
+            removed=[f"person_2-{i}.webp" for i in range(5)] + ["missing.webp"],
+        )
+        self.samples["person_3"].append(new_sample)
+        self.samples["renamed"] = self.samples.pop("person_1")
+        del self.samples["person_2"]
+
+        self.assertEqual(len(self.gallery), 196)
+        identities = self.gallery.get_identities()
+        self.assertEqual(identities["renamed-0.webp"], "renamed")
+        self.assertNotIn("person_1-0.webp", identities)
+
+        for query in self.queries:
+            name, similarity = self.gallery.search(query)
+            expected_name, expected_similarity = _exact_match(self.samples, query)
+
+            self.assertEqual(name, expected_name)
+            self.assertAlmostEqual(similarity, expected_similarity, places=5)
+
+    def test_empty_gallery(self):
+        self.assertIsNone(FaceGallery().search(np.ones(16)))
+        self.gallery.update(removed=list(self.gallery.get_identities()))
+        self.assertIsNone(self.gallery.search(np.ones(16)))
+
+
+class StubRecognizer(FaceRecognizer):
+    def __init__(self, config):
+        super().__init__(config)
+        self.landmark_detector = MagicMock()
+        self.embedded: list[int] = []
+
+    def align_face(self, image, output_width, output_height):
+        return image
+
+    def embed(self, face_image: np.ndarray) -> np.ndarray:
+        self.embedded.append(int(face_image[0, 0, 0]))
+        embedding = np.zeros(8, dtype=np.float32)
+        embedding[int(face_image[0, 0, 0]) % 8] = 1
+        return embedding
+
+    def classify(self, face_image):
+        return self.search(self.embed(face_image))
+
+
+class TestFaceRecognizerBuild(unittest.TestCase):
+    def setUp(self):
+        self.face_dir = tempfile.mkdtemp()
+        patcher = patch.object(face_model, "FACE_DIR", self.face_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.face_dir)
+        self.recognizer = StubRecognizer(MagicMock())
+
+    def _write_face(self, name: str, file: str, value: int) -> None:
+        os.makedirs(os.path.join(self.face_dir, name), exist_ok=True)
+        cv2.imwrite(
+            os.path.join(self.face_dir, name, file),
+            np.full((8, 8, 3), value, dtype=np.uint8),
+        )
+
+    def _build(self) -> None:
+        self.recognizer.build()
+
+        while self.recognizer.model_builder_queue is not None:
+            self.recognizer.build()
+            time.sleep(0.01)
+
+    def test_only_new_faces_are_embedded(self):
+        self._write_face("alice", "alice-1.png", 1)
+        self._write_face("bob", "bob-1.png", 2)
+        self._write_face("train", "attempt.png", 3)
+        self._build()
+
+        self.assertEqual(sorted(self.recognizer.embedded), [1, 2])
+        self.assertEqual(self.recognizer.classify(np.full((8, 8, 3), 1))[0], "alice")
+
+        self.recognizer.embedded.clear()
+        self._write_face("alice", "alice-2.png", 4)
+        os.rename(
+            os.path.join(self.face_dir, "bob"), os.path.join(self.face_dir, "robert")
+        )
+        self.recognizer.clear()
+
+        # the outdated gallery is used until the sync finished
+        self.assertEqual(self.recognizer.classify(np.full((8, 8, 3), 2))[0], "bob")
+        self._build()
+
+        self.assertEqual(self.recognizer.embedded, [2, 4])
+        self.assertEqual(
+            self.recognizer.gallery.get_identities(),
+            {
+                "alice/alice-1.png": "alice",
+                "alice/alice-2.png": "alice",
+                "robert/bob-1.png": "robert",
+            },
+        )
+
+        shutil.rmtree(os.path.join(self.face_dir, "robert"))
+        self.recognizer.clear()
+        self._build()
+
+        self.assertEqual(len(self.recognizer.gallery), 2)
+
+    def test_faces_are_keyed_by_folder_and_content(self):
+        self._write_face("alice", "face.png", 1)
+        self._write_face("bob", "face.png", 2)
+        self._build()
+
+        self.assertEqual(sorted(self.recognizer.embedded), [1, 2])
+        self.assertEqual(
+            self.recognizer.gallery.get_identities(),
+            {"alice/face.png": "alice", "bob/face.png": "bob"},
+        )
+
+        # a face replaced under the same name is embedded again, a face moved
+        # to another folder under another name is not
+        self.recognizer.embedded.clear()
+        self._write_face("alice", "face.png", 5)
+        os.rename(
+            os.path.join(self.face_dir, "bob", "face.png"),
+            os.path.join(self.face_dir, "alice", "bob.png"),
+        )
+        self.recognizer.clear()
+        self._build()
+
+        self.assertEqual(self.recognizer.embedded, [5])
+        self.assertEqual(
+            self.recognizer.gallery.get_identities(),
+            {"alice/face.png": "alice", "alice/bob.png": "alice"},
+        )
+        self.assertEqual(self.recognizer.classify(np.full((8, 8, 3), 5))[0], "alice")
+
+        # unchanged faces are neither read again nor embedded
+        self.recognizer.embedded.clear()
+        self.recognizer.clear()
+
+        with patch("builtins.open", side_effect=AssertionError):
+            self._build()
+
+        self.assertEqual(self.recognizer.embedded, [])
+        self.assertEqual(len(self.recognizer.gallery), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
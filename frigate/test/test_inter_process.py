@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+import unittest
+
+from frigate.comms.inter_process import (
+    InterProcessCommunicator,
+    InterProcessNotifier,
+    InterProcessRequestor,
+)
+from frigate.const import INSERT_MANY_RECORDINGS, UPDATE_CAMERA_ACTIVITY
+
+
+class TestInterProcessNotifier(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("/tmp/cache", exist_ok=True)
+        self.received = []
+        self.communicator = InterProcessCommunicator()
+        self.communicator.subscribe(self._receive)
+
+    def tearDown(self):
+        self.communicator.stop()
+
+    def _receive(self, topic, payload):
+        if topic == INSERT_MANY_RECORDINGS:
+            time.sleep(payload["sleep"])
+
+        self.received.append((topic, payload))
+        return payload
+
+    def _wait_for(self, count: int) -> None:
+        for _ in range(100):
+            if len(self.received) >= count:
+                return
+
+            time.sleep(0.02)
+
+    def test_coalesced_updates_keep_latest_value(self):
+        notifier = InterProcessNotifier(flush_interval=60)
+
+        try:
+            for i in range(10):
+                notifier.send_data("front_door/audio/dBFS", -i, coalesce=True)
+                notifier.send_data("front_door/audio/rms", i, coalesce=True)
+
+            notifier.send_data("audio_activity", {"front_door": {"detections": [1]}})
+            self._wait_for(1)
+            self.assertEqual(
+                self.received,
+                [("audio_activity", {"front_door": {"detections": [1]}})],
+            )
+
+            notifier.flush()
+            self._wait_for(3)
+            self.assertEqual(
+                self.received[1:],
+                [("front_door/audio/dBFS", -9), ("front_door/audio/rms", 9)],
+            )
+        finally:
+            notifier.stop()
+
+    def test_direct_update_replaces_pending_value(self):
+        notifier = InterProcessNotifier(flush_interval=60)
+
+        try:
+            notifier.send_data("audio_activity", "empty", coalesce=True)
+            notifier.send_data("audio_activity", "detection")
+            notifier.flush()
+            self._wait_for(1)
+            time.sleep(0.1)
+            self.assertEqual(self.received, [("audio_activity", "detection")])
+        finally:
+            notifier.stop()
+
+    def test_requests_still_get_replies(self):
+        notifier = InterProcessNotifier(flush_interval=0)
+        requestor = InterProcessRequestor()
+
+        try:
+            notifier.send_data("front_door/audio/dBFS", -30, coalesce=True)
+            self.assertEqual(requestor.send_data("echo", [1, 2]), [1, 2])
+            self._wait_for(2)
+            self.assertIn(("front_door/audio/dBFS", -30), self.received)
+        finally:
+            notifier.stop()
+            requestor.stop()
+
+    def test_slow_pooled_requests_do_not_block(self):
+        results = []
+
+        def insert(index: int) -> None:
+            requestor = InterProcessRequestor()
+            results.append(
+                requestor.send_data(
+                    INSERT_MANY_RECORDINGS, {"sleep": 0.5 - index * 0.2, "i": index}
+                )["i"]
+            )
+            requestor.stop()
+
+        threads = [threading.Thread(target=insert, args=(i,)) for i in range(2)]
+
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+
+        requestor = InterProcessRequestor()
+        start = time.monotonic()
+        self.assertEqual(requestor.send_data(UPDATE_CAMERA_ACTIVITY, {}), {})
+        self.assertLess(time.monotonic() - start, 0.3)
+        requestor.stop()
+
+        for thread in threads:
+            thread.join()
+
+        # requests for the same topic are handled in the order they arrived
+        self.assertEqual(results, [0, 1])
+        self.assertEqual(
+            [p["i"] for t, p in self.received if t == INSERT_MANY_RECORDINGS],
+            [0, 1],
+        )
+
+        stats = self.communicator.get_latency_stats()
+        self.assertEqual(stats[INSERT_MANY_RECORDINGS]["count"], 2)
+        self.assertEqual(stats[UPDATE_CAMERA_ACTIVITY]["count"], 1)
+        self.assertEqual(stats[UPDATE_CAMERA_ACTIVITY]["buckets"]["inf"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+# isort: off
+# the license plate mixin is imported by the embeddings maintainer, import it first
+from frigate.embeddings import EmbeddingsContext  # noqa: F401
+from frigate.data_processing.common.license_plate.mixin import (
+    CTCDecoder,
+    LicensePlateProcessingMixin,
+)
+from frigate.embeddings.maintainer import EmbeddingMaintainer
+from frigate.embeddings.onnx.lpr_embedding import (
+    PaddleOCRClassification,
+    PaddleOCRDetection,
+    PaddleOCRRecognition,
+)
+from frigate.events.types import EventTypeEnum
+# isort: on
+
+
+class FakeRunner:
+    """Runs a function on each image of the batch, counting the batches."""
+
+    def __init__(self, function):
+        self.function = function
+        self.batch_sizes: list[int] = []
+
+    def get_input_names(self) -> list[str]:
+        return ["x"]
+
+    def get_input_width(self) -> int:
+        return -1
+
+    def run(self, inputs: dict[str, np.ndarray]) -> list[np.ndarray]:
+        self.batch_sizes.append(len(inputs["x"]))
+        return [np.stack([self.function(image) for image in inputs["x"]])]
+
+
+def _probability_map(image: np.ndarray) -> np.ndarray:
+    # bright pixels are text
+    return (image.mean(axis=0) > 0)[np.newaxis].astype(np.float32)
+
+
+def _character_probabilities(image: np.ndarray) -> np.ndarray:
+    # every 8 columns are one time step, the brightness picks the character
+    steps = image.shape[2] // 8
+    probabilities = np.full((steps, 97), 0.001, dtype=np.float32)
+
+    for t in range(steps):
+        value = image[:, :, t * 8 : t * 8 + 8].mean()
+        index = 0 if value < -0.5 else 1 + int((value + 1) * 20) % 40
+        probabilities[t, index] = 0.9
+
+    return probabilities
+
+
+def _model(model_class, function):
+    model = model_class.__new__(model_class)
+    model.runner = FakeRunner(function)
+    return model
+
+
+def _plate(
+    width: int, lines: list[tuple[int, int, list[int]]], height: int = 120
+) -> np.ndarray:
+    """Dark plate with bright blocks of text, lines of (top, height, block values)."""
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+
+    for top, line_height, values in lines:
+        for i, value in enumerate(values):
+            left = 20 + i * 24
+            image[top : top + line_height, left : left + 18] = value
+
+    return image
+
+
+class TestLicensePlateBatching(unittest.TestCase):
+    def setUp(self):
+        self.processor = LicensePlateProcessingMixin.__new__(
+            LicensePlateProcessingMixin
+        )
+        self.processor.config = MagicMock()
+        self.processor.config.lpr.debug_save_plates = False
+        self.processor.config.cameras = {"highway": MagicMock()}
+        self.processor.config.cameras["highway"].lpr.enhancement = 0
+        self.processor.lpr_config = MagicMock(
+            recognition_threshold=0.5, replace_rules=[]
+        )
+        self.processor.ctc_decoder = CTCDecoder()
+        self.processor.min_size = 8
+        self.processor.max_size = 960
+        self.processor.box_thresh = 0.6
+        self.processor.mask_thresh = 0.6
+        self.processor.model_runner = MagicMock()
+        self.processor.model_runner.detection_model = _model(
+            PaddleOCRDetection, _probability_map
+        )
+        self.processor.model_runner.classification_model = _model(
+            PaddleOCRClassification, lambda image: np.array([0.9, 0.1])
+        )
+        self.processor.model_runner.recognition_model = _model(
+            PaddleOCRRecognition, _character_probabilities
+        )
+        self.plates = [
+            _plate(320, [(40, 40, [160, 200, 255, 180, 220])]),
+            _plate(320, [(20, 20, [255, 255, 200]), (60, 40, [160, 220, 180, 255])]),
+            _plate(320, [(30, 50, [200, 240, 170, 255, 190, 230])]),
+            _plate(400, [(40, 40, [255, 170, 210])]),
+        ]
+
+    def _runners(self) -> tuple[FakeRunner, FakeRunner]:
+        model_runner = self.processor.model_runner
+        return (
+            model_runner.detection_model.runner,
+            model_runner.recognition_model.runner,
+        )
+
+    def test_batch_matches_plates_processed_one_by_one(self):
+        detection, recognition = self._runners()
+        recognize = self.processor._recognize
+
+        # each plate on its own and each line of a plate on its own
+        with patch.object(
+            self.processor,
+            "_recognize",
+            side_effect=lambda camera, groups: [
+                recognize(camera, [group])[0] for group in groups
+            ],
+        ):
+            expected = [
+                self.processor._process_license_plate("highway", "car", plate)
+                for plate in self.plates
+            ]
+
+        detection.batch_sizes.clear()
+        recognition.batch_sizes.clear()
+
+        results = self.processor._process_license_plates(
+            "highway", [f"car{i}" for i in range(len(self.plates))], self.plates
+        )
+
+        self.assertEqual(results, expected)
+        self.assertTrue(all(plates for plates, _, _ in results))
+        # the lines of the two line plate have different heights
+        self.assertEqual(len(results[1][0]), 2)
+
+        # the wider plate resizes to a different shape
+        self.assertEqual(sorted(detection.batch_sizes), [1, 3])
+        # the text boxes of all plates are recognized at once
+        self.assertEqual(len(recognition.batch_sizes), 1)
+
+    def test_fixed_model_width_recognizes_all_groups_at_once(self):
+        groups = [
+            [np.full((40, 100, 3), 200, np.uint8), np.full((20, 80, 3), 255, np.uint8)],
+            [np.full((20, 300, 3), 255, np.uint8)],
+        ]
+        _, recognition = self._runners()
+        recognition.get_input_width = lambda: 640
+        expected = [self.processor._recognize("highway", [group]) for group in groups]
+        recognition.batch_sizes.clear()
+
+        results = self.processor._recognize("highway", groups)
+
+        self.assertEqual(results, [result[0] for result in expected])
+        self.assertEqual(recognition.batch_sizes, [3])
+
+    def test_groups_padded_to_another_width_are_recognized_separately(self):
+        groups = [
+            [np.full((40, 100, 3), 200, np.uint8), np.full((20, 80, 3), 255, np.uint8)],
+            [np.full((20, 300, 3), 255, np.uint8)],
+            [np.full((40, 120, 3), 160, np.uint8)],
+        ]
+        expected = [self.processor._recognize("highway", [group]) for group in groups]
+        _, recognition = self._runners()
+        recognition.batch_sizes.clear()
+
+        results = self.processor._recognize("highway", groups)
+
+        self.assertEqual(results, [result[0] for result in expected])
+        self.assertEqual(sorted(recognition.batch_sizes), [1, 3])
+
+    def test_images_without_text(self):
+        empty = np.zeros((120, 320, 3), dtype=np.uint8)
+
+        self.assertEqual(
+            self.processor._process_license_plates(
+                "highway", ["a", "b"], [empty, self.plates[0]]
+            )[0],
+            ([], [], []),
+        )
+        self.assertEqual(
+            self.processor._process_license_plate("highway", "a", empty), ([], [], [])
+        )
+
+    def test_objects_of_a_frame_are_recognized_together(self):
+        frame = np.zeros((10, 10), dtype=np.uint8)
+        objects = [
+            {"id": f"car{i}", "camera": "highway"} for i in range(len(self.plates))
+        ]
+        # the last car has no plate in view
+        crops = [
+            ("highway", obj["id"], (0, 0, 1, 1), plate)
+            for obj, plate in zip(objects, self.plates[:-1])
+        ] + [None]
+        self.processor.metrics = MagicMock()
+        self.processor.plates_rec_second = MagicMock()
+        self.processor.plates_det_second = MagicMock()
+        self.processor.plate_rec_speed = MagicMock()
+        expected = self.processor._process_license_plates(
+            "highway", ["car0", "car1", "car2"], self.plates[:-1]
+        )
+
+        with (
+            patch.object(self.processor, "_get_license_plate_frame", side_effect=crops),
+            patch.object(
+                self.processor,
+                "_process_license_plates",
+                wraps=self.processor._process_license_plates,
+            ) as process,
+            patch.object(self.processor, "_handle_license_plates") as handle,
+        ):
+            self.processor.lpr_process_objects(objects, frame)
+
+        process.assert_called_once()
+        self.assertEqual(process.call_args.args[1], ["car0", "car1", "car2"])
+        self.assertEqual(
+            [call.args[4] for call in handle.call_args_list], ["car0", "car1", "car2"]
+        )
+        self.assertEqual(
+            [tuple(call.args[6:9]) for call in handle.call_args_list], expected
+        )
+
+
+class TestFrameUpdates(unittest.TestCase):
+    def test_updates_of_a_frame_are_processed_together(self):
+        updates = [
+            (EventTypeEnum.tracked_object, "update", "highway", "frame1", {"id": "a"}),
+            (EventTypeEnum.tracked_object, "update", "highway", "frame1", {"id": "b"}),
+            (EventTypeEnum.api, "update", "highway", "frame1", {"id": "c"}),
+            (EventTypeEnum.tracked_object, "update", "highway", "frame2", {"id": "a"}),
+            None,
+        ]
+        maintainer = EmbeddingMaintainer.__new__(EmbeddingMaintainer)
+        maintainer.config = MagicMock()
+        maintainer.config.semantic_search.enabled = False
+        maintainer.config.cameras = {"highway": MagicMock()}
+        maintainer.event_subscriber = MagicMock()
+        maintainer.event_subscriber.check_for_update.side_effect = updates
+        maintainer.frame_manager = MagicMock()
+        maintainer.frame_manager.get.side_effect = lambda name, shape: name
+        processor = MagicMock()
+        maintainer.realtime_processors = [processor]
+        maintainer.post_processors = []
+
+        maintainer._process_updates()
+
+        self.assertEqual(
+            [call.args for call in processor.process_objects.call_args_list],
+            [([{"id": "a"}, {"id": "b"}], "frame1"), ([{"id": "a"}], "frame2")],
+        )
+        self.assertEqual(
+            [call.args[0] for call in maintainer.frame_manager.close.call_args_list],
+            ["frame1", "frame2"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
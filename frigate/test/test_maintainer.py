@@ -1,3 +1,6 @@
+import datetime
+import os
+import random
 import sys
 import unittest
 from unittest.mock import MagicMock, patch
@@ -11,12 +14,44 @@ sys.modules["frigate.config.camera.updater"] = MagicMock()
 # Now import the class under test
 from frigate.config import FrigateConfig  # noqa: E402
 from frigate.record.maintainer import RecordingMaintainer  # noqa: E402
+from frigate.record.summary import (  # noqa: E402
+    DetectionSummary,
+    get_motion_grid,
+    motion_grid_to_heatmap,
+)
+
+
+def _sparse_motion_heatmap(motion_boxes, frame_width, frame_height):
+    """Reference per-cell implementation the vectorized heatmap must match."""
+    GRID_SIZE = 16
+    counts: dict[int, int] = {}
+
+    for box in motion_boxes:
+        if len(box) < 4:
+            continue
+        x1, y1, x2, y2 = box
+
+        grid_x1 = max(0, int((x1 / frame_width) * GRID_SIZE))
+        grid_y1 = max(0, int((y1 / frame_height) * GRID_SIZE))
+        grid_x2 = min(GRID_SIZE - 1, int((x2 / frame_width) * GRID_SIZE))
+        grid_y2 = min(GRID_SIZE - 1, int((y2 / frame_height) * GRID_SIZE))
+
+        for y in range(grid_y1, grid_y2 + 1):
+            for x in range(grid_x1, grid_x2 + 1):
+                idx = y * GRID_SIZE + x
+                counts[idx] = min(255, counts.get(idx, 0) + 1)
+
+    if not counts:
+        return None
+
+    return {str(k): v for k, v in counts.items()}
 
 
 class TestMaintainer(unittest.IsolatedAsyncioTestCase):
     async def test_move_files_survives_bad_filename(self):
         config = MagicMock(spec=FrigateConfig)
         config.cameras = {}
+        config.record = MagicMock(aggregate_detections=False)
         stop_event = MagicMock()
 
         maintainer = RecordingMaintainer(config, stop_event)
@@ -62,5 +97,116 @@ class TestMaintainer(unittest.IsolatedAsyncioTestCase):
                         )
 
 
+class TestMotionHeatmap(unittest.TestCase):
+    def _heatmap(self, boxes, width=1280, height=720):
+        return motion_grid_to_heatmap(get_motion_grid(boxes, width, height))
+
+    def test_empty_boxes(self):
+        self.assertIsNone(self._heatmap([]))
+
+    def test_invalid_dimensions(self):
+        self.assertIsNone(self._heatmap([(0, 0, 10, 10)], width=0))
+
+    def test_single_box(self):
+        boxes = [(0, 0, 100, 50)]
+        self.assertEqual(self._heatmap(boxes), _sparse_motion_heatmap(boxes, 1280, 720))
+
+    def test_box_outside_frame(self):
+        self.assertIsNone(self._heatmap([(2000, 2000, 2100, 2100)]))
+
+        # coordinates truncate toward zero so slightly negative boxes hit cell 0
+        boxes = [(-50, -50, -10, -10)]
+        self.assertEqual(self._heatmap(boxes), {"0": 1})
+        self.assertEqual(self._heatmap(boxes), _sparse_motion_heatmap(boxes, 1280, 720))
+
+    def test_intensity_capped(self):
+        boxes = [(0, 0, 1279, 719)] * 300
+        heatmap = self._heatmap(boxes)
+        self.assertEqual(len(heatmap), 256)
+        self.assertTrue(all(v == 255 for v in heatmap.values()))
+
+    def test_parity_with_sparse_heatmap(self):
+        rng = random.Random(0)
+
+        for width, height in [(1280, 720), (640, 480), (1920, 1080), (333, 187)]:
+            for _ in range(50):
+                boxes = []
+
+                for _ in range(rng.randint(1, 40)):
+                    x1 = rng.randint(-20, width)
+                    y1 = rng.randint(-20, height)
+                    boxes.append(
+                        (
+                            x1,
+                            y1,
+                            x1 + rng.randint(0, width),
+                            y1 + rng.randint(0, height),
+                        )
+                    )
+
+                self.assertEqual(
+                    self._heatmap(boxes, width, height),
+                    _sparse_motion_heatmap(boxes, width, height),
+                )
+
+    def test_segment_accumulates_frame_grids(self):
+        config = MagicMock(spec=FrigateConfig)
+        config.cameras = {}
+        config.record = MagicMock(aggregate_detections=True)
+        maintainer = RecordingMaintainer(config, MagicMock())
+        summary = DetectionSummary(f"test_front_{os.getpid()}", create=True)
+        maintainer.summaries["front"] = summary
+
+        rng = random.Random(1)
+        all_boxes = []
+
+        try:
+            for i in range(20):
+                boxes = [
+                    (rng.randint(0, 1200), rng.randint(0, 700), 1279, 719)
+                    for _ in range(rng.randint(0, 5))
+                ]
+                all_boxes.extend(boxes)
+                summary.add_video(
+                    100 + i, 1, len(boxes), 2, get_motion_grid(boxes, 1280, 720)
+                )
+
+            segment = maintainer.segment_stats(
+                "front",
+                datetime.datetime.fromtimestamp(100, datetime.timezone.utc),
+                datetime.datetime.fromtimestamp(200, datetime.timezone.utc),
+            )
+            self.assertEqual(
+                segment.motion_heatmap, _sparse_motion_heatmap(all_boxes, 1280, 720)
+            )
+            self.assertEqual(segment.motion_count, len(all_boxes))
+            self.assertEqual(segment.active_object_count, 20)
+            self.assertEqual(segment.region_count, 40)
+        finally:
+            summary.close()
+            summary.unlink()
+
+    def test_segment_stats_without_aggregator(self):
+        camera_config = MagicMock()
+        camera_config.detect.fps = 5
+        config = MagicMock(spec=FrigateConfig)
+        config.cameras = {"front": camera_config}
+        config.record = MagicMock(aggregate_detections=False)
+        maintainer = RecordingMaintainer(config, MagicMock())
+        summary = maintainer.detection_summaries["front"]
+        summary.add_video(100.2, 1, 0, 1, None)
+        summary.add_video(100.7, 1, 3, 1, None)
+
+        segment = maintainer.segment_stats(
+            "front",
+            datetime.datetime.fromtimestamp(100.5, datetime.timezone.utc),
+            datetime.datetime.fromtimestamp(110.5, datetime.timezone.utc),
+        )
+        self.assertEqual(segment.motion_count, 3)
+        self.assertEqual(segment.active_object_count, 1)
+        self.assertEqual(segment.region_count, 1)
+        maintainer.detection_summaries.close()
+
+
 if __name__ == "__main__":
     unittest.main()
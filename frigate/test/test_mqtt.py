@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import MagicMock, call
+
+from frigate.comms.mqtt import MqttClient
+from frigate.config import FrigateConfig
+
+
+class TestMqttPublishing(unittest.TestCase):
+    def setUp(self):
+        config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "cameras": {
+                    "front_door": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"height": 1080, "width": 1920, "fps": 5},
+                    }
+                },
+            }
+        )
+        self.mqtt_client = MqttClient(config)
+        self.mqtt_client.client = MagicMock()
+        self.mqtt_client.connected = True
+
+    def _published(self) -> list[tuple]:
+        return [
+            (c.args[0], c.args[1], c.kwargs["retain"])
+            for c in self.mqtt_client.client.publish.call_args_list
+        ]
+
+    def test_unchanged_retained_state_is_suppressed(self):
+        self.mqtt_client.publish("front_door/detect/state", "ON", retain=True)
+        self.mqtt_client.flush()
+        self.mqtt_client.publish("front_door/detect/state", "ON", retain=True)
+        self.mqtt_client.publish("front_door/person", 1, retain=False)
+        self.mqtt_client.publish("front_door/person", 1, retain=False)
+        self.mqtt_client.flush()
+
+        self.assertEqual(
+            self._published(),
+            [
+                ("frigate/front_door/detect/state", "ON", True),
+                ("frigate/front_door/person", 1, False),
+                ("frigate/front_door/person", 1, False),
+            ],
+        )
+        self.assertEqual(self.mqtt_client.suppressed_count, 1)
+
+    def test_batch_keeps_latest_retained_value(self):
+        self.mqtt_client.publish("front_door/person", 1, retain=True)
+        self.mqtt_client.publish("events", "a", retain=False)
+        self.mqtt_client.publish("front_door/person", 2, retain=True)
+        self.mqtt_client.publish("events", "b", retain=False)
+        self.mqtt_client.flush()
+
+        self.assertEqual(
+            self._published(),
+            [
+                ("frigate/events", "a", False),
+                ("frigate/front_door/person", 2, True),
+                ("frigate/events", "b", False),
+            ],
+        )
+
+        stats = self.mqtt_client.get_publish_stats()
+        self.assertEqual(stats["published"], 3)
+        self.assertEqual(stats["suppressed"], 1)
+        self.assertEqual(stats["batches"], 1)
+        self.assertGreater(stats["publish_rate"], 0)
+
+    def test_reconnect_republishes_retained_state(self):
+        self.mqtt_client.publish("available", "online", retain=True)
+        self.mqtt_client.flush()
+        self.mqtt_client._set_initial_topics = MagicMock()
+        self.mqtt_client._on_connect(self.mqtt_client.client, None, None, 0, None)
+        self.mqtt_client.publish("available", "online", retain=True)
+        self.mqtt_client.flush()
+
+        self.assertEqual(
+            self.mqtt_client.client.publish.call_args_list,
+            [call("frigate/available", "online", qos=0, retain=True)] * 2,
+        )
+
+    def test_disconnected_publishes_are_dropped(self):
+        self.mqtt_client.connected = False
+        self.mqtt_client.publish("available", "online", retain=True)
+        self.mqtt_client.flush()
+
+        self.mqtt_client.client.publish.assert_not_called()
+        self.assertEqual(self.mqtt_client.last_retained, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+import datetime
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+from playhouse.sqliteq import SqliteQueueDatabase
+
+from frigate.config import FrigateConfig
+from frigate.models import Previews, Recordings, ReviewSegment, UserReviewStatus
+from frigate.record import cleanup
+from frigate.record.cleanup import RecordingCleanup
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class TestRecordingCleanup(unittest.TestCase):
+    def setUp(self):
+        # setup clean database for each test run
+        migrate_db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(migrate_db)
+        router.run()
+        migrate_db.close()
+        self.db = SqliteQueueDatabase(TEST_DB)
+        models = [Previews, Recordings, ReviewSegment, UserReviewStatus]
+        self.db.bind(models)
+        self.test_dir = tempfile.mkdtemp()
+        self.cursor_file = os.path.join(self.test_dir, ".recording_cleanup.json")
+        self.cursor_patch = patch.object(cleanup, "SWEEP_CURSOR_FILE", self.cursor_file)
+        self.cursor_patch.start()
+
+        self.config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "record": {"continuous": {"days": 1}},
+                "cameras": {
+                    "front_door": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {
+                            "height": 1080,
+                            "width": 1920,
+                            "fps": 5,
+                        },
+                    }
+                },
+            }
+        )
+        self.now = datetime.datetime.now().timestamp()
+
+    def tearDown(self):
+        self.cursor_patch.stop()
+
+        if not self.db.is_closed():
+            self.db.close()
+
+        try:
+            for file in TEST_DB_CLEANUPS:
+                os.remove(file)
+        except OSError:
+            pass
+
+    def _insert_recordings(self, start: float, count: int, duration: float = 10):
+        rows = []
+        paths = []
+
+        for i in range(count):
+            start_time = start + i * duration
+            path = os.path.join(self.test_dir, f"{start_time}.mp4")
+
+            with open(path, "w"):
+                pass
+
+            paths.append(path)
+            rows.append(
+                {
+                    Recordings.id.name: f"{start_time}-{i}",
+                    Recordings.camera.name: "front_door",
+                    Recordings.path.name: path,
+                    Recordings.start_time.name: start_time,
+                    Recordings.end_time.name: start_time + duration,
+                    Recordings.duration.name: duration,
+                    Recordings.motion.name: 0,
+                    Recordings.objects.name: 0,
+                    Recordings.dBFS.name: 0,
+                }
+            )
+
+        for i in range(0, len(rows), 500):
+            Recordings.insert_many(rows[i : i + 500]).execute()
+
+        return paths
+
+    def _cleanup(self) -> RecordingCleanup:
+        return RecordingCleanup(self.config, MagicMock(is_set=lambda: False))
+
+    def test_expired_recordings_are_deleted(self):
+        expired = self._insert_recordings(self.now - 3 * 86400, 60)
+        kept = self._insert_recordings(self.now - 3600, 60)
+
+        recording_cleanup = self._cleanup()
+        recording_cleanup.expire_recordings()
+
+        self.assertFalse(recording_cleanup.sweep_pending)
+        self.assertEqual(Recordings.select().count(), 60)
+        self.assertFalse(any(os.path.exists(p) for p in expired))
+        self.assertTrue(all(os.path.exists(p) for p in kept))
+
+    def test_files_are_removed_before_their_rows(self):
+        paths = self._insert_recordings(self.now - 3 * 86400, 20)
+        locked = set(paths[:5])
+        rows_at_unlink = []
+        recording_cleanup = self._cleanup()
+        unlink_path = recording_cleanup.unlink_path
+
+        def unlink_or_fail(path):
+            rows_at_unlink.append(
+                Recordings.select().where(Recordings.path == str(path)).count()
+            )
+            return str(path) not in locked and unlink_path(path)
+
+        with patch.object(recording_cleanup, "unlink_path", unlink_or_fail):
+            recording_cleanup.expire_recordings()
+
+        # every row still existed when its file was removed
+        self.assertEqual(rows_at_unlink, [1] * 20)
+        # rows of files that could not be removed are kept for the next pass
+        self.assertEqual(
+            sorted(r.path for r in Recordings.select(Recordings.path)), sorted(locked)
+        )
+
+    def test_recordings_in_review_are_kept(self):
+        start = self.now - 3 * 86400
+        self._insert_recordings(start, 60)
+        # alerts retain segments with motion by default
+        Recordings.update(motion=5).execute()
+        ReviewSegment.insert(
+            id="review",
+            camera="front_door",
+            start_time=start + 100,
+            end_time=start + 200,
+            severity="alert",
+            thumb_path="",
+            data={},
+        ).execute()
+
+        self._cleanup().expire_recordings()
+
+        # recordings overlapping the review and its pre/post capture are kept
+        remaining = [r.start_time for r in Recordings.select(Recordings.start_time)]
+        self.assertTrue(remaining)
+        self.assertTrue(all(start + 90 <= t <= start + 200 for t in remaining))
+
+    def test_sweep_is_bounded_and_resumes(self):
+        # 4 days of segments is more than a single cycle is allowed to sweep
+        start = self.now - 5 * 86400
+        window_count = cleanup.SWEEP_MAX_WINDOWS * 2
+        self._insert_recordings(
+            start, window_count * 6, duration=cleanup.SWEEP_WINDOW_SECONDS / 6
+        )
+        total = Recordings.select().count()
+
+        recording_cleanup = self._cleanup()
+        recording_cleanup.expire_recordings()
+
+        self.assertTrue(recording_cleanup.sweep_pending)
+        self.assertEqual(
+            Recordings.select().count(), total - cleanup.SWEEP_MAX_WINDOWS * 6
+        )
+
+        # cursor is saved so a new instance continues where the last one stopped
+        with open(self.cursor_file) as f:
+            cursor = json.load(f)["front_door"]
+
+        self.assertEqual(
+            cursor, start + cleanup.SWEEP_MAX_WINDOWS * cleanup.SWEEP_WINDOW_SECONDS
+        )
+
+        resumed_cleanup = self._cleanup()
+        self.assertEqual(resumed_cleanup.sweep_cursors["front_door"], cursor)
+        resumed_cleanup.expire_recordings()
+
+        self.assertFalse(resumed_cleanup.sweep_pending)
+        self.assertEqual(Recordings.select().count(), 0)
+        self.assertNotIn("front_door", resumed_cleanup.sweep_cursors)
+
+    def test_sweep_skips_gaps(self):
+        self._insert_recordings(self.now - 300 * 86400, 10)
+        self._insert_recordings(self.now - 3 * 86400, 10)
+
+        recording_cleanup = self._cleanup()
+        recording_cleanup.expire_recordings()
+
+        self.assertFalse(recording_cleanup.sweep_pending)
+        self.assertEqual(Recordings.select().count(), 0)
+
+    def test_previews_without_recordings_are_deleted(self):
+        start = self.now - 3 * 86400
+        self._insert_recordings(start, 10)
+        preview_path = os.path.join(self.test_dir, "preview.mp4")
+
+        with open(preview_path, "w"):
+            pass
+
+        Previews.insert(
+            id="preview",
+            camera="front_door",
+            path=preview_path,
+            start_time=start,
+            end_time=start + 100,
+            duration=100,
+        ).execute()
+
+        self._cleanup().expire_recordings()
+
+        self.assertEqual(Previews.select().count(), 0)
+        self.assertFalse(os.path.exists(preview_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""Verify the hot Recordings queries are served by the camera time indexes."""
+
+import datetime
+import os
+import random
+import re
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from frigate.config import FrigateConfig
+from frigate.const import MAX_SEGMENT_DURATION
+from frigate.models import (
+    Event,
+    Previews,
+    Recordings,
+    ReviewSegment,
+    UserReviewStatus,
+)
+from frigate.record import cleanup
+from frigate.record.cleanup import RecordingCleanup
+from frigate.test.http_api.base_http_test import AuthTestClient, BaseTestHttp
+from frigate.util.media import recordings_overlap_clause
+
+
+class TestRecordingsQueryPlan(BaseTestHttp):
+    """Explain the Recordings queries run by the API and the retention sweep."""
+
+    def setUp(self):
+        super().setUp([Event, Previews, Recordings, ReviewSegment, UserReviewStatus])
+        self.app = super().create_app()
+        self.camera = "front_door"
+        self.after = 1700000000.0
+        self.before = 1700003600.0
+        test_dir = tempfile.mkdtemp()
+        cursor_patch = patch.object(
+            cleanup,
+            "SWEEP_CURSOR_FILE",
+            os.path.join(test_dir, ".recording_cleanup.json"),
+        )
+        cursor_patch.start()
+        self.addCleanup(cursor_patch.stop)
+
+    def _recordings_plans(self, action) -> list[str]:
+        """Run an action and explain every Recordings select it executes."""
+        execute_sql = self.db.execute_sql
+        statements = []
+
+        def record(sql, params=None, *args, **kwargs):
+            if sql.startswith("SELECT") and '"recordings"' in sql:
+                statements.append((sql, params))
+
+            return execute_sql(sql, params, *args, **kwargs)
+
+        with patch.object(self.db, "execute_sql", side_effect=record):
+            action()
+
+        self.assertTrue(statements, "expected the action to query recordings")
+        return [
+            " ".join(
+                row[-1]
+                for row in execute_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            )
+            for sql, params in statements
+        ]
+
+    def assertIndexed(self, plans: list[str], range_search: str) -> None:
+        for plan in plans:
+            self.assertRegex(
+                plan,
+                rf"USING (COVERING )?INDEX recordings_\w+ {re.escape(range_search)}",
+            )
+            self.assertNotIn("SCAN", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_vod_ts(self):
+        with AuthTestClient(self.app) as client:
+            plans = self._recordings_plans(
+                lambda: client.get(
+                    f"/vod/{self.camera}/start/{self.after}/end/{self.before}"
+                )
+            )
+
+        self.assertIndexed(plans, "(camera=? AND start_time>? AND start_time<?)")
+
+    def test_recording_clip(self):
+        with AuthTestClient(self.app) as client:
+            plans = self._recordings_plans(
+                lambda: client.get(
+                    f"/{self.camera}/start/{self.after}/end/{self.before}/clip.mp4"
+                )
+            )
+
+        self.assertIndexed(plans, "(camera=? AND start_time>? AND start_time<?)")
+
+    def test_motion_activity(self):
+        with AuthTestClient(self.app) as client:
+            plans = self._recordings_plans(
+                lambda: client.get(
+                    "/review/activity/motion",
+                    params={
+                        "cameras": self.camera,
+                        "after": self.after,
+                        "before": self.before,
+                    },
+                )
+            )
+
+        self.assertIndexed(plans, "(camera=? AND start_time>?)")
+
+    def test_retention_sweep(self):
+        config = FrigateConfig(**self.minimal_config).cameras[self.camera]
+        recording_cleanup = RecordingCleanup(
+            FrigateConfig(**self.minimal_config), threading.Event()
+        )
+        now = datetime.datetime.now().timestamp()
+        Recordings.insert(
+            id="old",
+            camera=self.camera,
+            path="/media/frigate/recordings/old.mp4",
+            start_time=self.after,
+            end_time=self.after + 10,
+            duration=10,
+            motion=0,
+            objects=0,
+            dBFS=0,
+        ).execute()
+
+        plans = self._recordings_plans(
+            lambda: recording_cleanup.sweep_camera_recordings(now, now, config)
+        )
+
+        self.assertIndexed(plans, "(camera=? AND start_time")
+        self.assertTrue(
+            any("(camera=? AND start_time>? AND start_time<?)" in p for p in plans)
+        )
+
+    def test_overlap_clause_matches_between_form(self):
+        rng = random.Random(0)
+        rows = []
+        start = self.after - 1800
+
+        while start < self.before + 1800:
+            duration = rng.uniform(1, MAX_SEGMENT_DURATION - 1)
+            rows.append(
+                {
+                    Recordings.id.name: f"{start}-{len(rows)}",
+                    Recordings.camera.name: self.camera,
+                    Recordings.path.name: f"/media/frigate/recordings/{len(rows)}.mp4",
+                    Recordings.start_time.name: start,
+                    Recordings.end_time.name: start + duration,
+                    Recordings.duration.name: duration,
+                }
+            )
+            start += duration + rng.choice([0, 0, 5, 120])
+
+        Recordings.insert_many(rows).execute()
+
+        for _ in range(50):
+            after = rng.uniform(self.after - 2000, self.before + 2000)
+            before = after + rng.uniform(0, 3000)
+            between_ids = {
+                r.id
+                for r in Recordings.select(Recordings.id).where(
+                    Recordings.start_time.between(after, before)
+                    | Recordings.end_time.between(after, before)
+                    | ((after > Recordings.start_time) & (before < Recordings.end_time))
+                )
+            }
+            overlap_ids = {
+                r.id
+                for r in Recordings.select(Recordings.id).where(
+                    recordings_overlap_clause(after, before)
+                )
+            }
+            self.assertEqual(between_ids, overlap_ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,15 +3,15 @@ import logging
 import os
 import tempfile
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from peewee import DoesNotExist
+from peewee import DoesNotExist, OperationalError
 from peewee_migrate import Router
 from playhouse.sqlite_ext import SqliteExtDatabase
 from playhouse.sqliteq import SqliteQueueDatabase
 
 from frigate.config import FrigateConfig
-from frigate.models import Event, Recordings
+from frigate.models import Event, Recordings, RecordingsUsage
 from frigate.storage import StorageMaintainer
 from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
 
@@ -25,7 +25,7 @@ class TestHttp(unittest.TestCase):
         router.run()
         migrate_db.close()
         self.db = SqliteQueueDatabase(TEST_DB)
-        models = [Event, Recordings]
+        models = [Event, Recordings, RecordingsUsage]
         self.db.bind(models)
         self.test_dir = tempfile.mkdtemp()
 
@@ -260,6 +260,108 @@ class TestHttp(unittest.TestCase):
         assert Recordings.get(Recordings.id == rec_k2_id)
         assert Recordings.get(Recordings.id == rec_k3_id)
 
+    def test_usage_aggregates_follow_recordings(self):
+        """Ensure usage aggregates are kept in sync on insert, update and delete."""
+        config = FrigateConfig(**self.double_cam_config)
+        storage = StorageMaintainer(config, MagicMock())
+
+        day_start = 1700006400  # 2023-11-15 00:00 UTC
+        for i in range(6):
+            _insert_mock_recording(
+                f"{day_start + i * 10}.front",
+                os.path.join(self.test_dir, f"{i}.front.tmp"),
+                day_start - 30 + i * 10,
+                day_start - 20 + i * 10,
+                seg_size=2,
+            )
+        _insert_mock_recording(
+            "empty.back",
+            os.path.join(self.test_dir, "empty.back.tmp"),
+            day_start,
+            day_start + 10,
+            camera="back_door",
+            seg_size=0,
+        )
+
+        # segments are bucketed by the day they start in
+        assert {
+            (u.day, u.segment_count, u.segment_size)
+            for u in RecordingsUsage.select().where(
+                RecordingsUsage.camera == "front_door"
+            )
+        } == {(19675, 3, 6), (19676, 3, 6)}
+        assert storage.calculate_camera_usages() == {
+            "front_door": {"usage": 12, "bandwidth": 0},
+            "back_door": {"usage": None, "bandwidth": 0},
+        }
+
+        Recordings.update(segment_size=4).where(
+            Recordings.id == f"{day_start + 30}.front"
+        ).execute()
+        Recordings.delete().where(Recordings.start_time < day_start).execute()
+        assert [
+            (u.day, u.segment_count, u.segment_size, u.duration)
+            for u in RecordingsUsage.select()
+        ] == [(19676, 3, 8, 30)]
+        assert storage.verify_usage_aggregates() == []
+
+    def test_usage_aggregates_rebuild(self):
+        """Ensure out of sync usage aggregates are detected and rebuilt."""
+        config = FrigateConfig(**self.double_cam_config)
+        storage = StorageMaintainer(config, MagicMock())
+
+        time_keep = datetime.datetime.now().timestamp()
+        for camera in ["front_door", "back_door"]:
+            _insert_mock_recording(
+                f"1234567.{camera}",
+                os.path.join(self.test_dir, f"{camera}.tmp"),
+                time_keep,
+                time_keep + 10,
+                camera=camera,
+            )
+
+        RecordingsUsage.update(segment_size=100).where(
+            RecordingsUsage.camera == "back_door"
+        ).execute()
+        RecordingsUsage.insert(
+            camera="front_door", day=1, segment_count=1, segment_size=1, duration=1
+        ).execute()
+
+        assert storage.verify_usage_aggregates(rebuild=False) == [
+            "back_door",
+            "front_door",
+        ]
+        assert storage.verify_usage_aggregates() == ["back_door", "front_door"]
+        assert storage.verify_usage_aggregates() == []
+        assert storage.calculate_camera_usages() == {
+            "front_door": {"usage": 8, "bandwidth": 0},
+            "back_door": {"usage": 8, "bandwidth": 0},
+        }
+
+    def test_usage_rebuild_is_atomic(self):
+        """Ensure a failed rebuild leaves the previous aggregates in place."""
+        config = FrigateConfig(**self.double_cam_config)
+        storage = StorageMaintainer(config, MagicMock())
+        _insert_mock_recording(
+            "1234567.front_door",
+            os.path.join(self.test_dir, "front_door.tmp"),
+            datetime.datetime.now().timestamp(),
+            datetime.datetime.now().timestamp() + 10,
+        )
+        before = list(RecordingsUsage.select().tuples())
+        failing_insert = MagicMock()
+        failing_insert.on_conflict_replace.return_value.sql.return_value = (
+            "INSERT INTO missing_table VALUES (1)",
+            [],
+        )
+
+        with patch.object(RecordingsUsage, "insert_from", return_value=failing_insert):
+            with self.assertRaises(OperationalError):
+                storage.rebuild_camera_usage("front_door")
+
+        assert before
+        assert list(RecordingsUsage.select().tuples()) == before
+
 
 def _insert_mock_event(
     id: str,
@@ -0,0 +1,100 @@
+import json
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from frigate.comms.ws import (
+    WS_SUBSCRIBE,
+    WS_UNSUBSCRIBE,
+    ClientQueue,
+    WebSocket,
+    WebSocketClient,
+    topic_matches,
+)
+
+
+class FakeWebSocket(WebSocket):
+    def __init__(self) -> None:
+        # skip the socket setup, only subscriptions and the queue are used
+        self.subscriptions = {"#"}
+        self.send_queue = ClientQueue(max_size=5)
+        self.client_terminated = False
+        self.server_terminated = False
+
+
+class TestWebSocket(unittest.TestCase):
+    def setUp(self):
+        self.client = WebSocketClient(MagicMock())
+        self.sockets = {i: FakeWebSocket() for i in range(2)}
+        self.client.websocket_server = SimpleNamespace(
+            manager=SimpleNamespace(lock=threading.Lock(), websockets=self.sockets)
+        )
+
+    def _received(self, ws: FakeWebSocket) -> list[tuple[str, object]]:
+        return [
+            (m["topic"], m["payload"])
+            for m in map(json.loads, ws.send_queue.get_all(timeout=0))
+        ]
+
+    def test_topic_matches(self):
+        self.assertTrue(topic_matches("#", "front_door/audio/dBFS"))
+        self.assertTrue(topic_matches("front_door/#", "front_door/audio/dBFS"))
+        self.assertTrue(topic_matches("+/audio/dBFS", "front_door/audio/dBFS"))
+        self.assertTrue(topic_matches("stats", "stats"))
+        self.assertFalse(topic_matches("+/audio", "front_door/audio/dBFS"))
+        self.assertFalse(topic_matches("back_door/#", "front_door/audio/dBFS"))
+        self.assertFalse(topic_matches("stats/+", "stats"))
+
+    def test_state_topics_are_coalesced(self):
+        for i in range(10):
+            self.client.publish("front_door/audio/dBFS", -i)
+            self.client.publish("events", {"id": i})
+
+        self.client.publish("camera_activity", "{}")
+        self.client.flush()
+
+        received = self._received(self.sockets[0])
+        self.assertEqual(received.count(("front_door/audio/dBFS", -9)), 1)
+        self.assertEqual([p["id"] for t, p in received if t == "events"], [7, 8, 9])
+        self.assertEqual(received[-1], ("camera_activity", "{}"))
+        self.assertEqual(self.sockets[0].send_queue.dropped, 7)
+
+    def test_subscriptions(self):
+        self.sockets[1].update_subscriptions(WS_SUBSCRIBE, ["+/audio/#", "stats"])
+        self.client.publish("front_door/audio/dBFS", -30)
+        self.client.publish("front_door/person", 1)
+        self.client.publish("stats", "{}")
+        self.client.flush()
+
+        self.assertEqual(len(self._received(self.sockets[0])), 3)
+        self.assertEqual(
+            self._received(self.sockets[1]),
+            [("front_door/audio/dBFS", -30), ("stats", "{}")],
+        )
+
+        self.sockets[1].update_subscriptions(WS_UNSUBSCRIBE, "stats")
+        self.client.publish("stats", "{}")
+        self.client.flush()
+        self.assertEqual(self._received(self.sockets[1]), [])
+
+    def test_slow_client_gets_latest_state(self):
+        self.client.publish("front_door/audio/dBFS", -1)
+        self.client.flush()
+        self.client.publish("front_door/audio/dBFS", -2)
+        self.client.flush()
+
+        # the first value was never sent so it is replaced in the queue
+        self.assertEqual(
+            self._received(self.sockets[0]), [("front_door/audio/dBFS", -2)]
+        )
+
+    def test_unserializable_payload_is_skipped(self):
+        self.client.publish("snapshot", b"\x00")
+        self.client.publish("stats", "{}")
+        self.client.flush()
+        self.assertEqual(self._received(self.sockets[0]), [("stats", "{}")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import time
+import unittest
+
+from frigate.comms.zmq_proxy import (
+    CODECS,
+    JsonCodec,
+    MsgpackCodec,
+    Publisher,
+    Subscriber,
+    ZmqProxy,
+)
+
+
+class MsgpackPublisher(Publisher):
+    topic_base = "msgpack/"
+    codec = MsgpackCodec
+
+
+class TestCodecs(unittest.TestCase):
+    def test_round_trip(self):
+        payload = (
+            "front_door",
+            1700000000.5,
+            [{"id": "1", "box": [1, 2, 3, 4], "sub_label": None, "active": True}],
+        )
+        expected = [
+            "front_door",
+            1700000000.5,
+            [{"id": "1", "box": [1, 2, 3, 4], "sub_label": None, "active": True}],
+        ]
+
+        for codec in CODECS.values():
+            self.assertEqual(codec.decode(codec.encode(payload)), expected)
+
+    def test_msgpack_keeps_key_types(self):
+        self.assertEqual(JsonCodec.decode(JsonCodec.encode({1: "a"})), {"1": "a"})
+        self.assertEqual(MsgpackCodec.decode(MsgpackCodec.encode({1: "a"})), {1: "a"})
+
+
+class TestPublishSubscribe(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("/tmp/cache", exist_ok=True)
+        self.proxy = ZmqProxy()
+
+    def tearDown(self):
+        self.proxy.stop()
+
+    def _receive(self, subscriber, publisher, payload, sub_topic=""):
+        # subscriptions take a moment to propagate through the proxy
+        for _ in range(50):
+            publisher.publish(payload, sub_topic)
+            update = subscriber.check_for_update(timeout=0.1)
+
+            if update not in (None, (None, None)):
+                return update
+
+            time.sleep(0.05)
+
+        self.fail("no message received")
+
+    def test_topics_use_their_codec(self):
+        msgpack_publisher = MsgpackPublisher()
+        msgpack_subscriber = Subscriber("msgpack/")
+        publisher = Publisher("test/")
+        subscriber = Subscriber("test/")
+
+        try:
+            self.assertIs(publisher.codec, JsonCodec)
+            self.assertEqual(
+                self._receive(
+                    msgpack_subscriber,
+                    msgpack_publisher,
+                    ("front_door", 1.0, {1: "person"}),
+                    "video",
+                ),
+                ["front_door", 1.0, {1: "person"}],
+            )
+            # topic and payload are separate frames, so spaces are preserved
+            self.assertEqual(
+                self._receive(subscriber, publisher, "a b", "with space"),
+                "a b",
+            )
+        finally:
+            for socket in [
+                msgpack_publisher,
+                msgpack_subscriber,
+                publisher,
+                subscriber,
+            ]:
+                socket.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
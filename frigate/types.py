@@ -1,10 +1,16 @@
 from enum import Enum
-from typing import TypedDict
+from typing import TYPE_CHECKING, TypedDict
 
 from frigate.camera import CameraMetrics
+from frigate.comms.inter_process import InterProcessCommunicator
+from frigate.comms.mqtt import MqttClient
+from frigate.comms.zmq_proxy import Publisher
 from frigate.data_processing.types import DataProcessorMetrics
 from frigate.object_detection.base import ObjectDetectProcess
 
+if TYPE_CHECKING:
+    from frigate.embeddings import EmbeddingsContext
+
 
 class StatsTrackingTypes(TypedDict):
     camera_metrics: dict[str, CameraMetrics]
@@ -14,6 +20,10 @@ class StatsTrackingTypes(TypedDict):
     latest_frigate_version: str
     last_updated: int
     processes: dict[str, int]
+    publishers: list[Publisher]
+    inter_process_communicator: InterProcessCommunicator | None
+    mqtt_client: MqttClient | None
+    embeddings: "EmbeddingsContext | None"
 
 
 class ModelStatusTypesEnum(str, Enum):
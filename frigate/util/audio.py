@@ -9,6 +9,7 @@ from pathvalidate import sanitize_filename
 
 from frigate.const import CACHE_DIR
 from frigate.models import Recordings
+from frigate.util.media import recordings_overlap_clause
 
 logger = logging.getLogger(__name__)
 
@@ -39,11 +40,7 @@ def get_audio_from_recording(
             Recordings.start_time,
             Recordings.end_time,
         )
-        .where(
-            (Recordings.start_time.between(start_ts, end_ts))
-            | (Recordings.end_time.between(start_ts, end_ts))
-            | ((start_ts > Recordings.start_time) & (end_ts < Recordings.end_time))
-        )
+        .where(recordings_overlap_clause(start_ts, end_ts))
         .where(Recordings.camera == camera_name)
         .order_by(Recordings.start_time.asc())
     )
@@ -8,9 +8,15 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterable
 
-from peewee import DatabaseError, chunked
-
-from frigate.const import CLIPS_DIR, EXPORT_DIR, RECORD_DIR, THUMB_DIR
+from peewee import DatabaseError, Expression, chunked
+
+from frigate.const import (
+    CLIPS_DIR,
+    EXPORT_DIR,
+    MAX_SEGMENT_DURATION,
+    RECORD_DIR,
+    THUMB_DIR,
+)
 from frigate.models import (
     Event,
     Export,
@@ -50,6 +56,22 @@ class SyncResult:
         }
 
 
+def recordings_overlap_clause(start_ts: float, end_ts: float) -> Expression:
+    """Build a where clause matching recordings that overlap a time range.
+
+    Overlap is expressed as start_time <= end_ts AND end_time >= start_ts so
+    SQLite can range scan the (camera, start_time) index instead of evaluating
+    an OR of between clauses for every recording of the camera. Recording
+    segments are always shorter than MAX_SEGMENT_DURATION, which bounds the
+    start_time range from below as well.
+    """
+    return (
+        (Recordings.start_time >= start_ts - MAX_SEGMENT_DURATION)
+        & (Recordings.start_time <= end_ts)
+        & (Recordings.end_time >= start_ts)
+    )
+
+
 def remove_empty_directories(root: Path, paths: Iterable[Path]) -> None:
     """
     Remove directories if they exist and are empty.
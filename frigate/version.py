@@ -0,0 +1 @@
+VERSION = "0.18.0-local"
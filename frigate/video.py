@@ -12,6 +12,7 @@ from typing import Any
 import cv2
 
 from frigate.camera import CameraMetrics, PTZMetrics
+from frigate.camera.backpressure import BackpressureController, DropReasonEnum
 from frigate.comms.inter_process import InterProcessRequestor
 from frigate.comms.recordings_updater import (
     RecordingsDataSubscriber,
@@ -861,6 +862,7 @@ def process_frames(
 
     fps_tracker = EventsPerSecond()
     fps_tracker.start()
+    backpressure = BackpressureController(camera_metrics)
 
     startup_scan = True
     stationary_frame_counter = 0
@@ -956,6 +958,12 @@ def process_frames(
             )
             continue
 
+        if not backpressure.should_process():
+            frame_manager.close(frame_name)
+            continue
+
+        process_start = time.monotonic()
+
         # look for motion if enabled
         motion_boxes = motion_detector.detect(frame)
 
@@ -1052,6 +1060,8 @@ def process_frames(
                     regions.append(region)
                 startup_scan = False
 
+            regions = backpressure.limit_regions(regions)
+
             # resize regions and detect
             # seed with stationary objects
             detections = [
@@ -1196,7 +1206,19 @@ def process_frames(
                 bgr_frame,
             )
         # add to the queue if not full
-        if detected_objects_queue.full():
+        queue_full = detected_objects_queue.full()
+
+        if queue_full:
+            backpressure.record_drop(DropReasonEnum.queue_full)
+
+        backpressure.observe(
+            frame_time,
+            time.monotonic() - process_start,
+            camera_config.detect.fps,
+            datetime.now().timestamp(),
+        )
+
+        if queue_full:
             frame_manager.close(frame_name)
             continue
         else:
@@ -0,0 +1,111 @@
+"""Peewee migrations -- 036_create_recordings_usage_table.py.
+
+Some examples (model - class or model name)::
+
+    > Model = migrator.orm['model_name']            # Return model in current state by name
+
+    > migrator.sql(sql)                             # Run custom SQL
+    > migrator.python(func, *args, **kwargs)        # Run python code
+    > migrator.create_model(Model)                  # Create a model (could be used as decorator)
+    > migrator.remove_model(model, cascade=True)    # Remove a model
+    > migrator.add_fields(model, **fields)          # Add fields to a model
+    > migrator.change_fields(model, **fields)       # Change fields
+    > migrator.remove_fields(model, *field_names, cascade=True)
+    > migrator.rename_field(model, old_field_name, new_field_name)
+    > migrator.rename_table(model, new_table_name)
+    > migrator.add_index(model, *col_names, unique=False)
+    > migrator.drop_index(model, *col_names)
+    > migrator.add_not_null(model, *field_names)
+    > migrator.drop_not_null(model, *field_names)
+    > migrator.add_default(model, field_name, default)
+
+"""
+
+import peewee as pw
+
+SQL = pw.SQL
+
+# segments are bucketed by the UTC day they start in
+USAGE_DAY = "CAST({}.start_time / 86400 AS INTEGER)"
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    migrator.sql(
+        """
+        CREATE TABLE IF NOT EXISTS recordingsusage (
+            camera VARCHAR(20) NOT NULL,
+            day INTEGER NOT NULL,
+            segment_count INTEGER NOT NULL DEFAULT 0,
+            segment_size REAL NOT NULL DEFAULT 0,
+            duration REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (camera, day)
+        )
+        """
+    )
+    # keep the aggregates in sync with every write path of the recordings table
+    migrator.sql(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS recordings_usage_insert
+        AFTER INSERT ON recordings WHEN NEW.segment_size > 0
+        BEGIN
+            INSERT INTO recordingsusage (camera, day, segment_count, segment_size, duration)
+            VALUES (NEW.camera, {USAGE_DAY.format("NEW")}, 1, NEW.segment_size, NEW.end_time - NEW.start_time)
+            ON CONFLICT (camera, day) DO UPDATE SET
+                segment_count = segment_count + 1,
+                segment_size = segment_size + excluded.segment_size,
+                duration = duration + excluded.duration;
+        END
+        """
+    )
+    migrator.sql(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS recordings_usage_delete
+        AFTER DELETE ON recordings WHEN OLD.segment_size > 0
+        BEGIN
+            UPDATE recordingsusage SET
+                segment_count = segment_count - 1,
+                segment_size = segment_size - OLD.segment_size,
+                duration = duration - (OLD.end_time - OLD.start_time)
+            WHERE camera = OLD.camera AND day = {USAGE_DAY.format("OLD")};
+            DELETE FROM recordingsusage
+            WHERE camera = OLD.camera AND day = {USAGE_DAY.format("OLD")} AND segment_count <= 0;
+        END
+        """
+    )
+    migrator.sql(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS recordings_usage_update
+        AFTER UPDATE OF camera, start_time, end_time, segment_size ON recordings
+        BEGIN
+            UPDATE recordingsusage SET
+                segment_count = segment_count - 1,
+                segment_size = segment_size - OLD.segment_size,
+                duration = duration - (OLD.end_time - OLD.start_time)
+            WHERE OLD.segment_size > 0 AND camera = OLD.camera AND day = {USAGE_DAY.format("OLD")};
+            DELETE FROM recordingsusage
+            WHERE camera = OLD.camera AND day = {USAGE_DAY.format("OLD")} AND segment_count <= 0;
+            INSERT INTO recordingsusage (camera, day, segment_count, segment_size, duration)
+            SELECT NEW.camera, {USAGE_DAY.format("NEW")}, 1, NEW.segment_size, NEW.end_time - NEW.start_time
+            WHERE NEW.segment_size > 0
+            ON CONFLICT (camera, day) DO UPDATE SET
+                segment_count = segment_count + 1,
+                segment_size = segment_size + excluded.segment_size,
+                duration = duration + excluded.duration;
+        END
+        """
+    )
+    migrator.sql(
+        f"""
+        INSERT OR REPLACE INTO recordingsusage (camera, day, segment_count, segment_size, duration)
+        SELECT camera, {USAGE_DAY.format("recordings")}, COUNT(*), SUM(segment_size), SUM(end_time - start_time)
+        FROM recordings WHERE segment_size > 0
+        GROUP BY camera, {USAGE_DAY.format("recordings")}
+        """
+    )
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.sql("DROP TRIGGER IF EXISTS recordings_usage_insert")
+    migrator.sql("DROP TRIGGER IF EXISTS recordings_usage_delete")
+    migrator.sql("DROP TRIGGER IF EXISTS recordings_usage_update")
+    migrator.sql("DROP TABLE IF EXISTS recordingsusage")
@@ -3,6 +3,10 @@ export interface FrigateStats {
   cpu_usages: { [pid: string]: CpuStats };
   detectors: { [detectorKey: string]: DetectorStats };
   embeddings?: EmbeddingsStats;
+  embeddings_batching?: EmbeddingsBatchingStats;
+  image_embedding_stages?: ImageEmbeddingStageStats;
+  search_query_cache?: SearchQueryCacheStats;
+  embeddings_index?: EmbeddingsIndexStats;
   gpu_usages?: { [gpuKey: string]: GpuStats };
   npu_usages?: { [npuKey: string]: NpuStats };
   processes: { [processKey: string]: ExtraProcessStats };
@@ -16,6 +20,7 @@ export interface FrigateStats {
 export type CameraStats = {
   audio_dBFPS: number;
   audio_rms: number;
+  backpressure: CameraBackpressureStats;
   camera_fps: number;
   capture_pid: number;
   detection_enabled: number;
@@ -30,6 +35,16 @@ export type CameraStats = {
   stalls_last_hour: number;
 };
 
+export type CameraBackpressureStats = {
+  level: number;
+  effective_fps: number;
+  drops: {
+    capture: number;
+    queue_full: number;
+    throttled: number;
+  };
+};
+
 export type CpuStats = {
   cmdline: string;
   cpu: string;
@@ -49,6 +64,35 @@ export type EmbeddingsStats = {
   face_embedding_speed: number;
   plate_recognition_speed: number;
   text_embedding_speed: number;
+  trigger_matching_speed?: number;
+};
+
+export type EmbeddingBatchStats = {
+  batch_size: number;
+  queue_delay: number;
+};
+
+export type EmbeddingsBatchingStats = {
+  image: EmbeddingBatchStats;
+  text: EmbeddingBatchStats;
+};
+
+export type ImageEmbeddingStageStats = {
+  decode: number;
+  preprocess: number;
+  inference: number;
+};
+
+export type SearchQueryCacheStats = {
+  size: number;
+  hits: number;
+  misses: number;
+  hit_rate: number;
+};
+
+export type EmbeddingsIndexStats = {
+  count: number;
+  memory: number;
 };
 
 export type ExtraProcessStats = {